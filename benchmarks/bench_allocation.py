@@ -0,0 +1,58 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_allocation.py                                                     #
+# Description: Microbenchmark of the per-operation cost and per-object memory   #
+# of DualNumbers. Run with `python benchmarks/bench_allocation.py` from the     #
+# repository root.                                                              #
+#################################################################################
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.dual_number import DualNumbers
+
+
+def time_per_op(stmt, env, number=20000, repeat=5):
+    """Return the best time of a single execution of stmt in microseconds"""
+    best = min(timeit.repeat(stmt, globals=env, number=number, repeat=repeat))
+    return best / number * 1e6
+
+
+def object_bytes(n_objects=10000, n_inputs=50):
+    """Return the average number of bytes retained by one DualNumbers object
+    created through an arithmetic operation, excluding its derivative array"""
+    x = DualNumbers(1.5, np.ones(n_inputs))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [x * 2.0 for _ in range(n_objects)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    derv_bytes = sys.getsizeof(kept[0].derv)
+    return (after - before) / n_objects - derv_bytes
+
+
+def main():
+    print(f"{'inputs':>8} {'operation':>12} {'us/op':>10}")
+    for n in (1, 50, 500):
+        env = {'DualNumbers': DualNumbers, 'np': np,
+               'x': DualNumbers(1.5, np.linspace(0.1, 1.0, n)),
+               'y': DualNumbers(0.7, np.linspace(1.0, 2.0, n)),
+               'seed': np.linspace(0.1, 1.0, n)}
+        for name, stmt in (('construct', 'DualNumbers(1.5, seed)'),
+                           ('x + y', 'x + y'),
+                           ('x * y', 'x * y'),
+                           ('x / 2.0', 'x / 2.0'),
+                           ('x.sin()', 'x.sin()'),
+                           ('x.exp()', 'x.exp()')):
+            print(f"{n:>8} {name:>12} {time_per_op(stmt, env):>10.3f}")
+    print()
+    print(f"bytes per DualNumbers object (excluding derivative array): {object_bytes():.0f}")
+
+
+if __name__ == '__main__':
+    main()
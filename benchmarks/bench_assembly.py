@@ -0,0 +1,39 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_assembly.py                                                       #
+# Description: Benchmark of the assembly of the values and the Jacobian of a    #
+# vector function with m outputs of n inputs by fuse_multiple_inputs, from a    #
+# list of DualNumbers objects and from a batched DualArray output.              #
+# Run with `python benchmarks/bench_assembly.py` from the repository root.      #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.dual_number import DualNumbers
+from AD_fbi.forward_mode import ForwardMode
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'m':>6} {'n':>6} {'list ms':>9} {'batched ms':>11}")
+    for m, n in ((100, 100), (1000, 100), (1000, 1000), (5000, 200)):
+        outputs = [DualNumbers._make(v, d) for v, d in zip(rng.standard_normal(m), rng.standard_normal((m, n)))]
+        number = max(1, 20000 // m)
+        t_list = min(timeit.repeat(lambda: ForwardMode.fuse_multiple_inputs(outputs, n), number=number, repeat=5))
+        try:
+            batched = np.stack(outputs)
+            t_batched = min(timeit.repeat(lambda: ForwardMode.fuse_multiple_inputs(batched, n),
+                                          number=number, repeat=5)) / number * 1e3
+        except TypeError:
+            # a batched output is not supported
+            t_batched = float('nan')
+        print(f"{m:>6} {n:>6} {t_list / number * 1e3:>9.3f} {t_batched:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
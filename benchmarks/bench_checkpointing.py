@@ -0,0 +1,70 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_checkpointing.py                                                  #
+# Description: Benchmark of the gradient of the energy of a damped oscillator   #
+# after T steps, with one tape of the whole loop (ReverseMode) and with         #
+# CheckpointedLoop for ceil(log2(T)) and ceil(sqrt(T)) snapshots, reporting the #
+# time, the steps evaluated without a tape and the peak memory traced by        #
+# tracemalloc, which is measured in a separate run from the time.               #
+# Run with `python benchmarks/bench_checkpointing.py` from the repository root. #
+#################################################################################
+
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.checkpointing import CheckpointedLoop
+from AD_fbi.reverse_mode import ReverseMode
+
+H = 0.01
+
+
+def step(x, v):
+    """One semi-implicit Euler step of a damped nonlinear oscillator"""
+    v = v - H * (x.sin() + 0.1 * v)
+    return x + H * v, v
+
+
+def energy(x, v):
+    """The energy of the oscillator"""
+    return 0.5 * v * v + (1 - x.cos())
+
+
+def measure(run):
+    """Return the result and time in ms of run, and the peak traced memory in MiB of a second run"""
+    start = time.perf_counter()
+    result = run()
+    elapsed = (time.perf_counter() - start) * 1e3
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    x0 = np.array([1., 0.])
+    print(f"{'T':>7} {'method':>11} {'snapshots':>10} {'forward steps':>14} {'ms':>9} {'peak MiB':>9}")
+    for steps in (1000, 10000, 100000):
+        def unrolled(x, v):
+            for _ in range(steps):
+                x, v = step(x, v)
+            return energy(x, v)
+
+        expected, elapsed, peak = measure(lambda: ReverseMode(x0, unrolled).calculate_gradient()[1])
+        print(f"{steps:>7} {'full tape':>11} {'-':>10} {steps:>14} {elapsed:>9.1f} {peak:>9.2f}")
+        for snapshots in (math.ceil(math.log2(steps)), math.ceil(math.sqrt(steps))):
+            loop = CheckpointedLoop(step, energy, steps, snapshots)
+            gradient, elapsed, peak = measure(lambda: loop.value_and_gradient(x0)[1])
+            assert np.allclose(gradient, expected)
+            print(f"{steps:>7} {'checkpoint':>11} {snapshots:>10} {loop.forward_steps:>14} {elapsed:>9.1f} "
+                  f"{peak:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_chunked.py                                                        #
+# Description: Benchmark of the full Jacobian of a function of many inputs in   #
+# one evaluation with n-wide derivatives against the chunked evaluation with a  #
+# memory budget, reporting the chunk size, the time and the peak memory.        #
+# Run with `python benchmarks/bench_chunked.py` from the repository root.       #
+#################################################################################
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+
+
+def sensitivity(*x):
+    """A smooth test function of every input variable"""
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + (x[i] * x[i + 1]).sin() + (x[i] / 4).exp() * x[i + 1].log() + x[i].arctan() ** 2
+    return total
+
+
+def measure(fm):
+    """Return the time in ms and the peak traced memory in MB of one evaluation of fm"""
+    start = time.perf_counter()
+    fm.calculate_dual_number()
+    elapsed = (time.perf_counter() - start) * 1e3
+    tracemalloc.start()
+    fm.calculate_dual_number()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'budget MB':>10} {'chunk':>6} {'ms':>9} {'peak MB':>9}")
+    for input_num in (2000, 5000):
+        point = rng.uniform(0.5, 1.5, input_num)
+        elapsed, peak = measure(ForwardMode(point, sensitivity))
+        print(f"{input_num:>8} {'none':>10} {input_num:>6} {elapsed:>9.1f} {peak:>9.1f}")
+        for budget in (16, 4):
+            fm = ForwardMode(point, sensitivity, memory_budget=budget * 2 ** 20)
+            elapsed, peak = measure(fm)
+            print(f"{input_num:>8} {budget:>10} {fm.get_chunk_size(input_num):>6} {elapsed:>9.1f} {peak:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_constants.py                                                      #
+# Description: Microbenchmark of the binary operators of DualNumbers and        #
+# DualArray with a constant operand, on a scalar point and on a batch of        #
+# points. Run with `python benchmarks/bench_constants.py` from the repository   #
+# root.                                                                         #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.dual_number import DualNumbers, DualArray
+
+
+CASES = ['x + 1', 'x - 1', '1 - x', 'x * 2.0', 'x / 2.0', 'x ** 2', 'x ** 3', 'x ** -1', 'x ** 0.5', 'x * y']
+
+
+def best_time(stmt, env, number):
+    """Return the best time of one execution of stmt in microseconds"""
+    return min(timeit.repeat(stmt, globals=env, number=number, repeat=7)) / number * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    scalar = {'x': DualNumbers(1.5, np.ones(4)), 'y': DualNumbers(0.5, np.ones(4))}
+    # 100000 evaluation points with 2 input variables
+    batch = {'x': DualArray(rng.uniform(0.5, 1.5, 100000), rng.uniform(-1, 1, (100000, 2))),
+             'y': DualArray(rng.uniform(0.5, 1.5, 100000), rng.uniform(-1, 1, (100000, 2)))}
+    print(f"{'case':>10} {'scalar us':>10} {'batch ms':>9}")
+    for stmt in CASES:
+        print(f"{stmt:>10} {best_time(stmt, scalar, 20000):>10.2f} {best_time(stmt, batch, 20) / 1e3:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
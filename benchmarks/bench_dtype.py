@@ -0,0 +1,61 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_dtype.py                                                          #
+# Description: Benchmark of ForwardMode with float32 against float64 values and #
+# derivatives, reporting time, peak memory and the accuracy drift of float32.   #
+# Run with `python benchmarks/bench_dtype.py` from the repository root.         #
+#################################################################################
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+
+
+def sensitivity(*x):
+    """A smooth test function of every input variable"""
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + (x[i] * x[i + 1]).sin() + (x[i] / 4).exp() * x[i + 1].log() + x[i].arctan() ** 2
+    return total
+
+
+def peak_memory(fm):
+    """Return the peak memory in MB traced during one evaluation of fm"""
+    tracemalloc.start()
+    fm.calculate_dual_number()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def run(name, inputs):
+    results = {}
+    for dtype in (np.float64, np.float32):
+        fm = ForwardMode(inputs, sensitivity, dtype=dtype)
+        elapsed = min(timeit.repeat(fm.calculate_dual_number, number=1, repeat=3)) * 1e3
+        results[dtype] = (elapsed, peak_memory(fm), fm.calculate_dual_number())
+    (t64, m64, (v64, d64)), (t32, m32, (v32, d32)) = results[np.float64], results[np.float32]
+    # the drift of float32 relative to the largest derivative of float64
+    val_drift = np.max(np.abs(v32 - v64)) / np.max(np.abs(v64))
+    derv_drift = np.max(np.abs(d32 - d64)) / np.max(np.abs(d64))
+    print(f"{name:>24} {t64:>10.1f} {t32:>10.1f} {m64:>10.1f} {m32:>10.1f} {val_drift:>12.2e} {derv_drift:>12.2e}")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'case':>24} {'f64 ms':>10} {'f32 ms':>10} {'f64 MB':>10} {'f32 MB':>10} "
+          f"{'value drift':>12} {'derv drift':>12}")
+    # one evaluation point with a wide derivative vector
+    run('1 point x 2000 inputs', rng.uniform(0.5, 1.5, 2000))
+    # a batched sensitivity run with one evaluation point per row
+    run('100000 points x 8 inputs', rng.uniform(0.5, 1.5, (100000, 8)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_hessian.py                                                        #
+# Description: Benchmark of full Hessians of the extended Rosenbrock function  #
+# plus a dense exponential term: ForwardMode.get_hessian, which propagates the #
+# n(n+1)/2 packed upper triangle entries, against HessianNumbers objects that  #
+# propagate all of the n x n entries with np.outer, in time and peak memory.   #
+# Run with `python benchmarks/bench_hessian.py` from the repository root.      #
+#################################################################################
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.hessian_number import HessianNumbers
+
+
+def func(*x):
+    """The extended Rosenbrock function plus the exponential of the mean, which couples every pair of inputs"""
+    rosenbrock = sum(100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(len(x) - 1))
+    return rosenbrock + (sum(x) / len(x)).exp()
+
+
+class FullHessianNumbers(HessianNumbers):
+    """The naive approach, which propagates all of the n x n second derivatives of every intermediate"""
+
+    def _outer(self, a, b):
+        return np.outer(a, b).ravel()
+
+
+def full_hessian(x):
+    """Return the n x n Hessian of func at x from FullHessianNumbers objects"""
+    n = len(x)
+    gradients = np.eye(n)
+    z = func(*[FullHessianNumbers._make(val, gradients[i], 0., None) for i, val in enumerate(x.tolist())])
+    return z.hess.reshape(n, n)
+
+
+def best_time(func, number):
+    """Return the best time per call in ms of 3 repetitions"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def peak_memory(func):
+    """Return the peak memory allocated by func in MiB"""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'n':>5} {'packed ms':>10} {'full ms':>8} {'speedup':>8} {'packed MiB':>11} {'full MiB':>9} "
+          f"{'ratio':>6} {'max error':>10}")
+    for n in (50, 100, 200, 400):
+        x = rng.uniform(-1., 1., n)
+        number = max(1, 2000 // n)
+        packed = lambda: ForwardMode(x, func).get_hessian()
+        full = lambda: full_hessian(x)
+        error = np.abs(packed().toarray() - full()).max()
+        t_packed, t_full = best_time(packed, number), best_time(full, number)
+        m_packed, m_full = peak_memory(packed), peak_memory(full)
+        print(f"{n:>5} {t_packed:>10.2f} {t_full:>8.2f} {t_full / t_packed:>8.2f} {m_packed:>11.2f} {m_full:>9.2f} "
+              f"{m_full / m_packed:>6.2f} {error:>10.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_hvp.py                                                            #
+# Description: Benchmark of Hessian-vector products of the extended Rosenbrock  #
+# function of n input variables: hvp against central finite differences of the #
+# gradients of ReverseMode and of ForwardMode, relative to one gradient, and    #
+# batch_hvp with a block of 8 vectors against 8 calls of hvp.                   #
+# Run with `python benchmarks/bench_hvp.py` from the repository root.           #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.hessian import hvp, batch_hvp
+from AD_fbi.reverse_mode import ReverseMode
+
+MAX_FORWARD = 1000
+EPS = 1e-6
+
+
+def rosenbrock(*x):
+    """The extended Rosenbrock function, a scalar function of any number of input variables"""
+    return sum(100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(len(x) - 1))
+
+
+def finite_difference(mode, x, v):
+    """Central finite difference of the gradient of rosenbrock along v with ReverseMode or ForwardMode"""
+    return (mode(x + EPS * v, rosenbrock).get_derivative() - mode(x - EPS * v, rosenbrock).get_derivative()) / (2 * EPS)
+
+
+def best_time(func, number):
+    """Return the best time per call in ms of 3 repetitions"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'n':>6} {'gradient ms':>12} {'hvp ms':>8} {'hvp/grad':>9} {'FD reverse ms':>14} {'FD forward ms':>14} "
+          f"{'FD error':>9} {'8 x hvp ms':>11} {'batch 8 ms':>11}")
+    for n in (100, 1000, 10000):
+        x = rng.uniform(-1., 1., n)
+        v = rng.normal(size=n)
+        V = rng.normal(size=(n, 8))
+        number = max(1, 1000 // n)
+        t_gradient = best_time(lambda: ReverseMode(x, rosenbrock).get_derivative(), number)
+        t_hvp = best_time(lambda: hvp(rosenbrock, x, v), number)
+        t_fd = best_time(lambda: finite_difference(ReverseMode, x, v), number)
+        error = np.abs(finite_difference(ReverseMode, x, v) - hvp(rosenbrock, x, v)).max()
+        if n <= MAX_FORWARD:
+            t_forward = f"{best_time(lambda: finite_difference(ForwardMode, x, v), number):>14.2f}"
+        else:
+            t_forward = f"{'-':>14}"
+        t_loop = best_time(lambda: [hvp(rosenbrock, x, V[:, j]) for j in range(8)], number)
+        t_batch = best_time(lambda: batch_hvp(rosenbrock, x, V), number)
+        print(f"{n:>6} {t_gradient:>12.2f} {t_hvp:>8.2f} {t_hvp / t_gradient:>9.2f} {t_fd:>14.2f} {t_forward} "
+              f"{error:>9.1e} {t_loop:>11.2f} {t_batch:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_inplace.py                                                        #
+# Description: Benchmark of long summation and product loops with the in-place #
+# compound operators of DualNumbers against the binary operators. Run with      #
+# `python benchmarks/bench_inplace.py` from the repository root.                #
+#################################################################################
+
+import os
+import sys
+import timeit
+import weakref
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.dual_number import DualNumbers
+
+
+def sum_inplace(terms):
+    s = 0
+    for t in terms:
+        s += t
+    return s
+
+
+def sum_binary(terms):
+    s = 0
+    for t in terms:
+        s = s + t
+    return s
+
+
+def prod_inplace(terms):
+    p = terms[0] * 1.0
+    for t in terms[1:]:
+        p *= t
+    return p
+
+
+def prod_binary(terms):
+    p = terms[0] * 1.0
+    for t in terms[1:]:
+        p = p * t
+    return p
+
+
+def count_allocations(loop, terms):
+    """Return the number of DualNumbers objects created by the operators of the loop"""
+    created = {'objects': 0, 'arrays': 0}
+    make = DualNumbers._make
+
+    # count the DualNumbers objects created by the operators
+    def counting_make(cls, val, derv):
+        created['objects'] += 1
+        return make.__func__(cls, val, derv)
+
+    DualNumbers._make = classmethod(counting_make)
+    try:
+        baseline = created['objects']
+        loop(terms)
+        total = created['objects'] - baseline
+    finally:
+        DualNumbers._make = make
+    return total
+
+
+def count_accumulator_arrays(inplace, terms):
+    """Return how many times the derivative array of the accumulator was replaced by a new array"""
+    replaced = 0
+    s = terms[0] * 1.0
+    for t in terms[1:]:
+        # a weak reference does not count as another owner of the array
+        previous = weakref.ref(s._derv)
+        if inplace:
+            s += t
+        else:
+            s = s + t
+        replaced += previous() is not s._derv
+    return replaced
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'terms':>6} {'loop':>8} {'binary ms':>10} {'in-place ms':>12} "
+          f"{'binary objs':>12} {'in-place objs':>14} {'binary arrays':>14} {'in-place arrays':>16}")
+    for n in (10, 1000, 100000):
+        for length in (200,):
+            terms = [DualNumbers(v, rng.standard_normal(n) * 1e-3) for v in rng.uniform(0.9, 1.1, length)]
+            for name, binary, inplace in (('sum', sum_binary, sum_inplace), ('product', prod_binary, prod_inplace)):
+                t_binary = min(timeit.repeat(lambda: binary(terms), number=10, repeat=3)) / 10 * 1e3
+                t_inplace = min(timeit.repeat(lambda: inplace(terms), number=10, repeat=3)) / 10 * 1e3
+                objs_binary = count_allocations(binary, terms)
+                objs_inplace = count_allocations(inplace, terms)
+                arrays_binary = count_accumulator_arrays(False, terms)
+                arrays_inplace = count_accumulator_arrays(True, terms)
+                print(f"{n:>8} {length:>6} {name:>8} {t_binary:>10.3f} {t_inplace:>12.3f} "
+                      f"{objs_binary:>12} {objs_inplace:>14} {arrays_binary:>14} {arrays_inplace:>16}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_jvp.py                                                            #
+# Description: Benchmark of the Jacobian-vector product J v of a function of    #
+# many inputs from the dense seeded Jacobian against ForwardMode.jvp, which     #
+# carries a scalar tangent per input, and against the value-only evaluation.    #
+# Run with `python benchmarks/bench_jvp.py` from the repository root.           #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+
+
+def sensitivity(*x):
+    """A smooth test function of every input variable"""
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + (x[i] * x[i + 1]).sin() + (x[i] / 4).exp() * x[i + 1].log() + x[i].arctan() ** 2
+    return total
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'dense J v ms':>13} {'jvp ms':>8} {'value ms':>9} {'jvp / value':>12}")
+    for input_num in (10, 100, 1000, 5000):
+        fm = ForwardMode(rng.uniform(0.5, 1.5, input_num), sensitivity)
+        v = rng.standard_normal(input_num)
+        number = max(1, 2000 // input_num)
+        t_dense = min(timeit.repeat(lambda: fm.calculate_dual_number()[1] @ v, number=number, repeat=3)) / number * 1e3
+        t_jvp = min(timeit.repeat(lambda: fm.jvp(v), number=number, repeat=3)) / number * 1e3
+        t_value = min(timeit.repeat(fm.calculate_primal, number=number, repeat=3)) / number * 1e3
+        print(f"{input_num:>8} {t_dense:>13.2f} {t_jvp:>8.2f} {t_value:>9.2f} {t_jvp / t_value:>11.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_kernels.py                                                        #
+# Description: Benchmark of the fused elementary-function kernels of            #
+# DualNumbers against the unfused rules they replaced, on a scalar point and    #
+# on a batch of points. Run with `python benchmarks/bench_kernels.py` from the  #
+# repository root.                                                              #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.dual_number import DualNumbers, DualArray
+
+
+# the rules before the fused kernels, which evaluate their transcendental functions more than once
+UNFUSED = {
+    'exp': lambda x: x._make(np.exp(x._val), x._derv * np.exp(x._val)),
+    'tan': lambda x: (x._check_domain((x._val / (np.pi / 2)) % 2 == 1, "ERROR"),
+                      x._make(np.tan(x._val), x._derv * 1 / np.cos(x._val) ** 2)),
+    'tanh': lambda x: x._make(np.tanh(x._val), x._derv * 1 / (np.cosh(x._val) ** 2)),
+    '2 ** x': lambda x: x._make(2 ** x._val, (2 ** x._val) * x._derv * np.log(2)),
+    'logistic': lambda x: 1 / ((-x).exp() + 1),
+    'softplus': lambda x: (x.exp() + 1).log(),
+    'sin, cos': lambda x: (x._make(np.sin(x._val), x._derv * np.cos(x._val)),
+                           x._make(np.cos(x._val), -x._derv * np.sin(x._val))),
+}
+
+FUSED = {
+    'exp': lambda x: x.exp(),
+    'tan': lambda x: x.tan(),
+    'tanh': lambda x: x.tanh(),
+    '2 ** x': lambda x: 2 ** x,
+    'logistic': lambda x: x.logistic(),
+    'softplus': lambda x: x.softplus(),
+    'sin, cos': lambda x: x.sincos(),
+}
+
+
+def best_time(func, x, number):
+    """Return the best time of one call of func(x) in microseconds"""
+    return min(timeit.repeat(lambda: func(x), number=number, repeat=7)) / number * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    # one evaluation point with 4 input variables
+    scalar = DualNumbers(0.7, np.ones(4))
+    # 100000 evaluation points with 2 input variables
+    batch = DualArray(rng.uniform(-1, 1, 100000), rng.uniform(-1, 1, (100000, 2)))
+    # the pool is disabled so that both rules allocate their results
+    DualArray.pool = None
+    print(f"{'function':>10} {'scalar us':>10} {'fused us':>9} {'speedup':>8} "
+          f"{'batch ms':>9} {'fused ms':>9} {'speedup':>8}")
+    for name in FUSED:
+        s_old, s_new = best_time(UNFUSED[name], scalar, 20000), best_time(FUSED[name], scalar, 20000)
+        b_old, b_new = best_time(UNFUSED[name], batch, 20) / 1e3, best_time(FUSED[name], batch, 20) / 1e3
+        print(f"{name:>10} {s_old:>10.2f} {s_new:>9.2f} {s_old / s_new:>7.2f}x "
+              f"{b_old:>9.2f} {b_new:>9.2f} {b_old / b_new:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
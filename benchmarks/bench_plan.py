@@ -0,0 +1,53 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_plan.py                                                           #
+# Description: Benchmark of repeated evaluations of one function at new points  #
+# with a new ForwardMode object per point against a ForwardPlan, reporting the  #
+# time per evaluation and the time of the optimizers that use the plan.         #
+# Run with `python benchmarks/bench_plan.py` from the repository root.          #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.forward_plan import ForwardPlan
+from AD_fbi.optimizers import Optimizer
+
+
+def chain(*x):
+    """A smooth test function of every input variable"""
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + (x[i] * x[i + 1]).sin() + x[i] ** 2
+    return total
+
+
+def main():
+    rng = np.random.default_rng(0)
+    repeat = 2000
+    print(f"{'inputs':>8} {'ForwardMode us':>15} {'ForwardPlan us':>15}")
+    for input_num in (2, 50):
+        points = list(rng.uniform(0.5, 1.5, (repeat, input_num)))
+        plan = ForwardPlan(chain, input_num)
+        t_mode = min(timeit.repeat(lambda: [ForwardMode(x, chain).calculate_dual_number() for x in points],
+                                   number=1, repeat=3)) / repeat * 1e6
+        t_plan = min(timeit.repeat(lambda: [plan.evaluate(x) for x in points],
+                                   number=1, repeat=3)) / repeat * 1e6
+        print(f"{input_num:>8} {t_mode:>15.1f} {t_plan:>15.1f}")
+
+    rosenbrock = lambda x, y: (1 - x)**2 + 100*(y - x**2)**2
+    x0 = np.array([1., 2.])
+    for name, optimizer in (('momentum', lambda: Optimizer.momentum(x0, rosenbrock, 2000, alpha=1e-4)),
+                            ('gradient_descent', lambda: Optimizer.gradient_descent(x0, rosenbrock, 2000, alpha=1e-4)),
+                            ('ADAGRAD', lambda: Optimizer.ADAGRAD(x0, rosenbrock, 2000, alpha=0.2))):
+        elapsed = min(timeit.repeat(optimizer, number=1, repeat=3)) * 1e3
+        print(f"{name:>16} 2000 iterations {elapsed:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_pool.py                                                           #
+# Description: Benchmark of repeated batched ForwardMode evaluations with and   #
+# without the buffer pool of DualArray, reporting the time per evaluation and   #
+# the number of large arrays allocated per evaluation in the steady state.      #
+# Run with `python benchmarks/bench_pool.py` from the repository root.          #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.buffer_pool import BufferPool
+from AD_fbi.dual_number import DualArray
+from AD_fbi.forward_mode import ForwardMode
+
+
+def expression(x, y):
+    """The batched expression of the request, with a second input variable"""
+    return (x.exp() * x**4) / 10 - x.log() + (x * y).sin() / y
+
+
+def run(points, pool, repeat=20):
+    """Return the time per evaluation in ms and the pool misses per evaluation after a warm-up evaluation"""
+    DualArray.pool = pool
+    fm = ForwardMode(points, expression)
+    fm.calculate_dual_number()
+    misses = pool.misses if pool is not None else 0
+    elapsed = min(timeit.repeat(fm.calculate_dual_number, number=repeat, repeat=3)) / repeat * 1e3
+    # every evaluation of a timeit repetition after the warm-up counts
+    misses = (pool.misses - misses) / (3 * repeat) if pool is not None else float('nan')
+    return elapsed, misses
+
+
+def main():
+    rng = np.random.default_rng(0)
+    default_pool = DualArray.pool
+    print(f"{'points':>8} {'no pool ms':>11} {'pool ms':>9} {'allocs/eval':>12} {'pooled allocs/eval':>19}")
+    for batch_size in (1000, 100000, 1000000):
+        points = rng.uniform(0.5, 1.5, (batch_size, 2))
+        t_plain, _ = run(points, None)
+        # a pool that keeps no free arrays counts every large array allocated by the operators
+        _, allocations = run(points, BufferPool(max_buffers=0))
+        t_pool, misses = run(points, BufferPool())
+        print(f"{batch_size:>8} {t_plain:>11.2f} {t_pool:>9.2f} {allocations:>12.2f} {misses:>19.2f}")
+    DualArray.pool = default_pool
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_primal.py                                                         #
+# Description: Benchmark of the value of a function of many inputs evaluated    #
+# with seeded DualNumbers against value-only PrimalNumbers, reporting the time  #
+# per evaluation of ForwardMode.get_fx_value and ForwardMode.calculate_primal.  #
+# Run with `python benchmarks/bench_primal.py` from the repository root.        #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+
+
+def sensitivity(*x):
+    """A smooth test function of every input variable"""
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + (x[i] * x[i + 1]).sin() + (x[i] / 4).exp() * x[i + 1].log() + x[i].arctan() ** 2
+    return total
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'dual ms':>10} {'primal ms':>10} {'speedup':>8}")
+    for input_num in (10, 100, 1000, 5000):
+        fm = ForwardMode(rng.uniform(0.5, 1.5, input_num), sensitivity)
+        number = max(1, 2000 // input_num)
+        t_dual = min(timeit.repeat(lambda: fm.calculate_dual_number()[0], number=number, repeat=3)) / number * 1e3
+        t_primal = min(timeit.repeat(fm.calculate_primal, number=number, repeat=3)) / number * 1e3
+        print(f"{input_num:>8} {t_dual:>10.2f} {t_primal:>10.2f} {t_dual / t_primal:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_reverse.py                                                        #
+# Description: Benchmark of the gradient of the extended Rosenbrock function    #
+# of n input variables with ReverseMode and ForwardMode for n from 10 to 10^5,  #
+# reporting the time per gradient, the time of the function evaluation alone    #
+# and the length of the tape. ForwardMode is skipped above MAX_FORWARD inputs,  #
+# where its n x n derivatives take too much time and memory.                    #
+# Run with `python benchmarks/bench_reverse.py` from the repository root.       #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.reverse_mode import ReverseMode
+
+MAX_FORWARD = 10000
+
+
+def rosenbrock(*x):
+    """The extended Rosenbrock function, a scalar function of any number of input variables"""
+    return sum(100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(len(x) - 1))
+
+
+def best_time(func, number):
+    """Return the best time per call in ms of 3 repetitions"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'n':>7} {'tape nodes':>11} {'value ms':>10} {'reverse ms':>11} {'forward ms':>11} {'speedup':>8}")
+    for n in (10, 100, 1000, 10000, 100000):
+        point = rng.uniform(-1., 1., n)
+        number = max(1, 1000 // n)
+        rm = ReverseMode(point, rosenbrock)
+        t_value = best_time(rm.get_fx_value, number)
+        t_reverse = best_time(rm.calculate_gradient, number)
+        nodes = len(rm.record()[0])
+        if n <= MAX_FORWARD:
+            fm = ForwardMode(point, rosenbrock)
+            t_forward = best_time(fm.calculate_dual_number, number)
+            assert np.allclose(rm.get_derivative(), fm.get_derivative())
+            print(f"{n:>7} {nodes:>11} {t_value:>10.2f} {t_reverse:>11.2f} {t_forward:>11.2f} "
+                  f"{t_forward / t_reverse:>7.1f}x")
+        else:
+            print(f"{n:>7} {nodes:>11} {t_value:>10.2f} {t_reverse:>11.2f} {'-':>11} {'-':>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_seed_matrix.py                                                    #
+# Description: Benchmark of the product J S of the Jacobian of a function of    #
+# many inputs and a tall-skinny n x k seed matrix, from the full Jacobian       #
+# against one sweep with k-wide derivatives, reporting time and peak memory.    #
+# Run with `python benchmarks/bench_seed_matrix.py` from the repository root.   #
+#################################################################################
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+
+
+def sensitivity(*x):
+    """A smooth test function of every input variable"""
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + (x[i] * x[i + 1]).sin() + (x[i] / 4).exp() * x[i + 1].log() + x[i].arctan() ** 2
+    return total
+
+
+def measure(f):
+    """Return the time in ms and the peak traced memory in MB of f"""
+    elapsed = min(timeit.repeat(f, number=1, repeat=3)) * 1e3
+    tracemalloc.start()
+    f()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'k':>4} {'full J S ms':>12} {'seed matrix ms':>15} {'full MB':>8} {'seed matrix MB':>15}")
+    for input_num in (1000, 4000):
+        point = rng.uniform(0.5, 1.5, input_num)
+        full = ForwardMode(point, sensitivity)
+        for k in (4, 16):
+            seed = rng.standard_normal((input_num, k))
+            t_full, m_full = measure(lambda: full.get_derivative() @ seed)
+            t_seed, m_seed = measure(ForwardMode(point, sensitivity, seed).get_derivative)
+            print(f"{input_num:>8} {k:>4} {t_full:>12.1f} {t_seed:>15.1f} {m_full:>8.1f} {m_seed:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_sparse_hessian.py                                                 #
+# Description: Benchmark of sparse Hessians of the extended Rosenbrock function #
+# plus coupling terms of every variable with its second neighbor: the first     #
+# call of sparse_hessian, which detects and star colors the pattern, later      #
+# calls that reuse the cached pattern, and the dense Hessians of batch_hvp      #
+# with the identity and of ForwardMode.get_hessian.                             #
+# Run with `python benchmarks/bench_sparse_hessian.py` from the repository      #
+# root.                                                                         #
+#################################################################################
+
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.evaluation_cache import EvaluationCache
+from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.hessian import batch_hvp, sparse_hessian
+from AD_fbi.sparsity import hessian_sparsity, star_color
+
+MAX_DENSE = 1000
+MAX_FORWARD = 200
+
+
+def func(*x):
+    """The extended Rosenbrock function plus a coupling of every variable with its second neighbor"""
+    rosenbrock = sum(100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(len(x) - 1))
+    return rosenbrock + sum((x[i] * x[i + 2]).sin() for i in range(len(x) - 2))
+
+
+def best_time(func, number):
+    """Return the best time per call in ms of 3 repetitions"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'n':>6} {'nnz':>7} {'colors':>6} {'first ms':>9} {'cached ms':>10} {'identity ms':>12} "
+          f"{'forward ms':>11} {'max error':>10}")
+    for n in (100, 1000, 10000):
+        x = rng.uniform(-1., 1., n)
+        cache = EvaluationCache()
+        start = time.perf_counter()
+        H = sparse_hessian(func, x, cache=cache)
+        t_first = (time.perf_counter() - start) * 1e3
+        colors = star_color(hessian_sparsity(func, x)).max() + 1
+        number = max(1, 1000 // n)
+        t_cached = best_time(lambda: sparse_hessian(func, x, cache=cache), number)
+        if n <= MAX_DENSE:
+            t_identity = f"{best_time(lambda: batch_hvp(func, x, np.eye(n)), number):>12.2f}"
+            error = f"{np.abs(H.toarray() - batch_hvp(func, x, np.eye(n))).max():>10.1e}"
+        else:
+            t_identity, error = f"{'-':>12}", f"{'-':>10}"
+        if n <= MAX_FORWARD:
+            t_forward = f"{best_time(lambda: ForwardMode(x, func).get_hessian(), number):>11.2f}"
+        else:
+            t_forward = f"{'-':>11}"
+        print(f"{n:>6} {H.nnz:>7} {colors:>6} {t_first:>9.2f} {t_cached:>10.2f} {t_identity} {t_forward} {error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: bench_sparsity.py                                                       #
+# Description: Benchmark of the Jacobian of a tridiagonal system of n equations #
+# with dense n-wide derivatives against the sparsity pattern detection, column  #
+# coloring and compressed evaluation of sparse_jacobian, reporting the times.   #
+# Run with `python benchmarks/bench_sparsity.py` from the repository root.      #
+#################################################################################
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.sparsity import jacobian_sparsity, color_columns, sparse_jacobian
+
+
+def make_system(n):
+    """A discretized nonlinear boundary value problem with a tridiagonal Jacobian"""
+    def system(*x):
+        return [(x[i - 1] if i > 0 else 0) - 2 * x[i] + (x[i + 1] if i < n - 1 else 0) + x[i].exp()
+                for i in range(n)]
+    return system
+
+
+def measure(f):
+    return min(timeit.repeat(f, number=1, repeat=3)) * 1e3
+
+
+def main():
+    print(f"{'n':>6} {'colors':>7} {'dense ms':>9} {'pattern ms':>11} {'coloring ms':>12} "
+          f"{'compressed ms':>14} {'reused pattern ms':>18}")
+    for n in (100, 1000, 4000):
+        system = make_system(n)
+        x = np.linspace(0.1, 1., n)
+        t_dense = measure(lambda: ForwardMode(x, system).calculate_dual_number())
+        pattern = jacobian_sparsity(system, x)
+        t_pattern = measure(lambda: jacobian_sparsity(system, x))
+        t_color = measure(lambda: color_columns(pattern))
+        t_sparse = measure(lambda: sparse_jacobian(system, x))
+        t_reused = measure(lambda: sparse_jacobian(system, x, pattern))
+        colors = color_columns(pattern).max() + 1
+        print(f"{n:>6} {colors:>7} {t_dense:>9.1f} {t_pattern:>11.1f} {t_color:>12.1f} {t_sparse:>14.1f} {t_reused:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,21 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from .dual_number import DualNumbers, is_numeric
+from .dual_number import DualNumbers, DualArray, DomainContext, is_numeric
+from .hyper_dual_number import HyperDualNumbers
+from .taylor_number import TaylorNumbers
+from .reverse_number import ReverseNumbers, Tape
+from .tangent_number import TangentNumbers, TangentTape
+from .hessian_number import HessianNumbers, SymmetricMatrix
+from .sparse_derivative import SparseDerivative
+from .sparsity import SparseMatrix, jacobian_sparsity, color_columns, sparse_jacobian, hessian_sparsity, star_color
+from .buffer_pool import BufferPool
+from .evaluation_cache import EvaluationCache
 from .forward_mode import ForwardMode
+from .forward_plan import ForwardPlan
+from .reverse_mode import ReverseMode
+from .checkpointing import CheckpointedLoop
+from .hessian import hvp, batch_hvp, sparse_hessian
+from .taylor_mode import TaylorMode
 from .optimizers import Optimizer
 
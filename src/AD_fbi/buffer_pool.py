@@ -0,0 +1,116 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: buffer_pool.py                                                          #
+# Description: This class defines a pool of NumPy arrays that are recycled      #
+# between the intermediates of batched dual number expressions. Arrays of       #
+# intermediates that are no longer used are returned to the pool, and the       #
+# operators write their results into pooled arrays instead of allocating.      #
+#################################################################################
+
+import numpy as np
+
+
+class BufferPool:
+    r"""A class representing a pool of reusable NumPy arrays grouped by shape and dtype
+
+    Only arrays with at least min_size elements are pooled, since small arrays are cheaper to
+    allocate than to look up. The caller of give must guarantee that nothing else refers to
+    the array, which DualArray checks with reference counts before returning its arrays.
+
+    Instance Variables
+    ----------
+    max_buffers: the largest number of free arrays kept for each shape and dtype
+    min_size: the smallest number of elements of a pooled array
+    hits: the number of requests served with a pooled array
+    misses: the number of requests of a poolable size that allocated a new array
+    returns: the number of arrays given back to the pool
+
+    Examples
+    --------
+    >>> pool = BufferPool(min_size=10)
+    >>> a = pool.take((100,), np.float64)
+    >>> pool.give(a)
+    True
+    >>> pool.take((100,), np.float64) is a
+    True
+    >>> pool.stats()
+    {'hits': 1, 'misses': 1, 'returns': 1, 'free': 0}
+    """
+
+    def __init__(self, max_buffers=8, min_size=4096):
+        r"""A constructor to create an empty BufferPool object
+
+        Parameters
+        ----------
+        max_buffers: integer object with the largest number of free arrays kept for each shape and dtype (default 8)
+        min_size: integer object with the smallest number of elements of a pooled array (default 4096)
+
+        Returns
+        -------
+        None
+        """
+        self.max_buffers = max_buffers
+        self.min_size = min_size
+        self.hits = 0
+        self.misses = 0
+        self.returns = 0
+        self._free = {}
+
+    def take(self, shape, dtype=float):
+        r"""A method to get an uninitialized array, reusing a free array of the same shape and dtype if there is one
+
+        Parameters
+        ----------
+        shape: tuple of integers with the shape of the array
+        dtype: the dtype of the array (default float)
+
+        Returns
+        -------
+        A C-contiguous NumPy array of the given shape and dtype
+        """
+        if np.prod(shape) < self.min_size:
+            return np.empty(shape, dtype)
+        free = self._free.get((shape, np.dtype(dtype)))
+        if free:
+            self.hits += 1
+            return free.pop()
+        self.misses += 1
+        return np.empty(shape, dtype)
+
+    def give(self, array):
+        r"""A method to return an array that is no longer used to the pool
+
+        Parameters
+        ----------
+        array: NumPy array that nothing else refers to
+
+        Returns
+        -------
+        True if the array was added to the pool, False if it cannot be pooled or the pool is full
+        """
+        # a view or a read-only array shares its memory with another array, so it is never reused
+        if type(array) is not np.ndarray or array.base is not None or array.size < self.min_size:
+            return False
+        if not (array.flags.c_contiguous and array.flags.writeable):
+            return False
+        free = self._free.setdefault((array.shape, array.dtype), [])
+        if len(free) >= self.max_buffers:
+            return False
+        free.append(array)
+        self.returns += 1
+        return True
+
+    def clear(self):
+        r"""A method to release every free array of the pool and reset its counters"""
+        self._free.clear()
+        self.hits = self.misses = self.returns = 0
+
+    def stats(self):
+        r"""A method to report the counters of the pool
+
+        Returns
+        -------
+        A dictionary with the hits, misses and returns of the pool and the number of free arrays
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'returns': self.returns,
+                'free': sum(len(free) for free in self._free.values())}
@@ -0,0 +1,255 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: checkpointing.py                                                        #
+# Description: This class defines a reverse mode driver for a step function    #
+# iterated T times with binomial checkpointing. Only a few snapshots of the     #
+# state are stored, every step is recorded on a tape of its own during the      #
+# backward sweep, and the states between snapshots are recomputed, so the       #
+# memory does not grow with the tape of the whole loop.                         #
+#################################################################################
+
+import math
+
+import numpy as np
+from .dual_number import DualNumbers
+from .primal_number import PrimalNumbers
+from .reverse_number import ReverseNumbers, Tape, _INPUT
+
+
+def _binomial(snapshots, repetitions):
+    r"""Return the largest number of steps that can be reversed with the given number of snapshots,
+    counting the state at the start, when every step is evaluated forward at most the given number
+    of times, which is the binomial coefficient C(s + r, s), or 0 for a negative number of repetitions"""
+    if repetitions < 0:
+        return 0
+    return math.comb(snapshots + repetitions, snapshots)
+
+
+def _state(z):
+    r"""Return the outputs of a step function as a list, wrapping a single output of a scalar state"""
+    if isinstance(z, (list, tuple, np.ndarray)):
+        return list(z)
+    return [z]
+
+
+class CheckpointedLoop:
+    r"""A class representing the reverse mode differentiation of an objective of the final state of a loop
+
+    The loop starts from the state x_0 and computes x_{t+1} = step(x_t) for t = 0, ..., T - 1, and
+    the objective is evaluated at x_T. Recording the whole loop on one tape takes memory proportional
+    to T. Instead, the backward sweep reverses the loop one segment at a time in the manner of the
+    Revolve algorithm: a segment is split where a snapshot of the state is stored, the second part
+    is reversed first with one snapshot less, and the first part is then reversed from the state at
+    its start. With s snapshots and steps evaluated forward at most r times, C(s + r, s) steps can
+    be reversed, so the default of ceil(log2(T)) snapshots evaluates every step a few times. More
+    snapshots trade memory for fewer recomputed steps, and T - 1 snapshots evaluate every step once.
+
+    Only one step is recorded on a tape at a time. An objective that depends on the whole trajectory,
+    e.g. a sum of losses, can carry its running value as an extra state variable.
+
+    Instance Variables
+    ----------
+    step: function of the n state variables that returns the n state variables of the next step
+    objective: function of the n state variables of the final state that returns a scalar
+    steps: the number of steps T of the loop
+    snapshots: the largest number of intermediate states stored at once, besides the initial state
+    forward_steps: the number of steps evaluated without a tape by the last evaluation
+    peak_snapshots: the largest number of intermediate states stored at once by the last evaluation
+
+    Examples
+    --------
+    >>> loop = CheckpointedLoop(lambda x, v: (x + 0.1 * v, v - 0.1 * x), lambda x, v: x * x + v * v, 100)
+    >>> val, grad = loop.value_and_gradient(np.array([1., 0.]))
+    >>> np.round(grad, 6)
+    array([5.409628, 0.      ])
+    >>> loop.stats()
+    {'steps': 100, 'forward_steps': 245, 'taped_steps': 100, 'peak_snapshots': 7}
+    """
+
+    def __init__(self, step, objective, steps, snapshots=None):
+        r"""A constructor to create a CheckpointedLoop object
+
+        Parameters
+        ----------
+        step: function of the state variables, as ReverseNumbers or DualNumbers objects, that returns
+              the state variables of the next step, or a single state variable for a scalar state
+        objective: function of the state variables of the final state that returns a scalar
+        steps: integer object with the number of steps T of the loop
+        snapshots: integer object with the largest number of intermediate states stored at once
+                   (default None, which stores ceil(log2(T)) of them)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError if steps is less than 1 or snapshots is negative
+        """
+        if steps < 1:
+            raise ValueError("ERROR: The number of steps should be at least 1")
+        if snapshots is None:
+            snapshots = max(math.ceil(math.log2(steps)), 1)
+        if snapshots < 0:
+            raise ValueError("ERROR: The number of snapshots should not be negative")
+        self.step = step
+        self.objective = objective
+        self.steps = steps
+        self.snapshots = snapshots
+        self.forward_steps = 0
+        self.peak_snapshots = 0
+        self._live = 0
+        self._value = None
+
+    def stats(self):
+        r"""A method to report the work and memory of the last evaluation
+
+        Returns
+        -------
+        A dictionary with the number of steps of the loop, the number of steps evaluated without and with
+        a tape, and the largest number of intermediate states stored at once
+        """
+        return {'steps': self.steps, 'forward_steps': self.forward_steps, 'taped_steps': self.steps,
+                'peak_snapshots': self.peak_snapshots}
+
+    def get_fx_value(self, x):
+        r"""A method to evaluate the objective at the final state of the loop, without recording a tape
+
+        Parameters
+        ----------
+        x: a scalar or a 1D array with the initial state
+
+        Returns
+        -------
+        the value of the objective at the final state
+        """
+        self.forward_steps = 0
+        state = self._advance(np.atleast_1d(np.asarray(x, dtype=float)).tolist(), self.steps)
+        z = self.objective(*[PrimalNumbers._make(val) for val in state])
+        return float(z.val if isinstance(z, DualNumbers) else z)
+
+    def get_derivative(self, x):
+        r"""A method to compute the gradient of the objective at the final state with respect to the initial state
+
+        Parameters
+        ----------
+        x: a scalar or a 1D array with the initial state
+
+        Returns
+        -------
+        the gradient, a float for a scalar state or a 1D array with one entry per state variable
+        """
+        return self.value_and_gradient(x)[1]
+
+    def value_and_gradient(self, x):
+        r"""A method to compute the objective and its gradient with respect to the initial state in one sweep
+
+        Parameters
+        ----------
+        x: a scalar or a 1D array with the initial state
+
+        Returns
+        -------
+        the value of the objective and the gradient, a float for a scalar state or a 1D array with one
+        entry per state variable
+
+        Raises
+        ------
+        ValueError if the step function does not return one value per state variable
+        """
+        state = np.atleast_1d(np.asarray(x, dtype=float)).tolist()
+        self.forward_steps = self.peak_snapshots = self._live = 0
+        gradient = self._reverse(0, self.steps, state, self.snapshots, self._objective_adjoint)
+        if np.isscalar(x):
+            return self._value, float(gradient[0])
+        return self._value, gradient
+
+    def _advance(self, state, count):
+        r"""An internal method that evaluates count steps from state without a tape"""
+        for _ in range(count):
+            outputs = _state(self.step(*[PrimalNumbers._make(val) for val in state]))
+            if len(outputs) != len(state):
+                raise ValueError("ERROR: The step function should return one value per state variable.")
+            state = [funct.val if isinstance(funct, DualNumbers) else funct for funct in outputs]
+        self.forward_steps += count
+        return state
+
+    def _record(self, function, state):
+        r"""An internal method that records function on a new tape, returning the tape and its outputs"""
+        tape = Tape()
+        # the values of a state are floats already, so the input variables skip the validation
+        inputs = [ReverseNumbers._make(val, tape, tape.record(_INPUT, -1, 0.)) for val in state]
+        return tape, _state(function(*inputs))
+
+    def _objective_adjoint(self, state):
+        r"""An internal method that evaluates the objective at the final state and returns the adjoint of the state"""
+        tape, (z,) = self._record(self.objective, state)
+        if not isinstance(z, ReverseNumbers):
+            self._value = float(z)
+            return np.zeros(len(state))
+        self._value = z.val
+        return tape.vjp([z.index], [1.], len(state))
+
+    def _reverse_step(self, state, adjoint_after):
+        r"""An internal method that records one step from state and returns the adjoint of state
+
+        adjoint_after is a function of the state after the step that returns its adjoint, which for the
+        last step of the loop evaluates the objective.
+        """
+        tape, outputs = self._record(self.step, state)
+        if len(outputs) != len(state):
+            raise ValueError("ERROR: The step function should return one value per state variable.")
+        adjoint = adjoint_after([funct.val if isinstance(funct, ReverseNumbers) else funct for funct in outputs]).tolist()
+        nodes = [i for i, funct in enumerate(outputs) if isinstance(funct, ReverseNumbers)]
+        return tape.vjp([outputs[i].index for i in nodes], [adjoint[i] for i in nodes], len(state))
+
+    def _reverse(self, start, end, state, free, adjoint_after):
+        r"""An internal method that reverses the steps from start to end, given the state at start
+
+        The segment is split repeatedly, storing a snapshot at every split, until the last part is a
+        single step or has no snapshot left. The parts are then reversed from the last to the first,
+        each from the state at its start, so the recursion only goes as deep as the repetitions.
+
+        Parameters
+        ----------
+        start, end: the first step and the step after the last step of the segment
+        state: list of the values of the state at start
+        free: the number of snapshots that the segment may store
+        adjoint_after: function of the state at end that returns its adjoint
+
+        Returns
+        -------
+        1D array with the adjoint of the state at start
+        """
+        parts = []
+        while end - start > 1 and free > 0:
+            length = end - start
+            # the fewest repetitions r with which free snapshots and the state at start reverse the segment
+            repetitions = 0
+            while _binomial(free + 1, repetitions) < length:
+                repetitions += 1
+            # the second part stays within reach of free - 1 snapshots, and the first part takes at least
+            # C(free + 1, r - 2) steps, which gives the fewest recomputed steps r * l - C(free + 2, r - 1)
+            split = max(length - _binomial(free, repetitions), _binomial(free + 1, repetitions - 2))
+            split = min(max(split, 1), length - 1)
+
+            parts.append((start, start + split, state, free))
+            start, state, free = start + split, self._advance(state, split), free - 1
+            self._live += 1
+            self.peak_snapshots = max(self.peak_snapshots, self._live)
+
+        length = end - start
+        if length == 1:
+            adjoint = self._reverse_step(state, adjoint_after)
+        else:
+            # without a snapshot, every step is reached again from the start of the segment
+            adjoint = self._reverse_step(self._advance(state, length - 1), adjoint_after)
+            for count in range(length - 2, -1, -1):
+                adjoint = self._reverse_step(self._advance(state, count), lambda _, adjoint=adjoint: adjoint)
+
+        while parts:
+            # the snapshot at the start of the part that was just reversed is released
+            self._live -= 1
+            start, end, state, free = parts.pop()
+            adjoint = self._reverse(start, end, state, free, lambda _, adjoint=adjoint: adjoint)
+        return adjoint
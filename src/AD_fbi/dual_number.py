@@ -4,10 +4,17 @@
 # Description: This class defines the dual number object to be used in forward mode 
 # automatic differentiation. It contains methods to initialize the object, set and get    #
 # the function and derivative value of the object, overload elementary          #
-# operations, and define elementary functions.                                  #
+# operations, and define elementary functions. DualArray holds a batch of dual  #
+# numbers so that one function is evaluated at many points in a single pass.    #
 #################################################################################
 
+import contextvars
+import operator
+import sys
+
 import numpy as np
+from .buffer_pool import BufferPool
+from .sparse_derivative import SparseDerivative
 
 def is_numeric(x):
     r"""Method to check whether input x contains numeric elements or not
@@ -47,7 +54,277 @@ def is_numeric(x):
             else:
                 return False
         return True
-    
+
+
+def _float_array(x, dtype=None):
+    r"""Convert x to a NumPy array of dtype, or of float64 if dtype is None and x is not already a float array
+
+    Parameters
+    ----------
+    x: array-like object of integers or floats
+    dtype: the floating point dtype of the result (default None, which keeps a float array as it is)
+
+    Returns
+    -------
+    A NumPy array with a floating point dtype, which is x itself when no conversion is needed
+
+    Raises
+    ------
+    TypeError or ValueError if x is not numeric
+
+    Examples
+    --------
+    >>> _float_array(np.array([1, 2])).dtype
+    dtype('float64')
+    >>> _float_array(np.array([1, 2], dtype=np.float32)).dtype
+    dtype('float32')
+    """
+    x = np.asarray(x)
+    if dtype is not None:
+        return x.astype(dtype, copy=False)
+    if not np.issubdtype(x.dtype, np.floating):
+        return x.astype(float)
+    return x
+
+
+def _flatten_outputs(functions):
+    r"""Return the shape of the outputs of a vector or matrix function and the list of its DualNumbers objects
+
+    Nested lists are walked in Python rather than converted to a NumPy object array, which is much
+    slower to build from DualNumbers objects.
+
+    Raises
+    ------
+    ValueError if the rows of a matrix function have different shapes, or only some outputs are rows
+
+    Examples
+    --------
+    >>> _flatten_outputs([[1, 2, 3], [4, 5, 6]])
+    ((2, 3), [1, 2, 3, 4, 5, 6])
+    """
+    if isinstance(functions, np.ndarray):
+        return functions.shape, list(functions.ravel())
+    functions = list(functions)
+    nested = [isinstance(funct, (list, tuple, np.ndarray)) for funct in functions]
+    if any(nested):
+        rows = [_flatten_outputs(row) if is_row else None for row, is_row in zip(functions, nested)]
+        if not all(nested) or any(row[0] != rows[0][0] for row in rows):
+            raise ValueError("ERROR: The outputs of a matrix function should have the same shape.")
+        return (len(rows),) + rows[0][0], [funct for row in rows for funct in row[1]]
+    return (len(functions),), functions
+
+
+# NumPy binary ufuncs and the DualNumbers operator and reflected operator they dispatch to
+_UFUNC_OPERATORS = {
+    np.add: ('__add__', '__radd__'),
+    np.subtract: ('__sub__', '__rsub__'),
+    np.multiply: ('__mul__', '__rmul__'),
+    np.divide: ('__truediv__', '__rtruediv__'),
+    np.power: ('__pow__', '__rpow__'),
+}
+
+# NumPy unary ufuncs and the DualNumbers method they dispatch to
+_UFUNC_METHODS = {
+    np.negative: lambda x: -x,
+    np.positive: lambda x: x,
+    np.square: lambda x: x * x,
+    np.reciprocal: lambda x: 1 / x,
+    np.sqrt: lambda x: x.sqrt(),
+    np.exp: lambda x: x.exp(),
+    np.log: lambda x: x.log(),
+    np.log2: lambda x: x.log(2),
+    np.log10: lambda x: x.log(10),
+    np.sin: lambda x: x.sin(),
+    np.cos: lambda x: x.cos(),
+    np.tan: lambda x: x.tan(),
+    np.sinh: lambda x: x.sinh(),
+    np.cosh: lambda x: x.cosh(),
+    np.tanh: lambda x: x.tanh(),
+    np.arcsin: lambda x: x.arcsin(),
+    np.arccos: lambda x: x.arccos(),
+    np.arctan: lambda x: x.arctan(),
+}
+
+# NumPy functions with an implementation for dual numbers, filled in by _implements
+_HANDLED_FUNCTIONS = {}
+
+
+# the domain policy and report of the DomainContext that is entered in the current thread or task, if any
+_domain_context = contextvars.ContextVar('domain_context', default=None)
+
+
+# reference count of an object, used to detect that an in-place operator may overwrite its operand
+_refcount = getattr(sys, 'getrefcount', lambda obj: sys.maxsize)
+
+
+def _measure_owned_counts():
+    r"""Measure the reference counts seen by an in-place operator when the left operand and its derivative array have no other names
+
+    The in-place operators of DualNumbers only overwrite an object and its arrays when their reference counts
+    are not larger than the counts measured here with an object of the same layout, which makes the check
+    independent of how the interpreter counts the references held by the call itself.
+    """
+    class _Probe:
+        __slots__ = ('_derv', 'counts')
+
+        def __iadd__(self, other):
+            self.counts = (_refcount(self), _refcount(self._derv))
+            return self
+
+    probe = _Probe()
+    probe._derv = np.zeros(1)
+    probe += 1
+    return probe.counts
+
+
+# reference counts of an unshared left operand and of an unshared array slot inside an in-place operator
+_OWNED_OBJECT, _OWNED_ARRAY = _measure_owned_counts()
+
+
+def _measure_released_count():
+    r"""Measure the reference count seen by __del__ for an array slot that has no other names
+
+    DualArray only returns the arrays of a deleted object to the buffer pool when their reference
+    counts are not larger than the count measured here with an object of the same layout.
+    """
+    counts = []
+
+    class _Probe:
+        __slots__ = ('_derv',)
+
+        def __del__(self):
+            counts.append(_refcount(self._derv))
+
+    probe = _Probe()
+    probe._derv = np.zeros(1)
+    del probe
+    return counts[0]
+
+
+# reference count of an unshared array slot inside __del__
+_RELEASED_ARRAY = _measure_released_count()
+
+
+# Python and NumPy real number types, which take the constant-operand paths of the operators
+_SCALAR_TYPES = (int, float, np.integer, np.floating)
+
+
+def _int_power(x, n):
+    r"""Return x ** n for a positive integer n by repeated squaring and multiplication, which is
+    faster than the general power for arrays and exact for integers. For n == 1 the result is x itself.
+    """
+    result = None
+    while n:
+        if n & 1:
+            result = x if result is None else result * x
+        n >>= 1
+        if n:
+            x = x * x
+    return result
+
+
+def _is_integer(x):
+    r"""Return whether x is a Python or NumPy integer, excluding booleans"""
+    return type(x) is int or isinstance(x, np.integer)
+
+
+def _is_constant(x):
+    r"""Return whether x is a real number or an array of them that a DualArray object can combine with directly"""
+    return isinstance(x, (int, float, np.number, np.ndarray)) and not isinstance(x, bool)
+
+
+def _is_mixed(x, other):
+    r"""Return whether x and other are a DualNumbers object and a DualArray object, whose derivatives have different layouts"""
+    return isinstance(other, DualNumbers) and isinstance(x, DualArray) != isinstance(other, DualArray)
+
+
+def _inplace(inplace_op, op, current, operand, owned):
+    r"""Combine current with operand, overwriting current when it is an unshared, writable array of a compatible dtype
+
+    Parameters
+    ----------
+    inplace_op: the in-place operator to use when current can be overwritten, e.g. operator.iadd
+    op: the operator to use otherwise, e.g. operator.add
+    current: the value or derivative of the left operand
+    operand: the value or derivative of the right operand
+    owned: whether no other object refers to current (an array subclass is never overwritten)
+
+    Returns
+    -------
+    The result of the operation, which is current itself if it was updated in place
+    """
+    # a view shares its memory with another array, so only arrays that own their data are overwritten
+    if owned and type(current) is np.ndarray and current.base is None:
+        try:
+            return inplace_op(current, operand)
+        # the array is read-only or the result needs a different dtype or shape than current
+        except (TypeError, ValueError):
+            pass
+    return op(current, operand)
+
+
+# fused kernels of the elementary functions: each returns the value and the derivative factor of
+# the function at x, evaluating every transcendental function only once
+def _exp_kernel(x):
+    r"""Return exp(x) and its derivative, which is the same array"""
+    f = np.exp(x)
+    return f, f
+
+
+def _tan_kernel(x):
+    r"""Return tan(x) and its derivative 1 + tan(x)^2"""
+    f = np.tan(x)
+    return f, 1 + f * f
+
+
+def _tanh_kernel(x):
+    r"""Return tanh(x) and its derivative 1 - tanh(x)^2"""
+    f = np.tanh(x)
+    return f, 1 - f * f
+
+
+def _logistic_kernel(x):
+    r"""Return the logistic function of x, its derivative and exp(-|x|) from a single exponential
+
+    exp(-|x|) never overflows, so the value and derivative stay finite for any x.
+    """
+    e = np.exp(-np.abs(x))
+    d = 1 / (1 + e)
+    # 1 / (1 + exp(-x)) for x >= 0 and exp(x) / (1 + exp(x)) for x < 0, selected without branching
+    f = d * e ** (x < 0)
+    return f, e * d * d, e
+
+
+def _softplus_kernel(x):
+    r"""Return the softplus function log(1 + exp(x)) and its derivative, the logistic function of x"""
+    f_prime, _, e = _logistic_kernel(x)
+    return np.maximum(x, 0) + np.log1p(e), f_prime
+
+
+# nearest valid inputs used by the 'clip' domain policy of DualArray objects
+def _float_dtype(x):
+    r"""Return the floating point dtype of the array x, promoting integers to float64"""
+    return np.promote_types(np.asarray(x).dtype, np.float32)
+
+
+def _epsilon(x):
+    r"""Return the machine epsilon of the floating point dtype of x, a small positive input whose square
+    and reciprocal stay finite"""
+    return np.finfo(_float_dtype(x)).eps
+
+
+def _next_up(x):
+    r"""Return the next floating point number after x"""
+    return np.nextafter(x, np.inf)
+
+
+def _open_unit_interval(x):
+    r"""Return x clipped into the open interval (-1, 1)"""
+    # the largest floating point number below 1
+    bound = 1 - np.finfo(_float_dtype(x)).epsneg
+    return np.clip(x, -bound, bound)
+
+
 class DualNumbers:
     r"""A class representing a variable object to be used in automatic differentiation
     
@@ -71,14 +348,21 @@ class DualNumbers:
     >>> print(z_1 + z_2)
     Values: 3.2, Derivatives: -1
     """
-    
-    def __init__(self, val, derv):
+
+    # store the value and derivative in fixed slots instead of a per-object __dict__
+    __slots__ = ('_val', '_derv')
+
+    def __init__(self, val, derv, dtype=None):
         r"""A constructor to create DualNumbers object with a value and a derivative
         
         Parameters
         ----------
         val: integer or float object that represents the value of DualNumbers object
-        derv_seed: integer or float object that represents the seed value for the derivative of DualNumbers object 
+        derv_seed: integer or float object that represents the seed value for the derivative of DualNumbers object,
+                   a 1D array of them, or a SparseDerivative object
+        dtype: the floating point dtype of the value and derivative, e.g. np.float32 to halve the memory
+               of wide derivative vectors (default None, which keeps float arrays as they are and
+               converts integer arrays to float64)
         
         Returns
         -------
@@ -88,18 +372,160 @@ class DualNumbers:
             self._val = val
         else:
             raise TypeError('Error: Input value should be an int or float')
-        if is_numeric(derv):
-            self._derv = derv
-        # in the case of a 1D array of derivatives, check each element individually
-        elif isinstance(derv, np.ndarray) and len(derv.shape) == 1:
-            try:
-                derv = derv.astype(float)
-            except ValueError:
-                raise ValueError('Error: Input value should be an int or float')
-            self._derv = derv
-        # for all other non-numeric cases, raise the appropriate value error
-        else:
-            raise TypeError('Error: Input value must be an array of ints/floats or be a scalar int/float')
+        self.derv = derv
+        if dtype is not None:
+            self._val, self._derv = self._cast(self._val, dtype), self._cast(self._derv, dtype)
+
+    @classmethod
+    def _make(cls, val, derv):
+        r"""An internal constructor that creates a DualNumbers object without validating its inputs
+
+        The operators and elementary functions only combine values and derivatives that have
+        already been validated, so they use this constructor to skip the checks in __init__.
+
+        Parameters
+        ----------
+        val: integer or float object that represents the value of DualNumbers object
+        derv: float/integer object or 1D array of float/integer objects that represents the derivative
+
+        Returns
+        -------
+        A DualNumbers object that contains the value and derivative
+
+        Examples
+        --------
+        >>> print(DualNumbers._make(1.0, np.array([0., 1.])))
+        Values: 1.0, Derivatives: [0. 1.]
+        """
+        obj = object.__new__(cls)
+        obj._val = val
+        obj._derv = derv
+        return obj
+
+    @staticmethod
+    def _cast(x, dtype):
+        r"""An internal method to convert a value or derivative to dtype
+
+        Parameters
+        ----------
+        x: integer or float object, NumPy array, or SparseDerivative object
+        dtype: the floating point dtype to convert to
+
+        Returns
+        -------
+        A NumPy scalar for a scalar input, otherwise an array or SparseDerivative object of dtype
+        """
+        if isinstance(x, SparseDerivative):
+            return x.astype(dtype)
+        if np.ndim(x) == 0:
+            return np.dtype(dtype).type(x)
+        return np.asarray(x).astype(dtype, copy=False)
+
+    @property
+    def dtype(self):
+        r"""A method to retrieve the dtype of the derivative of DualNumbers object
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the NumPy dtype of the derivative
+
+        Examples
+        --------
+        >>> z = DualNumbers(1, np.array([0., 1.]), dtype=np.float32)
+        >>> print(z.dtype)
+        float32
+        """
+        derv = self._derv.values if isinstance(self._derv, SparseDerivative) else self._derv
+        return np.result_type(derv)
+
+    def astype(self, dtype):
+        r"""A method to convert the value and derivative of DualNumbers object to another dtype
+
+        Parameters
+        ----------
+        dtype: the floating point dtype to convert to, e.g. np.float32
+
+        Returns
+        -------
+        A new object of the same type with the value and derivative converted to dtype
+
+        Examples
+        --------
+        >>> z = DualNumbers(1., np.array([0., 1.])).astype(np.float32)
+        >>> print(z.derv.dtype)
+        float32
+        """
+        return self._make(self._cast(self._val, dtype), self._cast(self._derv, dtype))
+
+    @staticmethod
+    def _check_domain(invalid, message, error=ValueError):
+        r"""An internal method to raise an error when an operation is evaluated outside of its domain
+
+        Parameters
+        ----------
+        invalid: boolean object that is True when the input is outside of the domain of the operation
+        message: string object with the error message
+        error: the exception class to raise (default ValueError)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        error if invalid is True
+        """
+        if invalid:
+            raise error(message)
+
+    def _domain(self, x, invalid, message, error=ValueError, clip=_epsilon, mask=None):
+        r"""An internal method to check the input of an operation against the domain of the operation
+
+        A DualNumbers object raises an error outside of the domain, while DualArray objects follow
+        their domain policy.
+
+        Parameters
+        ----------
+        x: the input of the operation that invalid refers to
+        invalid: boolean object that is True when the input is outside of the domain of the operation
+        message: string object with the error message
+        error: the exception class to raise (default ValueError)
+        clip: function returning the nearest valid input for the 'clip' policy of DualArray objects
+        mask: boolean mask of the points that are already set to NaN by an earlier check (default None)
+
+        Returns
+        -------
+        A tuple of the input to evaluate the operation with and the mask of the points to set to NaN
+        """
+        self._check_domain(invalid, message, error)
+        return x, mask
+
+    def _finish(self, f, f_prime, mask):
+        r"""An internal method to create the result of an operation, setting the points in mask to NaN"""
+        if mask is not None:
+            f = np.where(mask, np.nan, f)
+            f_prime = np.where(mask, np.nan, f_prime)
+        return self._make(f, f_prime)
+
+    def _unary(self, kernel, x=None, mask=None):
+        r"""An internal method to apply a fused kernel of an elementary function with the chain rule
+
+        Parameters
+        ----------
+        kernel: function returning the value and the derivative factor of the elementary function
+        x: the input of the kernel returned by _domain (default None, which uses the value)
+        mask: boolean mask of the points to set to NaN returned by _domain (default None)
+
+        Returns
+        -------
+        A DualNumbers object with the value of the function and the derivative scaled by the derivative factor
+        """
+        f, f_prime = kernel(self._val if x is None else x)
+        return self._finish(f, self._derv * f_prime, mask)
 
     @property
     def val(self):
@@ -176,7 +602,7 @@ class DualNumbers:
         
         Parameters
         ----------
-        derv: float/integer object or 1D array of float/integer objects that represents DualNumbers derivative
+        derv: float/integer object, 1D array of float/integer objects, or SparseDerivative object that represents DualNumbers derivative
         
         Returns
         -------
@@ -194,9 +620,16 @@ class DualNumbers:
         >>> print(z.derv)
         1
         """
-        if is_numeric(derv):
+        # a sparse derivative vector is validated by its own constructor
+        if isinstance(derv, SparseDerivative):
             self._derv = derv
-        # in the case of a 1D array of derivatives, check each element individually
+        # an integer or float array, e.g. float32, is numeric as a whole and keeps its dtype
+        elif isinstance(derv, np.ndarray) and len(derv.shape) == 1 and (
+                np.issubdtype(derv.dtype, np.integer) or np.issubdtype(derv.dtype, np.floating)):
+            self._derv = derv
+        elif is_numeric(derv):
+            self._derv = derv
+        # in the case of any other 1D array of derivatives, convert each element individually
         elif isinstance(derv, np.ndarray) and len(derv.shape) == 1:
             try:
                 derv = derv.astype(float)
@@ -224,6 +657,82 @@ class DualNumbers:
         Values: 1, Derivatives: 2
         """
         return f'Values: {self.val}, Derivatives: {self.derv}'
+
+    # make NumPy arrays defer to the DualNumbers operators in mixed binary operations
+    __array_priority__ = 1000
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        r"""A method to dispatch NumPy ufuncs such as np.sin or np.add to the DualNumbers derivative rules
+        
+        Parameters
+        ----------
+        ufunc: the NumPy ufunc object that was called
+        method: string object with the ufunc method that was called, only '__call__' is supported
+        inputs: the inputs of the ufunc, at least one of them is a DualNumbers object
+        kwargs: optional keyword arguments of the ufunc, which are not supported
+        
+        Returns
+        -------
+        A DualNumbers object as the result of the ufunc, or NotImplemented if the ufunc has no derivative rule
+        
+        Examples
+        --------
+        >>> x = DualNumbers(0, np.array([1, 0]))
+        >>> print(np.sin(x))
+        Values: 0.0, Derivatives: [1. 0.]
+
+        >>> print(np.float64(2) * x)
+        Values: 0.0, Derivatives: [2. 0.]
+        """
+        if method != '__call__' or kwargs:
+            return NotImplemented
+        # unary ufuncs map to the elementary functions
+        if ufunc in _UFUNC_METHODS:
+            return _UFUNC_METHODS[ufunc](inputs[0])
+        if ufunc not in _UFUNC_OPERATORS:
+            return NotImplemented
+
+        # binary ufuncs map to the operator of the left operand, or the reflected operator of the right operand
+        left, right = inputs
+        name, reflected_name = _UFUNC_OPERATORS[ufunc]
+        dual, other = (left, right) if isinstance(left, DualNumbers) else (right, left)
+        # an array of constants with more dimensions than the dual values is combined element by element
+        if not isinstance(other, DualNumbers) and np.ndim(other) > np.ndim(dual._val):
+            wrapped = np.empty((), dtype=object)
+            wrapped[()] = dual
+            inputs = (wrapped, other) if dual is left else (other, wrapped)
+            return ufunc(*[np.asarray(x, dtype=object) for x in inputs])
+        # a DualArray operand takes precedence as with the operators, so that it broadcasts a DualNumbers operand
+        if dual is left and not (isinstance(right, DualArray) and not isinstance(left, DualArray)):
+            return getattr(left, name)(right)
+        return getattr(right, reflected_name)(left)
+
+    def __array_function__(self, func, types, args, kwargs):
+        r"""A method to dispatch NumPy functions such as np.sum or np.stack to vectorized implementations for dual numbers
+        
+        Parameters
+        ----------
+        func: the NumPy function that was called
+        types: the types of the arguments that implement __array_function__
+        args: the positional arguments of the function
+        kwargs: the keyword arguments of the function
+        
+        Returns
+        -------
+        The result of the function on the dual numbers, or NotImplemented if the function is not supported
+        
+        Examples
+        --------
+        >>> x = DualNumbers(1, np.array([1, 0]))
+        >>> y = DualNumbers(2, np.array([0, 1]))
+        >>> print(np.sum(np.stack([x, y])))
+        Values: 3.0, Derivatives: [1. 1.]
+        """
+        if func not in _HANDLED_FUNCTIONS:
+            return NotImplemented
+        if not all(issubclass(t, (DualNumbers, np.ndarray)) for t in types):
+            return NotImplemented
+        return _HANDLED_FUNCTIONS[func](*args, **kwargs)
     
     def __add__(self, other):
         r"""A method to perform addition operation on the DualNumbers object and the other object
@@ -249,14 +758,10 @@ class DualNumbers:
         Values: 2, Derivatives:[-1  2]
         """
         # perform addition if other is a dual number
-        try:
-            f = self.val + other.val
-            f_prime = self.derv + other.derv
+        if isinstance(other, DualNumbers):
+            return self._make(self._val + other._val, self._derv + other._derv)
         # perform addition if other is a real number
-        except AttributeError:
-            f = self.val + other
-            f_prime = self.derv
-        return DualNumbers(f, f_prime)
+        return self._make(self._val + other, self._derv)
     
     def __radd__(self, other):
         r"""A method to perform reverse addition operation on a DualNumbers object and the other object
@@ -283,6 +788,42 @@ class DualNumbers:
         """
         return self + other
     
+    def __iadd__(self, other):
+        r"""A method to perform in-place addition on the DualNumbers object and the other object
+        
+        The value and derivative are overwritten in place when no other name refers to this object or
+        to its arrays, which avoids allocating a new object and derivative array in accumulation loops.
+        Otherwise a new DualNumbers object is returned exactly as with the + operator.
+        
+        Parameters
+        ----------
+        other: float/integer object or DualNumbers object
+        
+        Returns
+        -------
+        A DualNumbers object as the result of the addition operation
+        
+        Examples
+        --------
+        >>> z = DualNumbers(1., np.array([1., 0.]))
+        >>> z += DualNumbers(2., np.array([0., 1.]))
+        >>> print(z)
+        Values: 3.0, Derivatives: [1. 1.]
+        """
+        # fall back to a new object when another name refers to this one, or when a DualNumbers object
+        # and a DualArray object are combined, whose derivatives are broadcast over the batch
+        if _refcount(self) > _OWNED_OBJECT or _is_mixed(self, other):
+            return self + other
+        owns_val, owns_derv = _refcount(self._val) <= _OWNED_ARRAY, _refcount(self._derv) <= _OWNED_ARRAY
+        # perform addition if other is a dual number
+        if isinstance(other, DualNumbers):
+            self._val = _inplace(operator.iadd, operator.add, self._val, other._val, owns_val)
+            self._derv = _inplace(operator.iadd, operator.add, self._derv, other._derv, owns_derv)
+        # perform addition if other is a real number
+        else:
+            self._val = _inplace(operator.iadd, operator.add, self._val, other, owns_val)
+        return self
+    
     def __sub__(self, other):
         r"""A method to perform subtraction operation on the DualNumbers object and the other object
         
@@ -307,14 +848,10 @@ class DualNumbers:
         Values: 0, Derivatives: [-1 -2]
         """
         # perform subtraction if other is a dual number
-        try:
-            f = self.val - other.val
-            f_prime = self.derv - other.derv
+        if isinstance(other, DualNumbers):
+            return self._make(self._val - other._val, self._derv - other._derv)
         # perform subtraction if other is a real number
-        except AttributeError:
-            f = self.val - other
-            f_prime = self.derv
-        return DualNumbers(f, f_prime)
+        return self._make(self._val - other, self._derv)
     
     def __rsub__(self, other):
         r"""A method to perform reverse subtraction operation on the DualNumbers object and the other object
@@ -339,7 +876,42 @@ class DualNumbers:
         >>> print(x1 - x2)
         Values: 0, Derivatives: [0  -2]
         """
-        return other + (-self)
+        return self._make(other - self._val, -self._derv)
+    
+    def __isub__(self, other):
+        r"""A method to perform in-place subtraction on the DualNumbers object and the other object
+        
+        The value and derivative are overwritten in place when no other name refers to this object or
+        to its arrays. Otherwise a new DualNumbers object is returned exactly as with the - operator.
+        
+        Parameters
+        ----------
+        other: float/integer object or DualNumbers object
+        
+        Returns
+        -------
+        A DualNumbers object as the result of the subtraction operation
+        
+        Examples
+        --------
+        >>> z = DualNumbers(1., np.array([1., 0.]))
+        >>> z -= DualNumbers(2., np.array([0., 1.]))
+        >>> print(z)
+        Values: -1.0, Derivatives: [ 1. -1.]
+        """
+        # fall back to a new object when another name refers to this one, or when a DualNumbers object
+        # and a DualArray object are combined, whose derivatives are broadcast over the batch
+        if _refcount(self) > _OWNED_OBJECT or _is_mixed(self, other):
+            return self - other
+        owns_val, owns_derv = _refcount(self._val) <= _OWNED_ARRAY, _refcount(self._derv) <= _OWNED_ARRAY
+        # perform subtraction if other is a dual number
+        if isinstance(other, DualNumbers):
+            self._val = _inplace(operator.isub, operator.sub, self._val, other._val, owns_val)
+            self._derv = _inplace(operator.isub, operator.sub, self._derv, other._derv, owns_derv)
+        # perform subtraction if other is a real number
+        else:
+            self._val = _inplace(operator.isub, operator.sub, self._val, other, owns_val)
+        return self
     
     def __mul__(self, other):
         r"""A method to perform multiplication operation on the DualNumbers object and the other object
@@ -365,14 +937,10 @@ class DualNumbers:
         Values: 1, Derivatives: [-1  2]
         """
         # perform multiplication if other is a dual number
-        try:
-            f = self.val * other.val
-            f_prime = self.val * other.derv + self.derv * other.val
+        if isinstance(other, DualNumbers):
+            return self._make(self._val * other._val, self._val * other._derv + self._derv * other._val)
         # perform multiplication if other is a real number
-        except AttributeError:
-            f = self.val * other
-            f_prime = self.derv * other
-        return DualNumbers(f, f_prime)
+        return self._make(self._val * other, self._derv * other)
     
     def __rmul__(self, other):
         r"""A method to perform the reverse multiplication operation on the DualNumbers object and the other object
@@ -399,6 +967,44 @@ class DualNumbers:
         """
         return self * other
     
+    def __imul__(self, other):
+        r"""A method to perform in-place multiplication on the DualNumbers object and the other object
+        
+        The value and derivative are overwritten in place when no other name refers to this object or
+        to its arrays. Otherwise a new DualNumbers object is returned exactly as with the * operator.
+        
+        Parameters
+        ----------
+        other: float/integer object or DualNumbers object
+        
+        Returns
+        -------
+        A DualNumbers object as the result of the multiplication operation
+        
+        Examples
+        --------
+        >>> z = DualNumbers(2., np.array([1., 0.]))
+        >>> z *= DualNumbers(3., np.array([0., 1.]))
+        >>> print(z)
+        Values: 6.0, Derivatives: [3. 2.]
+        """
+        # fall back to a new object when another name refers to this one, or when a DualNumbers object
+        # and a DualArray object are combined, whose derivatives are broadcast over the batch
+        if _refcount(self) > _OWNED_OBJECT or _is_mixed(self, other):
+            return self * other
+        owns_val, owns_derv = _refcount(self._val) <= _OWNED_ARRAY, _refcount(self._derv) <= _OWNED_ARRAY
+        # perform multiplication if other is a dual number
+        if isinstance(other, DualNumbers):
+            # the product rule needs the value before it is overwritten
+            f_prime = _inplace(operator.imul, operator.mul, self._derv, other._val, owns_derv)
+            self._derv = _inplace(operator.iadd, operator.add, f_prime, self._val * other._derv, owns_derv)
+            self._val = _inplace(operator.imul, operator.mul, self._val, other._val, owns_val)
+        # perform multiplication if other is a real number
+        else:
+            self._derv = _inplace(operator.imul, operator.mul, self._derv, other, owns_derv)
+            self._val = _inplace(operator.imul, operator.mul, self._val, other, owns_val)
+        return self
+    
     def __truediv__(self, other):
         r"""A method to perform division operation on the DualNumbers object and the other object
         
@@ -437,21 +1043,20 @@ class DualNumbers:
         ZeroDivisionError: Error: Denominator in division should not be 0
         """
         # perform division if other is a dual number
-        try:
+        if isinstance(other, DualNumbers):
             # avoid zero division
-            if other.val == 0:
-                raise ZeroDivisionError("Error: Denominator in division should not be 0")
-            f = self.val / other.val
-            f_prime = (self.derv * other.val - self.val * other.derv) / (other.val ** 2)
-            return DualNumbers(f, f_prime)
-        # perform division if other is a real number
-        except AttributeError:
-            # avoid zero division
-            if other == 0:
-                raise ZeroDivisionError("Error: Denominator in division should not be 0")
-            f = self.val / other
-            f_prime = self.derv / other
-            return DualNumbers(f, f_prime)
+            denominator, mask = self._domain(other._val, other._val == 0,
+                                             "Error: Denominator in division should not be 0", ZeroDivisionError)
+            f = self._val / denominator
+            f_prime = (self._derv * denominator - self._val * other._derv) / (denominator ** 2)
+            return self._finish(f, f_prime, mask)
+        # a nonzero real number needs no domain check
+        if isinstance(other, _SCALAR_TYPES) and other != 0:
+            return self._make(self._val / other, self._derv / other)
+        # perform division if other is an array of real numbers, avoiding zero division
+        denominator, mask = self._domain(other, other == 0,
+                                         "Error: Denominator in division should not be 0", ZeroDivisionError)
+        return self._finish(self._val / denominator, self._derv / denominator, mask)
         
     def __rtruediv__(self, other):
         r"""A method to perform the reverse division operation on the DualNumbers object and the other object
@@ -485,14 +1090,17 @@ class DualNumbers:
         >>> print(z1 / z2)
         ZeroDivisionError: Error: Denominator in division should not be 0
         """
-        if self.val == 0:
-            raise ZeroDivisionError("Error: Denominator in division should not be 0")
-        f = other / self.val
-        f_prime = (- other * self.derv) / (self.val ** 2)
-        return DualNumbers(f, f_prime)
+        denominator, mask = self._domain(self._val, self._val == 0,
+                                         "Error: Denominator in division should not be 0", ZeroDivisionError)
+        f = other / denominator
+        f_prime = (- other * self._derv) / (denominator ** 2)
+        return self._finish(f, f_prime, mask)
 
-    def __pow__(self, other):
-        r"""A method to perform power operation on the DualNumbers object and the other object
+    def __itruediv__(self, other):
+        r"""A method to perform in-place division on the DualNumbers object and the other object
+        
+        The value and derivative are overwritten in place when no other name refers to this object or
+        to its arrays. Otherwise a new DualNumbers object is returned exactly as with the / operator.
         
         Parameters
         ----------
@@ -500,11 +1108,56 @@ class DualNumbers:
         
         Returns
         -------
-        A DualNumbers object as the result of the power operation
+        A DualNumbers object as the result of the division operation
         
         Raises
         ------
-        ValueError
+        ZeroDivisionError if denominator in division is zero
+        
+        Examples
+        --------
+        >>> z = DualNumbers(1., np.array([1., 0.]))
+        >>> z /= DualNumbers(2., np.array([0., 1.]))
+        >>> print(z)
+        Values: 0.5, Derivatives: [ 0.5  -0.25]
+        """
+        # fall back to a new object when another name refers to this one, or when a DualNumbers object
+        # and a DualArray object are combined, whose derivatives are broadcast over the batch
+        if _refcount(self) > _OWNED_OBJECT or _is_mixed(self, other):
+            return self / other
+        owns_val, owns_derv = _refcount(self._val) <= _OWNED_ARRAY, _refcount(self._derv) <= _OWNED_ARRAY
+        # perform division if other is a dual number
+        if isinstance(other, DualNumbers):
+            # the / operator applies the domain check to a zero denominator
+            if np.any(other._val == 0):
+                return self / other
+            # (d * v - u * dv) / v ** 2 is computed as (d - (u / v) * dv) / v
+            f_prime = _inplace(operator.isub, operator.sub, self._derv, (self._val / other._val) * other._derv, owns_derv)
+            self._derv = _inplace(operator.itruediv, operator.truediv, f_prime, other._val, owns_derv)
+            self._val = _inplace(operator.itruediv, operator.truediv, self._val, other._val, owns_val)
+        # perform division if other is a real number
+        else:
+            # the / operator applies the domain check to a zero denominator
+            if np.any(other == 0):
+                return self / other
+            self._derv = _inplace(operator.itruediv, operator.truediv, self._derv, other, owns_derv)
+            self._val = _inplace(operator.itruediv, operator.truediv, self._val, other, owns_val)
+        return self
+    
+    def __pow__(self, other):
+        r"""A method to perform power operation on the DualNumbers object and the other object
+        
+        Parameters
+        ----------
+        other: float/integer object or DualNumbers object
+        
+        Returns
+        -------
+        A DualNumbers object as the result of the power operation
+        
+        Raises
+        ------
+        ValueError
             If negative number is raised to a fraction power with an even denominator
             If the power is less than 1 and differentiation occurs at 0
         
@@ -531,31 +1184,37 @@ class DualNumbers:
         ValueError: Error: Attempted to find derivative at 0 when power is less than 1
         """
         # perform power operation if other is a dual number
-        try:
+        if isinstance(other, DualNumbers):
             # avoid raising a negative number to a fraction power with an even denominator
-            if self.val < 0 and other.val % 1 != 0 and other.val.as_integer_ratio()[1] % 2 == 0:
-                raise ValueError("Error: Attempted to raise a negative number to a fraction power with even denominator")
+            # (every non-integer float has an even denominator in its integer ratio)
+            base, mask = self._domain(self._val, (self._val < 0) & (other._val % 1 != 0),
+                                      "Error: Attempted to raise a negative number to a fraction power with even denominator")
             # avoid having a 0 derivative when the power is less than 1
-            if self.val == 0 and other.val < 1:
-                raise ValueError("Error: Attempted to find derivative at 0 when the power is less than 1")
+            base, mask = self._domain(base, (base == 0) & (other._val < 1),
+                                      "Error: Attempted to find derivative at 0 when the power is less than 1", mask=mask)
 
-            f = self.val ** other.val
-            f_prime = (self.val ** (other.val - 1)) * self.derv * other.val + (
-                    self.val ** other.val) * other.derv * np.log(self.val)
-            return DualNumbers(f, f_prime)
+            f = base ** other._val
+            f_prime = (base ** (other._val - 1)) * self._derv * other._val + (
+                    base ** other._val) * other._derv * np.log(base)
+            return self._finish(f, f_prime, mask)
 
-        # perform power operation if other is a real number
-        except AttributeError:
-            # avoid raising a negative number to a fraction power with an even denominator
-            if self.val < 0 and other % 1 != 0 and other.as_integer_ratio()[1] % 2 == 0:
-                raise ValueError("Error: Attempted to raise a negative number to a fraction powerwith even denominator")
-            # avoid having a 0 derivative when the power is less than 1
-            if self.val == 0 and other < 1:
-                raise ValueError("Error: Attempted to find derivative at 0 when power is less than 1")
+        # an integer power of at least 2 is defined everywhere and is computed by repeated multiplication
+        if _is_integer(other) and other >= 2:
+            f_prime = other * _int_power(self._val, other - 1)
+            return self._make(_int_power(self._val, other), self._derv * f_prime)
 
-            f = self.val ** other
-            f_prime = other * self.val ** (other - 1)
-            return DualNumbers(f, self.derv * f_prime)
+        # perform power operation if other is a real number
+        # avoid raising a negative number to a fraction power with an even denominator
+        # (every non-integer float has an even denominator in its integer ratio)
+        base, mask = self._domain(self._val, (self._val < 0) & (other % 1 != 0),
+                                  "Error: Attempted to raise a negative number to a fraction powerwith even denominator")
+        # avoid having a 0 derivative when the power is less than 1
+        base, mask = self._domain(base, (base == 0) & (other < 1),
+                                  "Error: Attempted to find derivative at 0 when power is less than 1", mask=mask)
+
+        f = base ** other
+        f_prime = other * base ** (other - 1)
+        return self._finish(f, self._derv * f_prime, mask)
         
     def __rpow__(self, other):
         r"""A method to perform the reverse power operation on the DualNumbers object and the other object
@@ -580,9 +1239,9 @@ class DualNumbers:
         >>> print(x1 ** x2)
         Values: 1, Derivatives: [0.  -0.]
         """
-        f = other ** self.val
-        f_prime = (other ** self.val) * self.derv * np.log(other)
-        return DualNumbers(f, f_prime)
+        f = other ** self._val
+        f_prime = f * self._derv * np.log(other)
+        return self._make(f, f_prime)
     
     def __neg__(self):
         r"""A method to perform the negation operation on the DualNumbers object and the other object
@@ -605,7 +1264,7 @@ class DualNumbers:
         >>> print(-x)
         Values: -1, Derivatives: [1  0]
         """
-        return DualNumbers(-1 * self.val, -1 * self.derv)
+        return self._make(-1 * self._val, -1 * self._derv)
     
     def __eq__(self, other):
         r"""A method to check whether the DualNumbers objects are equal to each other
@@ -637,16 +1296,10 @@ class DualNumbers:
         (False, False)
         """
         # check if DualNumbers values are equal
-        try:
-            is_val_eq = all(self.val == other.val)
-        except TypeError:
-            is_val_eq = True if self.val == other.val else False
+        is_val_eq = bool(np.all(self._val == other._val))
 
         # check if DualNumbers derivatives are equal
-        try:
-            is_derv_eq = all(self.derv == other.derv)
-        except TypeError:
-            is_derv_eq = True if self.derv == other.derv else False
+        is_derv_eq = bool(np.all(self._derv == other._derv))
         return is_val_eq, is_derv_eq
     
     def __ne__(self, other):
@@ -679,16 +1332,10 @@ class DualNumbers:
         (True, True)
         """
         # check if DualNumbers values are not equal
-        try:
-            is_val_eq = all(self.val != other.val)
-        except TypeError:
-            is_val_eq = True if self.val != other.val else False
+        is_val_eq = bool(np.all(self._val != other._val))
 
         # check if DualNumbers derivatives are not equal
-        try:
-            is_derv_eq = all(self.derv != other.derv)
-        except TypeError:
-            is_derv_eq = True if self.derv != other.derv else False
+        is_derv_eq = bool(np.all(self._derv != other._derv))
 
         return is_val_eq, is_derv_eq
     def sqrt(self):
@@ -761,16 +1408,17 @@ class DualNumbers:
         """
 
         # ensure the value is greater than zero so that log is correctly defined
-        if self.val <= 0:
-            raise ValueError("ERROR: Value for log should be greater than 0")
+        x, mask = self._domain(self._val, self._val <= 0, "ERROR: Value for log should be greater than 0")
         # if the default base is used, proceed with default base numpy log funtion
         if base is None:
-            return DualNumbers(np.log(self.val), self.derv / self.val)
+            return self._finish(np.log(x), self._derv / x, mask)
         # ensure the user specifies a valid base before computing the log value and derivative
         else:
             if base <= 0 or base == 1:
                 raise ValueError("ERROR: LOG base should be greater than 0 and not equal to 1")
-            return DualNumbers(np.log(self.val) / np.log(base), self.derv / (self.val * np.log(base)))
+            # a Python float keeps the dtype of float32 values and derivatives
+            log_base = float(np.log(base))
+            return self._finish(np.log(x) / log_base, self._derv / (x * log_base), mask)
 
     def exp(self):
         """
@@ -797,7 +1445,7 @@ class DualNumbers:
         Values:1.0, Derivatives:[-1.  0.]
         """
         # compute the value and derivative of the exponential function for any input
-        return DualNumbers(np.exp(self.val), self.derv * np.exp(self.val))
+        return self._unary(_exp_kernel)
 
     def sin(self):
         """
@@ -824,7 +1472,7 @@ class DualNumbers:
         Values:0.0, Derivatives:[-1.  0.]
         """
         # compute the value and derivative of the sine function for any input
-        return DualNumbers(np.sin(self.val), self.derv * np.cos(self.val))
+        return self._make(np.sin(self._val), self._derv * np.cos(self._val))
 
     def cos(self):
         """
@@ -852,7 +1500,34 @@ class DualNumbers:
 
         """
         # compute the value and derivative of the cosine function for any input
-        return DualNumbers(np.cos(self.val), -self.derv * np.sin(self.val))
+        return self._make(np.cos(self._val), -self._derv * np.sin(self._val))
+
+    def sincos(self):
+        """
+        method to compute the value and derivative of the sine and cosine functions together
+
+        The sine and cosine of the value are each evaluated once and shared between the two
+        results, which halves the transcendental work of calling sin() and cos() separately.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        A tuple of two val_derv objects with the sine and the cosine function
+
+        Examples
+        --------
+        >>> x = DualNumbers(0, np.array([-1, 0]))
+        >>> sin, cos = x.sincos()
+        >>> print(sin)
+        Values: 0.0, Derivatives: [-1.  0.]
+        >>> print(cos)
+        Values: 1.0, Derivatives: [0. 0.]
+        """
+        sin, cos = np.sin(self._val), np.cos(self._val)
+        return self._make(sin, self._derv * cos), self._make(cos, -self._derv * sin)
 
     def tan(self):
         """
@@ -890,11 +1565,11 @@ class DualNumbers:
         """
 
         # ensure the user does not input an odd multiple of pi divided by 2
-        if (self.val / (np.pi / 2)) % 2 == 1:
-            raise ValueError("ERROR: Input to tan should not be an odd mutiple of pi/2")
+        x, mask = self._domain(self._val, (self._val / (np.pi / 2)) % 2 == 1,
+                               "ERROR: Input to tan should not be an odd mutiple of pi/2", clip=_next_up)
 
         # compute the value and derivative of the tangent function for a valid input
-        return DualNumbers(np.tan(self.val), self.derv * 1 / np.cos(self.val) ** 2)
+        return self._unary(_tan_kernel, x, mask)
 
     def sinh(self):
         """
@@ -921,7 +1596,7 @@ class DualNumbers:
         Values:0.0, Derivatives:[-1.  0.]
 
         """
-        return DualNumbers(np.sinh(self.val), self.derv * np.cosh(self.val))
+        return self._make(np.sinh(self._val), self._derv * np.cosh(self._val))
 
     def cosh(self):
         """
@@ -950,7 +1625,7 @@ class DualNumbers:
         """
 
         # compute the value and derivative of the hyperbolic cosine function for any input
-        return DualNumbers(np.cosh(self.val), self.derv * np.sinh(self.val))
+        return self._make(np.cosh(self._val), self._derv * np.sinh(self._val))
 
     def tanh(self):
         """
@@ -979,7 +1654,7 @@ class DualNumbers:
         """
 
         # compute the value and derivative of the hyperbolic tangent function for any input
-        return DualNumbers(np.tanh(self.val), self.derv * 1 / (np.cosh(self.val) ** 2))
+        return self._unary(_tanh_kernel)
 
     def arcsin(self):
         """
@@ -1017,10 +1692,10 @@ class DualNumbers:
         """
 
         # ensure the user passes in an input between -1 and 1
-        if -1 >= self.val or self.val >= 1:
-            raise ValueError("ERROR: Input to arcsin() should be between -1 and 1")
+        x, mask = self._domain(self._val, (self._val <= -1) | (self._val >= 1),
+                               "ERROR: Input to arcsin() should be between -1 and 1", clip=_open_unit_interval)
         # compute the value and derivative of the inverse sine function for a valid input
-        return DualNumbers(np.arcsin(self.val), self.derv * 1 / (1 - self.val ** 2) ** 0.5)
+        return self._finish(np.arcsin(x), self._derv * 1 / (1 - x ** 2) ** 0.5, mask)
 
     def arccos(self):
         """
@@ -1058,10 +1733,10 @@ class DualNumbers:
         """
 
         # ensure the user passes in an input between -1 and 1
-        if -1 >= self.val or self.val >= 1:
-            raise ValueError("ERROR: Input to arccos() should be between -1 and 1")
+        x, mask = self._domain(self._val, (self._val <= -1) | (self._val >= 1),
+                               "ERROR: Input to arccos() should be between -1 and 1", clip=_open_unit_interval)
         # compute the value and derivative of the inverse cosine function for a valid input
-        return DualNumbers(np.arccos(self.val),  - self.derv / (1 - self.val ** 2) ** 0.5)
+        return self._finish(np.arccos(x),  - self._derv / (1 - x ** 2) ** 0.5, mask)
 
     def arctan(self):
         """
@@ -1089,7 +1764,7 @@ class DualNumbers:
 
         """
         # compute the value and derivative of the inverse tangent function for a valid input
-        return DualNumbers(np.arctan(self.val), self.derv / (1 + self.val ** 2))
+        return self._make(np.arctan(self._val), self._derv / (1 + self._val ** 2))
 
     def logistic(self):
         """
@@ -1117,4 +1792,696 @@ class DualNumbers:
 
         """
 
-        return 1 / ((-self).exp() + 1)
\ No newline at end of file
+        f, f_prime, _ = _logistic_kernel(self._val)
+        return self._make(f, self._derv * f_prime)
+
+    def softplus(self):
+        """
+        method to compute the value and derivative of the softplus function log(1 + exp(x))
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        A val_derv object that contains the value and derivative of the softplus function
+
+        Examples
+        --------
+        # softplus of variable with scalar derivative
+        >>> x = DualNumbers(0, -1)
+        >>> print(x.softplus())
+        Values: 0.6931471805599453, Derivatives: -0.5
+
+        # softplus of variable with vector derivative
+        >>> x = DualNumbers(0, np.array([-1, 0]))
+        >>> print(x.softplus())
+        Values: 0.6931471805599453, Derivatives: [-0.5  0. ]
+
+        """
+        return self._unary(_softplus_kernel)
+
+class DualArray(DualNumbers):
+    r"""A class representing a batch of dual numbers that share the same derivative directions
+
+    A DualArray stores the values of B evaluation points in one array of shape (B,) and their
+    derivatives in one array of shape (B, n), so that a function written for DualNumbers is
+    evaluated at every point with a single pass of NumPy operations. The derivatives are kept
+    internally with the batch as the last axis, which lets all of the DualNumbers operators and
+    elementary functions broadcast over the batch without any change.
+
+    The domain_policy class variable chooses how an operation treats the evaluation points outside
+    of its domain, so that one bad point does not abort a large batch. 'raise' reports every failed
+    point in a single error. 'nan' sets the values and derivatives of the failed points to NaN.
+    'clip' evaluates them at the nearest valid input. Under 'nan' and 'clip', domain_report maps
+    each error message to the indices of its failed points. A DomainContext replaces both class
+    variables for the evaluations it encloses.
+
+    Instance Variables
+    ----------
+    val: 1D array of the values of the DualArray object, of shape (B,)
+    derv: 2D array of the derivatives of the DualArray object, of shape (B, n)
+
+    Returns
+    -------
+    A DualArray object that contains the values and derivatives
+
+    Examples
+    --------
+    >>> x = DualArray(np.array([0., 1., 2.]), np.array([[1.], [1.], [1.]]))
+    >>> print((x * x + 1).val)
+    [1. 2. 5.]
+    >>> print((x * x + 1).derv)
+    [[0.]
+     [2.]
+     [4.]]
+    """
+
+    __slots__ = ()
+
+    # pool of the arrays of the intermediates of batched expressions, or None to allocate every result
+    pool = BufferPool()
+
+    # how the operations treat evaluation points outside of their domain: 'raise' one error for the batch,
+    # set the values and derivatives of those points to 'nan', or 'clip' them to the nearest valid input
+    domain_policy = 'raise'
+
+    # the indices of the evaluation points outside of the domain under the 'nan' and 'clip' policies,
+    # by error message
+    domain_report = {}
+
+    def __init__(self, val, derv, dtype=None):
+        r"""A constructor to create DualArray object with an array of values and an array of derivatives
+
+        Parameters
+        ----------
+        val: 1D array of integers or floats of shape (B,) with the value at each evaluation point
+        derv: 2D array of integers or floats of shape (B, n) with the derivatives at each evaluation point,
+              or a 1D array of shape (B,) if there is a single derivative direction
+        dtype: the floating point dtype of the values and derivatives (default None, which keeps float
+               arrays as they are and converts integer arrays to float64)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError
+            If the values or derivatives are not numeric
+        ValueError
+            If the values are not a 1D array or the derivatives do not have one row per value
+        """
+        self.val = val
+        self.derv = derv
+        if dtype is not None:
+            self._val, self._derv = self._cast(self._val, dtype), self._cast(self._derv, dtype)
+
+    @property
+    def val(self):
+        r"""A method to retrieve the value attribute of DualArray object
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        1D array of the values of DualArray object
+
+        Examples
+        --------
+        >>> x = DualArray([1, 2], [1, 1])
+        >>> print(x.val)
+        [1. 2.]
+        """
+        return self._val
+
+    @val.setter
+    def val(self, val):
+        r"""A method to set the value attribute of DualArray object
+
+        Parameters
+        ----------
+        val: 1D array of integers or floats with the value at each evaluation point
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError
+            If input contains non-integer or non-float values
+        ValueError
+            If input is not a 1D array
+        """
+        try:
+            val = _float_array(val)
+        except (TypeError, ValueError):
+            raise TypeError('Error: Input value should be an array of ints or floats')
+        if val.ndim != 1:
+            raise ValueError('Error: Input value should be a 1D array')
+        self._val = val
+
+    @property
+    def derv(self):
+        r"""A method to retrieve the derivative attribute of DualArray object
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        2D array of shape (B, n) with the derivatives of DualArray object
+
+        Examples
+        --------
+        >>> x = DualArray([1, 2], [1, 1])
+        >>> print(x.derv)
+        [[1.]
+         [1.]]
+        """
+        return self._derv.T
+
+    @derv.setter
+    def derv(self, derv):
+        r"""A method to set the derivative attribute of DualArray object
+
+        Parameters
+        ----------
+        derv: 2D array of integers or floats of shape (B, n), or 1D array of shape (B,)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError
+            If input contains non-integer or non-float values
+        ValueError
+            If input does not have one row for each value of DualArray object
+        """
+        try:
+            derv = _float_array(derv)
+        except (TypeError, ValueError):
+            raise TypeError('Error: Input derivative should be an array of ints or floats')
+        # a 1D array holds a single derivative direction for each evaluation point
+        if derv.ndim == 1:
+            derv = derv[:, np.newaxis]
+        if derv.ndim != 2 or derv.shape[0] != len(self._val):
+            raise ValueError('Error: Input derivative should have shape (B, n) for B values')
+        # store the derivatives with the batch as the last axis so they broadcast against the values
+        self._derv = np.ascontiguousarray(derv.T)
+
+    def _domain(self, x, invalid, message, error=ValueError, clip=_epsilon, mask=None):
+        r"""An internal method to check the input of an operation at every evaluation point with the domain policy
+
+        Under the 'raise' policy a single error reports every failed point. Under the 'nan' and 'clip'
+        policies the failed points are added to domain_report, and the operation is evaluated with
+        the nearest valid input at those points so that the other points are not affected.
+
+        Parameters
+        ----------
+        x: the input of the operation that invalid refers to
+        invalid: boolean array that is True at the evaluation points outside of the domain of the operation
+        message: string object with the error message
+        error: the exception class to raise (default ValueError)
+        clip: function returning the nearest valid input at the failed points (default machine epsilon)
+        mask: boolean mask of the points that are already set to NaN by an earlier check (default None)
+
+        Returns
+        -------
+        A tuple of the input to evaluate the operation with and the mask of the points to set to NaN
+
+        Raises
+        ------
+        error if any evaluation point is outside of the domain under the 'raise' policy
+        ValueError if the domain policy is not 'raise', 'nan' or 'clip'
+        """
+        if not np.any(invalid):
+            return x, mask
+        invalid = np.broadcast_to(invalid, self._val.shape)
+        points = np.flatnonzero(invalid)
+        # a DomainContext takes the place of the class variables for the evaluations it encloses
+        context = _domain_context.get()
+        policy, report = (self.domain_policy, self.domain_report) if context is None else context
+        if policy == 'raise':
+            shown = ', '.join(str(i) for i in points[:10]) + (', ...' if len(points) > 10 else '')
+            raise error(f"{message} at {len(points)} of {invalid.size} points: [{shown}]")
+        if policy not in ('nan', 'clip'):
+            raise ValueError("ERROR: Domain policy should be 'raise', 'nan' or 'clip'")
+        report[message] = np.union1d(report[message], points) if message in report else points
+        # evaluate the failed points at the nearest valid input in the dtype of the values so that they raise no warnings
+        x = np.asarray(x, dtype=np.result_type(x, self._val))
+        x = np.where(invalid, clip(x), x)
+        if policy == 'nan':
+            mask = invalid if mask is None else mask | invalid
+        return x, mask
+
+    def __del__(self):
+        r"""A method to return the arrays of a DualArray object that is no longer used to the buffer pool
+
+        An array is only returned when the reference count shows that no other object, view or
+        name refers to it.
+        """
+        pool = self.pool
+        # the module globals may already be cleared at interpreter shutdown
+        if pool is None or _refcount is None or not hasattr(self, '_derv'):
+            return
+        if _refcount(self._derv) <= _RELEASED_ARRAY:
+            pool.give(self._derv)
+        if _refcount(self._val) <= _RELEASED_ARRAY:
+            pool.give(self._val)
+
+    def _apply(self, ufunc, *inputs):
+        r"""An internal method to evaluate a NumPy ufunc into an array taken from the buffer pool
+
+        Parameters
+        ----------
+        ufunc: the NumPy ufunc to evaluate, e.g. np.multiply
+        inputs: the arrays or numbers the ufunc is applied to
+
+        Returns
+        -------
+        The result of the ufunc, written into a pooled array when the batch is large enough
+        """
+        pool = self.pool
+        # a small batch is cheaper to allocate than to look up in the pool
+        if pool is None or self._derv.size < pool.min_size:
+            return ufunc(*inputs)
+        out = pool.take(np.broadcast_shapes(*[np.shape(x) for x in inputs]), np.result_type(*inputs))
+        return ufunc(*inputs, out=out)
+
+    def _release(self, array):
+        r"""An internal method to return a temporary array of an operator to the buffer pool"""
+        if self.pool is not None:
+            self.pool.give(array)
+
+    def _unary(self, kernel, x=None, mask=None):
+        r"""An internal method to apply a fused kernel of an elementary function, scaling the derivative into a pooled array"""
+        if mask is not None:
+            return super()._unary(kernel, x, mask)
+        f, f_prime = kernel(self._val if x is None else x)
+        return self._make(f, self._apply(np.multiply, self._derv, f_prime))
+
+    def _broadcast(self, other):
+        r"""An internal method to broadcast a DualNumbers object over the batch of the DualArray object
+
+        A DualNumbers object has the same value and derivative vector at every evaluation point, so its
+        value is broadcast to the batch and its derivative becomes a column of shape (n, 1), which
+        broadcasts along the batch axis of the derivatives of shape (n, B) instead of the variable axis.
+        Both are read-only views, so they are never overwritten or returned to the buffer pool.
+
+        Parameters
+        ----------
+        other: the other operand of an operation
+
+        Returns
+        -------
+        A DualArray object if other is a DualNumbers object that is not batched, otherwise other
+        """
+        if isinstance(other, DualNumbers) and not isinstance(other, DualArray):
+            return self._make(np.broadcast_to(other._val, self._val.shape),
+                              np.broadcast_to(np.asarray(other._derv)[..., np.newaxis], (np.size(other._derv), 1)))
+        return other
+
+    def __add__(self, other):
+        r"""A method to perform addition operation on the DualArray object and the other object
+
+        The results are written into arrays taken from the buffer pool. A DualNumbers object is
+        broadcast over the batch, with the same value and derivative at every evaluation point.
+
+        Parameters
+        ----------
+        other: float/integer object, array of them, DualArray object or DualNumbers object
+
+        Returns
+        -------
+        A DualArray object as the result of the addition operation
+        """
+        other = self._broadcast(other)
+        if isinstance(other, DualArray):
+            return self._make(self._apply(np.add, self._val, other._val), self._apply(np.add, self._derv, other._derv))
+        if _is_constant(other):
+            return self._make(self._apply(np.add, self._val, other), self._derv)
+        return super().__add__(other)
+
+    def __sub__(self, other):
+        r"""A method to perform subtraction operation on the DualArray object and the other object
+
+        The results are written into arrays taken from the buffer pool. A DualNumbers object is
+        broadcast over the batch.
+        """
+        other = self._broadcast(other)
+        if isinstance(other, DualArray):
+            return self._make(self._apply(np.subtract, self._val, other._val),
+                              self._apply(np.subtract, self._derv, other._derv))
+        if _is_constant(other):
+            return self._make(self._apply(np.subtract, self._val, other), self._derv)
+        return super().__sub__(other)
+
+    def __mul__(self, other):
+        r"""A method to perform multiplication operation on the DualArray object and the other object
+
+        The results are written into arrays taken from the buffer pool. A DualNumbers object is
+        broadcast over the batch.
+        """
+        other = self._broadcast(other)
+        if isinstance(other, DualArray) and self._derv.shape == other._derv.shape:
+            # val * dother + derv * vother, in the order of DualNumbers.__mul__
+            f_prime = self._apply(np.multiply, self._val, other._derv)
+            product = self._apply(np.multiply, self._derv, other._val)
+            np.add(f_prime, product, out=f_prime)
+            self._release(product)
+            return self._make(self._apply(np.multiply, self._val, other._val), f_prime)
+        if _is_constant(other):
+            return self._make(self._apply(np.multiply, self._val, other), self._apply(np.multiply, self._derv, other))
+        return super().__mul__(other)
+
+    def __truediv__(self, other):
+        r"""A method to perform division operation on the DualArray object and the other object
+
+        The results are written into arrays taken from the buffer pool. A DualNumbers object is
+        broadcast over the batch.
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero at any evaluation point under the 'raise' domain policy
+        """
+        other = self._broadcast(other)
+        # the domain policy of DualNumbers.__truediv__ applies to a zero denominator
+        if isinstance(other, DualArray) and self._derv.shape == other._derv.shape and not np.any(other._val == 0):
+            # (derv * vother - val * dother) / vother ** 2, in the order of DualNumbers.__truediv__
+            f_prime = self._apply(np.multiply, self._derv, other._val)
+            product = self._apply(np.multiply, self._val, other._derv)
+            np.subtract(f_prime, product, out=f_prime)
+            square = self._apply(np.square, other._val)
+            np.divide(f_prime, square, out=f_prime)
+            self._release(product)
+            self._release(square)
+            return self._make(self._apply(np.divide, self._val, other._val), f_prime)
+        if _is_constant(other) and not np.any(other == 0):
+            return self._make(self._apply(np.divide, self._val, other), self._apply(np.divide, self._derv, other))
+        return super().__truediv__(other)
+
+    def __rtruediv__(self, other):
+        r"""A method to perform the reverse division operation on the DualArray object and the other object
+
+        The results are written into arrays taken from the buffer pool. A DualNumbers object is
+        broadcast over the batch.
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero at any evaluation point under the 'raise' domain policy
+        """
+        if isinstance(other, DualNumbers):
+            return self._broadcast(other) / self
+        # the domain policy of DualNumbers.__rtruediv__ applies to a zero denominator
+        if not _is_constant(other) or np.any(self._val == 0):
+            return super().__rtruediv__(other)
+        f_prime = self._apply(np.multiply, -other, self._derv)
+        square = self._apply(np.square, self._val)
+        np.divide(f_prime, square, out=f_prime)
+        self._release(square)
+        return self._make(self._apply(np.divide, other, self._val), f_prime)
+
+    def __pow__(self, other):
+        r"""A method to perform power operation on the DualArray object and the other object
+
+        The derivative is written into an array taken from the buffer pool when other is a number.
+
+        Raises
+        ------
+        ValueError
+            If negative number is raised to a fraction power with an even denominator
+            If the power is less than 1 and differentiation occurs at 0
+            at any evaluation point under the 'raise' domain policy
+        """
+        if not (_is_constant(other) and np.ndim(other) == 0):
+            return super().__pow__(self._broadcast(other))
+        # the domain policy of DualNumbers.__pow__ applies to a negative number raised to a fraction
+        # power and to a zero raised to a power less than 1
+        if (other % 1 != 0 and np.any(self._val < 0)) or (other < 1 and np.any(self._val == 0)):
+            return super().__pow__(other)
+        # an integer power of at least 2 is computed by repeated multiplication as in DualNumbers.__pow__
+        if _is_integer(other) and other >= 2:
+            f, f_prime = _int_power(self._val, other), other * _int_power(self._val, other - 1)
+        else:
+            f, f_prime = self._val ** other, other * self._val ** (other - 1)
+        return self._make(f, self._apply(np.multiply, self._derv, f_prime))
+
+    def __radd__(self, other):
+        r"""A method to perform reverse addition operation, which broadcasts a DualNumbers object over the batch"""
+        return self + other
+
+    def __rsub__(self, other):
+        r"""A method to perform reverse subtraction operation, which broadcasts a DualNumbers object over the batch"""
+        if isinstance(other, DualNumbers):
+            return self._broadcast(other) - self
+        return super().__rsub__(other)
+
+    def __rmul__(self, other):
+        r"""A method to perform reverse multiplication operation, which broadcasts a DualNumbers object over the batch"""
+        return self * other
+
+    def __rpow__(self, other):
+        r"""A method to perform reverse power operation, which broadcasts a DualNumbers object over the batch"""
+        if isinstance(other, DualNumbers):
+            return self._broadcast(other) ** self
+        return super().__rpow__(other)
+
+    def __neg__(self):
+        r"""A method to perform the negation operation on the DualArray object into arrays taken from the buffer pool"""
+        return self._make(self._apply(np.negative, self._val), self._apply(np.negative, self._derv))
+
+    def exp(self):
+        r"""A method to compute the value and derivative of the exponential function into arrays taken from the buffer pool"""
+        f = self._apply(np.exp, self._val)
+        return self._make(f, self._apply(np.multiply, self._derv, f))
+
+    def log(self, base=None):
+        r"""A method to compute the value and derivative of the natural logarithm into arrays taken from the buffer pool
+
+        Raises
+        ------
+        ValueError
+            If self.val is less than or equal to zero at any evaluation point under the 'raise' domain policy
+            If input base is less than or equal to zero
+            If input base is equal to one
+        """
+        # the domain policy of DualNumbers.log applies to values that are not greater than zero
+        if base is not None or np.any(self._val <= 0):
+            return super().log(base)
+        return self._make(self._apply(np.log, self._val), self._apply(np.divide, self._derv, self._val))
+
+    def sin(self):
+        r"""A method to compute the value and derivative of the sine function into arrays taken from the buffer pool"""
+        cos = self._apply(np.cos, self._val)
+        f_prime = self._apply(np.multiply, self._derv, cos)
+        self._release(cos)
+        return self._make(self._apply(np.sin, self._val), f_prime)
+
+    def cos(self):
+        r"""A method to compute the value and derivative of the cosine function into arrays taken from the buffer pool"""
+        sin = self._apply(np.sin, self._val)
+        f_prime = self._apply(np.multiply, self._derv, sin)
+        np.negative(f_prime, out=f_prime)
+        self._release(sin)
+        return self._make(self._apply(np.cos, self._val), f_prime)
+
+    def sincos(self):
+        r"""A method to compute the sine and cosine functions together into arrays taken from the buffer pool"""
+        sin, cos = self._apply(np.sin, self._val), self._apply(np.cos, self._val)
+        sin_prime = self._apply(np.multiply, self._derv, cos)
+        cos_prime = self._apply(np.multiply, self._derv, sin)
+        np.negative(cos_prime, out=cos_prime)
+        return self._make(sin, sin_prime), self._make(cos, cos_prime)
+
+
+class DomainContext:
+    r"""A context manager that evaluates DualArray operations under a domain policy with a report of its own
+
+    The policy and the report are kept in a context variable instead of the class variables of
+    DualArray, so they only apply to the evaluations inside the with block of the current thread or
+    task, contexts can be nested, and the report is not changed by any evaluation after the block.
+
+    Instance Variables
+    ----------
+    policy: 'raise', 'nan' or 'clip', or None to use DualArray.domain_policy
+    report: dictionary mapping each error message to the indices of its failed points
+
+    Examples
+    --------
+    >>> x = DualArray([1., -1.], [1., 1.])
+    >>> with DomainContext('nan') as context:
+    ...     y = x.log()
+    >>> context.report
+    {'ERROR: Value for log should be greater than 0': array([1])}
+    """
+
+    __slots__ = ('policy', 'report', '_token')
+
+    def __init__(self, policy=None):
+        self.policy = policy
+        self.report = {}
+
+    def __enter__(self):
+        policy = DualArray.domain_policy if self.policy is None else self.policy
+        self._token = _domain_context.set((policy, self.report))
+        return self
+
+    def __exit__(self, *exc_info):
+        _domain_context.reset(self._token)
+        return False
+
+
+def _implements(np_function):
+    r"""A decorator to register an implementation of a NumPy function for dual numbers
+
+    Parameters
+    ----------
+    np_function: the NumPy function that is implemented
+
+    Returns
+    -------
+    A decorator that stores the implementation in _HANDLED_FUNCTIONS
+    """
+    def decorator(func):
+        _HANDLED_FUNCTIONS[np_function] = func
+        return func
+    return decorator
+
+
+def _check_axis(axis):
+    r"""Raise an error for a reduction over an axis other than the batch axis of a DualArray"""
+    if axis not in (None, 0, -1):
+        raise TypeError('Error: Dual numbers only support reductions over the batch axis')
+
+
+@_implements(np.stack)
+def _stack(arrays, axis=0):
+    r"""Stack a sequence of DualNumbers objects, or constants, into a DualArray object
+
+    Raises
+    ------
+    TypeError if a DualArray object is stacked, whose batch would be taken for a derivative direction
+
+    Examples
+    --------
+    >>> x = DualNumbers(1, np.array([1, 0]))
+    >>> y = DualNumbers(2, np.array([0, 1]))
+    >>> print(np.stack([x, y]).derv)
+    [[1. 0.]
+     [0. 1.]]
+    """
+    _check_axis(axis)
+    arrays = list(arrays)
+    if any(isinstance(x, DualArray) for x in arrays):
+        raise TypeError("Error: np.stack only joins DualNumbers objects, use np.concatenate to join DualArray objects")
+    # constants get a zero derivative of the same width as the dual numbers
+    width = next(np.shape(x._derv) for x in arrays if isinstance(x, DualNumbers))
+    # keep the common float dtype of the dual numbers, e.g. float32
+    dtype = np.result_type(*[x.dtype for x in arrays if isinstance(x, DualNumbers)])
+    if not np.issubdtype(dtype, np.floating):
+        dtype = np.dtype(float)
+    derv = np.empty(width + (len(arrays),), dtype=dtype)
+    for i, x in enumerate(arrays):
+        derv[..., i] = x._derv if isinstance(x, DualNumbers) else 0
+    val = np.array([x._val if isinstance(x, DualNumbers) else x for x in arrays], dtype=dtype)
+    return DualArray._make(val, derv.reshape(-1, len(arrays)))
+
+
+@_implements(np.concatenate)
+def _concatenate(arrays, axis=0):
+    r"""Join a sequence of DualArray objects along the batch axis
+
+    Examples
+    --------
+    >>> x = DualArray([1, 2], [1, 1])
+    >>> print(np.concatenate([x, x]).val)
+    [1. 2. 1. 2.]
+    """
+    _check_axis(axis)
+    return DualArray._make(np.concatenate([x._val for x in arrays]),
+                           np.concatenate([x._derv for x in arrays], axis=1))
+
+
+@_implements(np.sum)
+def _sum(a, axis=None):
+    r"""Sum the elements of a DualArray object into a DualNumbers object
+
+    Examples
+    --------
+    >>> x = DualArray([1, 2], [[1, 0], [0, 1]])
+    >>> print(np.sum(x))
+    Values: 3.0, Derivatives: [1. 1.]
+    """
+    _check_axis(axis)
+    if not isinstance(a, DualArray):
+        return a
+    return DualNumbers._make(a._val.sum(), a._derv.sum(axis=1))
+
+
+@_implements(np.mean)
+def _mean(a, axis=None):
+    r"""Average the elements of a DualArray object into a DualNumbers object
+
+    Examples
+    --------
+    >>> x = DualArray([1, 2], [[1, 0], [0, 1]])
+    >>> print(np.mean(x))
+    Values: 1.5, Derivatives: [0.5 0.5]
+    """
+    _check_axis(axis)
+    if not isinstance(a, DualArray):
+        return a
+    return _sum(a) / len(a._val)
+
+
+@_implements(np.prod)
+def _prod(a, axis=None):
+    r"""Multiply the elements of a DualArray object into a DualNumbers object
+
+    The derivative of each factor is scaled by the product of all of the other factors, which is
+    computed from prefix and suffix products so that zero factors are handled without division.
+
+    Examples
+    --------
+    >>> x = DualArray([2, 3], [[1, 0], [0, 1]])
+    >>> print(np.prod(x))
+    Values: 6.0, Derivatives: [3. 2.]
+    """
+    _check_axis(axis)
+    if not isinstance(a, DualArray):
+        return a
+    # product of the factors before and after each element
+    one = np.ones(1, dtype=a._val.dtype)
+    before = np.concatenate((one, np.cumprod(a._val[:-1])))
+    after = np.concatenate((np.cumprod(a._val[:0:-1])[::-1], one))
+    return DualNumbers._make(a._val.prod(), a._derv @ (before * after))
+
+
+@_implements(np.dot)
+def _dot(a, b):
+    r"""Compute the inner product of two DualArray objects, or of a DualArray object and an array of constants
+
+    Examples
+    --------
+    >>> x = DualArray([1, 2], [[1, 0], [0, 1]])
+    >>> print(np.dot(x, np.array([3, 4])))
+    Values: 11.0, Derivatives: [3. 4.]
+    """
+    if isinstance(a, DualArray) and isinstance(b, DualArray):
+        return DualNumbers._make(a._val @ b._val, a._derv @ b._val + b._derv @ a._val)
+    # the inner product is symmetric, so put the dual operand first
+    if not isinstance(a, DualArray):
+        a, b = b, a
+    if not isinstance(a, DualArray):
+        return NotImplemented
+    # the constants take the dtype of the derivatives so that a float32 DualArray stays float32
+    b = np.asarray(b, dtype=a._derv.dtype)
+    return DualNumbers._make(a._val @ b, a._derv @ b)
@@ -0,0 +1,146 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: evaluation_cache.py                                                     #
+# Description: This class defines a bounded least recently used cache of the   #
+# values and derivatives computed by ForwardMode, so that repeated queries at   #
+# the same point, e.g. in line searches and restarts, skip the evaluation.      #
+#################################################################################
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EvaluationCache:
+    r"""A class representing a bounded least recently used cache of ForwardMode results
+
+    The results are keyed by the input function, the bytes of the evaluation point and the
+    seed, so a cache can be shared between ForwardMode objects and functions. Cached arrays
+    are read-only, because every query at the same point returns the same arrays.
+
+    Instance Variables
+    ----------
+    max_size: the largest number of results kept in the cache
+    hits: the number of queries answered from the cache
+    misses: the number of queries that evaluated the function
+    evictions: the number of results dropped to keep at most max_size results
+
+    Examples
+    --------
+    >>> cache = EvaluationCache(max_size=2)
+    >>> fm = ForwardMode(np.array([1., 2.]), lambda x, y: x * y, cache=cache)
+    >>> fm.value_and_derivative()
+    (2.0, array([2., 1.]))
+    >>> fm.value_and_derivative()
+    (2.0, array([2., 1.]))
+    >>> cache.stats()
+    {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1}
+    """
+
+    def __init__(self, max_size=128):
+        r"""A constructor to create an empty EvaluationCache object
+
+        Parameters
+        ----------
+        max_size: integer object with the largest number of results kept in the cache (default 128)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError if max_size is less than 1
+        """
+        if max_size < 1:
+            raise ValueError("ERROR: Cache size should be at least 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, key):
+        r"""A method to look up a cached result and mark it as the most recently used
+
+        Parameters
+        ----------
+        key: hashable object identifying the evaluation
+
+        Returns
+        -------
+        The cached result, or None if the cache holds no result for key
+        """
+        result = self._results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._results.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        r"""A method to add a result, evicting the least recently used result when the cache is full
+
+        Parameters
+        ----------
+        key: hashable object identifying the evaluation
+        result: tuple of the values and derivatives of the evaluation
+
+        Returns
+        -------
+        The result as stored in the cache, with read-only arrays
+        """
+        result = tuple(_read_only(x) for x in result)
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self):
+        r"""A method to drop every cached result and reset the counters"""
+        self._results.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        r"""A method to report the counters of the cache
+
+        Returns
+        -------
+        A dictionary with the hits, misses and evictions of the cache and the number of cached results
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._results)}
+
+
+def evaluation_key(function, inputs, seed, dtype, *options):
+    r"""Return the hashable cache key of evaluating function at inputs along seed
+
+    Parameters
+    ----------
+    function: the input function
+    inputs: the evaluation point
+    seed: the seed vector or seed matrix, or a scalar seed for every input variable
+    dtype: the floating point dtype of the evaluation
+    options: any other options that change the result of the evaluation
+
+    Returns
+    -------
+    A tuple of the function, the shapes and bytes of the evaluation point and of the seed, and the options
+    """
+    inputs = np.atleast_1d(np.asarray(inputs, dtype=dtype))
+    seed = np.atleast_1d(np.asarray(seed, dtype=float))
+    # a seed matrix keeps its number of columns, which sets the shape of the derivatives
+    return (function, inputs.shape, inputs.tobytes(), seed.shape[1:], seed.tobytes(), np.dtype(dtype)) + options
+
+
+def _read_only(x):
+    r"""Return a read-only copy of an array, or x itself if it is not an array"""
+    if isinstance(x, np.ndarray):
+        x = x.copy()
+        x.flags.writeable = False
+    return x
@@ -8,7 +8,34 @@
 
 
 import numpy as np
-from .dual_number import DualNumbers
+from .dual_number import DualNumbers, DualArray, DomainContext, _flatten_outputs
+from .hyper_dual_number import HyperDualNumbers
+from .hessian_number import HessianNumbers, SymmetricMatrix, packed_triangle
+from .primal_number import PrimalNumbers
+from .sparse_derivative import SparseDerivative
+from .evaluation_cache import evaluation_key
+from .sparsity import sparse_jacobian
+
+
+def _stack_outputs(functions, attribute, dtype, axis=0):
+    r"""Stack an attribute of every output of a vector or matrix function into one array
+
+    The outputs are stacked along axis, which is then split into the shape of the outputs, so the
+    derivatives of a matrix function of DualArray objects stacked along axis 1 have shape (B, m1, m2, n).
+
+    Examples
+    --------
+    >>> x = DualNumbers(1., np.array([1., 0.]))
+    >>> y = DualNumbers(2., np.array([0., 1.]))
+    >>> _stack_outputs([[x, y], [x * y, x + y]], 'derv', float).shape
+    (2, 2, 2)
+    """
+    shape, flat = _flatten_outputs(functions)
+    # an output that is an input variable keeps its scalar seed, which is broadcast over the batch
+    stacked = np.stack(np.broadcast_arrays(*[np.asarray(getattr(funct, attribute), dtype=dtype) for funct in flat]),
+                       axis=axis)
+    axis %= stacked.ndim
+    return stacked.reshape(stacked.shape[:axis] + shape + stacked.shape[axis + 1:])
 
 
 class ForwardMode:
@@ -19,9 +46,30 @@ class ForwardMode:
     
     Instance Variables
     ----------
-    input_values: a scalar or a vector which indicates the evaluation point
+    input_values: a scalar or a vector which indicates the evaluation point, or a 2D array with one
+                  evaluation point per row to evaluate all of the points in a single batched pass
     input_function: a scalar function or a vector of functions 
-    seed: a seed vector (optional parameter: default value = 1 or np.ones(len(self.inputs))
+    seed: a seed vector (optional parameter: default value = 1 or np.ones(len(self.inputs)), or an n x k
+          seed matrix S, with which calculate_dual_number returns the k columns of J S from one evaluation
+    sparse: whether to propagate sparse derivative vectors, which is faster for functions of many
+            input variables where each intermediate depends on only a few of them (default False)
+    second_order: whether to propagate HyperDualNumbers objects so that calculate_dual_number returns
+                  the value, the directional derivative along the seed, and the second directional
+                  derivative seed^T H seed from a single evaluation (default False)
+    dtype: the floating point dtype of the values and derivatives returned by every path, e.g. np.float32
+           to halve the memory and bandwidth of wide derivative vectors and large batches (default float)
+    domain_policy: how a batched evaluation treats points outside of the domain of an operation: 'raise'
+                   one error for the batch, set the values and derivatives of those points to 'nan', or
+                   'clip' them to the nearest valid input (default None, which uses DualArray.domain_policy).
+                   The failed points of the last batched evaluation are kept in domain_report
+    cache: an EvaluationCache object shared by the ForwardMode objects whose results should be reused
+           when the same function is queried again at the same point with the same seed (default None)
+    chunk_size: evaluate the function ceil(n / chunk_size) times with chunk_size-wide derivatives and write
+                each block of Jacobian columns into a preallocated Jacobian, so the derivatives of n input
+                variables take O(n * chunk_size) memory instead of O(n^2) (default None, which propagates
+                all of the n derivatives in a single evaluation)
+    memory_budget: the number of bytes that the derivatives of the input variables may take in a chunked
+                   evaluation, from which the chunk size is derived when chunk_size is None (default None)
     
     Examples
     --------
@@ -51,19 +99,34 @@ class ForwardMode:
     
     """
 
-    def __init__(self, input_values, input_function, seed = "default seed"):
+    def __init__(self, input_values, input_function, seed = "default seed", sparse = False, second_order = False,
+                 dtype = float, domain_policy = None, cache = None, chunk_size = None, memory_budget = None):
         self.inputs = input_values
         self.functions = input_function
+        self.sparse = sparse
+        self.second_order = second_order
+        self.dtype = np.dtype(dtype)
+        if domain_policy not in (None, 'raise', 'nan', 'clip'):
+            raise ValueError("ERROR: Domain policy should be 'raise', 'nan' or 'clip'")
+        self.domain_policy = domain_policy
+        self.domain_report = {}
+        self.cache = cache
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("ERROR: Chunk size should be at least 1")
+        if memory_budget is not None and memory_budget <= 0:
+            raise ValueError("ERROR: Memory budget should be positive")
+        self.chunk_size = chunk_size
+        self.memory_budget = memory_budget
         
         # if there is no input value for seed
-        if seed == 'default seed':
+        if isinstance(seed, str) and seed == 'default seed':
             # if the input variable is a scalar
             if np.isscalar(self.inputs):
                 self.seed = 1
             
-            # if the input variable is an array
+            # if the input variable is an array (one row per evaluation point for a 2D array)
             else:
-                self.seed = np.ones(len(self.inputs))
+                self.seed = np.ones(np.shape(self.inputs)[-1])
                 
         # if seed is specified by the user
         else:
@@ -110,7 +173,10 @@ class ForwardMode:
         
         """
 
-        return self.calculate_dual_number()[0]
+        # a cached evaluation has the value already, and a new one fills the cache for the derivative
+        if self.cache is not None or np.ndim(self.inputs) == 2:
+            return self.value_and_derivative()[0]
+        return self.calculate_primal()
     
 
     def get_derivative(self):
@@ -157,25 +223,283 @@ class ForwardMode:
     
         """
 
-        return self.calculate_dual_number()[1]
-    
+        return self.value_and_derivative()[1]
+
+    def value_and_derivative(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the value and derivative of the input function at the evaluation point from a single evaluation,
+        in the format of calculate_dual_number. With a cache, a query that was answered before returns
+        the cached read-only arrays without evaluating the input function
+
+        Examples
+        --------
+        >>> func = lambda x, y: x * y.exp()
+        >>> fm = ForwardMode(np.array([2, 0]), func)
+        >>> fm.value_and_derivative()
+        (2.0, array([1., 2.]))
+        """
+
+        if self.cache is None:
+            return self.calculate_dual_number()
+        key = self._cache_key()
+        result = self.cache.get(key)
+        if result is None:
+            result = self.cache.put(key, self.calculate_dual_number())
+        return result
+
+    def _cache_key(self):
+        """
+        Returns
+        -------
+        a hashable key of the evaluation made of the input function, the bytes of the evaluation point
+        and of the seed, and the options that change the result
+        """
+
+        return evaluation_key(self.functions, self.inputs, self.seed, self.dtype,
+                              self.sparse, self.second_order, self.domain_policy)
+
+    def _as_dtype(self, x):
+        """
+        Returns
+        -------
+        x as a scalar or an array of the dtype of the object. Operations with Python floats promote
+        the NumPy scalars of a float32 evaluation to float64, so every path casts what it returns
+        """
+
+        x = np.asarray(x, dtype=self.dtype)
+        return x[()] if x.ndim == 0 else x
+
+    def jvp(self, v=None):
+        """
+        Parameters
+        ----------
+        v: the tangent vector, with one entry per input variable, a scalar tangent for every input
+           variable, or an n x k matrix with one row of k tangents per input variable (default None,
+           which uses the seed)
+
+        Returns
+        -------
+        the value of the input function and the Jacobian-vector product J v at the evaluation point.
+        Every input variable carries the scalar tangent v[i] instead of a seed vector, so one evaluation
+        costs about as much as evaluating the function, and the Jacobian is never built. J v is a float
+        for a scalar function and an array with one entry per output for a vector function, and for a
+        2D array of evaluation points it has one row per point. For an n x k matrix V every input variable
+        carries the k-wide derivative V[i], and the result J V has an extra last axis of length k
+
+        Raises
+        ------
+        ValueError if the tangent vector length mismatchs with the number of input variables
+
+        Examples
+        --------
+        >>> func = lambda x, y: (x * y, x + y.exp())
+        >>> fm = ForwardMode(np.array([2, 0]), func)
+        >>> fm.jvp([1, -1])
+        (array([0., 3.]), array([-2.,  0.]))
+
+        # the product of the Jacobian and a matrix with two columns
+        >>> fm.jvp(np.array([[1, 0], [1, 1]]))
+        (array([0., 3.]), array([[2., 2.],
+                                 [2., 1.]]))
+        """
+
+        if v is None:
+            v = self.seed
+        batched = np.ndim(self.inputs) == 2
+        points = np.asarray(self.inputs, dtype=self.dtype)
+        inputs = points.T if batched else np.atleast_1d(points)
+        input_num = len(inputs)
+        if np.isscalar(v):
+            tangents = np.full(input_num, v, dtype=self.dtype)
+        else:
+            tangents = np.asarray(v, dtype=self.dtype)
+            if tangents.ndim not in (1, 2) or len(tangents) != input_num:
+                raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+        # a matrix of tangents propagates k-wide derivatives instead of scalar tangents
+        width = tangents.shape[1:]
+
+        if batched:
+            # the tangents of each input variable are broadcast over the batch
+            columns = np.ascontiguousarray(inputs)
+            tangents = tangents.reshape(input_num, -1, 1)
+            dual_list = [DualArray._make(columns[i], np.broadcast_to(tangents[i], (tangents.shape[1], len(points))))
+                         for i in range(input_num)]
+            z = self._evaluate_batch(dual_list)
+        else:
+            z = self.functions(*[DualNumbers._make(val, tangent) for val, tangent in zip(inputs, tangents)])
+
+        try:
+            # input function is a scalar function
+            func_val, func_jvp = z.val, z.derv
+        except AttributeError:
+            # input function is a vector or matrix function
+            if batched:
+                func_val = _stack_outputs(z, 'val', self.dtype, axis=1)
+                func_jvp = _stack_outputs(z, 'derv', self.dtype, axis=1)
+                return func_val, func_jvp if width else func_jvp[..., 0]
+            return _stack_outputs(z, 'val', self.dtype), _stack_outputs(z, 'derv', self.dtype)
+        # a batched dual output holds every output of a vector function with one row of tangents each
+        if batched or isinstance(z, DualArray):
+            return self._as_dtype(func_val), np.ascontiguousarray(func_jvp if width else func_jvp[:, 0], dtype=self.dtype)
+        # copy J S, which is a row of the seed matrix when the output is an input variable
+        return self._as_dtype(func_val), np.array(func_jvp, dtype=self.dtype) if width else self._as_dtype(func_jvp)
+
+    def get_second_derivative(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the second directional derivative seed^T H seed of the input function at the evaluation point,
+        where H is the Hessian, computed exactly with HyperDualNumbers objects
+
+        Examples
+        --------
+        # get the second derivative of a univariate scalar function
+        >>> func = lambda x: x**3
+        >>> fm = ForwardMode(2, func)
+        >>> fm.get_second_derivative()
+        12.0
+
+        # get the curvature of a multivariate scalar function along the seed
+        # the Hessian of x*y is [[0, 1], [1, 0]]
+        >>> func = lambda x, y: x * y
+        >>> fm = ForwardMode(np.array([1, 1]), func, [1, 2])
+        >>> fm.get_second_derivative()
+        4.0
+        """
+
+        return self.calculate_hyper_dual_number()[2]
+
+    def get_hessian(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the Hessian of the input function at the evaluation point, computed exactly in a single pass with
+        HessianNumbers objects, as a SymmetricMatrix object that stores the n(n+1)/2 entries of the upper
+        triangle and unpacks to the full n x n array with toarray or np.asarray. A vector function returns
+        a list with one SymmetricMatrix object per output. The seed scales the input variables, so the
+        result is diag(seed) H diag(seed)
+
+        Raises
+        ------
+        ValueError if the seed vector length mismatchs with the number of input variables
+
+        Examples
+        --------
+        # the Hessian of x**2 * y is [[2y, 2x], [2x, 0]]
+        >>> func = lambda x, y: x**2 * y
+        >>> fm = ForwardMode(np.array([1., 3.]), func)
+        >>> H = fm.get_hessian()
+        >>> H.data
+        array([6., 2., 0.])
+        >>> H.toarray()
+        array([[6., 2.],
+               [2., 0.]])
+        """
+        inputs = np.atleast_1d(np.asarray(self.inputs, dtype=self.dtype))
+        if inputs.ndim != 1:
+            raise ValueError("ERROR: The Hessian takes a scalar or a vector as the evaluation point.")
+        input_num = len(inputs)
+
+        # get the seed for each input variable
+        if np.isscalar(self.seed):
+            seed = np.full(input_num, self.seed, dtype=self.dtype)
+        else:
+            seed = np.asarray(self.seed, dtype=self.dtype)
+            if input_num != len(seed):
+                raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+
+        # every intermediate shares the layout of the packed upper triangle, and the input variables have
+        # a Hessian of the scalar 0 until an operation creates a second derivative
+        triangle = packed_triangle(input_num)
+        gradients = np.diag(seed)
+        # Python floats are faster to combine than NumPy scalars, and only exact for float64
+        values, zero = (inputs.tolist(), 0.) if self.dtype == np.float64 else (list(inputs), self.dtype.type(0))
+        hyper_list = [HessianNumbers._make(val, gradients[i], zero, triangle) for i, val in enumerate(values)]
+
+        z = self.functions(*hyper_list)
+
+        packed = len(triangle[1])
+        def get_hessian(funct):
+            # a constant output has a zero Hessian
+            hess = funct.hess if isinstance(funct, HessianNumbers) else 0.
+            return SymmetricMatrix(np.broadcast_to(self._as_dtype(hess), (packed,)).copy(), input_num)
+
+        if isinstance(z, HessianNumbers) or np.isscalar(z):
+            # input function is a scalar function
+            return get_hessian(z)
+        # input function is an array function
+        return [get_hessian(funct) for funct in _flatten_outputs(z)[1]]
+
     @staticmethod
-    def fuse_multiple_inputs(functions, n_col):
-        
-        func_num = len(functions)
-        
+    def fuse_multiple_inputs(functions, n_col, dtype = float, empty = np.empty, out = None):
+        """
+        Parameters
+        ----------
+        functions: the outputs of a vector or matrix function: a list or tuple of DualNumbers objects, a
+                   nested list or NumPy object array of them, or a DualArray object with one output per element
+        n_col: the number of input variables
+        dtype: the floating point dtype of the values and derivatives (default float)
+        empty: function returning an uninitialized array for a shape and dtype, e.g. the take method of a
+               BufferPool object (default np.empty)
+        out: array of shape (m, n_col), or (m1, m2, n_col) for a matrix function, to write the derivatives
+             into (default None, which takes a new array from empty)
+
+        Returns
+        -------
+        the values of the outputs in an array of the shape of the outputs, and their derivatives in an array
+        with an extra last axis of length n_col, each filled with a single stacking operation
+
+        Examples
+        --------
+        >>> x = DualNumbers(1., np.array([1., 0.]))
+        >>> y = DualNumbers(2., np.array([0., 1.]))
+        >>> ForwardMode.fuse_multiple_inputs([[x, y], [x * y, x + y]], 2)
+        (array([[1., 2.],
+                [2., 3.]]), array([[[1., 0.],
+                                    [0., 1.]],
+                                   [[2., 1.],
+                                    [1., 1.]]]))
+        """
+
+        # a batched dual output already holds the values and derivatives of every output in one array
+        if isinstance(functions, DualArray):
+            func_val = empty(functions.val.shape, dtype)
+            func_der = empty(functions.val.shape + (n_col,), dtype) if out is None else out
+            func_val[...] = functions.val
+            func_der[...] = functions.derv
+            return func_val, func_der
+
+        shape, flat = _flatten_outputs(functions)
+
         # initialize the arrays to store the function and directional derivatives for the input functions
-        func_val = np.empty(func_num)  
-        func_der = np.empty([func_num, n_col])    
-        
-        # compute the function and directional derivative value for each input functions
-        for i, funct in enumerate(functions):
-            func_val[i] = funct.val
-            func_der[i] = funct.derv
-        
+        func_val = empty(shape, dtype)
+        func_der = empty(shape + (n_col,), dtype) if out is None else out
+
+        func_val.reshape(-1)[:] = np.fromiter((funct.val for funct in flat), dtype, count=len(flat))
+        derivatives = [funct.derv for funct in flat]
+        try:
+            # the rows of the Jacobian are joined into the buffer in a single operation
+            np.concatenate(derivatives, out=func_der.reshape(-1))
+        except ValueError:
+            # derivatives of a different width, e.g. a scalar zero, are broadcast one at a time
+            for i, derv in enumerate(derivatives):
+                func_der.reshape(-1, n_col)[i] = derv
         return func_val, func_der
-        
-    
+
     def calculate_dual_number(self):
         """
         Parameters
@@ -219,9 +543,30 @@ class ForwardMode:
                                  [ 4., -3.]]))
         
         """
-        
-        
-            
+
+        # a seed matrix S gives every input variable a row of S as its k-wide derivative, so the
+        # derivatives are J S and the cost scales with k instead of the number of input variables
+        if np.ndim(self.seed) == 2:
+            if self.second_order or self.sparse:
+                raise ValueError("ERROR: A seed matrix is not supported with sparse or second order derivatives.")
+            return self.jvp(self.seed)
+
+        # propagate second order derivatives along the seed
+        if self.second_order:
+            return self.calculate_hyper_dual_number()
+
+        # evaluate every row of a 2D input as a separate evaluation point in one batched pass
+        if np.ndim(self.inputs) == 2:
+            if self.sparse:
+                raise ValueError("ERROR: Batched evaluation is not supported with sparse derivatives.")
+            return self.calculate_dual_array()
+
+        # write the Jacobian one block of columns at a time
+        if self.chunk_size is not None or self.memory_budget is not None:
+            if self.sparse:
+                raise ValueError("ERROR: Chunked evaluation is not supported with sparse derivatives.")
+            return self.calculate_chunked()
+
         # check if the input is a scalar
         if np.isscalar(self.inputs):
             # enforce the self.inputs to become an array
@@ -236,43 +581,348 @@ class ForwardMode:
         # initialize the list of dual numbers
         dual_list = [0] * input_num
         
-        # get the corresponding seed vector       
-        def get_seed_vector(index):
-            
-            seed_vector = np.zeros(input_num)
+        # get the seed value of the input variable at the given index
+        def get_seed_value(index):
             
             # if self.seed is a scalar
             if np.isscalar(self.seed):
-                seed_vector[index] = self.seed
-            else:
-                # if self.seed is an array
-                if input_num != len(self.seed):
-                    raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
-                elif len(self.seed) == 1:
-                    seed_vector[index] = self.seed[0]
-                else:
-                    seed_vector[index] = self.seed[index]
+                return self.seed
+            # if self.seed is an array
+            if input_num != len(self.seed):
+                raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+            return self.seed[index]
+
+        # get the corresponding seed vector       
+        def get_seed_vector(index):
+            
+            # a sparse seed only stores the entry of its own input variable
+            if self.sparse:
+                return SparseDerivative.unit(index, get_seed_value(index), input_num, self.dtype)
 
+            seed_vector = np.zeros(input_num, dtype=self.dtype)
+            seed_vector[index] = get_seed_value(index)
             return seed_vector
         
         for i in range(input_num):
-            dual_list[i] = DualNumbers(self.inputs[i], get_seed_vector(i))
+            dual_list[i] = DualNumbers(self.inputs[i], get_seed_vector(i), self.dtype)
         
         z = self.functions(*dual_list)
+
+        # a batched dual output holds every output of a vector function
+        if isinstance(z, DualArray):
+            return self.fuse_multiple_inputs(z, input_num, self.dtype)
         
         try:
             # input function is a scalar function
-            if len(z.derv) == 1: # the input is a scalar
-                return float(z.val), float(z.derv)
+            derv = z.derv
+            if isinstance(derv, SparseDerivative):
+                derv = derv.toarray()
+            if len(derv) == 1: # the input is a scalar
+                return self._as_dtype(z.val), self._as_dtype(derv[0])
             else:
-                return z.val, z.derv
+                return self._as_dtype(z.val), self._as_dtype(derv)
         except AttributeError:
             # input function is an array function
-            return self.fuse_multiple_inputs(z, input_num)
-            
+            return self.fuse_multiple_inputs(z, input_num, self.dtype)
 
+    def calculate_sparse_jacobian(self, pattern=None):
+        """
+        Parameters
+        ----------
+        pattern: a SparseMatrix object with the sparsity pattern of the Jacobian (default None, which
+                 detects the pattern at the evaluation point)
 
+        Returns
+        -------
+        evaluated value of the input function and its Jacobian as a SparseMatrix object, computed with
+        one evaluation whose derivative vectors have one entry per color of the columns of the Jacobian,
+        e.g. 3 entries for a tridiagonal Jacobian of any size
 
+        Examples
+        --------
+        >>> func = lambda x, y, z: (x * y, y + z, z ** 2)
+        >>> fm = ForwardMode(np.array([1, 2, 3]), func)
+        >>> val, J = fm.calculate_sparse_jacobian()
+        >>> J.toarray()
+        array([[2., 1., 0.],
+               [0., 1., 1.],
+               [0., 0., 6.]])
+        """
 
+        return sparse_jacobian(self.functions, self.inputs, pattern, self.seed, self.dtype)
 
-    
\ No newline at end of file
+    def get_chunk_size(self, input_num):
+        """
+        Parameters
+        ----------
+        input_num: the number of input variables
+
+        Returns
+        -------
+        the number of derivative columns of one chunked evaluation: chunk_size if it is set, otherwise
+        the largest chunk size for which the input_num derivative vectors fit into memory_budget, and
+        at least 1 and at most input_num
+
+        Examples
+        --------
+        >>> fm = ForwardMode(np.ones(1000), lambda *x: sum(x), memory_budget=80000)
+        >>> fm.get_chunk_size(1000)
+        10
+        """
+
+        if self.chunk_size is not None:
+            return min(self.chunk_size, input_num)
+        if self.memory_budget is None:
+            return input_num
+        chunk_size = int(self.memory_budget // (input_num * self.dtype.itemsize))
+        return min(max(chunk_size, 1), input_num)
+
+    def calculate_chunked(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        evaluated value and derivative of the input function at the evaluation point, in the format of
+        calculate_dual_number. The function is evaluated once per chunk of input variables: the variables
+        of the chunk carry their seeded unit vectors of the chunk width, and every other variable shares a
+        single zero vector, so each evaluation gives one block of columns of the Jacobian
+
+        Raises
+        ------
+        ValueError if the seed vector length mismatchs with the number of input variables
+
+        Examples
+        --------
+        >>> func = lambda x, y, z: (x * y, y * z)
+        >>> fm = ForwardMode(np.array([1, 2, 3]), func, chunk_size=2)
+        >>> fm.calculate_chunked()
+        (array([2., 6.]), array([[2., 1., 0.],
+                                 [0., 3., 2.]]))
+        """
+
+        inputs = np.atleast_1d(np.asarray(self.inputs, dtype=self.dtype))
+        input_num = len(inputs)
+        if np.isscalar(self.seed):
+            seed = np.full(input_num, self.seed, dtype=self.dtype)
+        else:
+            seed = np.asarray(self.seed, dtype=self.dtype)
+            if seed.shape != (input_num,):
+                raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+
+        chunk_size = self.get_chunk_size(input_num)
+        func_val = func_der = None
+        for start in range(0, input_num, chunk_size):
+            stop = min(start + chunk_size, input_num)
+            # the seed block and the shared zero vector are read-only, so no operator updates them in place
+            block = np.diag(seed[start:stop])
+            zero = np.zeros(stop - start, dtype=self.dtype)
+            block.flags.writeable = zero.flags.writeable = False
+            z = self.functions(*[DualNumbers._make(val, block[i - start] if start <= i < stop else zero)
+                                 for i, val in enumerate(inputs)])
+
+            try:
+                # input function is a scalar function, or a vector function with a batched dual output
+                derv = z.derv
+            except AttributeError:
+                # input function is a vector or matrix function
+                shape, flat = _flatten_outputs(z)
+                if func_der is None:
+                    func_val = np.fromiter((funct.val for funct in flat), self.dtype, count=len(flat)).reshape(shape)
+                    func_der = np.empty(shape + (input_num,), dtype=self.dtype)
+                rows = func_der.reshape(-1, input_num)
+                for i, funct in enumerate(flat):
+                    rows[i, start:stop] = funct.derv
+            else:
+                if func_der is None:
+                    func_val, func_der = z.val, np.empty(np.shape(z.val) + (input_num,), dtype=self.dtype)
+                func_der[..., start:stop] = derv
+
+        if func_der.ndim == 1 and input_num == 1:
+            return self._as_dtype(func_val), func_der[0]
+        return self._as_dtype(func_val), func_der
+
+    def calculate_primal(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        value of the input function at the evaluation point, in the format of calculate_dual_number,
+        evaluated with PrimalNumbers objects that skip the propagation of the derivatives
+
+        Examples
+        --------
+        >>> func = lambda x, y: (x * y, x.exp())
+        >>> fm = ForwardMode(np.array([1, 2]), func)
+        >>> fm.calculate_primal()
+        array([2.        , 2.71828183])
+        """
+
+        inputs = np.atleast_1d(np.asarray(self.inputs, dtype=self.dtype))
+        z = self.functions(*[PrimalNumbers._make(val) for val in inputs])
+
+        try:
+            # input function is a scalar function
+            val = z.val
+        except AttributeError:
+            # input function is an array function, whose outputs can be nested lists
+            shape, flat = _flatten_outputs(z)
+            return np.fromiter((funct.val for funct in flat), self.dtype, count=len(flat)).reshape(shape)
+        return self._as_dtype(val)
+
+    def calculate_dual_array(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        evaluated values and derivatives of the input function at every row of the 2D array of
+        evaluation points, computed in a single pass with DualArray objects. For B points and n
+        input variables the values have shape (B,) and the derivatives have shape (B, n), or (B,)
+        when there is a single input variable. For a vector function with m outputs the values
+        have shape (B, m) and the derivatives have shape (B, m, n), and for a matrix function
+        (B, m1, m2) and (B, m1, m2, n).
+
+        Raises
+        ------
+        ValueError if the seed vector length mismatchs with the number of input variables
+
+        Examples
+        --------
+        # evaluate a univariate scalar function at three points
+        >>> func = lambda x: x**2
+        >>> fm = ForwardMode(np.array([[1], [2], [3]]), func)
+        >>> fm.calculate_dual_array()
+        (array([1., 4., 9.]), array([2., 4., 6.]))
+
+        # evaluate a multivariate scalar function at two points
+        >>> func = lambda x, y: 2*x + y
+        >>> fm = ForwardMode(np.array([[1, 1], [2, 3]]), func)
+        >>> fm.calculate_dual_array()
+        (array([3., 7.]), array([[2., 1.],
+                                 [2., 1.]]))
+
+        # set the points outside of the domain to NaN instead of raising an error
+        >>> func = lambda x: x.log()
+        >>> fm = ForwardMode(np.array([[1], [-1], [2]]), func, domain_policy='nan')
+        >>> fm.calculate_dual_array()
+        (array([0.        ,        nan, 0.69314718]), array([1. , nan, 0.5]))
+        >>> fm.domain_report
+        {'ERROR: Value for log should be greater than 0': array([1])}
+        """
+        points = np.asarray(self.inputs, dtype=self.dtype)
+        batch_size, input_num = points.shape
+
+        # get the seed for each input variable
+        if np.isscalar(self.seed):
+            seed = np.full(input_num, self.seed, dtype=self.dtype)
+        else:
+            seed = np.asarray(self.seed, dtype=self.dtype)
+            if input_num != len(seed):
+                raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+
+        # each input variable gets the same seed vector at every point, so the seed columns are
+        # broadcast over the batch instead of being copied B times
+        seed_block = np.diag(seed)
+        columns = np.ascontiguousarray(points.T)
+        dual_list = [DualArray._make(columns[i], np.broadcast_to(seed_block[:, i:i + 1], (input_num, batch_size)))
+                     for i in range(input_num)]
+
+        z = self._evaluate_batch(dual_list)
+
+        try:
+            # input function is a scalar function
+            func_val, func_der = z.val, z.derv
+        except AttributeError:
+            # input function is a vector or matrix function
+            func_val = _stack_outputs(z, 'val', self.dtype, axis=1)
+            func_der = _stack_outputs(z, 'derv', self.dtype, axis=1)
+
+        # a single input variable has one derivative per point and output
+        if input_num == 1:
+            func_der = func_der[..., 0]
+        return self._as_dtype(func_val), np.ascontiguousarray(func_der, dtype=self.dtype)
+
+    def _evaluate_batch(self, dual_list):
+        """
+        Parameters
+        ----------
+        dual_list: list of DualArray objects, one per input variable
+
+        Returns
+        -------
+        the output of the input function at the DualArray objects, evaluated under the domain policy
+        of the object. The failed points of the evaluation are kept in domain_report
+        """
+
+        # collect the failed points of this evaluation alone under the domain policy of the object
+        with DomainContext(self.domain_policy) as context:
+            self.domain_report = context.report
+            return self.functions(*dual_list)
+
+    def calculate_hyper_dual_number(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        evaluated value, directional derivative along the seed, and second directional derivative
+        seed^T H seed of the input function at the evaluation point, computed in a single pass with
+        HyperDualNumbers objects. A vector function returns an array of each with one entry per
+        output, and a 2D array of evaluation points returns one entry per row.
+
+        Raises
+        ------
+        ValueError if the seed vector length mismatchs with the number of input variables
+
+        Examples
+        --------
+        # get the value and the first and second derivatives of a univariate scalar function
+        >>> func = lambda x: x**3
+        >>> fm = ForwardMode(2, func, second_order=True)
+        >>> fm.calculate_hyper_dual_number()
+        (8.0, 12.0, 12.0)
+
+        # get the value and the first and second directional derivatives of a multivariate vector function
+        >>> func = lambda x, y: (x * y, x**2 + y)
+        >>> fm = ForwardMode(np.array([1., 2.]), func, [1, 1], second_order=True)
+        >>> fm.calculate_hyper_dual_number()
+        (array([2., 3.]), array([3., 3.]), array([2., 2.]))
+        """
+        points = np.asarray(self.inputs, dtype=self.dtype)
+        # every input variable is a column with one entry per evaluation point for a 2D input
+        if points.ndim == 2:
+            columns = np.ascontiguousarray(points.T)
+        else:
+            columns = np.atleast_1d(points)
+        input_num = len(columns)
+
+        # get the seed for each input variable
+        if np.isscalar(self.seed):
+            seed = np.full(input_num, self.seed, dtype=self.dtype)
+        else:
+            seed = np.asarray(self.seed, dtype=self.dtype)
+            if input_num != len(seed):
+                raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+
+        # both directions of every input variable are its seed entry, so the e1e2 part is seed^T H seed
+        dual_list = [HyperDualNumbers._make(columns[i], seed[i], seed[i], 0.) for i in range(input_num)]
+
+        z = self.functions(*dual_list)
+
+        try:
+            # input function is a scalar function
+            return self._as_dtype(z.val), self._as_dtype(z.derv1), self._as_dtype(z.derv12)
+        except AttributeError:
+            # input function is a vector or matrix function
+            return (_stack_outputs(z, 'val', self.dtype, axis=-1), _stack_outputs(z, 'derv1', self.dtype, axis=-1),
+                    _stack_outputs(z, 'derv12', self.dtype, axis=-1))
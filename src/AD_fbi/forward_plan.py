@@ -0,0 +1,189 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: forward_plan.py                                                         #
+# Description: This class defines a plan of forward mode evaluations of one     #
+# function at many points of the same shape. The seed vectors and the output    #
+# buffers are built once, so evaluating at a new point only costs the traversal #
+# of the function, e.g. in every iteration of an optimizer.                     #
+#################################################################################
+
+import numpy as np
+from .dual_number import DualNumbers, DualArray
+from .forward_mode import ForwardMode, _flatten_outputs
+from .primal_number import PrimalNumbers
+from .evaluation_cache import evaluation_key
+
+
+class ForwardPlan:
+    r"""A class representing a reusable forward mode evaluation of a function with a fixed number of inputs
+
+    The plan validates the seed and builds the seed vector of every input variable once. Each
+    evaluation writes the derivatives into the out array, or into a buffer owned by the plan
+    that the next evaluation overwrites, so copy the results that should outlive the next call.
+
+    Instance Variables
+    ----------
+    functions: a scalar function or a vector of functions
+    input_num: the number of input variables
+    seed: the seed vector, with one entry per input variable
+    dtype: the floating point dtype of the values and derivatives
+    cache: an EvaluationCache object shared with ForwardMode, or None
+
+    Examples
+    --------
+    >>> plan = ForwardPlan(lambda x, y: x * y, 2)
+    >>> plan.evaluate(np.array([1., 2.]))
+    (2.0, array([2., 1.]))
+    >>> plan.evaluate(np.array([3., 4.]))
+    (12.0, array([4., 3.]))
+    """
+
+    def __init__(self, input_function, input_num, seed="default seed", dtype=float, cache=None):
+        r"""A constructor to create a ForwardPlan object for a function of input_num variables
+
+        Parameters
+        ----------
+        input_function: a scalar function or a vector of functions
+        input_num: integer object with the number of input variables
+        seed: a scalar seed for every input variable or a seed vector (default 1 for every input variable)
+        dtype: the floating point dtype of the values and derivatives (default float)
+        cache: an EvaluationCache object that reuses the value and derivative at points evaluated before (default None)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError if input_num is less than 1 or the seed vector length mismatchs with the number of input variables
+        """
+        if input_num < 1:
+            raise ValueError("ERROR: The number of input variables should be at least 1")
+        if isinstance(seed, str) and seed == 'default seed':
+            seed = 1
+        if np.isscalar(seed):
+            seed = np.full(input_num, seed, dtype=float)
+        else:
+            seed = np.asarray(seed, dtype=float)
+            if seed.shape != (input_num,):
+                raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+        self.functions = input_function
+        self.input_num = input_num
+        self.seed = seed
+        self.dtype = np.dtype(dtype)
+        self.cache = cache
+
+        # the rows of the seed block are the seed vectors of the input variables. The block is
+        # read-only, so an operator can never update a seed vector in place
+        self._seeds = np.diag(seed).astype(self.dtype)
+        self._seeds.flags.writeable = False
+        self._rows = list(self._seeds)
+        self._buffers = {}
+
+    def _buffer(self, shape, dtype=None):
+        r"""Return the output buffer of the plan with the given shape and dtype, by default the dtype of the plan, allocating it on first use"""
+        key = (shape, self.dtype if dtype is None else np.dtype(dtype))
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = np.empty(shape, dtype=key[1])
+        return buffer
+
+    def evaluate(self, x, out=None):
+        r"""A method to evaluate the value and derivative of the function at a new point
+
+        Parameters
+        ----------
+        x: a scalar or a 1D array with one entry per input variable
+        out: a NumPy array of dtype to write the derivative into, of shape (input_num,) for a
+             scalar function or (m, input_num) for a vector function of m outputs (default None,
+             which writes into a buffer of the plan that the next evaluation overwrites)
+
+        Returns
+        -------
+        the value and derivative of the function at x, in the format of ForwardMode.calculate_dual_number.
+        With a cache, a query that was answered before returns the cached read-only arrays
+
+        Raises
+        ------
+        ValueError if the number of entries of x mismatchs with the number of input variables
+
+        Examples
+        --------
+        >>> plan = ForwardPlan(lambda x, y: (x + y, x * y), 2)
+        >>> plan.evaluate(np.array([1., 2.]))
+        (array([3., 2.]), array([[1., 1.],
+                                 [2., 1.]]))
+        """
+        x = np.asarray(x, dtype=self.dtype)
+        if x.size != self.input_num:
+            raise ValueError("ERROR: The evaluation point should have one entry per input variable.")
+
+        if self.cache is None:
+            return self._evaluate(x, out)
+        key = evaluation_key(self.functions, x.ravel(), self.seed, self.dtype, False, False, None)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.cache.put(key, self._evaluate(x, out))
+        elif out is not None:
+            out[...] = result[1]
+        return result
+
+    def value(self, x):
+        r"""A method to evaluate only the value of the function at a new point, skipping the derivatives
+
+        Parameters
+        ----------
+        x: a scalar or a 1D array with one entry per input variable
+
+        Returns
+        -------
+        the value of the function at x, in the format of ForwardMode.calculate_primal
+
+        Raises
+        ------
+        ValueError if the number of entries of x mismatchs with the number of input variables
+
+        Examples
+        --------
+        >>> plan = ForwardPlan(lambda x, y: x * y, 2)
+        >>> plan.value(np.array([3., 4.]))
+        12.0
+        """
+        x = np.asarray(x, dtype=self.dtype)
+        if x.size != self.input_num:
+            raise ValueError("ERROR: The evaluation point should have one entry per input variable.")
+
+        z = self.functions(*[PrimalNumbers._make(val) for val in x.ravel()])
+        try:
+            # input function is a scalar function
+            val = z.val
+        except AttributeError:
+            # input function is an array function, whose outputs can be nested lists
+            shape, flat = _flatten_outputs(z)
+            return np.fromiter((funct.val for funct in flat), self.dtype, count=len(flat)).reshape(shape)
+        return self.dtype.type(val)
+
+    def _evaluate(self, x, out):
+        r"""An internal method that traverses the function at x and fills the output buffers"""
+        z = self.functions(*[DualNumbers._make(val, row) for val, row in zip(x.ravel(), self._rows)])
+
+        # a batched dual output holds every output of a vector function
+        if isinstance(z, DualArray):
+            return ForwardMode.fuse_multiple_inputs(z, self.input_num, self.dtype, self._buffer, out)
+
+        try:
+            # input function is a scalar function
+            derv = z.derv
+        except AttributeError:
+            # input function is an array function
+            return ForwardMode.fuse_multiple_inputs(z, self.input_num, self.dtype, self._buffer, out)
+
+        if self.input_num == 1:
+            if out is not None:
+                out[...] = derv
+            return self.dtype.type(z.val), self.dtype.type(derv[0])
+        # copy the derivative, since it can be a read-only seed vector, e.g. for f(x, y) = x
+        if out is None:
+            out = self._buffer((self.input_num,))
+        out[...] = derv
+        return self.dtype.type(z.val), out
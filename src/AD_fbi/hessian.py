@@ -0,0 +1,176 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: hessian.py                                                              #
+# Description: Compute Hessian-vector products H v of a scalar function without #
+# forming the Hessian, by differentiating the reverse mode gradient along v     #
+# (tangent over reverse). One product costs a small multiple of one gradient    #
+# and takes memory proportional to the tape, not to the square of the number    #
+# of input variables. Sparse Hessians are recovered from the products with a    #
+# compressed seed matrix that has one column per color of a star coloring.      #
+#################################################################################
+
+import numpy as np
+from .tangent_number import TangentNumbers, TangentTape
+from .sparsity import SparseMatrix, hessian_sparsity, star_color
+from .evaluation_cache import EvaluationCache
+
+# the sparsity patterns and colorings of the functions passed to sparse_hessian
+_structures = EvaluationCache(max_size=32)
+
+
+def _tangent_sweep(fx, x, tangents):
+    r"""Evaluate fx at x with the given tangent of every input variable and return the gradient and its tangent"""
+    tape = TangentTape()
+    z = fx(*[TangentNumbers(val, dot, tape) for val, dot in zip(x.tolist(), tangents)])
+    if not isinstance(z, TangentNumbers):
+        raise ValueError("ERROR: The function should return a scalar that depends on the input variables.")
+    return tape.backward_tangent([z.index], len(x))
+
+
+def hvp(fx, x, v):
+    r"""Compute the product of the Hessian of fx at x with the vector v
+
+    The function is evaluated once with TangentNumbers objects whose tangents are the entries of v,
+    and one backward sweep over the tape gives the derivative of the gradient along v, which is H v.
+
+    Parameters
+    ----------
+    fx: a scalar function of n input variables
+    x: a scalar or a 1D array with the evaluation point
+    v: a scalar or a 1D array with one entry per input variable
+
+    Returns
+    -------
+    H v, a float for a function of one input variable or a 1D array with one entry per input variable
+
+    Raises
+    ------
+    ValueError if v has a different length than x or fx does not return a scalar of the input variables
+
+    Examples
+    --------
+    >>> fx = lambda x, y: x ** 2 * y + y.exp()
+    >>> hvp(fx, np.array([1., 0.]), np.array([1., 0.]))
+    array([0., 2.])
+    """
+    inputs = np.atleast_1d(np.asarray(x, dtype=float))
+    v = np.atleast_1d(np.asarray(v, dtype=float))
+    if v.shape != inputs.shape or inputs.ndim != 1:
+        raise ValueError("ERROR: The vector should have one entry per input variable.")
+    _, product = _tangent_sweep(fx, inputs, v.tolist())
+    if np.isscalar(x):
+        return float(product[0])
+    return product
+
+
+def batch_hvp(fx, x, V):
+    r"""Compute the product of the Hessian of fx at x with every column of the n x k matrix V
+
+    The function is evaluated once with k tangents per input variable, the rows of V, so the values
+    and the partials are recorded once for all of the columns and the backward sweep carries a row
+    of k tangent adjoints per node.
+
+    Parameters
+    ----------
+    fx: a scalar function of n input variables
+    x: a 1D array with the evaluation point
+    V: a 2D array of shape (n, k)
+
+    Returns
+    -------
+    H V, a 2D array of shape (n, k)
+
+    Raises
+    ------
+    ValueError if V does not have one row per input variable or fx does not return a scalar of the input variables
+
+    Examples
+    --------
+    >>> fx = lambda x, y: x ** 2 * y + y.exp()
+    >>> batch_hvp(fx, np.array([1., 0.]), np.eye(2))
+    array([[0., 2.],
+           [2., 1.]])
+    """
+    inputs = np.atleast_1d(np.asarray(x, dtype=float))
+    V = np.asarray(V, dtype=float)
+    if V.ndim != 2 or len(V) != len(inputs) or inputs.ndim != 1:
+        raise ValueError("ERROR: The matrix should have one row per input variable.")
+    # the tangent of every input variable is its row of V, which the operations never update in place
+    rows = np.array(V)
+    rows.flags.writeable = False
+    _, product = _tangent_sweep(fx, inputs, list(rows))
+    return product.reshape(V.shape)
+
+
+def _hessian_structure(fx, inputs):
+    r"""Detect the Hessian pattern of fx at inputs and star color it, returning the pattern, the colors and the
+    row and color column of the compressed product from which every entry of the pattern is read"""
+    pattern = hessian_sparsity(fx, inputs)
+    colors = star_color(pattern)
+    num_colors = colors.max(initial=-1) + 1
+    # both entries (i, j) and (j, i) are read at the same place, so the Hessian comes out exactly symmetric
+    lo, hi = np.minimum(pattern.row, pattern.col), np.maximum(pattern.row, pattern.col)
+    # an entry is read from row lo when hi is the only entry of that row with its color, and from row hi otherwise
+    counts = np.bincount(pattern.row * num_colors + colors[pattern.col], minlength=len(inputs) * num_colors)
+    unique = counts[lo * num_colors + colors[hi]] == 1
+    read_row = np.where(unique, lo, hi)
+    read_color = np.where(unique, colors[hi], colors[lo])
+    return pattern, colors, read_row, read_color
+
+
+def sparse_hessian(fx, x, cache=None):
+    r"""Compute the Hessian of fx at x as a sparse matrix from one Hessian-vector product per color
+
+    The sparsity pattern of the Hessian is detected by tracing fx once with hessian_sparsity and the
+    input variables are star colored with star_color. One evaluation of batch_hvp with the compressed
+    seed matrix, which has a 1 in the column of the color of every input variable, gives the sum of
+    the Hessian columns of every color, from which each nonzero entry is read directly. A function
+    that is a sum of local terms has a few colors however many input variables there are.
+
+    The pattern and the coloring are cached by function and number of input variables, so later calls
+    at new points evaluate only the products. A function that branches on its values keeps the pattern
+    of the point of the first call.
+
+    Parameters
+    ----------
+    fx: a scalar function of n input variables
+    x: a scalar or a 1D array with the evaluation point
+    cache: an EvaluationCache object for the patterns and colorings (default None, which uses a cache
+           shared by every call)
+
+    Returns
+    -------
+    A symmetric n x n SparseMatrix object with the entries of both triangles of the sparsity pattern
+
+    Raises
+    ------
+    ValueError if fx does not return a scalar of the input variables
+
+    Examples
+    --------
+    >>> fx = lambda x, y, z: x ** 2 * y + z.exp()
+    >>> H = sparse_hessian(fx, np.array([1., 2., 0.]))
+    >>> H
+    SparseMatrix(shape=(3, 3), nnz=4)
+    >>> H.toarray()
+    array([[4., 2., 0.],
+           [2., 0., 0.],
+           [0., 0., 1.]])
+    """
+    inputs = np.atleast_1d(np.asarray(x, dtype=float))
+    if inputs.ndim != 1:
+        raise ValueError("ERROR: The Hessian takes a scalar or a vector as the evaluation point.")
+    cache = _structures if cache is None else cache
+    key = (fx, len(inputs))
+    structure = cache.get(key)
+    if structure is None:
+        structure = cache.put(key, _hessian_structure(fx, inputs))
+    pattern, colors, read_row, read_color = structure
+
+    if pattern.nnz == 0:
+        # a linear or constant function has an empty Hessian
+        return SparseMatrix(pattern.row, pattern.col, np.zeros(0), pattern.shape)
+    compressed = np.zeros((len(inputs), colors.max() + 1))
+    compressed[np.arange(len(inputs)), colors] = 1.
+    product = batch_hvp(fx, inputs, compressed)
+    return SparseMatrix(pattern.row, pattern.col, product[read_row, read_color], pattern.shape)
@@ -0,0 +1,501 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: hessian_number.py                                                       #
+# Description: This class defines a second order forward mode number that      #
+# carries the value, the gradient and the Hessian of a function of n input      #
+# variables. The Hessian is symmetric, so only its n(n+1)/2 upper triangle      #
+# entries are propagated, in a packed array that a SymmetricMatrix object       #
+# unpacks to the full matrix when needed.                                       #
+#################################################################################
+
+import math
+
+import numpy as np
+from .dual_number import _SCALAR_TYPES, _UFUNC_OPERATORS, _UFUNC_METHODS, _int_power, _is_integer, _logistic_kernel
+
+
+def packed_triangle(n):
+    r"""Return the layout of the packed upper triangle of an n x n matrix, which is the tuple of the lengths
+    n, n - 1, ..., 1 of its rows and of the column index of every entry
+
+    Examples
+    --------
+    >>> packed_triangle(3)
+    (array([3, 2, 1]), array([0, 1, 2, 1, 2, 2]))
+    """
+    return np.arange(n, 0, -1), np.triu_indices(n)[1]
+
+
+class SymmetricMatrix:
+    r"""A class representing a symmetric matrix stored as its packed upper triangle
+
+    The entries (i, j) with i <= j are kept row by row in a 1D array of length n(n+1)/2, in the order
+    of np.triu_indices(n). Entries are read from the packed array, and the full matrix is only built
+    by toarray or when NumPy converts the object to an array, e.g. in np.asarray or np.allclose.
+
+    Instance Variables
+    ----------
+    data: 1D array of the n(n+1)/2 packed entries of the upper triangle
+    n: the number of rows and columns
+
+    Examples
+    --------
+    >>> H = SymmetricMatrix([1., 2., 3.], 2)
+    >>> H[1, 0]
+    2.0
+    >>> H.toarray()
+    array([[1., 2.],
+           [2., 3.]])
+    """
+
+    __slots__ = ('data', 'n')
+
+    def __init__(self, data, n):
+        r"""A constructor to create SymmetricMatrix object from its packed upper triangle
+
+        Parameters
+        ----------
+        data: 1D array of the n(n+1)/2 entries (i, j) with i <= j, row by row
+        n: integer object with the number of rows and columns
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError if data does not have n(n+1)/2 entries
+        """
+        data = np.asarray(data)
+        if data.shape != (n * (n + 1) // 2,):
+            raise ValueError('Error: A packed symmetric matrix of n rows should have n(n+1)/2 entries')
+        self.data = data
+        self.n = n
+
+    @property
+    def shape(self):
+        r"""A method to retrieve the shape of the full matrix"""
+        return (self.n, self.n)
+
+    def __repr__(self):
+        r"""A method to overload the string representation of SymmetricMatrix object
+
+        Examples
+        --------
+        >>> print(SymmetricMatrix([1., 2., 3.], 2))
+        SymmetricMatrix(n=2, packed=3)
+        """
+        return f'SymmetricMatrix(n={self.n}, packed={len(self.data)})'
+
+    def _position(self, i, j):
+        r"""An internal method to return the position of the entry (i, j) in the packed array"""
+        i, j = min(i, j), max(i, j)
+        return i * self.n - i * (i - 1) // 2 + j - i
+
+    def __getitem__(self, index):
+        r"""A method to read the entry (i, j) from the packed array"""
+        i, j = index
+        return self.data[self._position(i, j)]
+
+    def diagonal(self):
+        r"""A method to return the diagonal of the matrix"""
+        i = np.arange(self.n)
+        return self.data[i * self.n - i * (i - 1) // 2]
+
+    def toarray(self):
+        r"""A method to unpack the matrix to a full 2D array
+
+        Returns
+        -------
+        2D array of shape (n, n)
+        """
+        rows, cols = np.triu_indices(self.n)
+        full = np.empty((self.n, self.n), dtype=self.data.dtype)
+        full[rows, cols] = self.data
+        full[cols, rows] = self.data
+        return full
+
+    def __array__(self, dtype=None):
+        r"""A method to unpack the matrix when NumPy converts it to an array"""
+        full = self.toarray()
+        return full if dtype is None else full.astype(dtype)
+
+    def __matmul__(self, v):
+        r"""A method to multiply the matrix by a dense vector without unpacking it
+
+        Examples
+        --------
+        >>> SymmetricMatrix([1., 2., 3.], 2) @ np.array([1., 1.])
+        array([3., 5.])
+        """
+        rows, cols = np.triu_indices(self.n)
+        v = np.asarray(v)
+        # every off-diagonal entry contributes to both of its rows, and the diagonal only once
+        off = self.data * (rows != cols)
+        return (np.bincount(rows, weights=self.data * v[cols], minlength=self.n)
+                + np.bincount(cols, weights=off * v[rows], minlength=self.n))
+
+
+class HessianNumbers:
+    r"""A class representing a variable object that carries its value, gradient and packed Hessian
+
+    Every elementary function g is applied with the second order chain rule
+
+        H(g(u)) = g'(u) H(u) + g''(u) grad(u) grad(u)^T
+
+    where only the n(n+1)/2 entries of the upper triangle are propagated, so each operation costs
+    O(n^2 / 2) instead of O(n^2). The packed outer product of two gradients repeats the entries of
+    the first one by the lengths of the rows and gathers the second one by the column indices, so
+    the layout takes one index per entry. The input variables have a Hessian of the scalar 0, which
+    takes no memory until an operation creates a second derivative.
+
+    Instance Variables
+    ----------
+    val: value of the HessianNumbers object
+    grad: 1D array with the gradient with respect to the n input variables
+    hess: 1D array with the packed upper triangle of the Hessian, or the scalar 0
+    triangle: the layout of the packed upper triangle, shared by all of the objects of one evaluation
+
+    Examples
+    --------
+    >>> x = HessianNumbers(1., np.array([1., 0.]))
+    >>> y = HessianNumbers(2., np.array([0., 1.]), triangle=x.triangle)
+    >>> z = x * x * y
+    >>> z.hess
+    array([4., 2., 0.])
+    """
+
+    __slots__ = ('_val', '_grad', '_hess', '_triangle')
+
+    def __init__(self, val, grad, hess=0., triangle=None):
+        r"""A constructor to create HessianNumbers object
+
+        Parameters
+        ----------
+        val: integer or float object that represents the value of HessianNumbers object
+        grad: 1D array with the gradient, e.g. a scaled unit vector for an input variable
+        hess: 1D array with the packed upper triangle of the Hessian (default 0, for an input variable)
+        triangle: the layout of the packed upper triangle returned by packed_triangle, which the input
+                  variables of one evaluation should share (default None, which creates it)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError if the value is not an int or float
+        """
+        if not isinstance(val, _SCALAR_TYPES) or isinstance(val, bool):
+            raise TypeError('Error: Input value should be an int or float')
+        self._val = float(val)
+        self._grad = np.asarray(grad, dtype=float)
+        self._hess = hess
+        self._triangle = packed_triangle(len(self._grad)) if triangle is None else triangle
+
+    @classmethod
+    def _make(cls, val, grad, hess, triangle):
+        r"""An internal constructor that creates a HessianNumbers object without validation"""
+        obj = object.__new__(cls)
+        obj._val = val
+        obj._grad = grad
+        obj._hess = hess
+        obj._triangle = triangle
+        return obj
+
+    @staticmethod
+    def _check_domain(invalid, message, error=ValueError):
+        r"""An internal method to raise an error when an operation is evaluated outside of its domain"""
+        if invalid:
+            raise error(message)
+
+    def _outer(self, a, b):
+        r"""An internal method to return the packed upper triangle of the outer product of two gradients"""
+        counts, cols = self._triangle
+        outer = np.repeat(a, counts)
+        outer *= b[cols]
+        return outer
+
+    def _chain(self, f, f_prime, f_second):
+        r"""An internal method to apply the second order chain rule of an elementary function"""
+        if f_second == 0:
+            return self._make(f, f_prime * self._grad, f_prime * self._hess, self._triangle)
+        # the new arrays are updated in place to keep the temporaries of a wide Hessian few
+        hess = self._outer(self._grad, self._grad)
+        hess *= f_second
+        if f_prime != 0:
+            hess += f_prime * self._hess
+        return self._make(f, f_prime * self._grad, hess, self._triangle)
+
+    @property
+    def val(self):
+        r"""A method to retrieve the value attribute of HessianNumbers object"""
+        return self._val
+
+    @property
+    def grad(self):
+        r"""A method to retrieve the gradient of HessianNumbers object"""
+        return self._grad
+
+    @property
+    def hess(self):
+        r"""A method to retrieve the packed upper triangle of the Hessian of HessianNumbers object"""
+        return self._hess
+
+    @property
+    def triangle(self):
+        r"""A method to retrieve the layout of the packed upper triangle of HessianNumbers object"""
+        return self._triangle
+
+    def __repr__(self):
+        r"""A method to overload the string representation of HessianNumbers object"""
+        return f'Values: {self._val}, Gradient: {self._grad}, Hessian: {self._hess}'
+
+    # make NumPy arrays defer to the HessianNumbers operators in mixed binary operations
+    __array_priority__ = 1000
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        r"""A method to dispatch NumPy ufuncs such as np.sin or np.add to the HessianNumbers operations"""
+        if method != '__call__' or kwargs:
+            return NotImplemented
+        # unary ufuncs map to the elementary functions
+        if ufunc in _UFUNC_METHODS:
+            return _UFUNC_METHODS[ufunc](inputs[0])
+        if ufunc not in _UFUNC_OPERATORS:
+            return NotImplemented
+        left, right = inputs
+        name, reflected_name = _UFUNC_OPERATORS[ufunc]
+        if isinstance(left, HessianNumbers):
+            return getattr(left, name)(right)
+        return getattr(right, reflected_name)(left)
+
+    def __add__(self, other):
+        r"""A method to perform addition operation on the HessianNumbers object and the other object"""
+        if isinstance(other, HessianNumbers):
+            return self._make(self._val + other._val, self._grad + other._grad, self._hess + other._hess, self._triangle)
+        if isinstance(other, _SCALAR_TYPES):
+            return self._make(self._val + other, self._grad, self._hess, self._triangle)
+        return NotImplemented
+
+    def __radd__(self, other):
+        r"""A method to perform the reverse addition operation on the HessianNumbers object and the other object"""
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        r"""A method to perform subtraction operation on the HessianNumbers object and the other object"""
+        if isinstance(other, HessianNumbers):
+            return self._make(self._val - other._val, self._grad - other._grad, self._hess - other._hess, self._triangle)
+        if isinstance(other, _SCALAR_TYPES):
+            return self._make(self._val - other, self._grad, self._hess, self._triangle)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        r"""A method to perform the reverse subtraction operation on the HessianNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            return self._make(other - self._val, -self._grad, -self._hess, self._triangle)
+        return NotImplemented
+
+    def __mul__(self, other):
+        r"""A method to perform multiplication operation on the HessianNumbers object and the other object"""
+        if isinstance(other, HessianNumbers):
+            # the product rule adds both orders of the outer product of the gradients
+            hess = self._outer(self._grad, other._grad)
+            hess += self._outer(other._grad, self._grad)
+            hess += self._val * other._hess
+            hess += other._val * self._hess
+            return self._make(self._val * other._val, self._val * other._grad + other._val * self._grad, hess,
+                              self._triangle)
+        if isinstance(other, _SCALAR_TYPES):
+            return self._make(self._val * other, self._grad * other, self._hess * other, self._triangle)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        r"""A method to perform the reverse multiplication operation on the HessianNumbers object and the other object"""
+        return self.__mul__(other)
+
+    def _reciprocal(self):
+        r"""An internal method to compute the reciprocal with its first and second derivatives"""
+        self._check_domain(self._val == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+        inverse = 1 / self._val
+        return self._chain(inverse, -inverse ** 2, 2 * inverse ** 3)
+
+    def __truediv__(self, other):
+        r"""A method to perform division operation on the HessianNumbers object and the other object
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+        """
+        if isinstance(other, HessianNumbers):
+            return self * other._reciprocal()
+        if isinstance(other, _SCALAR_TYPES):
+            self._check_domain(other == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+            return self * (1 / other)
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        r"""A method to perform the reverse division operation on the HessianNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            return self._reciprocal() * other
+        return NotImplemented
+
+    def __pow__(self, other):
+        r"""A method to perform power operation on the HessianNumbers object and the other object
+
+        Raises
+        ------
+        ValueError
+            If negative number is raised to a fraction power with an even denominator
+            If the power is less than 1 and differentiation occurs at 0
+            If the power is less than 2 and second order differentiation occurs at 0
+        """
+        if isinstance(other, HessianNumbers):
+            # avoid raising a negative number to a fraction power with an even denominator
+            self._check_domain((self._val < 0) and (other._val % 1 != 0),
+                               "Error: Attempted to raise a negative number to a fraction power with even denominator")
+            # avoid having a 0 derivative when the power is less than 1
+            self._check_domain((self._val == 0) and (other._val < 1),
+                               "Error: Attempted to find derivative at 0 when the power is less than 1")
+            # x ** y = exp(y log(x)) carries the mixed second derivatives of both operands
+            return (other * self.log()).exp()
+        if not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
+
+        # an integer power of at least 2 is defined everywhere and is computed by repeated multiplication
+        if _is_integer(other) and other >= 2:
+            f_second = other * (other - 1) * (_int_power(self._val, other - 2) if other > 2 else 1.)
+            return self._chain(_int_power(self._val, other), other * _int_power(self._val, other - 1), f_second)
+
+        # avoid raising a negative number to a fraction power with an even denominator
+        self._check_domain((self._val < 0) and (other % 1 != 0),
+                           "Error: Attempted to raise a negative number to a fraction power with even denominator")
+        # avoid having a 0 derivative when the power is less than 1
+        self._check_domain((self._val == 0) and (other < 1),
+                           "Error: Attempted to find derivative at 0 when power is less than 1")
+        # the second derivative of x ** p is unbounded at 0 for 1 < p < 2
+        self._check_domain((self._val == 0) and (other < 2) and (other != 1),
+                           "Error: Attempted to find second derivative at 0 when power is less than 2")
+        f_second = 0. if other == 1 else other * (other - 1) * self._val ** (other - 2)
+        return self._chain(self._val ** other, other * self._val ** (other - 1), f_second)
+
+    def __rpow__(self, other):
+        r"""A method to perform the reverse power operation on the HessianNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            f = other ** self._val
+            log_other = np.log(other)
+            return self._chain(f, f * log_other, f * log_other ** 2)
+        return NotImplemented
+
+    def __neg__(self):
+        r"""A method to perform the negation operation on the HessianNumbers object"""
+        return self._make(-self._val, -self._grad, -self._hess, self._triangle)
+
+    def sqrt(self):
+        r"""method to compute the value and derivatives of the square root function"""
+        return self.__pow__(0.5)
+
+    def log(self, base=None):
+        r"""method to compute the value and derivatives of the logarithm with the natural base or the given base
+
+        Raises
+        ------
+        ValueError
+            If self.val is less than or equal to zero
+            If input base is less than or equal to zero or equal to one
+        """
+        self._check_domain(self._val <= 0, "ERROR: Value for log should be greater than 0")
+        if base is None:
+            scale = 1.
+        elif base <= 0 or base == 1:
+            raise ValueError("ERROR: LOG base should be greater than 0 and not equal to 1")
+        else:
+            scale = 1 / math.log(base)
+        return self._chain(math.log(self._val) * scale, scale / self._val, -scale / self._val ** 2)
+
+    def exp(self):
+        r"""method to compute the value and derivatives of the exponential function"""
+        # NumPy returns inf instead of raising an error when the value overflows
+        f = float(np.exp(self._val))
+        return self._chain(f, f, f)
+
+    def sin(self):
+        r"""method to compute the value and derivatives of the sine function"""
+        sin, cos = math.sin(self._val), math.cos(self._val)
+        return self._chain(sin, cos, -sin)
+
+    def cos(self):
+        r"""method to compute the value and derivatives of the cosine function"""
+        sin, cos = math.sin(self._val), math.cos(self._val)
+        return self._chain(cos, -sin, -cos)
+
+    def sincos(self):
+        r"""method to compute the values and derivatives of the sine and cosine functions together"""
+        sin, cos = math.sin(self._val), math.cos(self._val)
+        return self._chain(sin, cos, -sin), self._chain(cos, -sin, -cos)
+
+    def tan(self):
+        r"""method to compute the value and derivatives of the tangent function
+
+        Raises
+        ------
+        ValueError if the input is an odd multiple of pi/2
+        """
+        self._check_domain((self._val / (np.pi / 2)) % 2 == 1, "ERROR: Input to tan should not be an odd mutiple of pi/2")
+        tan = math.tan(self._val)
+        sec2 = 1 + tan * tan
+        return self._chain(tan, sec2, 2 * tan * sec2)
+
+    def sinh(self):
+        r"""method to compute the value and derivatives of the hyperbolic sine function"""
+        sinh, cosh = float(np.sinh(self._val)), float(np.cosh(self._val))
+        return self._chain(sinh, cosh, sinh)
+
+    def cosh(self):
+        r"""method to compute the value and derivatives of the hyperbolic cosine function"""
+        sinh, cosh = float(np.sinh(self._val)), float(np.cosh(self._val))
+        return self._chain(cosh, sinh, cosh)
+
+    def tanh(self):
+        r"""method to compute the value and derivatives of the hyperbolic tangent function"""
+        tanh = math.tanh(self._val)
+        sech2 = 1 - tanh * tanh
+        return self._chain(tanh, sech2, -2 * tanh * sech2)
+
+    def arcsin(self):
+        r"""method to compute the value and derivatives of the inverse sine function
+
+        Raises
+        ------
+        ValueError if the input is not strictly between -1 and 1
+        """
+        self._check_domain((self._val <= -1) or (self._val >= 1), "ERROR: Input to arcsin() should be between -1 and 1")
+        f_prime = 1 / math.sqrt(1 - self._val ** 2)
+        return self._chain(math.asin(self._val), f_prime, self._val * f_prime ** 3)
+
+    def arccos(self):
+        r"""method to compute the value and derivatives of the inverse cosine function
+
+        Raises
+        ------
+        ValueError if the input is not strictly between -1 and 1
+        """
+        self._check_domain((self._val <= -1) or (self._val >= 1), "ERROR: Input to arccos() should be between -1 and 1")
+        f_prime = 1 / math.sqrt(1 - self._val ** 2)
+        return self._chain(math.acos(self._val), -f_prime, -self._val * f_prime ** 3)
+
+    def arctan(self):
+        r"""method to compute the value and derivatives of the inverse tangent function"""
+        f_prime = 1 / (1 + self._val ** 2)
+        return self._chain(math.atan(self._val), f_prime, -2 * self._val * f_prime ** 2)
+
+    def logistic(self):
+        r"""method to compute the value and derivatives of the logistic function 1 / (1 + exp(-x))"""
+        f, f_prime, _ = _logistic_kernel(self._val)
+        f, f_prime = float(f), float(f_prime)
+        return self._chain(f, f_prime, f_prime * (1 - 2 * f))
+
+    def softplus(self):
+        r"""method to compute the value and derivatives of the softplus function log(1 + exp(x))"""
+        f_prime, f_second, e = _logistic_kernel(self._val)
+        f = float(np.maximum(self._val, 0) + np.log1p(e))
+        return self._chain(f, float(f_prime), float(f_second))
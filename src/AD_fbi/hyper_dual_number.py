@@ -0,0 +1,591 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: hyper_dual_number.py                                                    #
+# Description: This class defines the hyper-dual number object to be used in    #
+# second order forward mode automatic differentiation. A hyper-dual number      #
+# a + b e1 + c e2 + d e1e2 with e1**2 = e2**2 = 0 carries the value, the        #
+# derivatives along two directions v and w, and the second derivative v^T H w,  #
+# so one evaluation gives exact first and second directional derivatives.       #
+#################################################################################
+
+import numpy as np
+from .dual_number import is_numeric, _logistic_kernel
+
+
+class HyperDualNumbers:
+    r"""A class representing a variable object to be used in second order automatic differentiation
+
+    The class contains the same elementary operations and functions as DualNumbers. Every
+    elementary function g is applied with the second order chain rule
+
+        g(x) = g(a) + g'(a) b e1 + g'(a) c e2 + (g'(a) d + g''(a) b c) e1e2
+
+    Instance Variables
+    ----------
+    val: value of the HyperDualNumbers object
+    derv1: derivative(s) along the first direction v
+    derv2: derivative(s) along the second direction w
+    derv12: second derivative(s) v^T H w
+
+    Returns
+    -------
+    A HyperDualNumbers object that contains the value, the two directional derivatives and the second derivative
+
+    Examples
+    --------
+    >>> x = HyperDualNumbers(2., 1.)
+    >>> print(x ** 3)
+    Values: 8.0, Derivatives: 12.0, 12.0, Second Derivatives: 12.0
+    """
+
+    # store the value and derivatives in fixed slots instead of a per-object __dict__
+    __slots__ = ('_val', '_derv1', '_derv2', '_derv12')
+
+    def __init__(self, val, derv1, derv2=None, derv12=0):
+        r"""A constructor to create HyperDualNumbers object with a value, two directional derivatives and a second derivative
+
+        Parameters
+        ----------
+        val: integer or float object that represents the value of HyperDualNumbers object
+        derv1: integer or float object, or a 1D array of them, with the seed of the first direction
+        derv2: integer or float object, or a 1D array of them, with the seed of the second direction
+               (default None, which uses the first direction)
+        derv12: integer or float object, or a 1D array of them, with the seed of the second derivative (default 0)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError
+            If the value is not an int or float or a derivative is not an int, float or 1D array of them
+        """
+        if not is_numeric(val):
+            raise TypeError('Error: Input value should be an int or float')
+        self._val = val
+        self._derv1 = self._check_derivative(derv1)
+        self._derv2 = self._derv1 if derv2 is None else self._check_derivative(derv2)
+        self._derv12 = self._check_derivative(derv12)
+
+    @staticmethod
+    def _check_derivative(derv):
+        r"""An internal method to validate a derivative seed and convert a 1D array of them to floats"""
+        # in the case of a 1D array of derivatives, convert every element to a float
+        if isinstance(derv, np.ndarray) and derv.ndim == 1:
+            try:
+                return derv.astype(float)
+            except ValueError:
+                raise TypeError('Error: Input value should be an int or float')
+        if np.isscalar(derv) and is_numeric(derv):
+            return derv
+        raise TypeError('Error: Input value must be an array of ints/floats or be a scalar int/float')
+
+    @classmethod
+    def _make(cls, val, derv1, derv2, derv12):
+        r"""An internal constructor that creates a HyperDualNumbers object without validating its inputs"""
+        obj = object.__new__(cls)
+        obj._val = val
+        obj._derv1 = derv1
+        obj._derv2 = derv2
+        obj._derv12 = derv12
+        return obj
+
+    @staticmethod
+    def _check_domain(invalid, message, error=ValueError):
+        r"""An internal method to raise an error when an operation is evaluated outside of its domain
+
+        Parameters
+        ----------
+        invalid: boolean object or array that is True where the input is outside of the domain of the operation
+        message: string object with the error message
+        error: the exception class to raise (default ValueError)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        error if invalid is True anywhere
+        """
+        if np.any(invalid):
+            raise error(message)
+
+    def _chain(self, f, f_prime, f_second):
+        r"""An internal method to apply the second order chain rule of an elementary function
+
+        Parameters
+        ----------
+        f: the value of the elementary function at the value of the object
+        f_prime: the first derivative of the elementary function at the value of the object
+        f_second: the second derivative of the elementary function at the value of the object
+
+        Returns
+        -------
+        A HyperDualNumbers object with the value and derivatives of the composition
+
+        Examples
+        --------
+        >>> x = HyperDualNumbers(1., 2., 3.)
+        >>> print(x._chain(5., 1., 1.))
+        Values: 5.0, Derivatives: 2.0, 3.0, Second Derivatives: 6.0
+        """
+        return self._make(f, f_prime * self._derv1, f_prime * self._derv2,
+                          f_prime * self._derv12 + f_second * self._derv1 * self._derv2)
+
+    @property
+    def val(self):
+        r"""A method to retrieve the value attribute of HyperDualNumbers object"""
+        return self._val
+
+    @property
+    def derv1(self):
+        r"""A method to retrieve the derivative along the first direction of HyperDualNumbers object"""
+        return self._derv1
+
+    @property
+    def derv2(self):
+        r"""A method to retrieve the derivative along the second direction of HyperDualNumbers object"""
+        return self._derv2
+
+    @property
+    def derv12(self):
+        r"""A method to retrieve the second derivative v^T H w of HyperDualNumbers object"""
+        return self._derv12
+
+    def __repr__(self):
+        r"""A method to overload the string representation for HyperDualNumbers object
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(1, 2))
+        Values: 1, Derivatives: 2, 2, Second Derivatives: 0
+        """
+        return f'Values: {self._val}, Derivatives: {self._derv1}, {self._derv2}, Second Derivatives: {self._derv12}'
+
+    # make NumPy arrays defer to the HyperDualNumbers operators in mixed binary operations
+    __array_priority__ = 1000
+
+    def __add__(self, other):
+        r"""A method to perform addition operation on the HyperDualNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or HyperDualNumbers object
+
+        Returns
+        -------
+        A HyperDualNumbers object as the result of the addition operation
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(1, 2) + HyperDualNumbers(2, 1))
+        Values: 3, Derivatives: 3, 3, Second Derivatives: 0
+        """
+        # perform addition if other is a hyper-dual number
+        if isinstance(other, HyperDualNumbers):
+            return self._make(self._val + other._val, self._derv1 + other._derv1,
+                              self._derv2 + other._derv2, self._derv12 + other._derv12)
+        # perform addition if other is a real number
+        return self._make(self._val + other, self._derv1, self._derv2, self._derv12)
+
+    def __radd__(self, other):
+        r"""A method to perform the reverse addition operation on the HyperDualNumbers object and the other object"""
+        return self + other
+
+    def __sub__(self, other):
+        r"""A method to perform subtraction operation on the HyperDualNumbers object and the other object
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(1, 2) - 1)
+        Values: 0, Derivatives: 2, 2, Second Derivatives: 0
+        """
+        return self + (-other)
+
+    def __rsub__(self, other):
+        r"""A method to perform the reverse subtraction operation on the HyperDualNumbers object and the other object"""
+        return (-self) + other
+
+    def __mul__(self, other):
+        r"""A method to perform multiplication operation on the HyperDualNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or HyperDualNumbers object
+
+        Returns
+        -------
+        A HyperDualNumbers object as the result of the multiplication operation
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(2, 1, 0) * HyperDualNumbers(3, 0, 1))
+        Values: 6, Derivatives: 3, 2, Second Derivatives: 1
+        """
+        # perform multiplication if other is a hyper-dual number
+        if isinstance(other, HyperDualNumbers):
+            return self._make(self._val * other._val,
+                              self._derv1 * other._val + self._val * other._derv1,
+                              self._derv2 * other._val + self._val * other._derv2,
+                              self._derv12 * other._val + self._derv1 * other._derv2 +
+                              self._derv2 * other._derv1 + self._val * other._derv12)
+        # perform multiplication if other is a real number
+        return self._make(self._val * other, self._derv1 * other, self._derv2 * other, self._derv12 * other)
+
+    def __rmul__(self, other):
+        r"""A method to perform the reverse multiplication operation on the HyperDualNumbers object and the other object"""
+        return self * other
+
+    def _reciprocal(self):
+        r"""An internal method to compute 1 / x of the HyperDualNumbers object"""
+        self._check_domain(self._val == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+        inverse = 1 / self._val
+        return self._chain(inverse, -inverse ** 2, 2 * inverse ** 3)
+
+    def __truediv__(self, other):
+        r"""A method to perform division operation on the HyperDualNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or HyperDualNumbers object
+
+        Returns
+        -------
+        A HyperDualNumbers object as the result of the division operation
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(1., 1.) / HyperDualNumbers(2., 0.))
+        Values: 0.5, Derivatives: 0.5, 0.5, Second Derivatives: 0.0
+        """
+        # perform division if other is a hyper-dual number
+        if isinstance(other, HyperDualNumbers):
+            return self * other._reciprocal()
+        # perform division if other is a real number
+        self._check_domain(other == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+        return self._make(self._val / other, self._derv1 / other, self._derv2 / other, self._derv12 / other)
+
+    def __rtruediv__(self, other):
+        r"""A method to perform the reverse division operation on the HyperDualNumbers object and the other object
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+
+        Examples
+        --------
+        >>> print(1 / HyperDualNumbers(2., 1.))
+        Values: 0.5, Derivatives: -0.25, -0.25, Second Derivatives: 0.25
+        """
+        return self._reciprocal() * other
+
+    def __pow__(self, other):
+        r"""A method to perform power operation on the HyperDualNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or HyperDualNumbers object
+
+        Returns
+        -------
+        A HyperDualNumbers object as the result of the power operation
+
+        Raises
+        ------
+        ValueError
+            If negative number is raised to a fraction power with an even denominator
+            If the power is less than 1 and differentiation occurs at 0
+            If the power is between 1 and 2 and the second derivative is taken at 0
+            If a non-positive number is raised to a HyperDualNumbers power
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(2., 1.) ** 3)
+        Values: 8.0, Derivatives: 12.0, 12.0, Second Derivatives: 12.0
+
+        >>> print(HyperDualNumbers(0., 1.) ** 0.5)
+        ValueError: Error: Attempted to find derivative at 0 when power is less than 1
+        """
+        # perform power operation if other is a hyper-dual number
+        if isinstance(other, HyperDualNumbers):
+            # avoid raising a negative number to a fraction power with an even denominator
+            self._check_domain((self._val < 0) & (other._val % 1 != 0),
+                               "Error: Attempted to raise a negative number to a fraction power with even denominator")
+            # avoid having a 0 derivative when the power is less than 1
+            self._check_domain((self._val == 0) & (other._val < 1),
+                               "Error: Attempted to find derivative at 0 when the power is less than 1")
+            # x ** y = exp(y log(x)) carries the mixed second derivatives of both operands
+            return (other * self.log()).exp()
+
+        # perform power operation if other is a real number
+        # avoid raising a negative number to a fraction power with an even denominator
+        self._check_domain((self._val < 0) & (other % 1 != 0),
+                           "Error: Attempted to raise a negative number to a fraction power with even denominator")
+        # avoid having a 0 derivative when the power is less than 1
+        self._check_domain((self._val == 0) & (other < 1),
+                           "Error: Attempted to find derivative at 0 when power is less than 1")
+        # the second derivative of x ** p is unbounded at 0 for 1 < p < 2
+        self._check_domain((self._val == 0) & (other < 2) & (other != 1),
+                           "Error: Attempted to find second derivative at 0 when power is less than 2")
+
+        f = self._val ** other
+        f_prime = other * self._val ** (other - 1)
+        # the second derivative of x ** 1 vanishes and would otherwise evaluate 0 * x ** -1
+        f_second = 0 * self._val if other == 1 else other * (other - 1) * self._val ** (other - 2)
+        return self._chain(f, f_prime, f_second)
+
+    def __rpow__(self, other):
+        r"""A method to perform the reverse power operation on the HyperDualNumbers object and the other object
+
+        Examples
+        --------
+        >>> print(2 ** HyperDualNumbers(1., 1.))
+        Values: 2.0, Derivatives: 1.3862943611198906, 1.3862943611198906, Second Derivatives: 0.9609060278364028
+        """
+        f = other ** self._val
+        log_other = np.log(other)
+        return self._chain(f, f * log_other, f * log_other ** 2)
+
+    def __neg__(self):
+        r"""A method to perform the negation operation on the HyperDualNumbers object"""
+        return self._make(-1 * self._val, -1 * self._derv1, -1 * self._derv2, -1 * self._derv12)
+
+    def __eq__(self, other):
+        r"""A method to check whether the HyperDualNumbers objects are equal to each other
+
+        Returns
+        -------
+        A tuple of boolean variables that indicate whether the values, the derivatives along the first and
+        second direction, and the second derivatives are equal
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(1, 2) == HyperDualNumbers(1, 2, 1))
+        (True, True, False, True)
+        """
+        return (bool(np.all(self._val == other._val)), bool(np.all(self._derv1 == other._derv1)),
+                bool(np.all(self._derv2 == other._derv2)), bool(np.all(self._derv12 == other._derv12)))
+
+    def __ne__(self, other):
+        r"""A method to check whether the HyperDualNumbers objects are not equal to each other
+
+        Returns
+        -------
+        A tuple of boolean variables that indicate whether the values, the derivatives along the first and
+        second direction, and the second derivatives are not equal
+        """
+        return (bool(np.all(self._val != other._val)), bool(np.all(self._derv1 != other._derv1)),
+                bool(np.all(self._derv2 != other._derv2)), bool(np.all(self._derv12 != other._derv12)))
+
+    def sqrt(self):
+        """
+        method to compute the value and derivatives of the square root function of the HyperDualNumbers objects
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(4., 1.).sqrt())
+        Values: 2.0, Derivatives: 0.25, 0.25, Second Derivatives: -0.03125
+        """
+        return self.__pow__(0.5)
+
+    def log(self, base=None):
+        """
+        method to compute the value and derivatives of the logarithm of the HyperDualNumbers objects
+
+        Parameters
+        ----------
+        base: A float object that represents the base of the logarithm (default logarithmic base is None)
+
+        Raises
+        ------
+        ValueError
+            If self.val is less than or equal to zero
+            If input base is less than or equal to zero
+            If input base is equal to one
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(1., 1.).log())
+        Values: 0.0, Derivatives: 1.0, 1.0, Second Derivatives: -1.0
+        """
+        # ensure the value is greater than zero so that log is correctly defined
+        self._check_domain(self._val <= 0, "ERROR: Value for log should be greater than 0")
+        if base is None:
+            scale = 1
+        # ensure the user specifies a valid base before computing the log value and derivatives
+        elif base <= 0 or base == 1:
+            raise ValueError("ERROR: LOG base should be greater than 0 and not equal to 1")
+        else:
+            scale = 1 / np.log(base)
+        return self._chain(np.log(self._val) * scale, scale / self._val, -scale / self._val ** 2)
+
+    def exp(self):
+        """
+        method to compute the value and derivatives of the exponential function
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).exp())
+        Values: 1.0, Derivatives: 1.0, 1.0, Second Derivatives: 1.0
+        """
+        f = np.exp(self._val)
+        return self._chain(f, f, f)
+
+    def sin(self):
+        """
+        method to compute the value and derivatives of the sine function
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).sin())
+        Values: 0.0, Derivatives: 1.0, 1.0, Second Derivatives: 0.0
+        """
+        sin, cos = np.sin(self._val), np.cos(self._val)
+        return self._chain(sin, cos, -sin)
+
+    def cos(self):
+        """
+        method to compute the value and derivatives of the cosine function
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).cos())
+        Values: 1.0, Derivatives: -0.0, -0.0, Second Derivatives: -1.0
+        """
+        sin, cos = np.sin(self._val), np.cos(self._val)
+        return self._chain(cos, -sin, -cos)
+
+    def tan(self):
+        """
+        method to compute the value and derivatives of the tangent function
+
+        Raises
+        ------
+        ValueError if input is an odd multiple of pi/2
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).tan())
+        Values: 0.0, Derivatives: 1.0, 1.0, Second Derivatives: 0.0
+        """
+        # ensure the user does not input an odd multiple of pi divided by 2
+        self._check_domain((self._val / (np.pi / 2)) % 2 == 1, "ERROR: Input to tan should not be an odd mutiple of pi/2")
+        tan = np.tan(self._val)
+        sec2 = 1 + tan ** 2
+        return self._chain(tan, sec2, 2 * tan * sec2)
+
+    def sinh(self):
+        """
+        method to compute the value and derivatives of the hyperbolic sine function
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).sinh())
+        Values: 0.0, Derivatives: 1.0, 1.0, Second Derivatives: 0.0
+        """
+        sinh = np.sinh(self._val)
+        return self._chain(sinh, np.cosh(self._val), sinh)
+
+    def cosh(self):
+        """
+        method to compute the value and derivatives of the hyperbolic cosine function
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).cosh())
+        Values: 1.0, Derivatives: 0.0, 0.0, Second Derivatives: 1.0
+        """
+        cosh = np.cosh(self._val)
+        return self._chain(cosh, np.sinh(self._val), cosh)
+
+    def tanh(self):
+        """
+        method to compute the value and derivatives of the hyperbolic tangent function
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).tanh())
+        Values: 0.0, Derivatives: 1.0, 1.0, Second Derivatives: 0.0
+        """
+        tanh = np.tanh(self._val)
+        sech2 = 1 - tanh ** 2
+        return self._chain(tanh, sech2, -2 * tanh * sech2)
+
+    def arcsin(self):
+        """
+        method to compute the value and derivatives of the inverse sine function
+
+        Raises
+        ------
+        ValueError if input is not contained within the interval [-1,1]
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).arcsin())
+        Values: 0.0, Derivatives: 1.0, 1.0, Second Derivatives: 0.0
+        """
+        # ensure the user passes in an input between -1 and 1
+        self._check_domain((self._val <= -1) | (self._val >= 1), "ERROR: Input to arcsin() should be between -1 and 1")
+        f_prime = 1 / (1 - self._val ** 2) ** 0.5
+        return self._chain(np.arcsin(self._val), f_prime, self._val * f_prime ** 3)
+
+    def arccos(self):
+        """
+        method to compute the value and derivatives of the inverse cosine function
+
+        Raises
+        ------
+        ValueError if input is not contained within the interval [-1,1]
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).arccos())
+        Values: 1.5707963267948966, Derivatives: -1.0, -1.0, Second Derivatives: -0.0
+        """
+        # ensure the user passes in an input between -1 and 1
+        self._check_domain((self._val <= -1) | (self._val >= 1), "ERROR: Input to arccos() should be between -1 and 1")
+        f_prime = 1 / (1 - self._val ** 2) ** 0.5
+        return self._chain(np.arccos(self._val), -f_prime, -self._val * f_prime ** 3)
+
+    def arctan(self):
+        """
+        method to compute the value and derivatives of the inverse tangent function
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(1., 1.).arctan())
+        Values: 0.7853981633974483, Derivatives: 0.5, 0.5, Second Derivatives: -0.5
+        """
+        f_prime = 1 / (1 + self._val ** 2)
+        return self._chain(np.arctan(self._val), f_prime, -2 * self._val * f_prime ** 2)
+
+    def logistic(self):
+        """
+        method to compute the value and derivatives of the logistic function
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).logistic())
+        Values: 0.5, Derivatives: 0.25, 0.25, Second Derivatives: 0.0
+        """
+        f, f_prime, _ = _logistic_kernel(self._val)
+        return self._chain(f, f_prime, f_prime * (1 - 2 * f))
+
+    def softplus(self):
+        """
+        method to compute the value and derivatives of the softplus function log(1 + exp(x))
+
+        Examples
+        --------
+        >>> print(HyperDualNumbers(0., 1.).softplus())
+        Values: 0.6931471805599453, Derivatives: 0.5, 0.5, Second Derivatives: 0.25
+        """
+        # the derivatives of softplus are the logistic function and its derivative
+        f_prime, f_second, e = _logistic_kernel(self._val)
+        return self._chain(np.maximum(self._val, 0) + np.log1p(e), f_prime, f_second)
@@ -8,7 +8,7 @@
 #################################################################################
 
 import numpy as np
-from .forward_mode import ForwardMode
+from .forward_plan import ForwardPlan
 import time
 
 class Optimizer:
@@ -39,7 +39,7 @@ class Optimizer:
     
     """
     @staticmethod
-    def momentum(x, fx, num_iter = 10000, alpha=0.01, beta=.9, verbose = False):
+    def momentum(x, fx, num_iter = 10000, alpha=0.01, beta=.9, verbose = False, cache = None):
         """
         Parameters
         ----------
@@ -49,6 +49,7 @@ class Optimizer:
         alpha: learning rate for the gradiant descent (default 0.01)
         beta: exponential decay rate (default 0.9)
         verbose: if verbose = True, output the intermediary positions (vals) and values (currvals) for every iteration, if verbose = False, only output the final results (default False)
+        cache: an EvaluationCache object that reuses the value and derivative at points evaluated before, e.g. across restarts (default None)
 
         Returns
         -------
@@ -94,8 +95,9 @@ class Optimizer:
         # decay rate must be great than or equal to 0 and less than 1
         if 0 <= beta < 1 and 0 < alpha < 1:
             mt, curr_val = 0, x
-            fm = ForwardMode(x, fx)
-            val, x_der = fm.get_fx_value(), fm.get_derivative()
+            # build the seed vectors and derivative buffers once for every iteration
+            plan = ForwardPlan(fx, np.size(x), cache=cache)
+            val, x_der = plan.evaluate(x)
             vals.append(val)
             currvals.append(curr_val)
             # perform momentum optimization for the number of iterations specified
@@ -108,8 +110,7 @@ class Optimizer:
                 curr_val = curr_val - variation
                 
                 # recalculate the function value and derivative at the updated value
-                fm = ForwardMode(curr_val, fx)
-                val, x_der = fm.get_fx_value(), fm.get_derivative()
+                val, x_der = plan.evaluate(curr_val)
                 # store val and curr_val
                 vals.append(val)
                 currvals.append(curr_val)
@@ -131,7 +132,7 @@ class Optimizer:
     
     
     @staticmethod
-    def gradient_descent(x, fx, num_iter = 10000, alpha=0.001, verbose = False):
+    def gradient_descent(x, fx, num_iter = 10000, alpha=0.001, verbose = False, cache = None):
         """
         Parameters
         ----------
@@ -140,6 +141,7 @@ class Optimizer:
         num_iter: the number of interations to perform (default 10,000)
         alpha: learning rate for the gradiant descent (default 0.001)
         verbose: if verbose = True, output the intermediary positions (vals) and values (currvals) for every iteration, if verbose = False, only output the final results (default False)
+        cache: an EvaluationCache object that reuses the value and derivative at points evaluated before, e.g. across restarts (default None)
 
 
         Returns
@@ -188,8 +190,9 @@ class Optimizer:
         # learning rate value must be great than or equal to 0 and less than 1
         if 0 < alpha < 1:
             curr_val = x
-            fm = ForwardMode(x, fx)
-            val, x_der = fm.get_fx_value(), fm.get_derivative()
+            # build the seed vectors and derivative buffers once for every iteration
+            plan = ForwardPlan(fx, np.size(x), cache=cache)
+            val, x_der = plan.evaluate(x)
             vals.append(val)
             currvals.append(curr_val)
             # perform gradient descent for the number of iterations specified
@@ -199,8 +202,7 @@ class Optimizer:
                 
                 curr_val = curr_val - variation
                 # recalculate the function value and derivative at the updated value
-                fm = ForwardMode(curr_val, fx)
-                val, x_der = fm.get_fx_value(), fm.get_derivative()
+                val, x_der = plan.evaluate(curr_val)
                 # store val and curr_val
                 vals.append(val)
                 currvals.append(curr_val)
@@ -220,7 +222,7 @@ class Optimizer:
 
     
     @staticmethod
-    def ADAGRAD(x, fx, num_iter=10000, alpha=0.01, epsilon=1e-8, verbose=False):
+    def ADAGRAD(x, fx, num_iter=10000, alpha=0.01, epsilon=1e-8, verbose=False, cache=None):
         """
         Parameters
         ----------
@@ -230,6 +232,7 @@ class Optimizer:
         alpha: Learning rate for the gradiant descent (default 0.01)
         epsilon: Denominator value to assure that ZeroDivisionError is not raised (default 1e-8)
         verbose: Boolean to whether return the full trace of result at each step. Default to False.
+        cache: An EvaluationCache object that reuses the value and derivative at points evaluated before, e.g. across restarts (default None)
         
         Returns
         -------
@@ -271,8 +274,9 @@ class Optimizer:
         # learning rate value must be great than 0 and less or equal to 1
         if 0 < alpha <=1:
             x_val = x
-            fm = ForwardMode(x, fx)
-            fx_val, x_der = fm.get_fx_value(), fm.get_derivative()
+            # build the seed vectors and derivative buffers once for every iteration
+            plan = ForwardPlan(fx, np.size(x), cache=cache)
+            fx_val, x_der = plan.evaluate(x)
             fx_vals.append(fx_val)
             x_vals.append(x)
             G = x_der**2
@@ -282,8 +286,7 @@ class Optimizer:
                 variation = alpha / np.sqrt(G+epsilon) * x_der
                 x_val = x_val - variation
                 # recalculate the function value and derivative at the updated value
-                fm = ForwardMode(x_val, fx)
-                fx_val, x_der = fm.get_fx_value(), fm.get_derivative()
+                fx_val, x_der = plan.evaluate(x_val)
                 fx_vals.append(fx_val)
                 x_vals.append(x_val)
                 G = G + x_der**2
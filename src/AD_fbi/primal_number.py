@@ -0,0 +1,155 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: primal_number.py                                                        #
+# Description: This class defines a value-only dual number object, used to      #
+# evaluate a function written for DualNumbers without propagating derivatives, #
+# e.g. for the function values of line searches, logging and traces.            #
+#################################################################################
+
+import numpy as np
+from .dual_number import DualNumbers, is_numeric, _SCALAR_TYPES, _is_integer, _int_power
+
+
+class PrimalNumbers(DualNumbers):
+    r"""A class representing a variable object that only carries the value of a function
+
+    PrimalNumbers objects have every operator and elementary function of DualNumbers, with the same
+    domain checks and errors, but their derivative is the constant 0 instead of a seeded vector. The
+    most frequent operations are overridden to skip the derivative rules, and the other operations
+    fall back to the DualNumbers rules with a scalar derivative, which costs no more than the value.
+
+    Instance Variables
+    ----------
+    val: value of the PrimalNumbers object
+    derv: derivative of the PrimalNumbers object, which is always 0
+
+    Examples
+    --------
+    >>> x = PrimalNumbers(2.)
+    >>> print(x.exp() * x ** 2)
+    Values: 29.5562243957226, Derivatives: 0.0
+    """
+
+    __slots__ = ()
+
+    def __init__(self, val, dtype=None):
+        r"""A constructor to create PrimalNumbers object with a value
+
+        Parameters
+        ----------
+        val: integer or float object that represents the value of PrimalNumbers object
+        dtype: the floating point dtype of the value (default None, which keeps the value as it is)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError if the value is not an int or float
+        """
+        if not is_numeric(val):
+            raise TypeError('Error: Input value should be an int or float')
+        self._val = val if dtype is None else self._cast(val, dtype)
+        self._derv = 0.
+
+    @classmethod
+    def _make(cls, val, derv=0.):
+        r"""An internal constructor that creates a PrimalNumbers object, dropping the derivative"""
+        obj = object.__new__(cls)
+        obj._val = val
+        obj._derv = 0.
+        return obj
+
+    def __add__(self, other):
+        r"""A method to perform the addition operation on the value of the PrimalNumbers object"""
+        if isinstance(other, DualNumbers):
+            return self._make(self._val + other._val)
+        return self._make(self._val + other)
+
+    def __radd__(self, other):
+        r"""A method to perform the reverse addition operation on the value of the PrimalNumbers object"""
+        return self._make(other + self._val)
+
+    def __sub__(self, other):
+        r"""A method to perform the subtraction operation on the value of the PrimalNumbers object"""
+        if isinstance(other, DualNumbers):
+            return self._make(self._val - other._val)
+        return self._make(self._val - other)
+
+    def __rsub__(self, other):
+        r"""A method to perform the reverse subtraction operation on the value of the PrimalNumbers object"""
+        return self._make(other - self._val)
+
+    def __mul__(self, other):
+        r"""A method to perform the multiplication operation on the value of the PrimalNumbers object"""
+        if isinstance(other, DualNumbers):
+            return self._make(self._val * other._val)
+        return self._make(self._val * other)
+
+    def __rmul__(self, other):
+        r"""A method to perform the reverse multiplication operation on the value of the PrimalNumbers object"""
+        return self._make(other * self._val)
+
+    def __truediv__(self, other):
+        r"""A method to perform the division operation on the value of the PrimalNumbers object"""
+        # a nonzero denominator needs no domain check
+        denominator = other._val if isinstance(other, DualNumbers) else other
+        if isinstance(denominator, _SCALAR_TYPES) and denominator != 0:
+            return self._make(self._val / denominator)
+        return DualNumbers.__truediv__(self, other)
+
+    def __rtruediv__(self, other):
+        r"""A method to perform the reverse division operation on the value of the PrimalNumbers object"""
+        if isinstance(self._val, _SCALAR_TYPES) and self._val != 0:
+            return self._make(other / self._val)
+        return DualNumbers.__rtruediv__(self, other)
+
+    def __pow__(self, other):
+        r"""A method to perform the power operation on the value of the PrimalNumbers object"""
+        # an integer power of at least 2 is defined everywhere
+        if _is_integer(other) and other >= 2:
+            return self._make(_int_power(self._val, other))
+        return DualNumbers.__pow__(self, other)
+
+    def __neg__(self):
+        r"""A method to perform the negation operation on the value of the PrimalNumbers object"""
+        return self._make(-self._val)
+
+    # a value has no derivative arrays to update in place
+    __iadd__ = __add__
+    __isub__ = __sub__
+    __imul__ = __mul__
+    __itruediv__ = __truediv__
+
+    def exp(self):
+        r"""method to compute the value of the exponential function"""
+        return self._make(np.exp(self._val))
+
+    def sin(self):
+        r"""method to compute the value of the sine function"""
+        return self._make(np.sin(self._val))
+
+    def cos(self):
+        r"""method to compute the value of the cosine function"""
+        return self._make(np.cos(self._val))
+
+    def sincos(self):
+        r"""method to compute the values of the sine and cosine functions together"""
+        return self._make(np.sin(self._val)), self._make(np.cos(self._val))
+
+    def sinh(self):
+        r"""method to compute the value of the hyperbolic sine function"""
+        return self._make(np.sinh(self._val))
+
+    def cosh(self):
+        r"""method to compute the value of the hyperbolic cosine function"""
+        return self._make(np.cosh(self._val))
+
+    def tanh(self):
+        r"""method to compute the value of the hyperbolic tangent function"""
+        return self._make(np.tanh(self._val))
+
+    def arctan(self):
+        r"""method to compute the value of the inverse tangent function"""
+        return self._make(np.arctan(self._val))
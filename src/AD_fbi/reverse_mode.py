@@ -0,0 +1,203 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: reverse_mode.py                                                         #
+# Description: Perform reverse mode automatic differentiation, enabling a user  #
+# to output the function value and the gradient of a scalar function of many   #
+# input variables from one recorded evaluation and one backward sweep, whose    #
+# cost does not grow with the number of input variables.                        #
+#################################################################################
+
+import numpy as np
+from .reverse_number import ReverseNumbers, Tape
+from .forward_mode import ForwardMode, _flatten_outputs
+
+
+class ReverseMode:
+    """
+    A class to perform reverse mode automatic differentiation, enabling a user to output just the
+    function values evaluated at the evaluation point, just the derivative values, or both the
+    function and derivative values in a tuple, in the same format as ForwardMode.
+
+    The input function is evaluated once with ReverseNumbers objects, which record every operation
+    on a tape, and the gradient of every output is accumulated by one backward sweep over the tape.
+    A gradient costs a small multiple of the function evaluation however many input variables
+    there are, while ForwardMode propagates a derivative vector as wide as the number of input
+    variables through every operation. ForwardMode remains the better choice for functions with
+    more outputs than input variables.
+
+    Instance Variables
+    ----------
+    input_values: a scalar or a vector which indicates the evaluation point
+    input_function: a scalar function or a vector of functions
+    seed: a seed vector (optional parameter: default value = 1 or np.ones(len(self.inputs)), which
+          scales the derivative with respect to each input variable like the seed of ForwardMode,
+          or an n x k seed matrix S, with which the derivatives are J S
+
+    Examples
+    --------
+    >>> func = lambda x, y: x * y + y.exp()
+    >>> rm = ReverseMode(np.array([1, 0]), func)
+    >>> rm.get_fx_value()
+    1.0
+    >>> rm.get_derivative()
+    array([0., 2.])
+
+    >>> func = lambda x, y: (x + y, x * y)
+    >>> rm = ReverseMode(np.array([1, 2]), func, [2, -1])
+    >>> rm.calculate_gradient()
+    (array([3., 2.]), array([[ 2., -1.],
+                             [ 4., -1.]]))
+    """
+
+    def __init__(self, input_values, input_function, seed = "default seed"):
+        self.inputs = input_values
+        self.functions = input_function
+
+        # if there is no input value for seed
+        if isinstance(seed, str) and seed == 'default seed':
+            # if the input variable is a scalar
+            if np.isscalar(self.inputs):
+                self.seed = 1
+
+            # if the input variable is an array
+            else:
+                self.seed = np.ones(len(self.inputs))
+
+        # if seed is specified by the user
+        else:
+            self.seed = seed
+
+    def get_fx_value(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        value of the input function at the evaluation point, evaluated without recording a tape
+
+        Examples
+        --------
+        >>> func = lambda x, y: 2*x + y
+        >>> rm = ReverseMode(np.array([1, 1]), func)
+        >>> rm.get_fx_value()
+        3.0
+        """
+
+        return ForwardMode(self.inputs, self.functions).calculate_primal()
+
+    def get_derivative(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the derivative of the input function at the evaluation point, in the format of ForwardMode.get_derivative
+
+        Examples
+        --------
+        >>> func = lambda x, y: 2*x + y
+        >>> rm = ReverseMode(np.array([1, 1]), func, [2, -1])
+        >>> rm.get_derivative()
+        array([ 4., -1.])
+        """
+
+        return self.calculate_gradient()[1]
+
+    def value_and_derivative(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the value and derivative of the input function at the evaluation point from a single evaluation,
+        in the format of calculate_gradient
+        """
+
+        return self.calculate_gradient()
+
+    def record(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the tape of one evaluation of the input function at the evaluation point, whose first nodes are
+        the input variables, and the outputs of the input function
+
+        Raises
+        ------
+        ValueError if the evaluation point is not a scalar or a vector
+
+        Examples
+        --------
+        >>> rm = ReverseMode(np.array([1, 2]), lambda x, y: x * y)
+        >>> tape, z = rm.record()
+        >>> len(tape), z.index
+        (3, 2)
+        """
+
+        inputs = np.atleast_1d(np.asarray(self.inputs, dtype=float))
+        if inputs.ndim != 1:
+            raise ValueError("ERROR: Reverse mode takes a scalar or a vector as the evaluation point.")
+        tape = Tape()
+        return tape, self.functions(*[ReverseNumbers(val, tape) for val in inputs.tolist()])
+
+    def calculate_gradient(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        evaluated value and derivative of the input function at the evaluation point, in the format of
+        ForwardMode.calculate_dual_number. A vector function takes one backward sweep per output
+
+        Raises
+        ------
+        ValueError if the seed vector length mismatchs with the number of input variables
+
+        Examples
+        --------
+        >>> func = lambda x: x.sin() * x
+        >>> rm = ReverseMode(0, func, -1)
+        >>> rm.calculate_gradient()
+        (0.0, -0.0)
+        """
+
+        tape, z = self.record()
+        input_num = np.size(self.inputs)
+        if np.ndim(self.seed) and len(self.seed) != input_num:
+            raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+
+        if isinstance(z, ReverseNumbers) or np.isscalar(z):
+            # input function is a scalar function, and a constant output has no derivatives
+            outputs, shape = [z], ()
+        else:
+            # input function is an array function, whose outputs can be nested lists
+            shape, outputs = _flatten_outputs(z)
+
+        func_val = np.array([funct.val if isinstance(funct, ReverseNumbers) else funct for funct in outputs],
+                            dtype=float).reshape(shape)
+        nodes = [i for i, funct in enumerate(outputs) if isinstance(funct, ReverseNumbers)]
+        jacobian = np.zeros((len(outputs), input_num))
+        jacobian[nodes] = tape.backward([outputs[i].index for i in nodes], input_num)
+
+        # the seed scales the columns of the Jacobian, or a seed matrix S gives J S
+        func_der = jacobian @ self.seed if np.ndim(self.seed) == 2 else jacobian * self.seed
+        func_der = func_der.reshape(shape + func_der.shape[1:])
+
+        if shape == ():
+            # the input is a scalar
+            if input_num == 1 and np.ndim(self.seed) < 2:
+                return float(func_val), float(func_der[0])
+            return float(func_val), func_der
+        return func_val, func_der
@@ -0,0 +1,582 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: reverse_number.py                                                       #
+# Description: This class defines the variables and the tape of reverse mode    #
+# automatic differentiation. Every operation on a ReverseNumbers object appends #
+# its op code, operand indices and local partial derivatives to flat typed      #
+# arrays of a Tape object, and one backward sweep over the tape accumulates the #
+# derivatives of an output with respect to every input variable.                #
+#################################################################################
+
+import math
+from array import array
+
+import numpy as np
+from .dual_number import (is_numeric, _SCALAR_TYPES, _UFUNC_OPERATORS, _UFUNC_METHODS, _int_power, _is_integer,
+                          _logistic_kernel, _softplus_kernel)
+
+
+# names of the operations recorded on a tape, indexed by their op code
+OP_NAMES = ('input', 'add', 'sub', 'mul', 'div', 'neg', 'pow', 'log', 'exp', 'sin', 'cos', 'tan',
+            'sinh', 'cosh', 'tanh', 'arcsin', 'arccos', 'arctan', 'logistic', 'softplus')
+(_INPUT, _ADD, _SUB, _MUL, _DIV, _NEG, _POW, _LOG, _EXP, _SIN, _COS, _TAN,
+ _SINH, _COSH, _TANH, _ARCSIN, _ARCCOS, _ARCTAN, _LOGISTIC, _SOFTPLUS) = range(len(OP_NAMES))
+
+
+class Tape:
+    r"""A class representing the record of the operations of a reverse mode evaluation
+
+    Every node of the tape takes one entry in each of five flat typed arrays: the op code, the
+    indices of the two operands and the partial derivatives of the node with respect to them. An
+    operation with a single operand, or with a constant as the other operand, has the operand
+    index -1 and the partial derivative 0 for the missing operand. The arrays grow in place like
+    Python lists, and the nodes, operands and partials methods return NumPy views of them.
+
+    Examples
+    --------
+    >>> tape = Tape()
+    >>> x, y = ReverseNumbers(2., tape), ReverseNumbers(3., tape)
+    >>> z = x * y + x
+    >>> tape.nodes()
+    array([0, 0, 3, 1], dtype=int8)
+    >>> tape.backward([z.index], 2)
+    array([[4., 2.]])
+    """
+
+    __slots__ = ('_ops', '_left', '_right', '_dleft', '_dright')
+
+    def __init__(self):
+        r"""A constructor to create an empty Tape object
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._ops = array('b')
+        self._left = array('q')
+        self._right = array('q')
+        self._dleft = array('d')
+        self._dright = array('d')
+
+    def __len__(self):
+        return len(self._ops)
+
+    def record(self, op, left, dleft, right=-1, dright=0.):
+        r"""A method to append a node to the tape
+
+        Parameters
+        ----------
+        op: integer op code of the operation, an index into OP_NAMES
+        left: index of the first operand on the tape, or -1
+        dleft: partial derivative of the node with respect to the first operand
+        right: index of the second operand on the tape (default -1, for no second operand)
+        dright: partial derivative of the node with respect to the second operand (default 0)
+
+        Returns
+        -------
+        The index of the new node
+        """
+        self._ops.append(op)
+        self._left.append(left)
+        self._right.append(right)
+        self._dleft.append(dleft)
+        self._dright.append(dright)
+        return len(self._ops) - 1
+
+    def nodes(self):
+        r"""A method to return the op codes of the nodes as a NumPy view of the tape"""
+        return np.frombuffer(self._ops, dtype=np.int8)
+
+    def operands(self):
+        r"""A method to return the operand indices of the nodes as an array of shape (number of nodes, 2)"""
+        return np.stack([np.frombuffer(self._left, dtype=np.int64), np.frombuffer(self._right, dtype=np.int64)], axis=1)
+
+    def partials(self):
+        r"""A method to return the partial derivatives of the nodes as an array of shape (number of nodes, 2)"""
+        return np.stack([np.frombuffer(self._dleft), np.frombuffer(self._dright)], axis=1)
+
+    def backward(self, outputs, input_num, adjoints=None):
+        r"""A method to compute the derivatives of outputs with respect to the first input_num nodes
+
+        The sweep visits every node from the output back to the input variables once and adds the
+        adjoint of the node times its partial derivatives to the adjoints of its operands.
+
+        Parameters
+        ----------
+        outputs: list of the indices of the output nodes, one backward sweep each
+        input_num: the number of input variables, which are the first nodes of the tape
+        adjoints: list of the adjoints of the outputs to start the sweeps with (default None, which starts with 1)
+
+        Returns
+        -------
+        2D array with one row of derivatives per output and one column per input variable
+        """
+        size = len(self)
+        left, right = self._left.tolist(), self._right.tolist()
+        dleft, dright = self._dleft.tolist(), self._dright.tolist()
+
+        gradients = np.zeros((len(outputs), input_num))
+        for row, output in enumerate(outputs):
+            # the extra last adjoint collects the missing operands of index -1
+            adjoint = [0.] * (size + 1)
+            adjoint[output] = 1. if adjoints is None else adjoints[row]
+            for i in range(output, input_num - 1, -1):
+                a = adjoint[i]
+                if a:
+                    adjoint[left[i]] += a * dleft[i]
+                    adjoint[right[i]] += a * dright[i]
+            gradients[row] = adjoint[:input_num]
+        return gradients
+
+    def vjp(self, outputs, adjoints, input_num):
+        r"""A method to compute the vector-Jacobian product of the outputs with one backward sweep
+
+        Every output starts with its adjoint, so a single sweep accumulates the sum of the adjoints
+        times the derivatives of the outputs, e.g. the adjoint of the state before a step of a loop.
+
+        Parameters
+        ----------
+        outputs: list of the indices of the output nodes
+        adjoints: list of the adjoints of the outputs
+        input_num: the number of input variables, which are the first nodes of the tape
+
+        Returns
+        -------
+        1D array with the adjoint of every input variable
+
+        Examples
+        --------
+        >>> tape = Tape()
+        >>> x, y = ReverseNumbers(2., tape), ReverseNumbers(3., tape)
+        >>> tape.vjp([(x * y).index, y.index], [1., 2.], 2)
+        array([3., 4.])
+        """
+        left, right = self._left.tolist(), self._right.tolist()
+        dleft, dright = self._dleft.tolist(), self._dright.tolist()
+
+        adjoint = [0.] * (len(self) + 1)
+        for output, a in zip(outputs, adjoints):
+            adjoint[output] += a
+        for i in range(max(outputs, default=-1), input_num - 1, -1):
+            a = adjoint[i]
+            if a:
+                adjoint[left[i]] += a * dleft[i]
+                adjoint[right[i]] += a * dright[i]
+        return np.array(adjoint[:input_num])
+
+
+class ReverseNumbers:
+    r"""A class representing a variable object to be used in reverse mode automatic differentiation
+
+    A ReverseNumbers object holds a real value and the index of its node on a tape. The operators and
+    elementary functions have the same names, domain checks and errors as those of DualNumbers, so a
+    function written for DualNumbers objects can be evaluated with ReverseNumbers objects. The
+    values are Python floats and the elementary functions use the math module where it cannot overflow.
+
+    Instance Variables
+    ----------
+    val: value of the ReverseNumbers object
+    index: index of the node of the ReverseNumbers object on its tape
+    tape: the Tape object that records the operations
+
+    Examples
+    --------
+    >>> tape = Tape()
+    >>> x = ReverseNumbers(2., tape)
+    >>> z = x.exp() * x ** 2
+    >>> print(z)
+    Values: 29.5562243957226, Tape index: 3
+    """
+
+    __slots__ = ('_val', '_index', '_tape')
+
+    def __init__(self, val, tape=None):
+        r"""A constructor to create ReverseNumbers object as a new input variable of a tape
+
+        Parameters
+        ----------
+        val: integer or float object that represents the value of ReverseNumbers object
+        tape: the Tape object to record the input variable on (default None, which creates a new tape)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError if the value is not an int or float
+        """
+        if not is_numeric(val) or np.ndim(val) != 0:
+            raise TypeError('Error: Input value should be an int or float')
+        self._tape = Tape() if tape is None else tape
+        self._val = float(val)
+        self._index = self._tape.record(_INPUT, -1, 0.)
+
+    @classmethod
+    def _make(cls, val, tape, index):
+        r"""An internal constructor that creates a ReverseNumbers object for a node that is already recorded"""
+        obj = object.__new__(cls)
+        obj._val = val
+        obj._index = index
+        obj._tape = tape
+        return obj
+
+    @staticmethod
+    def _check_domain(invalid, message, error=ValueError):
+        r"""An internal method to raise an error when an operation is evaluated outside of its domain"""
+        if invalid:
+            raise error(message)
+
+    def _operand(self, other):
+        r"""An internal method to return the tape of a binary operation, checking that both operands share it"""
+        if other._tape is not self._tape:
+            raise ValueError('Error: ReverseNumbers objects should be recorded on the same tape')
+        return self._tape
+
+    def _unary(self, op, f, f_prime):
+        r"""An internal method to record a function of the ReverseNumbers object with value f and derivative f_prime"""
+        return self._make(f, self._tape, self._tape.record(op, self._index, f_prime))
+
+    @property
+    def val(self):
+        r"""A method to retrieve the value attribute of ReverseNumbers object"""
+        return self._val
+
+    @property
+    def index(self):
+        r"""A method to retrieve the index of the node of ReverseNumbers object on its tape"""
+        return self._index
+
+    @property
+    def tape(self):
+        r"""A method to retrieve the tape of ReverseNumbers object"""
+        return self._tape
+
+    def __repr__(self):
+        r"""A method to overload the string representation of ReverseNumbers object
+
+        Examples
+        --------
+        >>> print(ReverseNumbers(1.))
+        Values: 1.0, Tape index: 0
+        """
+        return f'Values: {self._val}, Tape index: {self._index}'
+
+    # make NumPy arrays defer to the ReverseNumbers operators in mixed binary operations
+    __array_priority__ = 1000
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        r"""A method to dispatch NumPy ufuncs such as np.sin or np.add to the ReverseNumbers operations
+
+        Parameters
+        ----------
+        ufunc: the NumPy ufunc object that was called
+        method: string object with the ufunc method that was called, only '__call__' is supported
+        inputs: the inputs of the ufunc, at least one of them is a ReverseNumbers object
+        kwargs: optional keyword arguments of the ufunc, which are not supported
+
+        Returns
+        -------
+        A ReverseNumbers object as the result of the ufunc, or NotImplemented if the ufunc has no derivative rule
+
+        Examples
+        --------
+        >>> x = ReverseNumbers(0.)
+        >>> print(np.sin(x))
+        Values: 0.0, Tape index: 1
+        """
+        if method != '__call__' or kwargs:
+            return NotImplemented
+        # unary ufuncs map to the elementary functions
+        if ufunc in _UFUNC_METHODS:
+            return _UFUNC_METHODS[ufunc](inputs[0])
+        if ufunc not in _UFUNC_OPERATORS:
+            return NotImplemented
+
+        # binary ufuncs map to the operator of the left operand, or the reflected operator of the right operand
+        left, right = inputs
+        name, reflected_name = _UFUNC_OPERATORS[ufunc]
+        node, other = (left, right) if isinstance(left, ReverseNumbers) else (right, left)
+        # an array of constants is combined element by element
+        if not isinstance(other, ReverseNumbers) and np.ndim(other) > 0:
+            wrapped = np.empty((), dtype=object)
+            wrapped[()] = node
+            inputs = (wrapped, other) if node is left else (other, wrapped)
+            return ufunc(*[np.asarray(x, dtype=object) for x in inputs])
+        if node is left:
+            return getattr(left, name)(right)
+        return getattr(right, reflected_name)(left)
+
+    def __add__(self, other):
+        r"""A method to perform addition operation on the ReverseNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or ReverseNumbers object
+
+        Returns
+        -------
+        A ReverseNumbers object as the result of the addition operation
+        """
+        if isinstance(other, ReverseNumbers):
+            tape = self._operand(other)
+            return self._make(self._val + other._val, tape, tape.record(_ADD, self._index, 1., other._index, 1.))
+        if isinstance(other, _SCALAR_TYPES):
+            return self._unary(_ADD, self._val + other, 1.)
+        return NotImplemented
+
+    def __radd__(self, other):
+        r"""A method to perform the reverse addition operation on the ReverseNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            return self._unary(_ADD, other + self._val, 1.)
+        return NotImplemented
+
+    def __sub__(self, other):
+        r"""A method to perform subtraction operation on the ReverseNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or ReverseNumbers object
+
+        Returns
+        -------
+        A ReverseNumbers object as the result of the subtraction operation
+        """
+        if isinstance(other, ReverseNumbers):
+            tape = self._operand(other)
+            return self._make(self._val - other._val, tape, tape.record(_SUB, self._index, 1., other._index, -1.))
+        if isinstance(other, _SCALAR_TYPES):
+            return self._unary(_SUB, self._val - other, 1.)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        r"""A method to perform the reverse subtraction operation on the ReverseNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            return self._unary(_SUB, other - self._val, -1.)
+        return NotImplemented
+
+    def __mul__(self, other):
+        r"""A method to perform multiplication operation on the ReverseNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or ReverseNumbers object
+
+        Returns
+        -------
+        A ReverseNumbers object as the result of the multiplication operation
+        """
+        if isinstance(other, ReverseNumbers):
+            tape = self._operand(other)
+            return self._make(self._val * other._val, tape,
+                              tape.record(_MUL, self._index, other._val, other._index, self._val))
+        if isinstance(other, _SCALAR_TYPES):
+            return self._unary(_MUL, self._val * other, other)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        r"""A method to perform the reverse multiplication operation on the ReverseNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            return self._unary(_MUL, other * self._val, other)
+        return NotImplemented
+
+    def __truediv__(self, other):
+        r"""A method to perform division operation on the ReverseNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or ReverseNumbers object
+
+        Returns
+        -------
+        A ReverseNumbers object as the result of the division operation
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+        """
+        if isinstance(other, ReverseNumbers):
+            tape = self._operand(other)
+            self._check_domain(other._val == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+            f = self._val / other._val
+            return self._make(f, tape, tape.record(_DIV, self._index, 1 / other._val, other._index, -f / other._val))
+        if isinstance(other, _SCALAR_TYPES):
+            self._check_domain(other == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+            return self._unary(_DIV, self._val / other, 1 / other)
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        r"""A method to perform the reverse division operation on the ReverseNumbers object and the other object
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+        """
+        if isinstance(other, _SCALAR_TYPES):
+            self._check_domain(self._val == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+            f = other / self._val
+            return self._unary(_DIV, f, -f / self._val)
+        return NotImplemented
+
+    def __pow__(self, other):
+        r"""A method to perform power operation on the ReverseNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or ReverseNumbers object
+
+        Returns
+        -------
+        A ReverseNumbers object as the result of the power operation
+
+        Raises
+        ------
+        ValueError
+            If negative number is raised to a fraction power with an even denominator
+            If the power is less than 1 and differentiation occurs at 0
+
+        Examples
+        --------
+        >>> print(ReverseNumbers(0.) ** 0.5)
+        ValueError: Error: Attempted to find derivative at 0 when power is less than 1
+        """
+        if isinstance(other, ReverseNumbers):
+            tape = self._operand(other)
+            # avoid raising a negative number to a fraction power with an even denominator
+            self._check_domain((self._val < 0) and (other._val % 1 != 0),
+                               "Error: Attempted to raise a negative number to a fraction power with even denominator")
+            # avoid having a 0 derivative when the power is less than 1
+            self._check_domain((self._val == 0) and (other._val < 1),
+                               "Error: Attempted to find derivative at 0 when the power is less than 1")
+            f = self._val ** other._val
+            # the derivative with respect to the power is 0 at a base of 0 and undefined for a negative base
+            f_log = f * math.log(self._val) if self._val > 0 else (0. if self._val == 0 else math.nan)
+            return self._make(f, tape, tape.record(_POW, self._index, other._val * self._val ** (other._val - 1),
+                                                   other._index, f_log))
+        if not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
+
+        # an integer power of at least 2 is defined everywhere and is computed by repeated multiplication
+        if _is_integer(other) and other >= 2:
+            return self._unary(_POW, _int_power(self._val, other), other * _int_power(self._val, other - 1))
+
+        # avoid raising a negative number to a fraction power with an even denominator
+        self._check_domain((self._val < 0) and (other % 1 != 0),
+                           "Error: Attempted to raise a negative number to a fraction power with even denominator")
+        # avoid having a 0 derivative when the power is less than 1
+        self._check_domain((self._val == 0) and (other < 1),
+                           "Error: Attempted to find derivative at 0 when power is less than 1")
+        return self._unary(_POW, self._val ** other, other * self._val ** (other - 1))
+
+    def __rpow__(self, other):
+        r"""A method to perform the reverse power operation on the ReverseNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            f = other ** self._val
+            return self._unary(_POW, f, f * np.log(other))
+        return NotImplemented
+
+    def __neg__(self):
+        r"""A method to perform the negation operation on the ReverseNumbers object"""
+        return self._unary(_NEG, -self._val, -1.)
+
+    def sqrt(self):
+        r"""method to compute the value and derivative of the square root function"""
+        return self.__pow__(0.5)
+
+    def log(self, base=None):
+        r"""method to compute the value and derivative of the logarithm with the natural base or the given base
+
+        Raises
+        ------
+        ValueError
+            If self.val is less than or equal to zero
+            If input base is less than or equal to zero or equal to one
+        """
+        self._check_domain(self._val <= 0, "ERROR: Value for log should be greater than 0")
+        if base is None:
+            return self._unary(_LOG, math.log(self._val), 1 / self._val)
+        if base <= 0 or base == 1:
+            raise ValueError("ERROR: LOG base should be greater than 0 and not equal to 1")
+        log_base = math.log(base)
+        return self._unary(_LOG, math.log(self._val) / log_base, 1 / (self._val * log_base))
+
+    def exp(self):
+        r"""method to compute the value and derivative of the exponential function"""
+        # NumPy returns inf instead of raising an error when the value overflows
+        f = float(np.exp(self._val))
+        return self._unary(_EXP, f, f)
+
+    def sin(self):
+        r"""method to compute the value and derivative of the sine function"""
+        return self._unary(_SIN, math.sin(self._val), math.cos(self._val))
+
+    def cos(self):
+        r"""method to compute the value and derivative of the cosine function"""
+        return self._unary(_COS, math.cos(self._val), -math.sin(self._val))
+
+    def sincos(self):
+        r"""method to compute the values and derivatives of the sine and cosine functions together"""
+        sin, cos = math.sin(self._val), math.cos(self._val)
+        return self._unary(_SIN, sin, cos), self._unary(_COS, cos, -sin)
+
+    def tan(self):
+        r"""method to compute the value and derivative of the tangent function
+
+        Raises
+        ------
+        ValueError if the input is an odd multiple of pi/2
+        """
+        self._check_domain((self._val / (np.pi / 2)) % 2 == 1, "ERROR: Input to tan should not be an odd mutiple of pi/2")
+        f = math.tan(self._val)
+        return self._unary(_TAN, f, 1 + f * f)
+
+    def sinh(self):
+        r"""method to compute the value and derivative of the hyperbolic sine function"""
+        return self._unary(_SINH, float(np.sinh(self._val)), float(np.cosh(self._val)))
+
+    def cosh(self):
+        r"""method to compute the value and derivative of the hyperbolic cosine function"""
+        return self._unary(_COSH, float(np.cosh(self._val)), float(np.sinh(self._val)))
+
+    def tanh(self):
+        r"""method to compute the value and derivative of the hyperbolic tangent function"""
+        f = math.tanh(self._val)
+        return self._unary(_TANH, f, 1 - f * f)
+
+    def arcsin(self):
+        r"""method to compute the value and derivative of the inverse sine function
+
+        Raises
+        ------
+        ValueError if the input is not strictly between -1 and 1
+        """
+        self._check_domain((self._val <= -1) or (self._val >= 1), "ERROR: Input to arcsin() should be between -1 and 1")
+        return self._unary(_ARCSIN, math.asin(self._val), 1 / math.sqrt(1 - self._val ** 2))
+
+    def arccos(self):
+        r"""method to compute the value and derivative of the inverse cosine function
+
+        Raises
+        ------
+        ValueError if the input is not strictly between -1 and 1
+        """
+        self._check_domain((self._val <= -1) or (self._val >= 1), "ERROR: Input to arccos() should be between -1 and 1")
+        return self._unary(_ARCCOS, math.acos(self._val), -1 / math.sqrt(1 - self._val ** 2))
+
+    def arctan(self):
+        r"""method to compute the value and derivative of the inverse tangent function"""
+        return self._unary(_ARCTAN, math.atan(self._val), 1 / (1 + self._val ** 2))
+
+    def logistic(self):
+        r"""method to compute the value and derivative of the logistic function 1 / (1 + exp(-x))"""
+        f, f_prime, _ = _logistic_kernel(self._val)
+        return self._unary(_LOGISTIC, float(f), float(f_prime))
+
+    def softplus(self):
+        r"""method to compute the value and derivative of the softplus function log(1 + exp(x))"""
+        f, f_prime = _softplus_kernel(self._val)
+        return self._unary(_SOFTPLUS, float(f), float(f_prime))
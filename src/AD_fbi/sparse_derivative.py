@@ -0,0 +1,258 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: sparse_derivative.py                                                    #
+# Description: This class defines a sparse derivative vector that stores only   #
+# the nonzero partial derivatives of a DualNumbers object as sorted index and   #
+# value arrays. Derivatives are merged on binary operations and switch to a     #
+# dense NumPy array once they become too dense to benefit from sparsity.        #
+#################################################################################
+
+import numpy as np
+
+
+class SparseDerivative:
+    r"""A class representing a sparse derivative vector of a DualNumbers object
+
+    The derivative stores the sorted indices of the input variables it depends on and the
+    corresponding partial derivatives. It supports the operations used by the DualNumbers
+    derivative rules: addition and subtraction with other derivative vectors, negation, and
+    multiplication or division by a scalar. When the number of stored entries of a sum exceeds
+    density_threshold times the length of the vector, the result is returned as a dense array.
+
+    Instance Variables
+    ----------
+    indices: sorted 1D integer array of the input variables the derivative depends on
+    values: 1D float array of the partial derivatives with respect to those input variables
+    size: the length of the dense derivative vector
+
+    Examples
+    --------
+    >>> d1 = SparseDerivative([0], [1.], 1000)
+    >>> d2 = SparseDerivative([5], [2.], 1000)
+    >>> print(d1 * 3 + d2)
+    SparseDerivative(indices=[0 5], values=[3. 2.], size=1000)
+    """
+
+    __slots__ = ('indices', 'values', 'size')
+
+    # fraction of nonzero entries above which a merged derivative is stored densely
+    density_threshold = 0.25
+
+    # make NumPy arrays and scalars defer to the reflected operators of this class
+    __array_ufunc__ = None
+
+    def __init__(self, indices, values, size, dtype=float):
+        r"""A constructor to create SparseDerivative object from the indices and values of its entries
+
+        Parameters
+        ----------
+        indices: 1D array of integers with the position of each entry in the dense vector
+        values: 1D array of integers or floats with the value of each entry
+        size: integer object with the length of the dense vector
+        dtype: the floating point dtype of the values (default float)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If the indices and values have different lengths or an index is outside of the vector
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        values = np.asarray(values, dtype=dtype)
+        if indices.shape != values.shape or indices.ndim != 1:
+            raise ValueError('Error: Indices and values should be 1D arrays of the same length')
+        if len(indices) and (indices.min() < 0 or indices.max() >= size):
+            raise ValueError('Error: Indices should be between 0 and size - 1')
+        # keep the entries sorted by index so that merges only need a union of sorted arrays
+        order = np.argsort(indices, kind='stable')
+        self.indices = indices[order]
+        self.values = values[order]
+        self.size = int(size)
+
+    @classmethod
+    def _make(cls, indices, values, size):
+        r"""An internal constructor that creates a SparseDerivative object from sorted indices without validation"""
+        obj = object.__new__(cls)
+        obj.indices = indices
+        obj.values = values
+        obj.size = size
+        return obj
+
+    @classmethod
+    def unit(cls, index, value, size, dtype=float):
+        r"""A method to create the seed derivative of one input variable
+
+        Parameters
+        ----------
+        index: integer object with the position of the input variable
+        value: integer or float object with the seed value
+        size: integer object with the number of input variables
+        dtype: the floating point dtype of the value (default float)
+
+        Returns
+        -------
+        A SparseDerivative object with a single entry
+
+        Examples
+        --------
+        >>> print(SparseDerivative.unit(2, 1., 4).toarray())
+        [0. 0. 1. 0.]
+        """
+        return cls._make(np.array([index], dtype=np.int64), np.array([value], dtype=dtype), size)
+
+    def toarray(self):
+        r"""A method to convert the sparse derivative to a dense 1D array
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        1D float array of length size with the dtype of the values
+
+        Examples
+        --------
+        >>> print(SparseDerivative([1], [2.], 3).toarray())
+        [0. 2. 0.]
+        """
+        dense = np.zeros(self.size, dtype=self.values.dtype)
+        dense[self.indices] = self.values
+        return dense
+
+    @property
+    def dtype(self):
+        r"""A method to retrieve the dtype of the values of SparseDerivative object"""
+        return self.values.dtype
+
+    def astype(self, dtype):
+        r"""A method to convert the values of the sparse derivative to another dtype
+
+        Parameters
+        ----------
+        dtype: the floating point dtype to convert to, e.g. np.float32
+
+        Returns
+        -------
+        A SparseDerivative object with the same indices and the values converted to dtype
+        """
+        return self._make(self.indices, self.values.astype(dtype, copy=False), self.size)
+
+    def __array__(self, dtype=None, copy=None):
+        r"""A method to convert the sparse derivative to a dense array when NumPy requests one"""
+        return self.toarray() if dtype is None else self.toarray().astype(dtype)
+
+    def __len__(self):
+        r"""A method to return the length of the dense derivative vector"""
+        return self.size
+
+    def __repr__(self):
+        r"""A method to overload the string representation of SparseDerivative object
+
+        Examples
+        --------
+        >>> print(SparseDerivative([1], [2.], 3))
+        SparseDerivative(indices=[1], values=[2.], size=3)
+        """
+        return f'SparseDerivative(indices={self.indices}, values={self.values}, size={self.size})'
+
+    def __add__(self, other):
+        r"""A method to add another derivative vector to the sparse derivative
+
+        Parameters
+        ----------
+        other: SparseDerivative object, dense 1D array or scalar
+
+        Returns
+        -------
+        A SparseDerivative object if the sum is sparse enough, otherwise a dense 1D array
+
+        Examples
+        --------
+        >>> d = SparseDerivative([0], [1.], 10) + SparseDerivative([0, 3], [1., 2.], 10)
+        >>> print(d)
+        SparseDerivative(indices=[0 3], values=[2. 2.], size=10)
+        """
+        if isinstance(other, SparseDerivative):
+            # entries with the same indices are added directly
+            if self.indices is other.indices or np.array_equal(self.indices, other.indices):
+                return self._make(self.indices, self.values + other.values, self.size)
+            indices = np.union1d(self.indices, other.indices)
+            # switch to a dense vector once the sum is too dense to benefit from sparsity
+            if len(indices) > self.density_threshold * self.size:
+                dense = self.toarray()
+                dense[other.indices] += other.values
+                return dense
+            values = np.zeros(len(indices), dtype=np.result_type(self.values, other.values))
+            values[np.searchsorted(indices, self.indices)] = self.values
+            values[np.searchsorted(indices, other.indices)] += other.values
+            return self._make(indices, values, self.size)
+        # a zero scalar leaves the derivative unchanged
+        if np.isscalar(other) and other == 0:
+            return self
+        dense = np.zeros(self.size, dtype=self.values.dtype) + other
+        dense[self.indices] += self.values
+        return dense
+
+    def __radd__(self, other):
+        r"""A method to add the sparse derivative to another derivative vector"""
+        return self + other
+
+    def __neg__(self):
+        r"""A method to negate the sparse derivative"""
+        return self._make(self.indices, -self.values, self.size)
+
+    def __sub__(self, other):
+        r"""A method to subtract another derivative vector from the sparse derivative"""
+        return self + (-other)
+
+    def __rsub__(self, other):
+        r"""A method to subtract the sparse derivative from another derivative vector"""
+        return (-self) + other
+
+    def __mul__(self, other):
+        r"""A method to multiply the sparse derivative by a scalar
+
+        Parameters
+        ----------
+        other: integer or float object
+
+        Returns
+        -------
+        A SparseDerivative object with the scaled entries
+
+        Examples
+        --------
+        >>> print(SparseDerivative([1], [2.], 3) * 3)
+        SparseDerivative(indices=[1], values=[6.], size=3)
+        """
+        return self._make(self.indices, self.values * other, self.size)
+
+    def __rmul__(self, other):
+        r"""A method to multiply a scalar by the sparse derivative"""
+        return self * other
+
+    def __truediv__(self, other):
+        r"""A method to divide the sparse derivative by a scalar"""
+        return self._make(self.indices, self.values / other, self.size)
+
+    def __eq__(self, other):
+        r"""A method to compare the sparse derivative with another derivative vector element by element
+
+        Returns
+        -------
+        1D boolean array with the element-wise comparison of the dense vectors
+        """
+        return self.toarray() == np.asarray(other)
+
+    def __ne__(self, other):
+        r"""A method to compare the sparse derivative with another derivative vector element by element
+
+        Returns
+        -------
+        1D boolean array with the element-wise comparison of the dense vectors
+        """
+        return self.toarray() != np.asarray(other)
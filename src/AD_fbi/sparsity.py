@@ -0,0 +1,522 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: sparsity.py                                                             #
+# Description: Compute sparse Jacobians with few evaluations. The sparsity      #
+# pattern is detected by propagating the sets of input variables each           #
+# intermediate depends on, structurally orthogonal columns are grouped by       #
+# greedy coloring, and one evaluation with a compressed seed matrix per color   #
+# recovers every nonzero entry, which is returned as a SparseMatrix object.     #
+# Hessian patterns are detected from the nonlinear operations and star colored. #
+#################################################################################
+
+import numpy as np
+from .dual_number import DualNumbers, DualArray, _flatten_outputs
+from .hessian_number import HessianNumbers
+
+
+class SparseMatrix:
+    r"""A class representing a sparse matrix in coordinate (COO) format with a compressed row (CSR) view
+
+    The entries are kept sorted by row and then by column, so the CSR arrays are computed from
+    the row indices without reordering.
+
+    Instance Variables
+    ----------
+    row: 1D integer array with the row of every stored entry
+    col: 1D integer array with the column of every stored entry
+    data: 1D array with the value of every stored entry
+    shape: tuple of the number of rows and columns of the dense matrix
+
+    Examples
+    --------
+    >>> J = SparseMatrix([0, 1, 1], [0, 0, 2], [1., 2., 3.], (2, 3))
+    >>> J.toarray()
+    array([[1., 0., 0.],
+           [2., 0., 3.]])
+    >>> J.tocsr()
+    (array([0, 1, 3]), array([0, 0, 2]), array([1., 2., 3.]))
+    """
+
+    __slots__ = ('row', 'col', 'data', 'shape')
+
+    def __init__(self, row, col, data, shape):
+        r"""A constructor to create SparseMatrix object from the coordinates and values of its entries
+
+        Parameters
+        ----------
+        row: 1D array of integers with the row of each entry
+        col: 1D array of integers with the column of each entry
+        data: 1D array with the value of each entry
+        shape: tuple of the number of rows and columns of the dense matrix
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If the coordinates and values have different lengths or an entry is outside of the matrix
+        """
+        row = np.asarray(row, dtype=np.int64)
+        col = np.asarray(col, dtype=np.int64)
+        data = np.asarray(data)
+        if not row.shape == col.shape == data.shape or row.ndim != 1:
+            raise ValueError('Error: Rows, columns and values should be 1D arrays of the same length')
+        if len(row) and (row.min() < 0 or row.max() >= shape[0] or col.min() < 0 or col.max() >= shape[1]):
+            raise ValueError('Error: Entries should be inside of the matrix')
+        order = np.lexsort((col, row))
+        self.row, self.col, self.data = row[order], col[order], data[order]
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    @property
+    def nnz(self):
+        r"""A method to retrieve the number of stored entries of SparseMatrix object"""
+        return len(self.data)
+
+    def __repr__(self):
+        r"""A method to overload the string representation of SparseMatrix object
+
+        Examples
+        --------
+        >>> print(SparseMatrix([0], [1], [2.], (2, 2)))
+        SparseMatrix(shape=(2, 2), nnz=1)
+        """
+        return f'SparseMatrix(shape={self.shape}, nnz={self.nnz})'
+
+    def toarray(self):
+        r"""A method to convert the sparse matrix to a dense 2D array
+
+        Returns
+        -------
+        2D array of the shape of the matrix with the dtype of the values
+        """
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        dense[self.row, self.col] = self.data
+        return dense
+
+    def tocsr(self):
+        r"""A method to return the compressed sparse row arrays of the matrix
+
+        Returns
+        -------
+        A tuple of the row pointers, of length the number of rows plus 1, the column indices and the values
+        """
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.row, minlength=self.shape[0]), out=indptr[1:])
+        return indptr, self.col, self.data
+
+    def __matmul__(self, v):
+        r"""A method to multiply the sparse matrix by a dense vector
+
+        Parameters
+        ----------
+        v: 1D array with one entry per column
+
+        Returns
+        -------
+        1D array with one entry per row
+
+        Examples
+        --------
+        >>> SparseMatrix([0, 1, 1], [0, 0, 2], [1., 2., 3.], (2, 3)) @ np.array([1., 1., 1.])
+        array([1., 5.])
+        """
+        return np.bincount(self.row, weights=self.data * np.asarray(v)[self.col], minlength=self.shape[0])
+
+
+class _Dependencies:
+    r"""A class representing the set of input variables that an intermediate depends on
+
+    It takes the place of the derivative vector of a DualNumbers object: every derivative rule
+    combines derivatives by sums and by products with scalars, so a sum is the union of the sets
+    and a product with a scalar keeps the set. The pattern is structural, an entry is kept even
+    when its partial derivative happens to be 0 at the evaluation point.
+    """
+
+    __slots__ = ('indices',)
+
+    # make NumPy scalars defer to the reflected operators of this class
+    __array_ufunc__ = None
+
+    def __init__(self, indices):
+        self.indices = indices
+
+    def __add__(self, other):
+        if isinstance(other, _Dependencies):
+            if other.indices <= self.indices:
+                return self
+            return _Dependencies(self.indices | other.indices)
+        return self
+
+    __radd__ = __sub__ = __rsub__ = __add__
+
+    def __mul__(self, other):
+        return self
+
+    __rmul__ = __truediv__ = __mul__
+
+    def __neg__(self):
+        return self
+
+
+class _LazyDependencies:
+    r"""A class representing the set of input variables that an intermediate depends on as an unevaluated union
+
+    A sum only records its two operands, so a long sum such as the accumulation of the terms of an
+    objective takes constant time per term, where merging the sets would copy the growing set every
+    time. The set is only built, once, when a nonlinear operation needs it.
+    """
+
+    __slots__ = ('parts', '_indices')
+
+    # make NumPy scalars defer to the reflected operators of this class
+    __array_ufunc__ = None
+
+    def __init__(self, parts, indices=None):
+        self.parts = parts
+        self._indices = indices
+
+    @property
+    def indices(self):
+        if self._indices is None:
+            # an operand used several times is visited once
+            sets, seen, stack = [], set(), [self]
+            while stack:
+                node = stack.pop()
+                if id(node) in seen:
+                    continue
+                seen.add(id(node))
+                if node._indices is not None:
+                    sets.append(node._indices)
+                else:
+                    stack.extend(node.parts)
+            self._indices = frozenset().union(*sets)
+            self.parts = ()
+        return self._indices
+
+    def __add__(self, other):
+        if isinstance(other, _LazyDependencies) and other is not self:
+            return _LazyDependencies((self, other))
+        return self
+
+    __radd__ = __sub__ = __rsub__ = __add__
+
+    def __mul__(self, other):
+        return self
+
+    __rmul__ = __truediv__ = __mul__
+
+    def __neg__(self):
+        return self
+
+
+class _JacobianTracer(DualNumbers):
+    r"""A class representing an intermediate of a trace that detects the sparsity pattern of a Jacobian
+
+    The derivative vector is replaced by a _Dependencies object, which cannot be stacked into the
+    derivatives of a DualArray object, so np.stack of the outputs of a vector function builds a NumPy
+    object array of them instead, which is flattened like a list of outputs.
+    """
+
+    __slots__ = ()
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func is np.stack:
+            arrays = list(args[0] if args else kwargs['arrays'])
+            stacked = np.empty(len(arrays), dtype=object)
+            for i, funct in enumerate(arrays):
+                stacked[i] = funct
+            return stacked
+        return super().__array_function__(func, types, args, kwargs)
+
+
+def jacobian_sparsity(function, x):
+    r"""Detect the sparsity pattern of the Jacobian of function at x
+
+    The function is evaluated once with the set of input variables each intermediate depends on
+    in place of its derivatives. The values are propagated as well, so a function that branches
+    on its values gets the pattern of the branch taken at x.
+
+    Parameters
+    ----------
+    function: a scalar function, or a vector or matrix of functions of DualNumbers objects
+    x: a scalar or a 1D array with the evaluation point
+
+    Returns
+    -------
+    A SparseMatrix object of boolean values with one row per output and one column per input variable,
+    which has a single row for a scalar function and the outputs of a matrix function in row-major order
+
+    Examples
+    --------
+    >>> pattern = jacobian_sparsity(lambda x, y, z: (x * y, z.exp()), np.array([1., 2., 3.]))
+    >>> pattern.toarray()
+    array([[ True,  True, False],
+           [False, False,  True]])
+    """
+    inputs = np.atleast_1d(np.asarray(x, dtype=float))
+    z = function(*[_JacobianTracer._make(val, _Dependencies(frozenset((i,)))) for i, val in enumerate(inputs)])
+    outputs = [z] if isinstance(z, (DualNumbers, int, float, np.number)) else _flatten_outputs(z)[1]
+
+    row, col = [], []
+    for i, funct in enumerate(outputs):
+        # an output that does not depend on any input variable is a constant or has a scalar derivative
+        indices = sorted(funct.derv.indices) if isinstance(funct, DualNumbers) and isinstance(funct.derv, _Dependencies) else []
+        row.extend([i] * len(indices))
+        col.extend(indices)
+    return SparseMatrix(row, col, np.ones(len(row), dtype=bool), (len(outputs), len(inputs)))
+
+
+def color_columns(pattern):
+    r"""Group the columns of a sparsity pattern into structurally orthogonal groups by greedy coloring
+
+    Two columns may share a color when no row has an entry in both of them, so the sum of the
+    columns of one color still holds every entry of each of them. The columns are colored in
+    order with the smallest color that none of the columns sharing a row with them has, which
+    needs 3 colors for a tridiagonal pattern and w colors for a banded pattern of width w.
+
+    Parameters
+    ----------
+    pattern: a SparseMatrix object with the sparsity pattern
+
+    Returns
+    -------
+    1D integer array with the color of every column, numbered from 0
+
+    Examples
+    --------
+    >>> n = 6
+    >>> pattern = SparseMatrix(*np.nonzero(np.eye(n) + np.eye(n, k=1) + np.eye(n, k=-1)), np.ones(3 * n - 2), (n, n))
+    >>> color_columns(pattern)
+    array([0, 1, 2, 0, 1, 2])
+    """
+    indptr, indices, _ = pattern.tocsr()
+    # the rows of every column, from the column-sorted order of the entries
+    by_col = np.argsort(pattern.col, kind='stable')
+    col_ptr = np.zeros(pattern.shape[1] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pattern.col, minlength=pattern.shape[1]), out=col_ptr[1:])
+    col_rows = pattern.row[by_col]
+
+    colors = np.full(pattern.shape[1], -1, dtype=np.int64)
+    for j in range(pattern.shape[1]):
+        forbidden = set()
+        for r in col_rows[col_ptr[j]:col_ptr[j + 1]]:
+            forbidden.update(colors[indices[indptr[r]:indptr[r + 1]]].tolist())
+        color = 0
+        while color in forbidden:
+            color += 1
+        colors[j] = color
+    return colors
+
+
+class _HessianTracer(HessianNumbers):
+    r"""A class representing an intermediate of a trace that detects the sparsity pattern of a Hessian
+
+    The gradient of a HessianNumbers object is replaced by the set of input variables it depends on,
+    as an unevaluated union that is only built when a nonlinear operation needs it.
+    A Hessian entry (i, j) can only be nonzero when a nonlinear operation, the second order term of
+    the chain rule or the product rule, combines a dependency on i with a dependency on j. Instead
+    of propagating a set of pairs per intermediate, every such operation adds its pairs (i, j), i <= j,
+    to one set shared by the trace, which is kept in place of the layout of the packed triangle. The
+    pairs of operations that do not reach the output are kept as well, which only adds structural zeros.
+    """
+
+    __slots__ = ()
+
+    def _outer(self, a, b):
+        r"""An internal method to add the pairs of the outer product of two dependency sets to the trace"""
+        if isinstance(a, _LazyDependencies) and isinstance(b, _LazyDependencies):
+            self._triangle.update((i, j) if i <= j else (j, i) for i in a.indices for j in b.indices)
+        return 0.
+
+    def _chain(self, f, f_prime, f_second):
+        r"""An internal method to apply the chain rule of an elementary function to the dependencies"""
+        # the pattern is structural, so the pairs are kept even where the second derivative happens to be 0
+        self._outer(self._grad, self._grad)
+        return self._make(f, self._grad, 0., self._triangle)
+
+
+def hessian_sparsity(function, x):
+    r"""Detect the sparsity pattern of the Hessian of a scalar function at x
+
+    The function is evaluated once with the set of input variables each intermediate depends on in
+    place of its gradient, and every nonlinear operation adds the pairs of input variables it couples.
+    The values are propagated as well, so a function that branches on its values gets the pattern of
+    the branch taken at x.
+
+    Parameters
+    ----------
+    function: a scalar function of HessianNumbers objects
+    x: a scalar or a 1D array with the evaluation point
+
+    Returns
+    -------
+    A symmetric n x n SparseMatrix object of boolean values, with the entries of both triangles
+
+    Raises
+    ------
+    ValueError if the function does not return a scalar
+
+    Examples
+    --------
+    >>> pattern = hessian_sparsity(lambda x, y, z: x * y + z.exp() + 2 * x, np.array([1., 2., 3.]))
+    >>> pattern.toarray()
+    array([[False,  True, False],
+           [ True, False, False],
+           [False, False,  True]])
+    """
+    inputs = np.atleast_1d(np.asarray(x, dtype=float))
+    pairs = set()
+    z = function(*[_HessianTracer._make(val, _LazyDependencies((), frozenset((i,))), 0., pairs)
+                   for i, val in enumerate(inputs.tolist())])
+    if not isinstance(z, (HessianNumbers, int, float, np.number)):
+        raise ValueError("ERROR: The function should return a scalar that depends on the input variables.")
+
+    upper = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+    # the entries of the upper triangle are mirrored to the lower triangle
+    lower = upper[upper[:, 0] != upper[:, 1]]
+    row = np.concatenate([upper[:, 0], lower[:, 1]])
+    col = np.concatenate([upper[:, 1], lower[:, 0]])
+    return SparseMatrix(row, col, np.ones(len(row), dtype=bool), (len(inputs), len(inputs)))
+
+
+def star_color(pattern):
+    r"""Color the input variables of a symmetric sparsity pattern by greedy star coloring
+
+    The off-diagonal entries are the edges of a graph on the input variables. A star coloring gives
+    neighbors different colors and uses at least 3 colors on every path of 4 vertices, so the vertices
+    of any 2 colors form stars. Then for every entry (i, j), i is the only neighbor of j with the color
+    of i, or j is the only neighbor of i with the color of j, and the entry is read directly from the
+    product of the Hessian with the compressed seed matrix that has one column per color. The vertices
+    are colored from the largest degree to the smallest with the smallest color that keeps the coloring
+    a star coloring, following Gebremedhin, Manne and Pothen, which needs 3 colors for a tridiagonal
+    pattern and 2 colors for an arrowhead pattern, where column coloring of a Jacobian would need n.
+
+    Parameters
+    ----------
+    pattern: a symmetric SparseMatrix object with the sparsity pattern of a Hessian
+
+    Returns
+    -------
+    1D integer array with the color of every input variable, numbered from 0
+
+    Examples
+    --------
+    >>> n = 6
+    >>> pattern = SparseMatrix(*np.nonzero(np.eye(n) + np.eye(n, k=1) + np.eye(n, k=-1)), np.ones(3 * n - 2), (n, n))
+    >>> star_color(pattern)
+    array([2, 0, 1, 0, 2, 0])
+    """
+    n = pattern.shape[0]
+    off = pattern.row != pattern.col
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pattern.row[off], minlength=n), out=indptr[1:])
+    cols = pattern.col[off].tolist()
+    neighbors = [cols[indptr[i]:indptr[i + 1]] for i in range(n)]
+
+    colors = [-1] * n
+    # forbidden[c] == v marks the colors that v may not take
+    forbidden = [-1] * (n + 1)
+    for v in np.argsort(-np.diff(indptr), kind='stable').tolist():
+        for w in neighbors[v]:
+            if colors[w] >= 0:
+                forbidden[colors[w]] = v
+        for w in neighbors[v]:
+            color_w = colors[w]
+            if color_w < 0:
+                # v and the colored neighbors of an uncolored vertex w will be the ends of a path through w
+                for x in neighbors[w]:
+                    if colors[x] >= 0 and x != v:
+                        forbidden[colors[x]] = v
+                continue
+            for x in neighbors[w]:
+                color_x = colors[x]
+                if color_x < 0 or x == v or forbidden[color_x] == v:
+                    continue
+                # the path v, w, x, y would be 2 colored if v took the color of x
+                for y in neighbors[x]:
+                    if y != w and colors[y] == color_w:
+                        forbidden[color_x] = v
+                        break
+        color = 0
+        while forbidden[color] == v:
+            color += 1
+        colors[v] = color
+    return np.array(colors, dtype=np.int64)
+
+
+def sparse_jacobian(function, x, pattern=None, seed=1, dtype=float):
+    r"""Compute the value and the sparse Jacobian of function at x with one evaluation per color
+
+    The columns of the Jacobian are colored with color_columns, and the function is evaluated once
+    with a compressed seed matrix that has one column per color, so every input variable carries a
+    derivative vector as wide as the number of colors. Each entry of the Jacobian is read from the
+    compressed column of the color of its column.
+
+    Parameters
+    ----------
+    function: a scalar function, or a vector or matrix of functions of DualNumbers objects
+    x: a scalar or a 1D array with the evaluation point
+    pattern: a SparseMatrix object with the sparsity pattern of the Jacobian (default None, which detects
+             the pattern at x with jacobian_sparsity). Pass the pattern to reuse it at other points
+    seed: a scalar seed for every input variable or a seed vector that scales the columns of the Jacobian
+          (default 1)
+    dtype: the floating point dtype of the values and derivatives (default float)
+
+    Returns
+    -------
+    A tuple of the value of the function, in the format of ForwardMode.calculate_dual_number, and a
+    SparseMatrix object with the Jacobian, which has a single row for a scalar function and the outputs
+    of a matrix function in row-major order
+
+    Raises
+    ------
+    ValueError if the seed vector length mismatchs with the number of input variables
+
+    Examples
+    --------
+    >>> func = lambda x, y, z: (x * y, y + z, z ** 2)
+    >>> val, J = sparse_jacobian(func, np.array([1., 2., 3.]))
+    >>> val
+    array([2., 5., 9.])
+    >>> J.toarray()
+    array([[2., 1., 0.],
+           [0., 1., 1.],
+           [0., 0., 6.]])
+    """
+    inputs = np.atleast_1d(np.asarray(x, dtype=dtype))
+    input_num = len(inputs)
+    seed = np.asarray(seed, dtype=dtype)
+    if seed.ndim and seed.shape != (input_num,):
+        raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+    if pattern is None:
+        pattern = jacobian_sparsity(function, inputs)
+
+    # the compressed seed matrix has the seed of every column in the column of its color
+    colors = color_columns(pattern)
+    compressed = np.zeros((input_num, max(colors.max(initial=-1) + 1, 1)), dtype=dtype)
+    compressed[np.arange(input_num), colors] = seed
+    z = function(*[DualNumbers._make(val, compressed[i]) for i, val in enumerate(inputs)])
+
+    # a batched dual output holds every output of a vector function
+    if isinstance(z, DualArray):
+        func_val, compressed_der = z.val, z.derv
+    elif isinstance(z, DualNumbers):
+        func_val = float(z.val) if input_num == 1 else z.val
+        compressed_der = np.atleast_2d(z.derv)
+    elif isinstance(z, (int, float, np.number)):
+        # a constant function has a zero Jacobian
+        func_val = z
+        compressed_der = np.zeros((1, compressed.shape[1]), dtype=dtype)
+    else:
+        # an output that does not depend on any input variable has a zero row
+        shape, flat = _flatten_outputs(z)
+        compressed_der = np.zeros((len(flat), compressed.shape[1]), dtype=dtype)
+        for i, funct in enumerate(flat):
+            if isinstance(funct, DualNumbers):
+                compressed_der[i] = funct.derv
+        func_val = np.array([funct.val if isinstance(funct, DualNumbers) else funct for funct in flat],
+                            dtype=dtype).reshape(shape)
+    data = compressed_der[pattern.row, colors[pattern.col]]
+    return func_val, SparseMatrix(pattern.row, pattern.col, data, pattern.shape)
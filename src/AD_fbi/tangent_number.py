@@ -0,0 +1,411 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: tangent_number.py                                                       #
+# Description: This class defines the variables and the tape of tangent over    #
+# reverse mode automatic differentiation. Every node carries the derivative of  #
+# its value along a direction v, and the tape also records the derivatives of   #
+# the local partials along v, so that one backward sweep gives the gradient     #
+# and the Hessian-vector product H v together.                                  #
+#################################################################################
+
+import math
+
+import numpy as np
+from .dual_number import _SCALAR_TYPES, _int_power, _is_integer, _logistic_kernel
+from .reverse_number import (ReverseNumbers, Tape, _ADD, _SUB, _MUL, _DIV, _NEG, _POW, _LOG, _EXP, _SIN,
+                             _COS, _TAN, _SINH, _COSH, _TANH, _ARCSIN, _ARCCOS, _ARCTAN, _LOGISTIC, _SOFTPLUS)
+
+
+class TangentTape(Tape):
+    r"""A class representing a tape that also records the derivatives of the local partials along a direction
+
+    The op codes, operands and partials are kept in the typed arrays of Tape, so the backward and
+    vjp methods of Tape compute gradients from a TangentTape as well. The derivatives of the partials
+    along the direction are floats for a single direction, or 1D arrays of length k for a block of k
+    directions, and are kept in lists next to the typed arrays.
+
+    Examples
+    --------
+    >>> tape = TangentTape()
+    >>> x = TangentNumbers(2., 1., tape)
+    >>> z = x ** 3
+    >>> tape.backward_tangent([z.index], 1)
+    (array([12.]), array([12.]))
+    """
+
+    __slots__ = ('_dleft_dot', '_dright_dot')
+
+    def __init__(self):
+        r"""A constructor to create an empty TangentTape object"""
+        super().__init__()
+        self._dleft_dot = []
+        self._dright_dot = []
+
+    def record(self, op, left, dleft, right=-1, dright=0., dleft_dot=0., dright_dot=0.):
+        r"""A method to append a node to the tape
+
+        Parameters
+        ----------
+        op: integer op code of the operation, an index into OP_NAMES
+        left: index of the first operand on the tape, or -1
+        dleft: partial derivative of the node with respect to the first operand
+        right: index of the second operand on the tape (default -1, for no second operand)
+        dright: partial derivative of the node with respect to the second operand (default 0)
+        dleft_dot: derivative of dleft along the direction (default 0)
+        dright_dot: derivative of dright along the direction (default 0)
+
+        Returns
+        -------
+        The index of the new node
+        """
+        self._dleft_dot.append(dleft_dot)
+        self._dright_dot.append(dright_dot)
+        return super().record(op, left, dleft, right, dright)
+
+    def backward_tangent(self, outputs, input_num):
+        r"""A method to compute the gradient of the outputs and its derivative along the direction
+
+        The adjoint a of every node is accumulated as in Tape.backward, and its derivative along the
+        direction by the product rule, adding a_dot * p + a * p_dot to the operands, where p is the
+        partial derivative of the node with respect to an operand and p_dot its derivative.
+
+        Parameters
+        ----------
+        outputs: list of the indices of the output nodes, whose adjoints are summed
+        input_num: the number of input variables, which are the first nodes of the tape
+
+        Returns
+        -------
+        A tuple of the gradient, a 1D array with one entry per input variable, and its derivative along
+        the direction, H v, of shape (input_num,) for a single direction or (input_num, k) for k directions
+        """
+        size = len(self)
+        left, right = self._left.tolist(), self._right.tolist()
+        dleft, dright = self._dleft.tolist(), self._dright.tolist()
+        dleft_dot, dright_dot = self._dleft_dot, self._dright_dot
+
+        # the extra last entries collect the missing operands of index -1
+        adjoint = [0.] * (size + 1)
+        tangent = [0.] * (size + 1)
+        for output in outputs:
+            adjoint[output] += 1.
+        for i in range(max(outputs, default=-1), input_num - 1, -1):
+            a, t = adjoint[i], tangent[i]
+            l, r = left[i], right[i]
+            adjoint[l] += a * dleft[i]
+            adjoint[r] += a * dright[i]
+            tangent[l] = tangent[l] + t * dleft[i] + a * dleft_dot[i]
+            tangent[r] = tangent[r] + t * dright[i] + a * dright_dot[i]
+        # an input variable that the outputs do not depend on keeps a scalar zero tangent
+        shape = np.broadcast_shapes(*[np.shape(t) for t in tangent[:input_num]])
+        return np.array(adjoint[:input_num]), np.array([np.broadcast_to(t, shape) for t in tangent[:input_num]])
+
+
+class TangentNumbers(ReverseNumbers):
+    r"""A class representing a variable object of tangent over reverse mode automatic differentiation
+
+    A TangentNumbers object is a ReverseNumbers object that also carries the derivative of its
+    value along a direction v, a float or a 1D array for a block of directions. Every operation
+    records its partials and their derivatives along v with the second order chain rule, so the
+    backward sweep of the tape differentiates the gradient along v.
+
+    Instance Variables
+    ----------
+    val: value of the TangentNumbers object
+    dot: derivative of the value along the direction
+    index: index of the node of the TangentNumbers object on its tape
+    tape: the TangentTape object that records the operations
+
+    Examples
+    --------
+    >>> tape = TangentTape()
+    >>> x, y = TangentNumbers(1., 1., tape), TangentNumbers(2., 0., tape)
+    >>> z = x * x * y
+    >>> tape.backward_tangent([z.index], 2)
+    (array([4., 1.]), array([4., 2.]))
+    """
+
+    __slots__ = ('_dot',)
+
+    def __init__(self, val, dot, tape=None):
+        r"""A constructor to create TangentNumbers object as a new input variable of a tape
+
+        Parameters
+        ----------
+        val: integer or float object that represents the value of TangentNumbers object
+        dot: float object, or a 1D array for a block of directions, with the entry of the direction
+        tape: the TangentTape object to record the input variable on (default None, which creates a new tape)
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError if the value is not an int or float
+        """
+        super().__init__(val, TangentTape() if tape is None else tape)
+        self._dot = dot
+
+    @classmethod
+    def _make(cls, val, dot, tape, index):
+        r"""An internal constructor that creates a TangentNumbers object for a node that is already recorded"""
+        obj = object.__new__(cls)
+        obj._val = val
+        obj._dot = dot
+        obj._index = index
+        obj._tape = tape
+        return obj
+
+    @property
+    def dot(self):
+        r"""A method to retrieve the derivative of the value along the direction"""
+        return self._dot
+
+    def _chain(self, op, f, f_prime, f_second):
+        r"""An internal method to record an elementary function with its first and second derivatives at the value"""
+        tape = self._tape
+        return self._make(f, f_prime * self._dot, tape, tape.record(op, self._index, f_prime,
+                                                                    dleft_dot=f_second * self._dot))
+
+    def __add__(self, other):
+        r"""A method to perform addition operation on the TangentNumbers object and the other object"""
+        if isinstance(other, TangentNumbers):
+            tape = self._operand(other)
+            return self._make(self._val + other._val, self._dot + other._dot, tape,
+                              tape.record(_ADD, self._index, 1., other._index, 1.))
+        if isinstance(other, _SCALAR_TYPES):
+            return self._chain(_ADD, self._val + other, 1., 0.)
+        return NotImplemented
+
+    def __radd__(self, other):
+        r"""A method to perform the reverse addition operation on the TangentNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            return self._chain(_ADD, other + self._val, 1., 0.)
+        return NotImplemented
+
+    def __sub__(self, other):
+        r"""A method to perform subtraction operation on the TangentNumbers object and the other object"""
+        if isinstance(other, TangentNumbers):
+            tape = self._operand(other)
+            return self._make(self._val - other._val, self._dot - other._dot, tape,
+                              tape.record(_SUB, self._index, 1., other._index, -1.))
+        if isinstance(other, _SCALAR_TYPES):
+            return self._chain(_SUB, self._val - other, 1., 0.)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        r"""A method to perform the reverse subtraction operation on the TangentNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            return self._chain(_SUB, other - self._val, -1., 0.)
+        return NotImplemented
+
+    def __mul__(self, other):
+        r"""A method to perform multiplication operation on the TangentNumbers object and the other object"""
+        if isinstance(other, TangentNumbers):
+            tape = self._operand(other)
+            # the partial with respect to each operand is the other operand, whose derivative is its tangent
+            return self._make(self._val * other._val, self._dot * other._val + self._val * other._dot, tape,
+                              tape.record(_MUL, self._index, other._val, other._index, self._val,
+                                          other._dot, self._dot))
+        if isinstance(other, _SCALAR_TYPES):
+            return self._chain(_MUL, self._val * other, other, 0.)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        r"""A method to perform the reverse multiplication operation on the TangentNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            return self._chain(_MUL, other * self._val, other, 0.)
+        return NotImplemented
+
+    def __truediv__(self, other):
+        r"""A method to perform division operation on the TangentNumbers object and the other object
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+        """
+        if isinstance(other, TangentNumbers):
+            tape = self._operand(other)
+            self._check_domain(other._val == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+            y = other._val
+            f = self._val / y
+            f_dot = (self._dot - f * other._dot) / y
+            # the partials 1 / y and -f / y, and their derivatives along the direction
+            return self._make(f, f_dot, tape, tape.record(_DIV, self._index, 1 / y, other._index, -f / y,
+                                                          -other._dot / (y * y), (f * other._dot / y - f_dot) / y))
+        if isinstance(other, _SCALAR_TYPES):
+            self._check_domain(other == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+            return self._chain(_DIV, self._val / other, 1 / other, 0.)
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        r"""A method to perform the reverse division operation on the TangentNumbers object and the other object
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+        """
+        if isinstance(other, _SCALAR_TYPES):
+            self._check_domain(self._val == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+            f = other / self._val
+            return self._chain(_DIV, f, -f / self._val, 2 * f / (self._val * self._val))
+        return NotImplemented
+
+    def __pow__(self, other):
+        r"""A method to perform power operation on the TangentNumbers object and the other object
+
+        Raises
+        ------
+        ValueError
+            If negative number is raised to a fraction power with an even denominator
+            If the power is less than 1 and differentiation occurs at 0
+            If the power is less than 2 and second order differentiation occurs at 0
+        """
+        if isinstance(other, TangentNumbers):
+            self._operand(other)
+            # avoid raising a negative number to a fraction power with an even denominator
+            self._check_domain((self._val < 0) and (other._val % 1 != 0),
+                               "Error: Attempted to raise a negative number to a fraction power with even denominator")
+            # avoid having a 0 derivative when the power is less than 1
+            self._check_domain((self._val == 0) and (other._val < 1),
+                               "Error: Attempted to find derivative at 0 when the power is less than 1")
+            # x ** y = exp(y log(x)) carries the mixed second derivatives of both operands
+            return (other * self.log()).exp()
+        if not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
+
+        # an integer power of at least 2 is defined everywhere and is computed by repeated multiplication
+        if _is_integer(other) and other >= 2:
+            f_second = other * (other - 1) * (_int_power(self._val, other - 2) if other > 2 else 1.)
+            return self._chain(_POW, _int_power(self._val, other), other * _int_power(self._val, other - 1), f_second)
+
+        # avoid raising a negative number to a fraction power with an even denominator
+        self._check_domain((self._val < 0) and (other % 1 != 0),
+                           "Error: Attempted to raise a negative number to a fraction power with even denominator")
+        # avoid having a 0 derivative when the power is less than 1
+        self._check_domain((self._val == 0) and (other < 1),
+                           "Error: Attempted to find derivative at 0 when power is less than 1")
+        # the second derivative of x ** p is unbounded at 0 for 1 < p < 2
+        self._check_domain((self._val == 0) and (other < 2) and (other != 1),
+                           "Error: Attempted to find second derivative at 0 when power is less than 2")
+        f_second = 0. if other == 1 else other * (other - 1) * self._val ** (other - 2)
+        return self._chain(_POW, self._val ** other, other * self._val ** (other - 1), f_second)
+
+    def __rpow__(self, other):
+        r"""A method to perform the reverse power operation on the TangentNumbers object and the other object"""
+        if isinstance(other, _SCALAR_TYPES):
+            f = other ** self._val
+            log_other = np.log(other)
+            return self._chain(_POW, f, f * log_other, f * log_other ** 2)
+        return NotImplemented
+
+    def __neg__(self):
+        r"""A method to perform the negation operation on the TangentNumbers object"""
+        return self._chain(_NEG, -self._val, -1., 0.)
+
+    def log(self, base=None):
+        r"""method to compute the value and derivatives of the logarithm with the natural base or the given base
+
+        Raises
+        ------
+        ValueError
+            If self.val is less than or equal to zero
+            If input base is less than or equal to zero or equal to one
+        """
+        self._check_domain(self._val <= 0, "ERROR: Value for log should be greater than 0")
+        if base is None:
+            scale = 1.
+        elif base <= 0 or base == 1:
+            raise ValueError("ERROR: LOG base should be greater than 0 and not equal to 1")
+        else:
+            scale = 1 / math.log(base)
+        return self._chain(_LOG, math.log(self._val) * scale, scale / self._val, -scale / self._val ** 2)
+
+    def exp(self):
+        r"""method to compute the value and derivatives of the exponential function"""
+        # NumPy returns inf instead of raising an error when the value overflows
+        f = float(np.exp(self._val))
+        return self._chain(_EXP, f, f, f)
+
+    def sin(self):
+        r"""method to compute the value and derivatives of the sine function"""
+        sin, cos = math.sin(self._val), math.cos(self._val)
+        return self._chain(_SIN, sin, cos, -sin)
+
+    def cos(self):
+        r"""method to compute the value and derivatives of the cosine function"""
+        sin, cos = math.sin(self._val), math.cos(self._val)
+        return self._chain(_COS, cos, -sin, -cos)
+
+    def sincos(self):
+        r"""method to compute the values and derivatives of the sine and cosine functions together"""
+        sin, cos = math.sin(self._val), math.cos(self._val)
+        return self._chain(_SIN, sin, cos, -sin), self._chain(_COS, cos, -sin, -cos)
+
+    def tan(self):
+        r"""method to compute the value and derivatives of the tangent function
+
+        Raises
+        ------
+        ValueError if the input is an odd multiple of pi/2
+        """
+        self._check_domain((self._val / (np.pi / 2)) % 2 == 1, "ERROR: Input to tan should not be an odd mutiple of pi/2")
+        tan = math.tan(self._val)
+        sec2 = 1 + tan * tan
+        return self._chain(_TAN, tan, sec2, 2 * tan * sec2)
+
+    def sinh(self):
+        r"""method to compute the value and derivatives of the hyperbolic sine function"""
+        sinh, cosh = float(np.sinh(self._val)), float(np.cosh(self._val))
+        return self._chain(_SINH, sinh, cosh, sinh)
+
+    def cosh(self):
+        r"""method to compute the value and derivatives of the hyperbolic cosine function"""
+        sinh, cosh = float(np.sinh(self._val)), float(np.cosh(self._val))
+        return self._chain(_COSH, cosh, sinh, cosh)
+
+    def tanh(self):
+        r"""method to compute the value and derivatives of the hyperbolic tangent function"""
+        tanh = math.tanh(self._val)
+        sech2 = 1 - tanh * tanh
+        return self._chain(_TANH, tanh, sech2, -2 * tanh * sech2)
+
+    def arcsin(self):
+        r"""method to compute the value and derivatives of the inverse sine function
+
+        Raises
+        ------
+        ValueError if the input is not strictly between -1 and 1
+        """
+        self._check_domain((self._val <= -1) or (self._val >= 1), "ERROR: Input to arcsin() should be between -1 and 1")
+        f_prime = 1 / math.sqrt(1 - self._val ** 2)
+        return self._chain(_ARCSIN, math.asin(self._val), f_prime, self._val * f_prime ** 3)
+
+    def arccos(self):
+        r"""method to compute the value and derivatives of the inverse cosine function
+
+        Raises
+        ------
+        ValueError if the input is not strictly between -1 and 1
+        """
+        self._check_domain((self._val <= -1) or (self._val >= 1), "ERROR: Input to arccos() should be between -1 and 1")
+        f_prime = 1 / math.sqrt(1 - self._val ** 2)
+        return self._chain(_ARCCOS, math.acos(self._val), -f_prime, -self._val * f_prime ** 3)
+
+    def arctan(self):
+        r"""method to compute the value and derivatives of the inverse tangent function"""
+        f_prime = 1 / (1 + self._val ** 2)
+        return self._chain(_ARCTAN, math.atan(self._val), f_prime, -2 * self._val * f_prime ** 2)
+
+    def logistic(self):
+        r"""method to compute the value and derivatives of the logistic function 1 / (1 + exp(-x))"""
+        f, f_prime, _ = _logistic_kernel(self._val)
+        f, f_prime = float(f), float(f_prime)
+        return self._chain(_LOGISTIC, f, f_prime, f_prime * (1 - 2 * f))
+
+    def softplus(self):
+        r"""method to compute the value and derivatives of the softplus function log(1 + exp(x))"""
+        f_prime, f_second, e = _logistic_kernel(self._val)
+        f = float(np.maximum(self._val, 0) + np.log1p(e))
+        return self._chain(_SOFTPLUS, f, float(f_prime), float(f_second))
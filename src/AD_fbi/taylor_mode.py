@@ -0,0 +1,150 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen                 #
+# Course: AC207/CS107                                                                  #
+# File: taylor_mode.py                                                                 #
+# Description: Perform higher order forward mode automatic differentiation with        #
+# truncated Taylor polynomials, enabling a user to output the function value and all   #
+# derivatives up to order K along a seed direction from a single evaluation            #
+########################################################################################
+
+
+import numpy as np
+from .taylor_number import TaylorNumbers, _factorials
+
+
+class TaylorMode:
+    """
+    A class to perform higher order forward mode automatic differentiation, enabling a user
+    to output the derivatives of order 0 to K of the input function along the seed direction,
+    i.e. the derivatives of t -> f(x + t * seed) at t = 0, from a single evaluation.
+
+    Instance Variables
+    ----------
+    input_values: a scalar or a vector which indicates the evaluation point
+    input_function: a scalar function or a vector of functions
+    order: the highest derivative order K
+    seed: a seed vector (optional parameter: default value = 1 or np.ones(len(self.inputs))
+
+    Examples
+    --------
+    # get the derivatives of order 0 to 4 of a univariate scalar function
+    >>> func = lambda x: x.sin()
+    >>> tm = TaylorMode(0, func, 4)
+    >>> tm.get_derivatives()
+    array([ 0.,  1.,  0., -1.,  0.])
+
+    # get the derivatives of a multivariate scalar function along the seed direction
+    >>> func = lambda x, y: x * y
+    >>> tm = TaylorMode(np.array([1, 2]), func, 2, [1, 1])
+    >>> tm.get_derivatives()
+    array([2., 3., 2.])
+    """
+
+    def __init__(self, input_values, input_function, order, seed = "default seed"):
+        self.inputs = input_values
+        self.functions = input_function
+        self.order = order
+
+        # if there is no input value for seed
+        if isinstance(seed, str) and seed == 'default seed':
+            # if the input variable is a scalar
+            if np.isscalar(self.inputs):
+                self.seed = 1
+
+            # if the input variable is an array
+            else:
+                self.seed = np.ones(len(self.inputs))
+
+        # if seed is specified by the user
+        else:
+            self.seed = seed
+
+    def get_fx_value(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        value of the input function at the evaluation point
+
+        Examples
+        --------
+        >>> func = lambda x: x.exp()
+        >>> tm = TaylorMode(0, func, 3)
+        >>> tm.get_fx_value()
+        1.0
+        """
+
+        derivatives = self.get_derivatives()
+        # a vector function has one row of derivatives per output
+        if derivatives.ndim == 2:
+            return derivatives[:, 0]
+        return float(derivatives[0])
+
+    def get_derivatives(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the derivatives of order 0 to K of the input function along the seed direction, as a 1D array
+        of length K + 1 for a scalar function or a 2D array with one row per output of a vector function
+
+        Examples
+        --------
+        >>> func = lambda x: (x**3, x.exp())
+        >>> tm = TaylorMode(1, func, 3)
+        >>> tm.get_derivatives()
+        array([[1.        , 3.        , 6.        , 6.        ],
+               [2.71828183, 2.71828183, 2.71828183, 2.71828183]])
+        """
+
+        return self.calculate_taylor_coefficients() * _factorials(self.order)
+
+    def calculate_taylor_coefficients(self):
+        """
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        the Taylor coefficients f^(k) / k! for k = 0, ..., K of the input function along the seed direction,
+        as a 1D array of length K + 1 for a scalar function or a 2D array with one row per output of a
+        vector function
+
+        Raises
+        ------
+        ValueError if the seed vector length mismatchs with the number of input variables
+
+        Examples
+        --------
+        >>> func = lambda x: 1 / (1 - x)
+        >>> tm = TaylorMode(0, func, 3)
+        >>> tm.calculate_taylor_coefficients()
+        array([1., 1., 1., 1.])
+        """
+        inputs = np.atleast_1d(np.asarray(self.inputs, dtype=float))
+        input_num = len(inputs)
+
+        # get the seed for each input variable
+        if np.isscalar(self.seed):
+            seed = np.full(input_num, self.seed, dtype=float)
+        else:
+            seed = np.asarray(self.seed, dtype=float)
+            if input_num != len(seed):
+                raise ValueError("ERROR: Seed vector length mismatchs with the number of input variables.")
+
+        taylor_list = [TaylorNumbers.variable(inputs[i], self.order, seed[i]) for i in range(input_num)]
+
+        z = self.functions(*taylor_list)
+
+        try:
+            # input function is a scalar function
+            return z.coefficients
+        except AttributeError:
+            # input function is an array function
+            return np.stack([funct.coefficients for funct in z])
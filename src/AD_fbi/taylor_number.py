@@ -0,0 +1,535 @@
+# Authors: Wenxu Liu, Queenie Luo, Guangya Wan, Mengyao Zheng, Di Zhen          #
+# Course: AC207/CS107                                                           #
+# File: taylor_number.py                                                        #
+# Description: This class defines the truncated Taylor polynomial object to be  #
+# used in higher order forward mode automatic differentiation. The object       #
+# stores the Taylor coefficients f^(k) / k! for k = 0, ..., K along one         #
+# direction, and its elementary functions use the O(K^2) coefficient            #
+# recurrences instead of nesting DualNumbers K times.                           #
+#################################################################################
+
+import math
+
+import numpy as np
+
+
+class TaylorNumbers:
+    r"""A class representing a truncated Taylor polynomial to be used in higher order automatic differentiation
+
+    The coefficient k of the object is the k-th derivative along the seed direction divided by k!.
+    Products and quotients use the Cauchy product, and every elementary function uses the standard
+    recurrence of its Taylor coefficients, so evaluating a function to order K costs O(K^2).
+
+    Instance Variables
+    ----------
+    coefficients: 1D float array with the K + 1 Taylor coefficients of the object
+
+    Returns
+    -------
+    A TaylorNumbers object that contains the Taylor coefficients
+
+    Examples
+    --------
+    >>> x = TaylorNumbers.variable(0., 4)
+    >>> print(x.exp())
+    Coefficients: [1.         1.         0.5        0.16666667 0.04166667]
+    >>> print(x.exp().derivatives())
+    [1. 1. 1. 1. 1.]
+    """
+
+    # store the coefficients in a fixed slot instead of a per-object __dict__
+    __slots__ = ('_coefficients',)
+
+    def __init__(self, coefficients):
+        r"""A constructor to create TaylorNumbers object from its Taylor coefficients
+
+        Parameters
+        ----------
+        coefficients: 1D array of integers or floats with the Taylor coefficients f^(k) / k! for k = 0, ..., K
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError
+            If the coefficients are not a non-empty 1D array of integers or floats
+        """
+        try:
+            coefficients = np.array(coefficients, dtype=float)
+        except (TypeError, ValueError):
+            raise TypeError('Error: Coefficients should be a 1D array of ints or floats')
+        if coefficients.ndim != 1 or len(coefficients) == 0:
+            raise TypeError('Error: Coefficients should be a 1D array of ints or floats')
+        self._coefficients = coefficients
+
+    @classmethod
+    def _make(cls, coefficients):
+        r"""An internal constructor that creates a TaylorNumbers object without validating its coefficients"""
+        obj = object.__new__(cls)
+        obj._coefficients = coefficients
+        return obj
+
+    @classmethod
+    def variable(cls, val, order, direction=1):
+        r"""A method to create the Taylor polynomial of an input variable x + t * direction
+
+        Parameters
+        ----------
+        val: integer or float object with the value of the input variable
+        order: integer object with the highest derivative order K
+        direction: integer or float object with the seed of the input variable (default 1)
+
+        Returns
+        -------
+        A TaylorNumbers object with the coefficients [val, direction, 0, ..., 0]
+
+        Raises
+        ------
+        ValueError if order is negative
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(2, 3, -1))
+        Coefficients: [ 2. -1.  0.  0.]
+        """
+        if order < 0:
+            raise ValueError('Error: Order should be a non-negative integer')
+        coefficients = np.zeros(int(order) + 1)
+        coefficients[0] = val
+        if order > 0:
+            coefficients[1] = direction
+        return cls._make(coefficients)
+
+    @staticmethod
+    def _check_domain(invalid, message, error=ValueError):
+        r"""An internal method to raise an error when an operation is evaluated outside of its domain"""
+        if invalid:
+            raise error(message)
+
+    @property
+    def coefficients(self):
+        r"""A method to retrieve the Taylor coefficients of TaylorNumbers object"""
+        return self._coefficients
+
+    @property
+    def val(self):
+        r"""A method to retrieve the value of TaylorNumbers object, i.e. its coefficient of order 0"""
+        return self._coefficients[0]
+
+    @property
+    def order(self):
+        r"""A method to retrieve the highest derivative order K of TaylorNumbers object"""
+        return len(self._coefficients) - 1
+
+    def derivatives(self):
+        r"""A method to compute the derivatives of order 0 to K along the seed direction
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        1D float array with the K + 1 derivatives k! * coefficient k
+
+        Examples
+        --------
+        >>> print((TaylorNumbers.variable(1., 3) ** 3).derivatives())
+        [1. 3. 6. 6.]
+        """
+        return self._coefficients * _factorials(self.order)
+
+    def __repr__(self):
+        r"""A method to overload the string representation for TaylorNumbers object
+
+        Examples
+        --------
+        >>> print(TaylorNumbers([1, 2]))
+        Coefficients: [1. 2.]
+        """
+        return f'Coefficients: {self._coefficients}'
+
+    # make NumPy arrays defer to the TaylorNumbers operators in mixed binary operations
+    __array_priority__ = 1000
+
+    def _coefficients_of(self, other):
+        r"""An internal method to truncate the coefficients of both operands to the lower of their orders"""
+        order = min(self.order, other.order)
+        return self._coefficients[:order + 1], other._coefficients[:order + 1]
+
+    def __add__(self, other):
+        r"""A method to perform addition operation on the TaylorNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or TaylorNumbers object
+
+        Returns
+        -------
+        A TaylorNumbers object as the result of the addition operation
+
+        Examples
+        --------
+        >>> print(TaylorNumbers([1, 2, 3]) + 1)
+        Coefficients: [2. 2. 3.]
+        """
+        # perform addition if other is a Taylor polynomial
+        if isinstance(other, TaylorNumbers):
+            a, b = self._coefficients_of(other)
+            return self._make(a + b)
+        # perform addition if other is a real number
+        coefficients = self._coefficients.copy()
+        coefficients[0] += other
+        return self._make(coefficients)
+
+    def __radd__(self, other):
+        r"""A method to perform the reverse addition operation on the TaylorNumbers object and the other object"""
+        return self + other
+
+    def __sub__(self, other):
+        r"""A method to perform subtraction operation on the TaylorNumbers object and the other object"""
+        return self + (-other)
+
+    def __rsub__(self, other):
+        r"""A method to perform the reverse subtraction operation on the TaylorNumbers object and the other object"""
+        return (-self) + other
+
+    def __neg__(self):
+        r"""A method to perform the negation operation on the TaylorNumbers object"""
+        return self._make(-self._coefficients)
+
+    def __mul__(self, other):
+        r"""A method to perform multiplication operation on the TaylorNumbers object and the other object
+
+        Parameters
+        ----------
+        other: float/integer object or TaylorNumbers object
+
+        Returns
+        -------
+        A TaylorNumbers object with the truncated Cauchy product of the coefficients
+
+        Examples
+        --------
+        >>> x = TaylorNumbers.variable(1., 3)
+        >>> print(x * x)
+        Coefficients: [1. 2. 1. 0.]
+        """
+        # perform multiplication if other is a Taylor polynomial
+        if isinstance(other, TaylorNumbers):
+            a, b = self._coefficients_of(other)
+            return self._make(np.convolve(a, b)[:len(a)])
+        # perform multiplication if other is a real number
+        return self._make(self._coefficients * other)
+
+    def __rmul__(self, other):
+        r"""A method to perform the reverse multiplication operation on the TaylorNumbers object and the other object"""
+        return self * other
+
+    def __truediv__(self, other):
+        r"""A method to perform division operation on the TaylorNumbers object and the other object
+
+        The coefficients of c = a / b follow c_k = (a_k - sum_{j=1}^{k} b_j c_{k-j}) / b_0.
+
+        Parameters
+        ----------
+        other: float/integer object or TaylorNumbers object
+
+        Returns
+        -------
+        A TaylorNumbers object as the result of the division operation
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+
+        Examples
+        --------
+        >>> print(1 / (1 - TaylorNumbers.variable(0., 3)))
+        Coefficients: [1. 1. 1. 1.]
+        """
+        # perform division if other is a Taylor polynomial
+        if isinstance(other, TaylorNumbers):
+            # avoid zero division
+            self._check_domain(other.val == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+            a, b = self._coefficients_of(other)
+            c = np.empty_like(a)
+            for k in range(len(a)):
+                c[k] = (a[k] - np.dot(b[1:k + 1], c[k - 1::-1] if k else c[:0])) / b[0]
+            return self._make(c)
+        # perform division if other is a real number
+        self._check_domain(other == 0, "Error: Denominator in division should not be 0", ZeroDivisionError)
+        return self._make(self._coefficients / other)
+
+    def __rtruediv__(self, other):
+        r"""A method to perform the reverse division operation on the TaylorNumbers object and the other object
+
+        Raises
+        ------
+        ZeroDivisionError if denominator in division is zero
+        """
+        constant = np.zeros_like(self._coefficients)
+        constant[0] = other
+        return self._make(constant) / self
+
+    def __pow__(self, other):
+        r"""A method to perform power operation on the TaylorNumbers object and the other object
+
+        The coefficients of w = u ** p follow w_k = sum_{j=1}^{k} (p j - k + j) u_j w_{k-j} / (k u_0). A
+        non-negative integer power is computed by repeated multiplication, which is also defined at u_0 = 0.
+
+        Parameters
+        ----------
+        other: float/integer object or TaylorNumbers object
+
+        Returns
+        -------
+        A TaylorNumbers object as the result of the power operation
+
+        Raises
+        ------
+        ValueError
+            If negative number is raised to a fraction power with an even denominator
+            If the power is not a non-negative integer and differentiation occurs at 0
+            If a non-positive number is raised to a TaylorNumbers power
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(1., 3) ** 0.5)
+        Coefficients: [ 1.      0.5    -0.125   0.0625]
+        """
+        # perform power operation if other is a Taylor polynomial
+        if isinstance(other, TaylorNumbers):
+            # x ** y = exp(y log(x))
+            return (other * self.log()).exp()
+
+        # perform power operation if other is a real number
+        # a non-negative integer power is exact at every value by binary exponentiation
+        if other % 1 == 0 and other >= 0:
+            result, base, exponent = self._make(np.zeros_like(self._coefficients)) + 1, self, int(other)
+            while exponent:
+                if exponent & 1:
+                    result = result * base
+                base = base * base
+                exponent >>= 1
+            return result
+        # avoid raising a negative number to a fraction power with an even denominator
+        self._check_domain(self.val < 0 and other % 1 != 0,
+                           "Error: Attempted to raise a negative number to a fraction power with even denominator")
+        # avoid having a 0 derivative when the power is not a non-negative integer
+        self._check_domain(self.val == 0, "Error: Attempted to find derivative at 0 when power is less than 1")
+
+        u = self._coefficients
+        w = np.empty_like(u)
+        w[0] = u[0] ** other
+        for k in range(1, len(u)):
+            j = np.arange(1, k + 1)
+            w[k] = np.dot((other * j - k + j) * u[1:k + 1], w[k - 1::-1]) / (k * u[0])
+        return self._make(w)
+
+    def __rpow__(self, other):
+        r"""A method to perform the reverse power operation on the TaylorNumbers object and the other object
+
+        Raises
+        ------
+        ValueError if the base is not greater than 0
+        """
+        self._check_domain(other <= 0, "ERROR: Value for log should be greater than 0")
+        return (self * np.log(other)).exp()
+
+    def _integrate(self, f, h):
+        r"""An internal method to compute the coefficients of g with g(0) = f and g' = h u'
+
+        The coefficients follow g_k = sum_{j=1}^{k} j u_j h_{k-j} / k, where h holds the Taylor coefficients
+        of the derivative of the elementary function evaluated at the object.
+
+        Parameters
+        ----------
+        f: float object with the value of the elementary function at the value of the object
+        h: 1D float array with the Taylor coefficients of the derivative of the elementary function
+
+        Returns
+        -------
+        A TaylorNumbers object with the coefficients of g
+        """
+        u = self._coefficients
+        g = np.empty_like(u)
+        g[0] = f
+        for k in range(1, len(u)):
+            j = np.arange(1, k + 1)
+            g[k] = np.dot(j * u[1:k + 1], h[k - 1::-1]) / k
+        return self._make(g)
+
+    def sqrt(self):
+        r"""A method to compute the Taylor coefficients of the square root function
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(1., 2).sqrt())
+        Coefficients: [ 1.     0.5   -0.125]
+        """
+        return self.__pow__(0.5)
+
+    def log(self, base=None):
+        r"""A method to compute the Taylor coefficients of the logarithm
+
+        Parameters
+        ----------
+        base: A float object that represents the base of the logarithm (default logarithmic base is None)
+
+        Raises
+        ------
+        ValueError
+            If self.val is less than or equal to zero
+            If input base is less than or equal to zero
+            If input base is equal to one
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(1., 3).log())
+        Coefficients: [ 0.          1.         -0.5         0.33333333]
+        """
+        # ensure the value is greater than zero so that log is correctly defined
+        self._check_domain(self.val <= 0, "ERROR: Value for log should be greater than 0")
+        if base is not None and (base <= 0 or base == 1):
+            raise ValueError("ERROR: LOG base should be greater than 0 and not equal to 1")
+        # (log u)' = u' / u
+        result = self._integrate(np.log(self.val), (1 / self)._coefficients)
+        return result if base is None else result / np.log(base)
+
+    def exp(self):
+        r"""A method to compute the Taylor coefficients of the exponential function
+
+        The coefficients of e = exp(u) follow e_k = sum_{j=1}^{k} j u_j e_{k-j} / k.
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(0., 3).exp())
+        Coefficients: [1.         1.         0.5        0.16666667]
+        """
+        u = self._coefficients
+        e = np.empty_like(u)
+        e[0] = np.exp(u[0])
+        for k in range(1, len(u)):
+            j = np.arange(1, k + 1)
+            e[k] = np.dot(j * u[1:k + 1], e[k - 1::-1]) / k
+        return self._make(e)
+
+    def _sincos(self, hyperbolic=False):
+        r"""An internal method to compute the coefficients of sine and cosine, or their hyperbolic versions, together
+
+        The coefficients follow s_k = sum_{j=1}^{k} j u_j c_{k-j} / k and c_k = -+ sum_{j=1}^{k} j u_j s_{k-j} / k.
+        """
+        u = self._coefficients
+        s, c = np.empty_like(u), np.empty_like(u)
+        if hyperbolic:
+            s[0], c[0], sign = np.sinh(u[0]), np.cosh(u[0]), 1
+        else:
+            s[0], c[0], sign = np.sin(u[0]), np.cos(u[0]), -1
+        for k in range(1, len(u)):
+            ju = np.arange(1, k + 1) * u[1:k + 1]
+            s[k] = np.dot(ju, c[k - 1::-1]) / k
+            c[k] = sign * np.dot(ju, s[k - 1::-1]) / k
+        return self._make(s), self._make(c)
+
+    def sin(self):
+        r"""A method to compute the Taylor coefficients of the sine function
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(0., 3).sin())
+        Coefficients: [ 0.          1.          0.         -0.16666667]
+        """
+        return self._sincos()[0]
+
+    def cos(self):
+        r"""A method to compute the Taylor coefficients of the cosine function
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(0., 3).cos())
+        Coefficients: [ 1.  -0.  -0.5 -0. ]
+        """
+        return self._sincos()[1]
+
+    def tan(self):
+        r"""A method to compute the Taylor coefficients of the tangent function
+
+        Raises
+        ------
+        ValueError if input is an odd multiple of pi/2
+        """
+        # ensure the user does not input an odd multiple of pi divided by 2
+        self._check_domain((self.val / (np.pi / 2)) % 2 == 1, "ERROR: Input to tan should not be an odd mutiple of pi/2")
+        sin, cos = self._sincos()
+        return sin / cos
+
+    def sinh(self):
+        r"""A method to compute the Taylor coefficients of the hyperbolic sine function"""
+        return self._sincos(hyperbolic=True)[0]
+
+    def cosh(self):
+        r"""A method to compute the Taylor coefficients of the hyperbolic cosine function"""
+        return self._sincos(hyperbolic=True)[1]
+
+    def tanh(self):
+        r"""A method to compute the Taylor coefficients of the hyperbolic tangent function"""
+        sinh, cosh = self._sincos(hyperbolic=True)
+        return sinh / cosh
+
+    def arcsin(self):
+        r"""A method to compute the Taylor coefficients of the inverse sine function
+
+        Raises
+        ------
+        ValueError if input is not contained within the interval [-1,1]
+        """
+        # ensure the user passes in an input between -1 and 1
+        self._check_domain(self.val <= -1 or self.val >= 1, "ERROR: Input to arcsin() should be between -1 and 1")
+        # arcsin(u)' = u' (1 - u ** 2) ** -0.5
+        return self._integrate(np.arcsin(self.val), ((1 - self * self) ** -0.5)._coefficients)
+
+    def arccos(self):
+        r"""A method to compute the Taylor coefficients of the inverse cosine function
+
+        Raises
+        ------
+        ValueError if input is not contained within the interval [-1,1]
+        """
+        # ensure the user passes in an input between -1 and 1
+        self._check_domain(self.val <= -1 or self.val >= 1, "ERROR: Input to arccos() should be between -1 and 1")
+        # arccos(u)' = -u' (1 - u ** 2) ** -0.5
+        return self._integrate(np.arccos(self.val), -((1 - self * self) ** -0.5)._coefficients)
+
+    def arctan(self):
+        r"""A method to compute the Taylor coefficients of the inverse tangent function
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(0., 3).arctan())
+        Coefficients: [ 0.          1.          0.         -0.33333333]
+        """
+        # arctan(u)' = u' / (1 + u ** 2)
+        return self._integrate(np.arctan(self.val), (1 / (1 + self * self))._coefficients)
+
+    def logistic(self):
+        r"""A method to compute the Taylor coefficients of the logistic function"""
+        return 1 / ((-self).exp() + 1)
+
+    def softplus(self):
+        r"""A method to compute the Taylor coefficients of the softplus function log(1 + exp(u))
+
+        Examples
+        --------
+        >>> print(TaylorNumbers.variable(0., 3).softplus())
+        Coefficients: [0.69314718 0.5        0.125      0.        ]
+        """
+        # softplus(u)' = u' logistic(u)
+        return self._integrate(np.logaddexp(0, self.val), self.logistic()._coefficients)
+
+
+def _factorials(order):
+    r"""Return the 1D float array [0!, 1!, ..., order!]"""
+    return np.array([math.factorial(k) for k in range(order + 1)], dtype=float)
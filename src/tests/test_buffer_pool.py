@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+from AD_fbi.buffer_pool import BufferPool
+
+
+class TestBufferPool:
+    """Test class for BufferPool module"""
+
+    # test attribute initialization
+    def test_init(self):
+        pool = BufferPool()
+        assert pool.max_buffers == 8
+        assert pool.min_size == 4096
+        assert pool.stats() == {'hits': 0, 'misses': 0, 'returns': 0, 'free': 0}
+
+    def test_take_give(self):
+        pool = BufferPool(max_buffers=1, min_size=10)
+        a = pool.take((2, 10))
+        assert a.shape == (2, 10)
+        assert a.dtype == np.float64
+        assert pool.give(a)
+        assert pool.take((2, 10), np.float32) is not a
+        assert pool.take((10, 2)) is not a
+        assert pool.take((2, 10)) is a
+        assert pool.stats() == {'hits': 1, 'misses': 3, 'returns': 1, 'free': 0}
+        # the pool keeps at most max_buffers free arrays of each shape and dtype
+        assert pool.give(np.empty((2, 10)))
+        assert not pool.give(np.empty((2, 10)))
+        pool.clear()
+        assert pool.stats() == {'hits': 0, 'misses': 0, 'returns': 0, 'free': 0}
+
+    def test_give_rejected(self):
+        pool = BufferPool(min_size=10)
+        base = np.empty(100)
+        # views, small arrays, read-only and non-contiguous arrays are never pooled
+        assert not pool.give(base[:50])
+        assert not pool.give(np.empty(5))
+        assert not pool.give(np.broadcast_to(np.ones(1), (20,)))
+        assert not pool.give(np.empty((20, 20)).T.copy(order='F'))
+        assert not pool.give([0.] * 20)
+        small = pool.take((5,))
+        assert pool.stats()['misses'] == 0
@@ -0,0 +1,83 @@
+import math
+
+import pytest
+import numpy as np
+from AD_fbi.checkpointing import CheckpointedLoop, _binomial
+from AD_fbi.reverse_mode import ReverseMode
+
+
+def step(x, v):
+    v = v - 0.1 * (x.sin() + 0.1 * v)
+    return x + 0.1 * v, v
+
+
+def energy(x, v):
+    return 0.5 * v * v + (1 - x.cos())
+
+
+def unrolled(steps):
+    def function(x, v):
+        for _ in range(steps):
+            x, v = step(x, v)
+        return energy(x, v)
+    return function
+
+
+class TestCheckpointedLoop:
+    """Test class for CheckpointedLoop module"""
+
+    def test_init(self):
+        loop = CheckpointedLoop(step, energy, 1000)
+        assert loop.snapshots == 10
+        assert CheckpointedLoop(step, energy, 1).snapshots == 1
+        with pytest.raises(ValueError) as e:
+            CheckpointedLoop(step, energy, 0)
+        with pytest.raises(ValueError) as e:
+            CheckpointedLoop(step, energy, 10, -1)
+
+    def test_gradient(self):
+        x0 = np.array([1., 0.5])
+        for steps in (1, 2, 7, 100):
+            expected = ReverseMode(x0, unrolled(steps)).calculate_gradient()
+            for snapshots in (None, 0, 1, 3, steps):
+                loop = CheckpointedLoop(step, energy, steps, snapshots)
+                val, gradient = loop.value_and_gradient(x0)
+                assert val == pytest.approx(expected[0])
+                assert np.allclose(gradient, expected[1])
+                assert loop.get_fx_value(x0) == pytest.approx(expected[0])
+                assert np.allclose(loop.get_derivative(x0), expected[1])
+
+    def test_snapshots_and_recomputation(self):
+        steps = 100
+        x0 = np.array([1., 0.5])
+        forward_steps = []
+        for snapshots in (0, 1, 2, 7, 99):
+            loop = CheckpointedLoop(step, energy, steps, snapshots)
+            loop.value_and_gradient(x0)
+            assert loop.peak_snapshots <= snapshots
+            forward_steps.append(loop.stats()['forward_steps'])
+        # more snapshots recompute fewer steps, down to a single forward pass
+        assert forward_steps == sorted(forward_steps, reverse=True)
+        assert forward_steps[0] == steps * (steps - 1) // 2
+        assert forward_steps[-1] == steps - 1
+        # the binomial schedule recomputes the optimal number of steps r * T - C(s + 2, r - 1)
+        repetitions = 0
+        while _binomial(3, repetitions) < steps:
+            repetitions += 1
+        assert forward_steps[2] == repetitions * steps - math.comb(4 + repetitions - 1, 4)
+
+    def test_long_loop(self):
+        # a schedule with many snapshots does not recurse once per snapshot
+        loop = CheckpointedLoop(lambda x: x * 0.9999 + 0.001, lambda x: x * x, 5000, 4999)
+        val, gradient = loop.value_and_gradient(1.)
+        assert isinstance(gradient, float)
+        assert gradient == pytest.approx(2 * val ** 0.5 * 0.9999 ** 5000)
+
+    def test_constants(self):
+        # a state variable that does not depend on the state has no adjoint
+        loop = CheckpointedLoop(lambda x, y: (x * y, 2.), lambda x, y: x + y, 3)
+        val, gradient = loop.value_and_gradient(np.array([1., 3.]))
+        assert val == 14.
+        assert np.allclose(gradient, [12., 4.])
+        with pytest.raises(ValueError) as e:
+            CheckpointedLoop(lambda x, y: x, lambda x: x, 3).value_and_gradient(np.array([1., 2.]))
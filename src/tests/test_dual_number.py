@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
-from AD_fbi.dual_number import DualNumbers, is_numeric
+from AD_fbi.dual_number import DualNumbers, DualArray, DomainContext, is_numeric
+from AD_fbi.buffer_pool import BufferPool
 
 z0 = DualNumbers(1, 2)
 z1 = DualNumbers(1, -1)
@@ -407,4 +408,387 @@ class TestDualNumbers:
         logi_scalar2 = z3.logistic()
         assert pytest.approx((1 / (1 + np.exp(-2)))) == logi_scalar2.val
         assert pytest.approx((6.036 * np.exp(-2) / ((np.exp(-2) + 1) ** 2))) == logi_scalar2.derv
+        # the value and derivative stay finite far from 0
+        for x in [-800., 800.]:
+            logi = DualNumbers(x, 1.).logistic()
+            assert logi.val == (x > 0) and logi.derv == 0
+        assert DualNumbers(-40., 1.).logistic().val == pytest.approx(np.exp(-40.))
+        logi = DualNumbers(-2, 6.036).logistic()
+        assert pytest.approx(1 / (1 + np.exp(2))) == logi.val
+        assert pytest.approx(6.036 * np.exp(2) / ((np.exp(2) + 1) ** 2)) == logi.derv
 
+    # test scalar softplus function
+    def test_softplus_scalar(self):
+        soft = z3.softplus()
+        assert pytest.approx(np.log(1 + np.exp(2))) == soft.val
+        assert pytest.approx(6.036 / (1 + np.exp(-2))) == soft.derv
+        assert DualNumbers(800., 1.).softplus().val == 800.
+        assert DualNumbers(-40., 1.).softplus().val == pytest.approx(np.exp(-40.))
+
+    # test the shared sine and cosine computation
+    def test_sincos(self):
+        sin, cos = x2.sincos()
+        assert sin == x2.sin()
+        assert cos == x2.cos()
+        assert all(cos.derv == x2.cos().derv)
+
+
+    # test NumPy ufunc dispatch to the derivative rules
+    def test_array_ufunc(self):
+        out = np.sin(z3)
+        assert pytest.approx(np.sin(2)) == out.val
+        assert pytest.approx(np.cos(2) * 6.036) == out.derv
+        out = np.log10(z3)
+        assert pytest.approx(np.log10(2)) == out.val
+        out = np.float64(2) * x1 + np.int64(1)
+        assert out.val == 3
+        assert all(out.derv == [0, 4])
+        out = np.power(2, z4)
+        assert out.val == 8
+        with pytest.raises(ValueError) as e:
+            np.log(z6 - 1)
+
+    # test NumPy functions on a sequence of dual numbers
+    def test_array_function(self):
+        out = np.stack([x1, x2, 1.])
+        assert all(out.val == [1., 1., 1.])
+        assert (out.derv == np.array([[0., 2.], [-1., 0.], [0., 0.]])).all()
+        out = np.sum(out)
+        assert out.val == 3
+        assert all(out.derv == [-1., 2.])
+        assert np.sum(z1) is z1
+
+    # test the slotted representation and the internal constructor
+    def test_slots(self):
+        assert not hasattr(z1, '__dict__')
+        with pytest.raises(AttributeError) as e:
+            z1.other = 1
+        out = DualNumbers._make(1.0, np.array([0., 1.]))
+        assert isinstance(out, DualNumbers)
+        assert out.val == 1.0
+        assert all(out.derv == [0., 1.])
+        out = (x1 * x2).sin()
+        assert type(out) is DualNumbers
+        assert pytest.approx(np.sin(1)) == out.val
+
+    def test_inplace_operators(self):
+        z = DualNumbers(2., np.array([1., 0.]))
+        z += DualNumbers(1., np.array([0., 1.]))
+        assert z.val == 3.
+        assert all(z.derv == [1., 1.])
+        z -= 1
+        assert z.val == 2.
+        assert all(z.derv == [1., 1.])
+        z *= DualNumbers(3., np.array([0., 1.]))
+        assert z.val == 6.
+        assert all(z.derv == [3., 5.])
+        z /= DualNumbers(2., np.array([1., 0.]))
+        assert z.val == 3.
+        assert all(z.derv == [0., 2.5])
+        z *= 2
+        z /= 4
+        assert z.val == 1.5
+        assert all(z.derv == [0., 1.25])
+        with pytest.raises(ZeroDivisionError) as e:
+            z /= 0
+        with pytest.raises(ZeroDivisionError) as e:
+            z /= DualNumbers(0., np.array([1., 0.]))
+        # integer derivatives that cannot hold the result are replaced by a new array
+        z = DualNumbers(1, np.array([0, 2]))
+        z *= 0.5
+        assert all(z.derv == [0., 1.])
+
+    def test_inplace_reuse(self):
+        z = DualNumbers(1., np.array([1., 0.]))
+        z_id, derv_id = id(z), id(z._derv)
+        for _ in range(3):
+            z += DualNumbers(1., np.array([0., 1.]))
+            z *= DualNumbers(2., np.array([1., 1.]))
+        assert id(z) == z_id
+        assert id(z._derv) == derv_id
+
+    def test_inplace_aliasing(self):
+        # another name for the object keeps its value
+        z = DualNumbers(1., np.array([1., 0.]))
+        alias = z
+        z += DualNumbers(1., np.array([0., 1.]))
+        assert z is not alias
+        assert alias.val == 1.
+        assert all(alias.derv == [1., 0.])
+        # another name for the derivative array keeps its entries
+        z = DualNumbers(1., np.array([1., 0.]))
+        derv = z.derv
+        z *= 3.
+        assert all(derv == [1., 0.])
+        assert all(z.derv == [3., 0.])
+        # a view of another array is never written to
+        seeds = np.eye(2)
+        z = DualNumbers(1., seeds[0])
+        z += DualNumbers(1., seeds[1])
+        assert all(seeds[0] == [1., 0.])
+        assert all(z.derv == [1., 1.])
+        # a global operand such as x1 is not modified
+        z = DualNumbers(0., np.array([1., 1.]))
+        z += x1
+        assert all(x1.derv == [0, 2])
+
+    # test float32 values and derivatives through the operators and elementary functions
+    def test_dtype(self):
+        x = DualNumbers(0.5, np.array([1., 0.]), dtype=np.float32)
+        y = DualNumbers(2, np.array([0, 1]), np.float32)
+        assert x.dtype == np.float32
+        assert type(y.val) is np.float32
+        assert DualNumbers(1., np.array([1, 0], dtype=np.float32)).dtype == np.float32
+        assert DualNumbers(1., np.array([1., 0.])).dtype == np.float64
+        out = (x * y).sin() / y + x.log(2) - y ** 1.5 + 2 ** x + x.exp() * y.arctan() - x.logistic()
+        assert out.derv.dtype == np.float32
+        expected = (DualNumbers(0.5, np.array([1., 0.])) * DualNumbers(2., np.array([0., 1.]))).sin()
+        assert pytest.approx(expected.derv, rel=1e-6) == (x * y).sin().derv
+        out = x.astype(np.float64)
+        assert out.dtype == np.float64
+        assert type(out.val) is np.float64
+        assert x.dtype == np.float32
+
+    # integer powers take the repeated multiplication route, every other power the general rule
+    def test_pow_dispatch(self):
+        for val in (1.5, -1.5):
+            derv = np.array([1., -2.])
+            for power in (2, np.int64(3), 0, 1, True, -2):
+                out = DualNumbers(val, derv) ** power
+                assert out.val == pytest.approx(float(val) ** int(power))
+                assert out.derv == pytest.approx(int(power) * float(val) ** (int(power) - 1) * derv)
+
+    # a nonzero real denominator skips the domain check, and a zero one still raises
+    def test_div_dispatch(self):
+        x = DualNumbers(1.5, np.array([1., -2.]))
+        for denominator in (np.float64(2), 2, 0.5):
+            out = x / denominator
+            assert out.val == pytest.approx(1.5 / denominator)
+            assert out.derv == pytest.approx(np.array([1., -2.]) / denominator)
+        with pytest.raises(ZeroDivisionError) as e:
+            x / 0.0
+        with pytest.raises(ZeroDivisionError) as e:
+            x / np.float64(0)
+
+
+a1 = DualArray(np.array([0.5, 1., 2.]), np.array([[1., 0.], [1., 0.], [1., 0.]]))
+a2 = DualArray(np.array([2., 3., 4.]), np.array([[0., 1.], [0., 1.], [0., 1.]]))
+
+
+class TestDualArray:
+    """Test class for the batched DualArray object"""
+
+    # compare every point of a batched result with the DualNumbers result at that point
+    def check_points(self, func, *arrays):
+        out = func(*arrays)
+        for b in range(len(arrays[0].val)):
+            point = func(*[DualNumbers(a.val[b], a.derv[b].copy()) for a in arrays])
+            assert pytest.approx(point.val) == out.val[b]
+            assert pytest.approx(point.derv) == out.derv[b]
+
+    def test_init(self):
+        out = DualArray([1, 2], [1, 1])
+        assert all(out.val == [1., 2.])
+        assert out.derv.shape == (2, 1)
+        assert a1.derv.shape == (3, 2)
+
+    def test_init_Error(self):
+        with pytest.raises(TypeError) as e:
+            DualArray(['a', 'b'], [1, 1])
+        with pytest.raises(ValueError) as e:
+            DualArray([[1, 2]], [1, 1])
+        with pytest.raises(ValueError) as e:
+            DualArray([1, 2], [1, 1, 1])
+
+    def test_operators(self):
+        self.check_points(lambda x, y: x + y - 2 * x, a1, a2)
+        self.check_points(lambda x, y: x * y / (y - x) + 1 / y, a1, a2)
+        self.check_points(lambda x, y: x ** y + y ** 2 + 2 ** x + y ** 0.5, a1, a2)
+        self.check_points(lambda x, y: -x, a1, a2)
+
+    # a DualNumbers object has the same value and derivative at every point of the batch
+    def test_mixed_operators(self):
+        z = DualNumbers(1.5, np.array([2., -1.]))
+        square = DualArray(np.array([0.5, 2.]), np.array([[1., 0.], [0.5, 1.]]))
+        for a in (a1, square):
+            self.check_points(lambda x: x + z - x * z + z * x, a)
+            self.check_points(lambda x: z - x + x / z + z / x, a)
+            self.check_points(lambda x: x ** z + z ** x, a)
+            # the in-place operators of a DualNumbers object return a new DualArray object
+            out = z * 1.
+            out += a
+            out *= a
+            assert isinstance(out, DualArray) and pytest.approx(((z + a) * a).derv) == out.derv
+
+    def test_elementary_functions(self):
+        self.check_points(lambda x: x.sin() + x.cos() + x.tan() + x.exp(), a1)
+        self.check_points(lambda x: x.sinh() + x.cosh() + x.tanh() + x.arctan(), a1)
+        self.check_points(lambda x: x.log() + x.log(2) + x.sqrt() + x.logistic(), a1)
+        self.check_points(lambda x: (x / 4).arcsin() + (x / 4).arccos(), a1)
+        self.check_points(lambda x: x.softplus() + x.sincos()[0] * x.sincos()[1], a1)
+        self.check_points(lambda x: (-x).logistic() + (-x).softplus() + (-x).tanh(), a1)
+
+    def test_pow_dispatch(self):
+        val = np.array([-1.5, 0.5, 2.])
+        derv = np.array([[1., 0.], [1., -1.], [0., 2.]])
+        for power in (2, np.int64(3), 0, 1, True, -2):
+            out = DualArray(val, derv) ** power
+            assert out.val == pytest.approx(val ** int(power))
+            assert out.derv == pytest.approx(int(power) * (val ** (int(power) - 1.))[:, None] * derv)
+
+    def test_div_dispatch(self):
+        for denominator in (np.float64(2), 2, 0.5):
+            out = a1 / denominator
+            assert out.val == pytest.approx(a1.val / denominator)
+            assert out.derv == pytest.approx(a1.derv / denominator)
+        with pytest.raises(ZeroDivisionError) as e:
+            a1 / 0.0
+        with pytest.raises(ZeroDivisionError) as e:
+            a1 / np.float64(0)
+
+    def test_domain_Error(self):
+        with pytest.raises(ValueError) as e:
+            (a1 - 1).log()
+        with pytest.raises(ValueError) as e:
+            a1.arcsin()
+        with pytest.raises(ZeroDivisionError) as e:
+            a2 / (a1 - 1)
+        # one error reports every failed point
+        with pytest.raises(ValueError, match=r"at 2 of 3 points: \[0, 1\]"):
+            (a1 - 1).log()
+
+    # test the nan and clip domain policies against the points inside the domain
+    def test_domain_policy(self):
+        x = DualArray(np.array([-1., 0., 0.5, 2.]), np.ones(4))
+        func = lambda x: x.log() + 1 / x + x.arcsin() + x ** 0.5 + x.tan() + x / (x - 2)
+        try:
+            DualArray.domain_policy, DualArray.domain_report = 'nan', {}
+            out = func(x)
+            assert np.isnan(out.val).tolist() == [True, True, False, True]
+            assert np.isnan(out.derv[:, 0]).tolist() == [True, True, False, True]
+            point = func(DualNumbers(0.5, 1.))
+            assert out.val[2] == pytest.approx(point.val)
+            assert out.derv[2, 0] == pytest.approx(point.derv)
+            assert DualArray.domain_report["ERROR: Value for log should be greater than 0"].tolist() == [0, 1]
+            assert DualArray.domain_report["Error: Denominator in division should not be 0"].tolist() == [1, 3]
+            assert DualArray.domain_report["ERROR: Input to arcsin() should be between -1 and 1"].tolist() == [0, 3]
+            # in-place division follows the policy too
+            y = x * 1
+            y /= x
+            assert np.isnan(y.val).tolist() == [False, True, False, False]
+
+            DualArray.domain_policy, DualArray.domain_report = 'clip', {}
+            out = x.log()
+            assert out.val[:2] == pytest.approx(np.log(np.finfo(float).eps))
+            assert out.val[2:] == pytest.approx(np.log([0.5, 2.]))
+            assert np.isfinite(x.arcsin().derv).all()
+            assert np.isfinite((1 / x).val).all()
+            assert DualArray.domain_report["ERROR: Value for log should be greater than 0"].tolist() == [0, 1]
+
+            DualArray.domain_policy = 'ignore'
+            with pytest.raises(ValueError) as e:
+                x.log()
+        finally:
+            DualArray.domain_policy, DualArray.domain_report = 'raise', {}
+
+    def test_domain_context(self):
+        x = DualArray(np.array([-1., 0., 2.]), np.ones(3))
+        with DomainContext('nan') as outer:
+            x.log()
+            # a nested context has a report of its own
+            with DomainContext('clip') as inner:
+                assert np.isfinite((1 / x).val).all()
+            (x - 2).log()
+        assert outer.report["ERROR: Value for log should be greater than 0"].tolist() == [0, 1, 2]
+        assert list(inner.report) == ["Error: Denominator in division should not be 0"]
+        # the class variables are unchanged and apply again after the block
+        assert DualArray.domain_policy == 'raise' and DualArray.domain_report == {}
+        with pytest.raises(ValueError) as e:
+            x.log()
+
+    def test_eq(self):
+        assert (a1 == a1) == (True, True)
+        assert (a1 != a2) == (True, True)
+
+    # test NumPy ufunc dispatch on batched inputs
+    def test_array_ufunc(self):
+        self.check_points(lambda x, y: np.sin(x) * np.exp(y) + np.log(y) - np.sqrt(x), a1, a2)
+        self.check_points(lambda x, y: np.power(x, 2) / np.float64(2) + np.arctan(y), a1, a2)
+        out = np.ones(3) * 2 + a1
+        assert isinstance(out, DualArray)
+        assert all(out.val == [2.5, 3., 4.])
+
+    # test NumPy functions implemented for batched inputs
+    def test_array_function(self):
+        out = np.sum(a1 * a2)
+        assert out.val == pytest.approx(12.)
+        assert pytest.approx([9., 3.5]) == out.derv
+        out = np.mean(a1)
+        assert out.val == pytest.approx(3.5 / 3)
+        assert pytest.approx([1., 0.]) == out.derv
+        out = np.prod(a2)
+        assert out.val == pytest.approx(24.)
+        assert pytest.approx([0., 26.]) == out.derv
+        out = np.dot(a1, np.array([1., 2., 3.]))
+        assert out.val == pytest.approx(8.5)
+        assert pytest.approx([6., 0.]) == out.derv
+        out = np.concatenate([a1, a2])
+        assert out.derv.shape == (6, 2)
+        with pytest.raises(TypeError) as e:
+            np.stack([a1, a2])
+
+    # a stack of as many DualNumbers objects as derivative directions combined with one of them
+    def test_stack_mixed(self):
+        x = DualNumbers(2., np.array([1., 0.]))
+        y = DualNumbers(3., np.array([0., 1.]))
+        stack = np.stack([x, y])
+        for out in (stack * x, x * stack, np.multiply(x, stack), np.multiply(stack, x)):
+            assert pytest.approx([7., 2.]) == np.sum(out).derv
+        for out in (x + stack, np.add(x, stack)):
+            assert (out.derv == [[2., 0.], [1., 1.]]).all()
+        assert (np.subtract(stack, x).derv == [[0., 0.], [-1., 1.]]).all()
+        with pytest.raises(TypeError) as e:
+            np.sum(a1, axis=1)
+
+    # test float32 batches through the operators and NumPy functions
+    def test_dtype(self):
+        x = DualArray([0.5, 1.], [[1, 0], [0, 1]], dtype=np.float32)
+        assert x.val.dtype == np.float32
+        assert x.dtype == np.float32
+        assert DualArray(np.array([1., 2.], dtype=np.float32), np.ones((2, 1), dtype=np.float32)).dtype == np.float32
+        out = (x * x).sin() + x.log(10) / x - x ** 0.5
+        assert out.val.dtype == np.float32
+        assert out.derv.dtype == np.float32
+        for out in (np.sum(x), np.prod(x), np.dot(x, [1., 2.]), np.stack([np.sum(x), np.prod(x)])):
+            assert out.derv.dtype == np.float32
+        assert a1.astype(np.float32).val.dtype == np.float32
+
+    # test that the operators reuse pooled arrays and give the same results as without the pool
+    def test_buffer_pool(self):
+        default_pool = DualArray.pool
+        func = lambda x, y: (x.exp() * x**4) / 10 - x.log() + (x * y).sin() / y - 1 / x + (-y).cos() + x.tanh()
+        try:
+            DualArray.pool = None
+            expected = func(a1, a2)
+            DualArray.pool = pool = BufferPool(min_size=1)
+            out = func(a1, a2)
+            assert (out.val == expected.val).all()
+            assert (out.derv == expected.derv).all()
+            assert pool.returns > 0
+            # the arrays of a result that is still used are never recycled
+            kept_val, kept_derv = out.val.copy(), out.derv.copy()
+            func(a1, a2)
+            misses = pool.misses
+            for _ in range(3):
+                func(a1, a2)
+            assert pool.misses == misses
+            assert (out.val == kept_val).all()
+            assert (out.derv == kept_derv).all()
+            # an array held by another name is not returned when its object is deleted
+            val = (a1 * a2).val
+            returns = pool.returns
+            del out
+            assert pool.returns > returns
+            assert all(val == a1.val * a2.val)
+        finally:
+            DualArray.pool = default_pool
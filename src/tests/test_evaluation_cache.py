@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+from AD_fbi.evaluation_cache import EvaluationCache
+from AD_fbi.forward_mode import ForwardMode
+
+
+class TestEvaluationCache:
+    """Test class for EvaluationCache module"""
+
+    def test_init(self):
+        cache = EvaluationCache()
+        assert cache.max_size == 128
+        assert cache.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0}
+        with pytest.raises(ValueError) as e:
+            EvaluationCache(0)
+
+    def test_get_put(self):
+        cache = EvaluationCache(max_size=2)
+        assert cache.get('a') is None
+        result = cache.put('a', (1., np.array([1., 2.])))
+        assert cache.get('a') is result
+        assert not result[1].flags.writeable
+        cache.put('b', (2., np.array([0.])))
+        # 'a' was used more recently than 'b', so 'b' is evicted
+        cache.get('a')
+        cache.put('c', (3., np.array([0.])))
+        assert cache.get('b') is None
+        assert cache.get('a') is result
+        assert len(cache) == 2
+        assert cache.stats() == {'hits': 3, 'misses': 2, 'evictions': 1, 'size': 2}
+        cache.clear()
+        assert cache.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0}
+
+    # test that repeated queries at the same point evaluate the function once
+    def test_forward_mode(self):
+        calls = []
+
+        def func(x, y):
+            calls.append(1)
+            return x * y.exp()
+
+        cache = EvaluationCache()
+        val, derv = ForwardMode(np.array([2., 0.]), func, cache=cache).value_and_derivative()
+        assert val == 2.
+        assert all(derv == [1., 2.])
+        fm = ForwardMode(np.array([2, 0]), func, cache=cache)
+        assert fm.get_fx_value() == 2.
+        assert all(fm.get_derivative() == [1., 2.])
+        assert len(calls) == 1
+        # a different point, seed or option is a new evaluation
+        ForwardMode(np.array([2., 1.]), func, cache=cache).value_and_derivative()
+        ForwardMode(np.array([2., 0.]), func, [1, 0], cache=cache).value_and_derivative()
+        ForwardMode(np.array([2., 0.]), func, sparse=True, cache=cache).value_and_derivative()
+        # a seed matrix with one column has the bytes of a seed vector but gives J S
+        ForwardMode(np.array([2., 0.]), func, np.ones((2, 1)), cache=cache).value_and_derivative()
+        assert len(calls) == 5
+        assert cache.stats() == {'hits': 2, 'misses': 5, 'evictions': 0, 'size': 5}
+        with pytest.raises(ValueError) as e:
+            derv[0] = 0.
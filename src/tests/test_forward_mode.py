@@ -2,6 +2,7 @@ import pytest
 import numpy as np
 
 from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.dual_number import DualNumbers, DualArray
 
 
 ##initialize ForwardMode objects
@@ -107,3 +108,370 @@ class TestForwardMode:
 
         
         
+    # test the batched evaluation of a 2D array of evaluation points
+    def test_calculate_dual_array(self):
+        fm = ForwardMode(np.array([[1], [2], [3]]), func2)
+        assert (fm.calculate_dual_number()[0] == np.array([3., 6., 11.])).all()
+        assert (fm.calculate_dual_number()[1] == np.array([2., 4., 6.])).all()
+
+        fm = ForwardMode(np.array([[1, 1], [1, 2]]), func3, [2, -1])
+        assert (fm.get_fx_value() == np.array([3., 4.])).all()
+        assert (fm.get_derivative() == np.array([[4., -1.], [4., -1.]])).all()
+
+        fm = ForwardMode(np.array([[1, 2], [1, 1]]), func4)
+        assert (fm.get_fx_value() == np.array([[4., 7.], [3., 4.]])).all()
+        assert (fm.get_derivative()[0] == fm7.get_derivative()).all()
+        assert (fm.get_derivative()[1] == np.array([[2., 1.], [2., 3.]])).all()
+
+        with pytest.raises(ValueError) as e:
+            ForwardMode(np.array([[1, 2], [1, 1]]), func4, [1, 2, 3]).get_derivative()
+
+    # test sparse derivative propagation for a function of many input variables
+    def test_sparse(self):
+        func = lambda *x: sum((x[i] - x[i + 1]) ** 2 for i in range(len(x) - 1)) + x[0].sin()
+        inputs = np.linspace(0, 1, 200)
+        fm = ForwardMode(inputs, func, sparse=True)
+        assert fm.sparse == True
+        val, derv = fm.calculate_dual_number()
+        expected_val, expected_derv = ForwardMode(inputs, func).calculate_dual_number()
+        assert val == pytest.approx(expected_val)
+        assert derv == pytest.approx(expected_derv)
+
+        fm = ForwardMode(np.array([1, 1]), func4, [2, -1], sparse=True)
+        assert (fm.get_derivative() == np.array([[4., -1.], [4., -3.]])).all()
+        assert ForwardMode(3, func2, -2, sparse=True).calculate_dual_number() == (11, -12)
+
+        # a 2D array of evaluation points is not evaluated with sparse derivatives
+        with pytest.raises(ValueError) as e:
+            ForwardMode(np.array([[1, 1], [2, 3]]), func4, sparse=True).calculate_dual_number()
+
+    # test exact second directional derivatives with hyper-dual numbers
+    def test_second_order(self):
+        fm = ForwardMode(3, func2, -2, second_order=True)
+        assert fm.second_order == True
+        assert fm.calculate_dual_number() == (11, -12, 8)
+        assert fm.get_fx_value() == 11
+        assert fm.get_derivative() == -12
+        assert fm.get_second_derivative() == 8
+        assert fm4.get_second_derivative() == 8
+
+        # the Hessian of x * y**2 at (1, 2) is [[0, 4], [4, 2]]
+        fm = ForwardMode(np.array([1, 2]), lambda x, y: x * y**2, [1, -1], second_order=True)
+        assert fm.calculate_dual_number() == pytest.approx((4., 0., -6.))
+
+        val, derv, second = ForwardMode(np.array([1, 1]), func4, [2, -1], second_order=True).calculate_dual_number()
+        assert (val == np.array([3., 4.])).all()
+        assert (derv == np.array([3., 1.])).all()
+        assert (second == np.array([0., 8.])).all()
+
+        # every row of a 2D input is a separate evaluation point
+        val, derv, second = ForwardMode(np.array([[1.], [2.], [3.]]), lambda x: x.exp() * x, second_order=True).calculate_dual_number()
+        points = np.array([1., 2., 3.])
+        assert val == pytest.approx(np.exp(points) * points)
+        assert derv == pytest.approx(np.exp(points) * (points + 1))
+        assert second == pytest.approx(np.exp(points) * (points + 2))
+
+        with pytest.raises(ValueError) as e:
+            ForwardMode(np.array([1, 1]), func4, [1, 2, 3]).get_second_derivative()
+
+    # test the full Hessian with packed upper triangle propagation
+    def test_hessian(self):
+        # the Hessian of x * y**2 at (1, 2) is [[0, 4], [4, 2]]
+        H = ForwardMode(np.array([1, 2]), lambda x, y: x * y**2).get_hessian()
+        assert (H.data == np.array([0., 4., 2.])).all()
+        assert (np.asarray(H) == np.array([[0., 4.], [4., 2.]])).all()
+
+        # the seed scales the input variables
+        H = ForwardMode(np.array([1, 2]), lambda x, y: x * y**2, [1, -1]).get_hessian()
+        assert (H.toarray() == np.array([[0., -4.], [-4., 2.]])).all()
+        assert ForwardMode(3, func2, -2).get_hessian().toarray() == pytest.approx(np.array([[8.]]))
+
+        # every entry matches the second directional derivatives of hyper-dual numbers
+        func = lambda x, y, z: (x * y).sin() * z**3 + (x / y).exp() - z.log() * x + y**x
+        point = np.array([0.7, 1.3, 0.4])
+        H = ForwardMode(point, func).get_hessian()
+        for v in np.eye(3) + np.array([0., 1., -1.]):
+            assert v @ (H @ v) == pytest.approx(ForwardMode(point, func, v).get_second_derivative())
+
+        # a vector function returns one Hessian per output, and a constant output has a zero Hessian
+        hessians = ForwardMode(np.array([1, 1]), lambda x, y: (x * y, 3.), [2, -1]).get_hessian()
+        assert len(hessians) == 2
+        assert (hessians[0].toarray() == np.array([[0., -2.], [-2., 0.]])).all()
+        assert (hessians[1].toarray() == 0).all()
+
+        with pytest.raises(ValueError) as e:
+            ForwardMode(np.array([1, 1]), func4, [1, 2, 3]).get_hessian()
+        with pytest.raises(ValueError) as e:
+            ForwardMode(np.ones((2, 2)), func4).get_hessian()
+
+    # test float32 values and derivatives
+    def test_dtype(self):
+        func = lambda x, y: (x * y).sin() + x.log() * y.exp()
+        fm = ForwardMode(np.array([1., 2.]), func, dtype=np.float32)
+        assert fm.dtype == np.float32
+        assert ForwardMode(1, func1).dtype == np.float64
+        val, derv = fm.calculate_dual_number()
+        expected_val, expected_derv = ForwardMode(np.array([1., 2.]), func).calculate_dual_number()
+        assert derv.dtype == np.float32
+        assert val == pytest.approx(expected_val, rel=1e-6)
+        assert derv == pytest.approx(expected_derv, rel=1e-6)
+
+        val, derv = ForwardMode(np.array([1, 1]), func4, [2, -1], dtype=np.float32).calculate_dual_number()
+        assert val.dtype == np.float32
+        assert (derv == np.array([[4., -1.], [4., -3.]])).all()
+
+        points = np.array([[1., 2.], [0.5, 1.5]])
+        val, derv = ForwardMode(points, func, dtype=np.float32).calculate_dual_number()
+        assert val.dtype == np.float32
+        assert derv.dtype == np.float32
+        assert derv == pytest.approx(ForwardMode(points, func).get_derivative(), rel=1e-6)
+
+        val, derv = ForwardMode(np.array([1., 2.]), func, sparse=True, dtype=np.float32).calculate_dual_number()
+        assert val.dtype == np.float32 and derv.dtype == np.float32
+        assert val == pytest.approx(expected_val, rel=1e-6)
+        assert derv == pytest.approx(expected_derv, rel=1e-6)
+
+    # test that operations with Python floats do not promote the results of the other paths to float64
+    def test_dtype_paths(self):
+        func = lambda x, y: (x * y).sin() * 2.5 + x.log(2) * y ** 2 + 1 / y
+        point = np.array([1.5, 2.])
+        expected = ForwardMode(point, func).calculate_dual_number()
+        results = [ForwardMode(point, func, dtype=np.float32).calculate_dual_number(),
+                   ForwardMode(point, func, dtype=np.float32, chunk_size=1).calculate_dual_number(),
+                   ForwardMode(point, func, dtype=np.float32).jvp(np.eye(2))]
+        for val, derv in results:
+            assert val.dtype == np.float32 and derv.dtype == np.float32
+            assert val == pytest.approx(expected[0], rel=1e-6)
+            assert derv == pytest.approx(expected[1], rel=1e-6)
+
+        # a scalar point and the scalar tangent of jvp
+        val, derv = ForwardMode(1.5, lambda x: x * 2.5 + x ** 2, dtype=np.float32).calculate_dual_number()
+        assert val.dtype == np.float32 and derv.dtype == np.float32 and val == 6. and derv == 5.5
+        val, derv = ForwardMode(point, func, dtype=np.float32).jvp([1., -1.])
+        assert val.dtype == np.float32 and derv.dtype == np.float32
+        assert derv == pytest.approx(expected[1] @ [1., -1.], rel=1e-6)
+        assert ForwardMode(point, func, dtype=np.float32).calculate_primal().dtype == np.float32
+
+        # second order derivatives of a scalar and a vector function
+        results = ForwardMode(point, func, [1., -1.], second_order=True, dtype=np.float32).calculate_dual_number()
+        expected = ForwardMode(point, func, [1., -1.], second_order=True).calculate_dual_number()
+        assert all(x.dtype == np.float32 for x in results)
+        assert results == pytest.approx(expected, rel=1e-5)
+        results = ForwardMode(point, lambda x, y: (x * 0.5, y ** 2), second_order=True, dtype=np.float32).calculate_dual_number()
+        assert all(x.dtype == np.float32 for x in results)
+
+        # the packed Hessian of a scalar function and of every output of a vector function
+        H = ForwardMode(point, func, dtype=np.float32).get_hessian()
+        assert H.data.dtype == np.float32
+        assert H.toarray() == pytest.approx(ForwardMode(point, func).get_hessian().toarray(), rel=1e-5)
+        hessians = ForwardMode(point, lambda x, y: (x * y, 3.), dtype=np.float32).get_hessian()
+        assert all(H.data.dtype == np.float32 for H in hessians)
+
+    def test_domain_policy(self):
+        func = lambda x, y: x.log() + y.arcsin()
+        points = np.array([[1., 0.5], [-1., 0.5], [2., 2.], [0., 0.]])
+        fm = ForwardMode(points, func, domain_policy='nan')
+        val, derv = fm.calculate_dual_number()
+        assert np.isnan(val).tolist() == [False, True, True, True]
+        assert val[0] == pytest.approx(np.arcsin(0.5))
+        assert derv[0] == pytest.approx([1., 1 / np.sqrt(0.75)])
+        assert fm.domain_report["ERROR: Value for log should be greater than 0"].tolist() == [1, 3]
+        assert fm.domain_report["ERROR: Input to arcsin() should be between -1 and 1"].tolist() == [2]
+        # the policy only applies to the evaluations of the object
+        with pytest.raises(ValueError) as e:
+            ForwardMode(points, func).calculate_dual_number()
+        assert np.isfinite(ForwardMode(points, func, domain_policy='clip').get_fx_value()).all()
+        with pytest.raises(ValueError) as e:
+            ForwardMode(points, func, domain_policy='ignore')
+        # a later evaluation does not change the report of an earlier one
+        policy, class_report = DualArray.domain_policy, DualArray.domain_report
+        try:
+            DualArray.domain_report = {}
+            fm.calculate_dual_number()
+            report = fm.domain_report
+            DualArray.domain_policy = 'nan'
+            DualArray(np.array([-1., 1.]), np.ones(2)).log()
+        finally:
+            DualArray.domain_policy, DualArray.domain_report = policy, class_report
+        ForwardMode(points[::-1], func, domain_policy='nan').calculate_dual_number()
+        assert report["ERROR: Value for log should be greater than 0"].tolist() == [1, 3]
+
+    def test_value_and_derivative(self):
+        calls = []
+
+        def func(x, y):
+            calls.append(1)
+            return x ** 2 + y
+
+        val, derv = ForwardMode(np.array([3, 1]), func).value_and_derivative()
+        assert val == 10
+        assert all(derv == [6., 1.])
+        assert len(calls) == 1
+        assert ForwardMode(2, func1).value_and_derivative() == (2.0, 1.0)
+
+    def test_calculate_primal(self):
+        for fm in (fm1, fm3, fm5, fm6, fm7, fm8):
+            assert np.all(fm.calculate_primal() == fm.calculate_dual_number()[0])
+        assert fm3.calculate_primal() == 6.0
+        assert isinstance(fm3.calculate_primal(), float)
+        fm = ForwardMode(np.array([1., 2.]), lambda x, y: x.log() * y.exp() + (x * y).sin(), dtype=np.float32)
+        assert fm.calculate_primal().dtype == np.float32
+        # the values are evaluated without any derivatives
+        seen = []
+        ForwardMode(np.array([1., 2.]), lambda x, y: seen.append(x.derv) or x * y).get_fx_value()
+        assert seen == [0.]
+        with pytest.raises(ValueError) as e:
+            ForwardMode(0, lambda x: x.log()).get_fx_value()
+
+    def test_jvp(self):
+        # J v matches the dense Jacobian
+        func = lambda x, y, z: (x * y.sin() + z.exp(), (x / z).log())
+        point, v = np.array([1., 2., 3.]), np.array([0.5, -1., 2.])
+        val, jv = ForwardMode(point, func).jvp(v)
+        dense_val, jacobian = ForwardMode(point, func).calculate_dual_number()
+        assert np.allclose(val, dense_val)
+        assert np.allclose(jv, jacobian @ v)
+        # the seed is the default tangent
+        assert fm6.jvp() == (3, 3.0)
+        assert fm4.jvp() == (11.0, -12.0)
+        assert fm1.jvp(2) == (1.0, 2.0)
+        val, jv = fm8.jvp()
+        assert all(val == [3., 4.]) and all(jv == [3., 1.])
+        with pytest.raises(ValueError) as e:
+            fm5.jvp([1, 2, 3])
+
+    def test_jvp_batched(self):
+        points = np.array([[1., 2.], [3., 4.], [5., 6.]])
+        val, jv = ForwardMode(points, func3).jvp([1, -1])
+        assert all(val == [4., 10., 16.]) and all(jv == [1., 1., 1.])
+        val, jv = ForwardMode(points, func4).jvp([1, 0])
+        assert val.shape == jv.shape == (3, 2)
+        assert (jv == [[2., 2.], [2., 6.], [2., 10.]]).all()
+        fm = ForwardMode(np.array([[1.], [-1.]]), lambda x: x.log(), domain_policy='nan')
+        val, jv = fm.jvp()
+        assert jv[0] == 1. and np.isnan(jv[1])
+        assert list(fm.domain_report.values())[0].tolist() == [1]
+
+    def test_seed_matrix(self):
+        func = lambda x, y, z: (x * y.sin() + z.exp(), (x / z).log())
+        point = np.array([1., 2., 3.])
+        seed = np.array([[1., 0.], [0.5, -1.], [2., 1.]])
+        jacobian = ForwardMode(point, func).get_derivative()
+        val, js = ForwardMode(point, func, seed).calculate_dual_number()
+        assert js.shape == (2, 2)
+        assert np.allclose(js, jacobian @ seed)
+        assert np.allclose(ForwardMode(point, func).jvp(seed)[1], js)
+        # a scalar function gives one row of J S
+        val, js = ForwardMode(point, lambda x, y, z: x * y * z, seed).calculate_dual_number()
+        assert val == 6. and np.allclose(js, [6. + 1.5 + 4., -3. + 2.])
+        # the derivatives of an input variable are a copy of its row of the seed matrix
+        js = ForwardMode(point, lambda x, y, z: x, seed).get_derivative()
+        js[0] = 5.
+        assert seed[0, 0] == 1.
+        # every point of a batch gets the same seed matrix
+        points = np.array([[1., 2., 3.], [2., 1., 0.5]])
+        val, js = ForwardMode(points, func, seed).calculate_dual_number()
+        assert js.shape == (2, 2, 2)
+        assert np.allclose(js[1], ForwardMode(points[1], func).get_derivative() @ seed)
+        with pytest.raises(ValueError) as e:
+            ForwardMode(point, func, seed[:2]).calculate_dual_number()
+        with pytest.raises(ValueError) as e:
+            ForwardMode(point, func, seed, second_order=True).calculate_dual_number()
+
+    def test_chunked(self):
+        func = lambda *x: (sum(x[i] * x[i + 1].sin() for i in range(len(x) - 1)), x[0].exp() * x[-1])
+        point = np.linspace(0.5, 1.5, 7)
+        val, jacobian = ForwardMode(point, func).calculate_dual_number()
+        for chunk_size in (1, 3, 7, 100):
+            fm = ForwardMode(point, func, chunk_size=chunk_size)
+            chunked_val, chunked_jacobian = fm.calculate_dual_number()
+            assert np.allclose(chunked_val, val)
+            assert np.allclose(chunked_jacobian, jacobian)
+        # a scalar function with a seed
+        val, derv = ForwardMode(np.array([1., 2., 3.]), lambda x, y, z: x * y * z, [1, 2, -1],
+                                chunk_size=2).calculate_dual_number()
+        assert val == 6. and all(derv == [6., 6., -2.])
+        assert ForwardMode(3, func2, chunk_size=1).calculate_dual_number() == (11.0, 6.0)
+        with pytest.raises(ValueError) as e:
+            ForwardMode(point, func, chunk_size=0)
+        with pytest.raises(ValueError) as e:
+            ForwardMode(point, func, memory_budget=0)
+        with pytest.raises(ValueError) as e:
+            ForwardMode(point, func, [1, 2], chunk_size=2).calculate_dual_number()
+        with pytest.raises(ValueError) as e:
+            ForwardMode(point, func, sparse=True, chunk_size=2).calculate_dual_number()
+
+    def test_chunk_size(self):
+        fm = ForwardMode(np.ones(100), func3, memory_budget=8000)
+        assert fm.get_chunk_size(100) == 10
+        fm = ForwardMode(np.ones(100), func3, memory_budget=8000, dtype=np.float32)
+        assert fm.get_chunk_size(100) == 20
+        # the chunk size is at least 1 and at most the number of input variables
+        assert ForwardMode(np.ones(100), func3, memory_budget=1).get_chunk_size(100) == 1
+        assert ForwardMode(np.ones(100), func3, memory_budget=1e9).get_chunk_size(100) == 100
+        assert ForwardMode(np.ones(100), func3, chunk_size=30, memory_budget=1).get_chunk_size(100) == 30
+
+    def test_fuse_multiple_inputs(self):
+        x = DualNumbers(1., np.array([1., 0.]))
+        y = DualNumbers(2., np.array([0., 1.]))
+        val, derv = ForwardMode.fuse_multiple_inputs([x, x * y], 2)
+        assert all(val == [1., 2.]) and (derv == [[1., 0.], [2., 1.]]).all()
+        # nested lists and object arrays keep the shape of a matrix function
+        for outputs in ([[x, y], [x * y, x + y]], np.array([[x, y], [x * y, x + y]])):
+            val, derv = ForwardMode.fuse_multiple_inputs(outputs, 2)
+            assert val.shape == (2, 2) and derv.shape == (2, 2, 2)
+            assert (derv[1] == [[2., 1.], [1., 1.]]).all()
+        # a batched dual output is copied in one operation
+        val, derv = ForwardMode.fuse_multiple_inputs(np.stack([x, y, x * y]), 2)
+        assert all(val == [1., 2., 2.]) and (derv == [[1., 0.], [0., 1.], [2., 1.]]).all()
+        # the derivatives are written into out
+        out = np.empty((2, 2))
+        assert ForwardMode.fuse_multiple_inputs([x, y], 2, out=out)[1] is out
+        assert (out == np.eye(2)).all()
+        with pytest.raises(ValueError) as e:
+            ForwardMode.fuse_multiple_inputs([[x, y], [x]], 2)
+
+    def test_matrix_function(self):
+        func = lambda x, y: [[x * y, x + y], [x.exp(), y ** 2]]
+        fm = ForwardMode(np.array([1., 2.]), func)
+        val, derv = fm.calculate_dual_number()
+        assert val.shape == (2, 2) and derv.shape == (2, 2, 2)
+        assert np.allclose(derv[1, 0], [np.e, 0.]) and all(derv[1, 1] == [0., 4.])
+        assert np.array_equal(fm.get_fx_value(), val)
+        val, derv = ForwardMode(np.array([1., 2.]), lambda x, y: np.stack([x * y, x + y])).calculate_dual_number()
+        assert all(val == [2., 3.]) and (derv == [[2., 1.], [1., 1.]]).all()
+
+    def test_matrix_function_paths(self):
+        func = lambda x, y: [[x * y, x], [y.exp(), x + y]]
+        point = np.array([1., 2.])
+        val, derv = ForwardMode(point, func).calculate_dual_number()
+        # the chunked path writes every block of columns into the (m1, m2, n) buffer
+        chunk_val, chunk_derv = ForwardMode(point, func, chunk_size=1).calculate_dual_number()
+        assert np.array_equal(chunk_val, val) and np.array_equal(chunk_derv, derv)
+        # the Jacobian-vector product and the product with a seed matrix
+        jvp_val, jvp = ForwardMode(point, func).jvp([1., -1.])
+        assert np.array_equal(jvp_val, val) and np.allclose(jvp, derv @ [1., -1.])
+        seed_val, seed_derv = ForwardMode(point, func, np.array([[1., 0.], [1., 1.]])).calculate_dual_number()
+        assert seed_derv.shape == (2, 2, 2) and np.allclose(seed_derv, derv @ [[1., 0.], [1., 1.]])
+        # a batch of points has a leading batch axis
+        points = np.array([[1., 2.], [3., 4.]])
+        batch_val, batch_derv = ForwardMode(points, func).calculate_dual_number()
+        assert batch_val.shape == (2, 2, 2) and batch_derv.shape == (2, 2, 2, 2)
+        assert np.allclose(batch_derv[0], derv)
+        batch_val, batch_jvp = ForwardMode(points, func).jvp([1., -1.])
+        assert batch_jvp.shape == (2, 2, 2) and np.allclose(batch_jvp[0], derv @ [1., -1.])
+        # the second directional derivatives of every output along the seed
+        second_val, first, second = ForwardMode(point, func, [1., 1.], second_order=True).calculate_dual_number()
+        assert np.allclose(second_val, val) and np.allclose(first, derv.sum(axis=-1))
+        assert np.allclose(second, [[2., 0.], [np.exp(2.), 0.]])
+        second_val, first, second = ForwardMode(points, func, [1., 1.], second_order=True).calculate_dual_number()
+        assert second.shape == (2, 2, 2) and np.allclose(second[1], [[2., 0.], [np.exp(4.), 0.]])
+        # a batched dual output holds every output of a vector function
+        stacked = lambda x, y: np.stack([x * y, x + y])
+        chunk_val, chunk_derv = ForwardMode(point, stacked, chunk_size=1).calculate_dual_number()
+        assert all(chunk_val == [2., 3.]) and (chunk_derv == [[2., 1.], [1., 1.]]).all()
+        assert all(ForwardMode(point, stacked).jvp([1., -1.])[1] == [1., 0.])
+        # the rows of a matrix function should all be rows of the same shape
+        for ragged in (lambda x, y: [[x, y], [x]], lambda x, y: [[x, y], x]):
+            with pytest.raises(ValueError) as e:
+                ForwardMode(point, ragged, chunk_size=1).calculate_dual_number()
@@ -0,0 +1,114 @@
+import pytest
+import numpy as np
+from AD_fbi.forward_plan import ForwardPlan
+from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.evaluation_cache import EvaluationCache
+
+
+class TestForwardPlan:
+    """Test class for ForwardPlan module"""
+
+    def test_init(self):
+        plan = ForwardPlan(lambda x, y: x * y, 2)
+        assert np.array_equal(plan.seed, [1., 1.])
+        assert plan.dtype == np.float64
+        plan = ForwardPlan(lambda x, y: x * y, 2, seed=2)
+        assert np.array_equal(plan.seed, [2., 2.])
+        with pytest.raises(ValueError) as e:
+            ForwardPlan(lambda x, y: x * y, 2, seed=[1, 2, 3])
+        with pytest.raises(ValueError) as e:
+            ForwardPlan(lambda x: x, 0)
+
+    def test_scalar_function(self):
+        func = lambda x, y: x.sin() * y.exp() + x / y
+        plan = ForwardPlan(func, 2, seed=[2, -1])
+        for point in ([1., 2.], [0.5, -3.], [2., 0.1]):
+            val, derv = plan.evaluate(np.array(point))
+            expected = ForwardMode(np.array(point), func, [2, -1]).calculate_dual_number()
+            assert val == pytest.approx(expected[0])
+            assert np.allclose(derv, expected[1])
+
+    def test_univariate(self):
+        plan = ForwardPlan(lambda x: x**3, 1)
+        assert plan.evaluate(2) == (8.0, 12.0)
+        assert plan.evaluate(np.array([1.])) == (1.0, 3.0)
+        with pytest.raises(ValueError) as e:
+            plan.evaluate(np.array([1., 2.]))
+
+    def test_vector_function(self):
+        func = lambda x, y: (2*x + y, 3*y + x**2, x)
+        plan = ForwardPlan(func, 2)
+        val, derv = plan.evaluate(np.array([1., 2.]))
+        expected = ForwardMode(np.array([1., 2.]), func).calculate_dual_number()
+        assert np.array_equal(val, expected[0])
+        assert np.array_equal(derv, expected[1])
+
+    def test_buffers(self):
+        plan = ForwardPlan(lambda x, y: x, 2)
+        _, first = plan.evaluate(np.array([1., 2.]))
+        _, second = plan.evaluate(np.array([3., 4.]))
+        # the plan writes every evaluation into the same buffer
+        assert first is second
+        assert np.array_equal(second, [1., 0.])
+        # the seed vectors are unchanged by writes into the buffer
+        second[0] = 5.
+        assert np.array_equal(plan.evaluate(np.array([3., 4.]))[1], [1., 0.])
+
+    def test_out(self):
+        out = np.zeros((2, 2))
+        plan = ForwardPlan(lambda x, y: (x * y, x + y), 2)
+        val, derv = plan.evaluate(np.array([2., 3.]), out=out)
+        assert derv is out
+        assert np.array_equal(out, [[3., 2.], [1., 1.]])
+        out = np.zeros(2)
+        plan = ForwardPlan(lambda x, y: x * y, 2)
+        val, derv = plan.evaluate(np.array([2., 3.]), out=out)
+        assert derv is out
+        assert np.array_equal(out, [3., 2.])
+
+    def test_dtype(self):
+        plan = ForwardPlan(lambda x, y: x * y, 2, dtype=np.float32)
+        val, derv = plan.evaluate(np.array([2., 3.]))
+        assert derv.dtype == np.float32
+        # the one-input and scalar paths return the dtype of the plan, as ForwardMode does
+        func = lambda x: x.log(2) * 2.5 + 1
+        plan = ForwardPlan(func, 1, dtype=np.float32)
+        val, derv = plan.evaluate(3.)
+        assert type(val) is type(derv) is np.float32
+        assert (val, derv) == ForwardMode(3., func, dtype=np.float32).calculate_dual_number()
+        assert type(plan.value(3.)) is np.float32
+        assert type(ForwardPlan(lambda x, y: x * y + 0.5, 2, dtype=np.float32).evaluate([2., 3.])[0]) is np.float32
+        # a buffer of another dtype is kept apart from the buffer of the plan
+        assert plan._buffer((2,), np.float64).dtype == np.float64 and plan._buffer((2,)).dtype == np.float32
+
+    def test_cache(self):
+        cache = EvaluationCache()
+        func = lambda x, y: x * y
+        plan = ForwardPlan(func, 2, cache=cache)
+        val, derv = plan.evaluate(np.array([2., 3.]))
+        assert not derv.flags.writeable
+        # the plan and ForwardMode share the results of the same evaluation
+        assert ForwardMode(np.array([2., 3.]), func, cache=cache).value_and_derivative()[1] is derv
+        out = np.zeros(2)
+        plan.evaluate(np.array([2., 3.]), out=out)
+        assert np.array_equal(out, [3., 2.])
+        assert cache.stats() == {'hits': 2, 'misses': 1, 'evictions': 0, 'size': 1}
+
+    def test_value(self):
+        func = lambda x, y: (x * y, x.exp())
+        plan = ForwardPlan(func, 2)
+        assert np.array_equal(plan.value(np.array([1., 2.])), plan.evaluate(np.array([1., 2.]))[0])
+        plan = ForwardPlan(lambda x: x ** 3, 1)
+        assert plan.value(2) == 8.0
+        with pytest.raises(ValueError) as e:
+            plan.value(np.array([1., 2.]))
+
+    def test_matrix_function(self):
+        func = lambda x, y: np.array([[x * y, x + y], [x.exp(), y ** 2]])
+        plan = ForwardPlan(func, 2)
+        val, derv = plan.evaluate(np.array([1., 2.]))
+        expected = ForwardMode(np.array([1., 2.]), func).calculate_dual_number()
+        assert np.array_equal(val, expected[0]) and np.array_equal(derv, expected[1])
+        assert np.array_equal(plan.value(np.array([1., 2.])), val)
+        # the buffers are reused by the next evaluation
+        assert plan.evaluate(np.array([3., 4.]))[1] is derv
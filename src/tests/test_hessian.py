@@ -0,0 +1,98 @@
+import pytest
+import numpy as np
+from AD_fbi.hessian import hvp, batch_hvp, sparse_hessian
+from AD_fbi.reverse_mode import ReverseMode
+from AD_fbi.forward_mode import ForwardMode
+from AD_fbi.evaluation_cache import EvaluationCache
+
+
+def rosenbrock(*x):
+    return sum(100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(len(x) - 1))
+
+
+def rosenbrock_hessian(x):
+    n = len(x)
+    H = np.zeros((n, n))
+    for i in range(n - 1):
+        H[i, i] += 1200 * x[i] ** 2 - 400 * x[i + 1] + 2
+        H[i + 1, i + 1] += 200
+        H[i, i + 1] = H[i + 1, i] = -400 * x[i]
+    return H
+
+
+class TestHessian:
+    """Test class for Hessian-vector products"""
+
+    def test_hvp(self):
+        rng = np.random.default_rng(0)
+        x = rng.uniform(-1., 1., 20)
+        v = rng.normal(size=20)
+        assert np.allclose(hvp(rosenbrock, x, v), rosenbrock_hessian(x) @ v)
+
+    def test_hvp_matches_finite_differences(self):
+        fx = lambda x, y, z: (x * y).exp() / z + z.log() * x.sin() - y ** 3 * z.sqrt()
+        x = np.array([0.5, -1.2, 2.])
+        v = np.array([1., 2., -0.5])
+        eps = 1e-6
+        expected = (ReverseMode(x + eps * v, fx).get_derivative() - ReverseMode(x - eps * v, fx).get_derivative()) / (2 * eps)
+        assert np.allclose(hvp(fx, x, v), expected, atol=1e-6)
+
+    def test_univariate(self):
+        product = hvp(lambda x: x.sin() * x, 0.5, 2.)
+        assert isinstance(product, float)
+        assert product == pytest.approx(2 * (2 * np.cos(0.5) - 0.5 * np.sin(0.5)))
+
+    def test_batch_hvp(self):
+        rng = np.random.default_rng(1)
+        x = rng.uniform(-1., 1., 15)
+        V = rng.normal(size=(15, 4))
+        H = rosenbrock_hessian(x)
+        assert np.allclose(batch_hvp(rosenbrock, x, V), H @ V)
+        assert np.allclose(batch_hvp(rosenbrock, x, np.eye(15)), H)
+        # a single column gives the same product as hvp
+        assert np.allclose(batch_hvp(rosenbrock, x, V[:, :1])[:, 0], hvp(rosenbrock, x, V[:, 0]))
+
+    def test_independent_input(self):
+        # an input variable that the function does not depend on has a zero row
+        product = batch_hvp(lambda x, y: x ** 3, np.array([1., 2.]), np.eye(2))
+        assert np.allclose(product, [[6., 0.], [0., 0.]])
+
+    def test_sparse_hessian(self):
+        rng = np.random.default_rng(2)
+        x = rng.uniform(-1., 1., 30)
+        H = sparse_hessian(rosenbrock, x)
+        assert H.shape == (30, 30) and H.nnz == 3 * 30 - 2
+        assert np.allclose(H.toarray(), rosenbrock_hessian(x))
+        # the entries are read at the same place for both triangles
+        assert (H.toarray() == H.toarray().T).all()
+
+        # coupled terms and a dense row match the Hessian of ForwardMode
+        fx = lambda *x: sum((x[i] * x[-1]).sin() + x[i] / x[i + 1] for i in range(len(x) - 1)) + x[2].log()
+        x = rng.uniform(0.5, 1.5, 12)
+        assert np.allclose(sparse_hessian(fx, x).toarray(), ForwardMode(x, fx).get_hessian().toarray())
+
+        # a linear function has an empty Hessian
+        H = sparse_hessian(lambda x, y: 2 * x - y, np.ones(2))
+        assert H.nnz == 0 and (H.toarray() == 0).all()
+
+    def test_sparse_hessian_cache(self):
+        cache = EvaluationCache()
+        x = np.linspace(-1., 1., 8)
+        sparse_hessian(rosenbrock, x, cache=cache)
+        # a call at a new point reuses the pattern and coloring
+        H = sparse_hessian(rosenbrock, 2 * x, cache=cache)
+        assert np.allclose(H.toarray(), rosenbrock_hessian(2 * x))
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1}
+        # a different number of input variables detects the pattern again
+        sparse_hessian(rosenbrock, x[:5], cache=cache)
+        assert cache.stats()['size'] == 2
+
+    def test_errors(self):
+        with pytest.raises(ValueError) as e:
+            hvp(rosenbrock, np.ones(3), np.ones(2))
+        with pytest.raises(ValueError) as e:
+            batch_hvp(rosenbrock, np.ones(3), np.ones(3))
+        with pytest.raises(ValueError) as e:
+            hvp(lambda x, y: (x, y), np.ones(2), np.ones(2))
+        with pytest.raises(ValueError) as e:
+            sparse_hessian(lambda x, y: (x * y, y), np.ones(2))
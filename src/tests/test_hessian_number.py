@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+from AD_fbi.hessian_number import HessianNumbers, SymmetricMatrix, packed_triangle
+from AD_fbi.hyper_dual_number import HyperDualNumbers
+
+
+def inputs(vals):
+    """Return the HessianNumbers input variables at vals, sharing the layout of the upper triangle"""
+    triangle = packed_triangle(len(vals))
+    return [HessianNumbers(val, row, triangle=triangle) for val, row in zip(vals, np.eye(len(vals)))]
+
+
+def hessian(z, input_num):
+    """Return the full Hessian of z, whose packed Hessian is the scalar 0 while it has no second derivative"""
+    return SymmetricMatrix(np.broadcast_to(z.hess, (input_num * (input_num + 1) // 2,)), input_num).toarray()
+
+
+def curvature(op, vals, v):
+    """Return the second directional derivative v^T H v of op at vals from HyperDualNumbers objects"""
+    return op(*[HyperDualNumbers(val, d, d) for val, d in zip(vals, v)]).derv12
+
+
+class TestSymmetricMatrix:
+    """Test class for SymmetricMatrix module"""
+
+    def test_unpack(self):
+        H = SymmetricMatrix(np.array([1., 2., 3., 4., 5., 6.]), 3)
+        full = np.array([[1., 2., 3.], [2., 4., 5.], [3., 5., 6.]])
+        assert H.shape == (3, 3)
+        assert np.array_equal(H.toarray(), full)
+        assert np.array_equal(np.asarray(H), full)
+        assert np.array_equal(H.diagonal(), [1., 4., 6.])
+        assert H[2, 1] == H[1, 2] == 5.
+        assert np.allclose(H @ np.array([1., -2., 0.5]), full @ np.array([1., -2., 0.5]))
+        assert repr(H) == 'SymmetricMatrix(n=3, packed=6)'
+
+    def test_size(self):
+        with pytest.raises(ValueError):
+            SymmetricMatrix(np.zeros(4), 3)
+
+
+class TestHessianNumbers:
+    """Test class for HessianNumbers module"""
+
+    def test_init(self):
+        x = HessianNumbers(2, [1., 0.])
+        assert x.val == 2. and np.array_equal(x.grad, [1., 0.]) and x.hess == 0.
+        assert [list(index) for index in x.triangle] == [[2, 1], [0, 1, 1]]
+        with pytest.raises(TypeError):
+            HessianNumbers('a', [1.])
+
+    def test_operators(self):
+        vals = [2., 0.5]
+        for op in (lambda a, b: a * b, lambda a, b: a / b, lambda a, b: a ** b, lambda a, b: a + b * b,
+                   lambda a, b: a - b * a, lambda a, b: 4 / a, lambda a, b: a ** 3, lambda a, b: a ** 2,
+                   lambda a, b: a ** 2.5, lambda a, b: 2 ** a * b, lambda a, b: -a * b, lambda a, b: a * 3 + b,
+                   lambda a, b: 1 - a / b, lambda a, b: (3 * a - 2) * b.sqrt(), lambda a, b: np.add(a, b) ** 2):
+            z = op(*inputs(vals))
+            H = hessian(z, 2)
+            # the Hessian matches the second directional derivatives along the axes and the diagonal
+            for v in ([1., 0.], [0., 1.], [1., -0.5]):
+                assert np.dot(v, H @ v) == pytest.approx(curvature(op, vals, v))
+
+    def test_functions(self):
+        for val in (0.3, -0.7, 0.9):
+            for name in ('exp', 'sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh', 'arcsin', 'arccos', 'arctan',
+                         'logistic', 'softplus'):
+                op = lambda a, b: getattr(a * b + 0.1 * a, name)()
+                vals = [val, 0.8]
+                z = op(*inputs(vals))
+                H = hessian(z, 2)
+                for v in ([1., 0.], [0., 1.], [1., 2.]):
+                    assert np.dot(v, H @ v) == pytest.approx(curvature(op, vals, v))
+        x, y = inputs([0.5, 2.])
+        assert np.allclose(x.log(2).hess, [-1 / (0.25 * np.log(2)), 0., 0.])
+        assert np.allclose(np.sin(x * y).hess, (x * y).sin().hess)
+        sin, cos = (x * y).sincos()
+        assert np.allclose(sin.hess, (x * y).sin().hess) and np.allclose(cos.hess, (x * y).cos().hess)
+
+    def test_domain(self):
+        x, y = inputs([0., -1.])
+        with pytest.raises(ZeroDivisionError):
+            y / x
+        with pytest.raises(ValueError):
+            y.log()
+        with pytest.raises(ValueError):
+            x.log(1)
+        with pytest.raises(ValueError):
+            x ** 1.5
+        with pytest.raises(ValueError):
+            y ** 0.5
+        with pytest.raises(ValueError):
+            y.arcsin()
+        with pytest.raises(ValueError):
+            (x + np.pi / 2).tan()
+        with pytest.raises(TypeError):
+            x * 'a'
@@ -0,0 +1,147 @@
+import pytest
+import numpy as np
+from AD_fbi.hyper_dual_number import HyperDualNumbers
+
+h1 = HyperDualNumbers(0.5, 1.)
+h2 = HyperDualNumbers(2., 1., 0.)
+h3 = HyperDualNumbers(3., 0., 1.)
+h4 = HyperDualNumbers(0., 1.)
+
+
+def check(z, val, derv1, derv12, derv2=None):
+    assert z.val == pytest.approx(val)
+    assert z.derv1 == pytest.approx(derv1)
+    assert z.derv2 == pytest.approx(derv1 if derv2 is None else derv2)
+    assert z.derv12 == pytest.approx(derv12)
+
+
+class TestHyperDualNumbers:
+    """Test class for HyperDualNumbers module"""
+
+    # test attribute initialization
+    def test_init(self):
+        check(h1, 0.5, 1., 0.)
+        check(h2, 2., 1., 0., 0.)
+        z = HyperDualNumbers(1, np.array([1, 0]), 2., np.array([0, 0]))
+        assert z.derv1.dtype == float
+        assert all(z.derv1 == [1., 0.])
+        assert z.derv2 == 2.
+        assert "Values: 0.5, Derivatives: 1.0, 1.0, Second Derivatives: 0" == h1.__repr__()
+        assert not hasattr(h1, '__dict__')
+
+    def test_init_Error(self):
+        with pytest.raises(TypeError) as e:
+            HyperDualNumbers('a', 1)
+        with pytest.raises(TypeError) as e:
+            HyperDualNumbers(1, 'a')
+        with pytest.raises(TypeError) as e:
+            HyperDualNumbers(1, 1, np.array(['a']))
+        with pytest.raises(TypeError) as e:
+            HyperDualNumbers(1, 1, 1, [1, 2])
+
+    def test_operators(self):
+        check(h1 + h1, 1., 2., 0.)
+        check(h1 + 2, 2.5, 1., 0.)
+        check(2 + h1, 2.5, 1., 0.)
+        check(h1 - 2, -1.5, 1., 0.)
+        check(2 - h1, 1.5, -1., 0.)
+        check(-h1, -0.5, -1., 0.)
+        check(h1 * h1, 0.25, 1., 2.)
+        check(h1 * 3, 1.5, 3., 0.)
+        check(3 * h1, 1.5, 3., 0.)
+        # the e1e2 part of x * y with x along e1 and y along e2 is the mixed partial 1
+        check(h2 * h3, 6., 3., 1., 2.)
+        check(h1 / 2, 0.25, 0.5, 0.)
+        check(1 / h1, 2., -4., 16.)
+        check(h2 / h3, 2 / 3, 1 / 3, -1 / 9, -2 / 9)
+        check(h1 ** 3, 0.125, 0.75, 3.)
+        check(h1 ** 1, 0.5, 1., 0.)
+        check(h4 ** 2, 0., 0., 2.)
+        check(h4 ** 1, 0., 1., 0.)
+        check(2 ** h1, 2 ** 0.5, 2 ** 0.5 * np.log(2), 2 ** 0.5 * np.log(2) ** 2)
+        # x ** y with x = 2 along e1 and y = 3 along e2
+        check(h2 ** h3, 8., 12., 4 + 12 * np.log(2), 8 * np.log(2))
+        check(h1.sqrt(), 0.5 ** 0.5, 0.5 / 0.5 ** 0.5, -0.25 * 0.5 ** -1.5)
+
+    def test_operators_Error(self):
+        with pytest.raises(ZeroDivisionError) as e:
+            h1 / 0
+        with pytest.raises(ZeroDivisionError) as e:
+            h1 / h4
+        with pytest.raises(ZeroDivisionError) as e:
+            1 / h4
+        with pytest.raises(ValueError) as e:
+            (-h1) ** 0.5
+        with pytest.raises(ValueError) as e:
+            h4 ** 0.5
+        with pytest.raises(ValueError) as e:
+            h4 ** 1.5
+        with pytest.raises(ValueError) as e:
+            (-h1) ** HyperDualNumbers(0.5, 0.)
+        with pytest.raises(ValueError) as e:
+            h4 ** HyperDualNumbers(0.5, 0.)
+
+    def test_elementary_functions(self):
+        x = 0.5
+        check(h1.exp(), np.exp(x), np.exp(x), np.exp(x))
+        check(h1.log(), np.log(x), 1 / x, -1 / x ** 2)
+        check(h1.log(2), np.log(x) / np.log(2), 1 / (x * np.log(2)), -1 / (x ** 2 * np.log(2)))
+        check(h1.sin(), np.sin(x), np.cos(x), -np.sin(x))
+        check(h1.cos(), np.cos(x), -np.sin(x), -np.cos(x))
+        check(h1.tan(), np.tan(x), 1 / np.cos(x) ** 2, 2 * np.tan(x) / np.cos(x) ** 2)
+        check(h1.sinh(), np.sinh(x), np.cosh(x), np.sinh(x))
+        check(h1.cosh(), np.cosh(x), np.sinh(x), np.cosh(x))
+        check(h1.tanh(), np.tanh(x), 1 / np.cosh(x) ** 2, -2 * np.tanh(x) / np.cosh(x) ** 2)
+        check(h1.arcsin(), np.arcsin(x), 1 / (1 - x ** 2) ** 0.5, x / (1 - x ** 2) ** 1.5)
+        check(h1.arccos(), np.arccos(x), -1 / (1 - x ** 2) ** 0.5, -x / (1 - x ** 2) ** 1.5)
+        check(h1.arctan(), np.arctan(x), 1 / (1 + x ** 2), -2 * x / (1 + x ** 2) ** 2)
+        s = 1 / (1 + np.exp(-x))
+        check(h1.logistic(), s, s * (1 - s), s * (1 - s) * (1 - 2 * s))
+        check(h1.softplus(), np.log(1 + np.exp(x)), s, s * (1 - s))
+
+    def test_elementary_functions_Error(self):
+        with pytest.raises(ValueError) as e:
+            h4.log()
+        with pytest.raises(ValueError) as e:
+            h1.log(1)
+        with pytest.raises(ValueError) as e:
+            h1.log(-2)
+        with pytest.raises(ValueError) as e:
+            HyperDualNumbers(np.pi / 2, 1.).tan()
+        with pytest.raises(ValueError) as e:
+            HyperDualNumbers(1., 1.).arcsin()
+        with pytest.raises(ValueError) as e:
+            HyperDualNumbers(-1., 1.).arccos()
+
+    # test the second derivatives of a composite function against central differences
+    def test_composite(self):
+        f = lambda x: (x.sin() * x.exp() + x ** 2).log()
+        g = lambda x: np.log(np.sin(x) * np.exp(x) + x ** 2)
+        z = f(HyperDualNumbers(1.3, 1.))
+        step = 1e-4
+        assert z.val == pytest.approx(g(1.3))
+        assert z.derv1 == pytest.approx((g(1.3 + step) - g(1.3 - step)) / (2 * step))
+        assert z.derv12 == pytest.approx((g(1.3 + step) - 2 * g(1.3) + g(1.3 - step)) / step ** 2, rel=1e-5)
+
+    # test that gradient seeds in e1 and a direction in e2 give a Hessian-vector product
+    def test_hessian_vector_product(self):
+        x = HyperDualNumbers(1., np.array([1., 0.]), 2., np.zeros(2))
+        y = HyperDualNumbers(2., np.array([0., 1.]), -1., np.zeros(2))
+        z = x ** 2 * y + y.sin()
+        # gradient of x**2 y + sin(y) and Hessian [[2y, 2x], [2x, -sin(y)]] times [2, -1]
+        assert z.derv1 == pytest.approx([4., 1 + np.cos(2.)])
+        assert z.derv12 == pytest.approx([8. - 2., 4. + np.sin(2.)])
+
+    # test batched evaluation with an array of values
+    def test_batch(self):
+        x = HyperDualNumbers._make(np.array([0.5, 1.5]), 1., 1., 0.)
+        z = x.sin() * x
+        assert z.val == pytest.approx(np.sin([0.5, 1.5]) * [0.5, 1.5])
+        assert z.derv12 == pytest.approx(2 * np.cos([0.5, 1.5]) - np.sin([0.5, 1.5]) * [0.5, 1.5])
+        with pytest.raises(ValueError) as e:
+            HyperDualNumbers._make(np.array([0.5, -1.5]), 1., 1., 0.).log()
+
+    def test_eq(self):
+        assert (h1 == HyperDualNumbers(0.5, 1.)) == (True, True, True, True)
+        assert (h2 == h3) == (False, False, False, True)
+        assert (h2 != h3) == (True, True, True, False)
@@ -90,3 +90,16 @@ class TestOptimizer:
             assert True
     
 
+    # test that a restart with a shared cache reuses the evaluations of the first run
+    def test_cache(self):
+        from AD_fbi.evaluation_cache import EvaluationCache
+        cache = EvaluationCache(max_size=1000)
+        first = Optimizer.gradient_descent(xy, f_xy, 100, alpha=0.01, cache=cache)
+        assert cache.misses == 101
+        second = Optimizer.gradient_descent(xy, f_xy, 100, alpha=0.01, cache=cache)
+        assert cache.hits == 101 and cache.misses == 101
+        assert second[1] == first[1]
+        assert all(second[2] == first[2])
+        assert Optimizer.gradient_descent(xy, f_xy, 100, alpha=0.01)[1] == first[1]
+        assert Optimizer.momentum(xy, f_xy, 10, cache=cache)[1] == Optimizer.momentum(xy, f_xy, 10)[1]
+        assert Optimizer.ADAGRAD(xy, f_xy, 10, cache=cache)[1] == Optimizer.ADAGRAD(xy, f_xy, 10)[1]
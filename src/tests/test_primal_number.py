@@ -0,0 +1,63 @@
+import pytest
+import numpy as np
+from AD_fbi.primal_number import PrimalNumbers
+from AD_fbi.dual_number import DualNumbers
+
+
+class TestPrimalNumbers:
+    """Test class for PrimalNumbers module"""
+
+    def test_init(self):
+        x = PrimalNumbers(2)
+        assert x.val == 2
+        assert x.derv == 0
+        assert PrimalNumbers(2, np.float32).val.dtype == np.float32
+        with pytest.raises(TypeError) as e:
+            PrimalNumbers('a')
+
+    def test_operators(self):
+        x, y = PrimalNumbers(2.), PrimalNumbers(4.)
+        assert (x + y).val == 6. and (x + 1).val == 3. and (1 + x).val == 3.
+        assert (x - y).val == -2. and (x - 1).val == 1. and (1 - x).val == -1.
+        assert (x * y).val == 8. and (x * 3).val == 6. and (3 * x).val == 6.
+        assert (x / y).val == 0.5 and (x / 4).val == 0.5 and (4 / x).val == 2.
+        assert (x ** 3).val == 8. and (x ** y).val == 16. and (2 ** x).val == 4.
+        assert (x ** 0.5).val == pytest.approx(2 ** 0.5)
+        assert (-x).val == -2.
+        z = PrimalNumbers(1.)
+        z += x
+        z *= y
+        z -= 1
+        z /= 11
+        assert z.val == 1.
+        # every result is a value-only object
+        for result in (x + y, x * 3, 4 / x, x ** 3, x.exp(), x.log(), np.float64(2) * x):
+            assert isinstance(result, PrimalNumbers)
+            assert result.derv == 0
+
+    def test_functions(self):
+        for val in (0.3, -0.7, 0.9):
+            x = PrimalNumbers(val)
+            dual = DualNumbers(val, 1.)
+            for name in ('exp', 'sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh', 'arcsin', 'arccos', 'arctan',
+                         'logistic', 'softplus'):
+                assert getattr(x, name)().val == pytest.approx(getattr(dual, name)().val)
+            sin, cos = x.sincos()
+            assert (sin.val, cos.val) == (np.sin(val), np.cos(val))
+        assert PrimalNumbers(4.).sqrt().val == 2.
+        assert PrimalNumbers(8.).log(2).val == pytest.approx(3.)
+
+    def test_domain(self):
+        # the domain checks and errors are the same as for DualNumbers
+        with pytest.raises(ValueError) as e:
+            PrimalNumbers(0.).log()
+        with pytest.raises(ValueError) as e:
+            PrimalNumbers(2.).arcsin()
+        with pytest.raises(ValueError) as e:
+            PrimalNumbers(-1.) ** 0.5
+        with pytest.raises(ZeroDivisionError) as e:
+            PrimalNumbers(1.) / PrimalNumbers(0.)
+        with pytest.raises(ZeroDivisionError) as e:
+            PrimalNumbers(1.) / 0
+        with pytest.raises(ZeroDivisionError) as e:
+            1 / PrimalNumbers(0.)
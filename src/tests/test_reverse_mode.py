@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+from AD_fbi.reverse_mode import ReverseMode
+from AD_fbi.forward_mode import ForwardMode
+
+
+class TestReverseMode:
+    """Test class for ReverseMode module"""
+
+    def test_univariate(self):
+        func = lambda x: x.sin() * x ** 2 + 1
+        rm = ReverseMode(1.5, func, -1)
+        val, derv = rm.calculate_gradient()
+        expected = ForwardMode(1.5, func, -1).calculate_dual_number()
+        assert isinstance(val, float) and isinstance(derv, float)
+        assert val == pytest.approx(expected[0])
+        assert derv == pytest.approx(expected[1])
+        assert rm.get_fx_value() == pytest.approx(expected[0])
+        assert rm.get_derivative() == pytest.approx(expected[1])
+
+    def test_multivariate(self):
+        func = lambda x, y, z: (x * y).exp() / z + z.log() * x - y ** 3
+        point = np.array([0.5, -1.2, 2.])
+        for seed in ("default seed", [2, -1, 0.5]):
+            rm = ReverseMode(point, func, seed)
+            fm = ForwardMode(point, func, seed)
+            val, derv = rm.value_and_derivative()
+            assert val == pytest.approx(fm.get_fx_value())
+            assert np.allclose(derv, fm.get_derivative())
+            assert np.allclose(rm.get_derivative(), fm.get_derivative())
+
+    def test_vector_function(self):
+        func = lambda x, y: (x + y, x * y, y.sin(), 3.)
+        rm = ReverseMode(np.array([1., 2.]), func, [2, -1])
+        val, derv = rm.calculate_gradient()
+        assert np.allclose(val, [3., 2., np.sin(2.), 3.])
+        assert np.allclose(derv, [[2., -1.], [4., -1.], [0., -np.cos(2.)], [0., 0.]])
+        assert np.allclose(ReverseMode(np.array([1., 2.]), lambda x, y: (x + y, x * y)).get_fx_value(), val[:2])
+        # a matrix function keeps the shape of its outputs
+        val, derv = ReverseMode(np.array([1., 2.]), lambda x, y: [[x, y], [x * y, x - y]]).calculate_gradient()
+        assert val.shape == (2, 2) and derv.shape == (2, 2, 2)
+        assert np.allclose(derv[1, 0], [2., 1.])
+        # a univariate vector function has one column of derivatives
+        val, derv = ReverseMode(1., lambda x: (x + 1, x ** 3), -1).calculate_gradient()
+        assert np.allclose(derv, [[-1.], [-3.]])
+
+    def test_seed_matrix(self):
+        func = lambda x, y, z: x * y * z
+        point = np.array([1., 2., 3.])
+        S = np.array([[1., 0.], [0., 1.], [1., 1.]])
+        _, derv = ReverseMode(point, func, S).calculate_gradient()
+        assert np.allclose(derv, np.array([6., 3., 2.]) @ S)
+
+    def test_many_inputs(self):
+        n = 200
+        func = lambda *x: sum((x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(n - 1))
+        point = np.linspace(-1., 1., n)
+        val, derv = ReverseMode(point, func).calculate_gradient()
+        expected = ForwardMode(point, func).calculate_dual_number()
+        assert val == pytest.approx(expected[0])
+        assert np.allclose(derv, expected[1])
+
+    def test_errors(self):
+        with pytest.raises(ValueError) as e:
+            ReverseMode(np.array([1., 2.]), lambda x, y: x * y, [1., 2., 3.]).calculate_gradient()
+        with pytest.raises(ValueError) as e:
+            ReverseMode(np.ones((2, 2)), lambda x, y: x * y).calculate_gradient()
+        with pytest.raises(ValueError) as e:
+            ReverseMode(0., lambda x: x.log()).get_derivative()
@@ -0,0 +1,116 @@
+import pytest
+import numpy as np
+from AD_fbi.reverse_number import ReverseNumbers, Tape, OP_NAMES
+from AD_fbi.dual_number import DualNumbers
+
+
+def gradient(z, input_num):
+    """Return the derivatives of z with respect to the first input_num nodes of its tape"""
+    return z.tape.backward([z.index], input_num)[0]
+
+
+class TestReverseNumbers:
+    """Test class for ReverseNumbers module"""
+
+    def test_init(self):
+        x = ReverseNumbers(2)
+        assert x.val == 2. and x.index == 0 and len(x.tape) == 1
+        y = ReverseNumbers(3., x.tape)
+        assert y.index == 1 and y.tape is x.tape
+        with pytest.raises(TypeError) as e:
+            ReverseNumbers('a')
+        with pytest.raises(TypeError) as e:
+            ReverseNumbers(np.array([1., 2.]))
+        assert repr(y) == 'Values: 3.0, Tape index: 1'
+
+    def test_tape(self):
+        tape = Tape()
+        x, y = ReverseNumbers(2., tape), ReverseNumbers(3., tape)
+        z = x * y + x.sin()
+        assert len(tape) == 5
+        assert [OP_NAMES[op] for op in tape.nodes()] == ['input', 'input', 'mul', 'sin', 'add']
+        assert np.array_equal(tape.operands(), [[-1, -1], [-1, -1], [0, 1], [0, -1], [2, 3]])
+        assert np.allclose(tape.partials()[2:], [[3., 2.], [np.cos(2.), 0.], [1., 1.]])
+        assert np.allclose(gradient(z, 2), [3. + np.cos(2.), 2.])
+        # the adjoints of the outputs scale their derivatives
+        assert np.allclose(tape.backward([z.index, x.index], 2, [2., 1.]), [[6. + 2 * np.cos(2.), 4.], [1., 0.]])
+        # one sweep of the vector-Jacobian product seeds every output with its adjoint
+        assert np.allclose(tape.vjp([z.index, x.index], [2., 1.], 2), [7. + 2 * np.cos(2.), 4.])
+        with pytest.raises(ValueError) as e:
+            x + ReverseNumbers(1.)
+
+    def test_operators(self):
+        tape = Tape()
+        x, y = ReverseNumbers(2., tape), ReverseNumbers(4., tape)
+        dx, dy = DualNumbers(2., np.array([1., 0.])), DualNumbers(4., np.array([0., 1.]))
+        for op in (lambda a, b: a + b, lambda a, b: a - b, lambda a, b: a * b, lambda a, b: a / b,
+                   lambda a, b: a ** b, lambda a, b: a + 1, lambda a, b: 1 + a, lambda a, b: a - 1,
+                   lambda a, b: 1 - a, lambda a, b: 3 * a, lambda a, b: a * 3, lambda a, b: a / 4,
+                   lambda a, b: 4 / a, lambda a, b: a ** 3, lambda a, b: a ** 0.5, lambda a, b: 2 ** a,
+                   lambda a, b: -a, lambda a, b: np.float64(2) * a, lambda a, b: np.add(a, b)):
+            z, expected = op(x, y), op(dx, dy)
+            assert z.val == pytest.approx(expected.val)
+            assert np.allclose(gradient(z, 2), expected.derv)
+
+    def test_array_operands(self):
+        x = ReverseNumbers(2.)
+        z = np.array([1., 2.]) * x
+        assert z.dtype == object
+        assert [funct.val for funct in z] == [2., 4.]
+        assert np.allclose([gradient(funct, 1) for funct in z], [[1.], [2.]])
+
+    def test_functions(self):
+        for val in (0.3, -0.7, 0.9):
+            x = ReverseNumbers(val)
+            dual = DualNumbers(val, 1.)
+            for name in ('exp', 'sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh', 'arcsin', 'arccos', 'arctan',
+                         'logistic', 'softplus'):
+                z, expected = getattr(x, name)(), getattr(dual, name)()
+                assert z.val == pytest.approx(expected.val)
+                assert gradient(z, 1)[0] == pytest.approx(expected.derv)
+            sin, cos = x.sincos()
+            assert gradient(sin, 1)[0] == pytest.approx(np.cos(val))
+            assert gradient(cos, 1)[0] == pytest.approx(-np.sin(val))
+            assert gradient(np.exp(x), 1)[0] == pytest.approx(np.exp(val))
+        x = ReverseNumbers(8.)
+        assert x.sqrt().val == pytest.approx(8 ** 0.5)
+        assert x.log(2).val == pytest.approx(3.)
+        assert gradient(x.log(2), 1)[0] == pytest.approx(1 / (8 * np.log(2)))
+        assert gradient(x.log(), 1)[0] == pytest.approx(1 / 8)
+        # exp overflows to inf like the NumPy exponential
+        with np.errstate(over='ignore'):
+            assert ReverseNumbers(1000.).exp().val == np.inf
+
+    def test_domain(self):
+        with pytest.raises(ValueError) as e:
+            ReverseNumbers(0.).log()
+        assert str(e.value) == "ERROR: Value for log should be greater than 0"
+        with pytest.raises(ValueError) as e:
+            ReverseNumbers(2.).log(1)
+        with pytest.raises(ZeroDivisionError) as e:
+            ReverseNumbers(2.) / 0
+        with pytest.raises(ZeroDivisionError) as e:
+            1 / ReverseNumbers(0.)
+        x = ReverseNumbers(0.)
+        with pytest.raises(ZeroDivisionError) as e:
+            ReverseNumbers(1., x.tape) / x
+        with pytest.raises(ValueError) as e:
+            ReverseNumbers(np.pi / 2).tan()
+        with pytest.raises(ValueError) as e:
+            ReverseNumbers(1.).arcsin()
+        with pytest.raises(ValueError) as e:
+            ReverseNumbers(-1.).arccos()
+        with pytest.raises(ValueError) as e:
+            ReverseNumbers(-2.) ** 0.5
+        with pytest.raises(ValueError) as e:
+            x ** 0.5
+        y = ReverseNumbers(-2., x.tape)
+        with pytest.raises(ValueError) as e:
+            y ** ReverseNumbers(0.5, x.tape)
+
+    def test_power_of_zero(self):
+        tape = Tape()
+        x, y = ReverseNumbers(0., tape), ReverseNumbers(2., tape)
+        z = x ** y
+        assert z.val == 0.
+        assert np.array_equal(gradient(z, 2), [0., 0.])
@@ -0,0 +1,89 @@
+import pytest
+import numpy as np
+from AD_fbi.sparse_derivative import SparseDerivative
+from AD_fbi.dual_number import DualNumbers
+
+d1 = SparseDerivative([3, 0], [2., 1.], 12)
+d2 = SparseDerivative([5], [-1.], 12)
+d3 = SparseDerivative([0, 3], [1., 1.], 12)
+
+
+class TestSparseDerivative:
+    """Test class for SparseDerivative module"""
+
+    # test attribute initialization
+    def test_init(self):
+        assert all(d1.indices == [0, 3])
+        assert all(d1.values == [1., 2.])
+        assert d1.size == 12
+        assert len(d1) == 12
+        assert all(SparseDerivative.unit(2, 3., 4).toarray() == [0., 0., 3., 0.])
+
+    def test_init_Error(self):
+        with pytest.raises(ValueError) as e:
+            SparseDerivative([0, 1], [1.], 12)
+        with pytest.raises(ValueError) as e:
+            SparseDerivative([12], [1.], 12)
+
+    def test_repr(self):
+        assert "SparseDerivative(indices=[5], values=[-1.], size=12)" == d2.__repr__()
+
+    # test merging sparse derivatives
+    def test_add(self):
+        out = d1 + d2
+        assert isinstance(out, SparseDerivative)
+        assert all(out.indices == [0, 3, 5])
+        assert all(out.toarray() == d1.toarray() + d2.toarray())
+        out = d1 + d3
+        assert all(out.indices == [0, 3])
+        assert all(out.values == [2., 3.])
+        assert d1 + 0 is d1
+
+    # test the switch to a dense derivative above the density threshold
+    def test_add_dense(self):
+        out = d1 + d2 + SparseDerivative([7], [1.], 12)
+        assert isinstance(out, np.ndarray)
+        assert all(out == [1., 0., 0., 2., 0., -1., 0., 1., 0., 0., 0., 0.])
+        out = np.ones(12) + d2
+        assert isinstance(out, np.ndarray)
+        assert out[5] == 0.
+        out = d2 - np.ones(12)
+        assert out[5] == -2.
+
+    def test_sub_neg(self):
+        out = d1 - d3
+        assert all(out.values == [0., 1.])
+        out = -d2
+        assert all(out.values == [1.])
+
+    def test_mul_div(self):
+        out = 2 * d1
+        assert all(out.values == [2., 4.])
+        out = d1 * np.float64(0.5)
+        assert isinstance(out, SparseDerivative)
+        assert all(out.values == [0.5, 1.])
+        out = d1 / 2
+        assert all(out.values == [0.5, 1.])
+
+    def test_eq(self):
+        assert all(d1 == d1.toarray())
+        assert not any(d1 != d1.toarray())
+        assert all(np.asarray(d1) == d1.toarray())
+
+    def test_dtype(self):
+        d = SparseDerivative.unit(2, 1., 12, np.float32)
+        assert d.dtype == np.float32
+        assert (d + d3.astype(np.float32)).dtype == np.float32
+        assert (d * 2.).toarray().dtype == np.float32
+        assert SparseDerivative([0], [1], 12, dtype=np.float32).values.dtype == np.float32
+        assert d1.astype(np.float32).dtype == np.float32
+
+    # test sparse derivatives propagated through dual numbers
+    def test_dual_numbers(self):
+        x = DualNumbers(1., SparseDerivative.unit(0, 1., 100))
+        y = DualNumbers(2., SparseDerivative.unit(99, 1., 100))
+        out = (x * y).sin() + x / y - y ** 2 + x.exp()
+        assert isinstance(out.derv, SparseDerivative)
+        assert all(out.derv.indices == [0, 99])
+        assert pytest.approx(np.cos(2.) * 2 + 0.5 + np.e) == out.derv.values[0]
+        assert pytest.approx(np.cos(2.) - 0.25 - 4) == out.derv.values[1]
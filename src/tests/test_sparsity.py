@@ -0,0 +1,127 @@
+import pytest
+import numpy as np
+from AD_fbi.sparsity import SparseMatrix, jacobian_sparsity, color_columns, sparse_jacobian, hessian_sparsity, star_color
+from AD_fbi.forward_mode import ForwardMode
+
+
+n = 10
+# a discretized nonlinear boundary value problem with a tridiagonal Jacobian
+tridiagonal = lambda *x: [(x[i - 1] if i > 0 else 0) - 2 * x[i] + (x[i + 1] if i < n - 1 else 0) + x[i].exp()
+                          for i in range(n)]
+
+
+class TestSparseMatrix:
+    """Test class for SparseMatrix"""
+
+    def test_init(self):
+        J = SparseMatrix([1, 0, 1], [2, 1, 0], [3., 1., 2.], (2, 3))
+        # the entries are sorted by row and column
+        assert all(J.row == [0, 1, 1]) and all(J.col == [1, 0, 2]) and all(J.data == [1., 2., 3.])
+        assert J.nnz == 3
+        assert J.shape == (2, 3)
+        assert repr(J) == 'SparseMatrix(shape=(2, 3), nnz=3)'
+        with pytest.raises(ValueError) as e:
+            SparseMatrix([0, 1], [0], [1.], (2, 2))
+        with pytest.raises(ValueError) as e:
+            SparseMatrix([0, 2], [0, 0], [1., 1.], (2, 2))
+
+    def test_conversions(self):
+        J = SparseMatrix([0, 2, 2], [0, 0, 2], [1., 2., 3.], (3, 3))
+        assert (J.toarray() == [[1., 0., 0.], [0., 0., 0.], [2., 0., 3.]]).all()
+        indptr, indices, data = J.tocsr()
+        assert all(indptr == [0, 1, 1, 3]) and all(indices == [0, 0, 2]) and all(data == [1., 2., 3.])
+        assert all(J @ np.array([1., 2., 3.]) == J.toarray() @ np.array([1., 2., 3.]))
+
+
+class TestSparsity:
+    """Test class for sparsity pattern detection, coloring and sparse Jacobians"""
+
+    def test_jacobian_sparsity(self):
+        pattern = jacobian_sparsity(tridiagonal, np.ones(n))
+        expected = np.eye(n) + np.eye(n, k=1) + np.eye(n, k=-1)
+        assert (pattern.toarray() == expected.astype(bool)).all()
+        # the pattern is structural, a partial derivative of 0 at the point is kept
+        pattern = jacobian_sparsity(lambda x, y, z: (x * y, z.sin() + 1, x ** z), np.array([1., 0., 0.]))
+        assert (pattern.toarray() == [[True, True, False], [False, False, True], [True, False, True]]).all()
+        # a scalar function has a single row
+        pattern = jacobian_sparsity(lambda x, y, z: x.log(2) * z.arctan(), np.array([1., 2., 3.]))
+        assert (pattern.toarray() == [[True, False, True]]).all()
+
+    def test_color_columns(self):
+        colors = color_columns(jacobian_sparsity(tridiagonal, np.ones(n)))
+        assert colors.max() + 1 == 3
+        # a dense row needs one color per column
+        colors = color_columns(jacobian_sparsity(lambda *x: sum(x), np.ones(4)))
+        assert all(colors == [0, 1, 2, 3])
+        # columns of a diagonal Jacobian share one color
+        colors = color_columns(jacobian_sparsity(lambda *x: [xi ** 2 for xi in x], np.ones(4)))
+        assert all(colors == 0)
+
+    def test_hessian_sparsity(self):
+        # the Hessian of a sum of terms of neighbors is tridiagonal
+        pattern = hessian_sparsity(lambda *x: sum((x[i] - x[i + 1]) ** 2 for i in range(n - 1)) + x[0].exp(), np.ones(n))
+        expected = np.eye(n) + np.eye(n, k=1) + np.eye(n, k=-1)
+        assert (pattern.toarray() == expected.astype(bool)).all()
+        # linear terms add no entries, and the pattern is structural, a second derivative of 0 at the point is kept
+        pattern = hessian_sparsity(lambda x, y, z: 3 * x - y / 2 + z.sin() + (x * y).exp(), np.array([1., 0., 0.]))
+        assert (pattern.toarray() == [[True, True, False], [True, True, False], [False, False, True]]).all()
+        assert hessian_sparsity(lambda x, y: x + 2 * y, np.ones(2)).nnz == 0
+        with pytest.raises(ValueError) as e:
+            hessian_sparsity(lambda x, y: (x * y, y), np.ones(2))
+
+    def test_star_color(self):
+        def recoverable(dense):
+            # every off-diagonal entry is the only entry of its color in its row or in its column
+            row, col = np.nonzero(dense)
+            colors = star_color(SparseMatrix(row, col, np.ones(len(row)), dense.shape))
+            counts = np.zeros((len(dense), colors.max() + 1), dtype=int)
+            np.add.at(counts, (row, colors[col]), 1)
+            return colors, all(i == j or (colors[i] != colors[j] and (counts[i, colors[j]] == 1 or counts[j, colors[i]] == 1))
+                               for i, j in zip(row, col))
+
+        colors, valid = recoverable(np.eye(n) + np.eye(n, k=1) + np.eye(n, k=-1))
+        assert valid and colors.max() + 1 == 3
+        # an arrowhead pattern needs 2 colors, where a distance-2 coloring would need n
+        arrowhead = np.eye(n)
+        arrowhead[-1] = arrowhead[:, -1] = 1
+        colors, valid = recoverable(arrowhead)
+        assert valid and colors.max() + 1 == 2
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            dense = rng.random((20, 20)) < 0.15
+            assert recoverable(dense | dense.T | np.eye(20, dtype=bool))[1]
+
+    def test_sparse_jacobian(self):
+        x = np.linspace(0.1, 1., n)
+        val, J = sparse_jacobian(tridiagonal, x)
+        dense_val, dense_J = ForwardMode(x, tridiagonal).calculate_dual_number()
+        assert np.allclose(val, dense_val)
+        assert np.allclose(J.toarray(), dense_J)
+        assert J.nnz == 3 * n - 2
+        # the pattern can be reused at another point, and the seed scales the columns
+        val, J = sparse_jacobian(tridiagonal, 2 * x, pattern=J, seed=np.arange(n))
+        assert np.allclose(J.toarray(), ForwardMode(2 * x, tridiagonal, np.arange(n)).get_derivative())
+        val, J = sparse_jacobian(lambda x, y: x * y, np.array([2., 3.]))
+        assert val == 6. and (J.toarray() == [[3., 2.]]).all()
+        # an output that does not depend on any input variable has a zero row
+        val, J = sparse_jacobian(lambda a, b, c: (a * b, 3., c.exp()), np.array([1., 2., 0.]))
+        assert (val == [2., 3., 1.]).all()
+        assert (J.toarray() == [[2., 1., 0.], [0., 0., 0.], [0., 0., 1.]]).all()
+        val, J = sparse_jacobian(lambda a, b: 3., np.array([1., 2.]))
+        assert val == 3. and J.nnz == 0 and (J.toarray() == [[0., 0.]]).all()
+        # the outputs of a matrix function are the rows of the Jacobian in row-major order
+        val, J = sparse_jacobian(lambda a, b, c: [[a * b, c], [b.exp(), 2.]], np.array([1., 2., 0.]))
+        assert val.shape == (2, 2) and np.allclose(val, [[2., 0.], [np.exp(2.), 2.]])
+        assert np.allclose(J.toarray(), [[2., 1., 0.], [0., 0., 1.], [0., np.exp(2.), 0.], [0., 0., 0.]])
+        # a batched dual output holds every output of a vector function
+        val, J = sparse_jacobian(lambda a, b, c: np.stack([a * b, c.exp()]) * 2, np.array([1., 2., 0.]))
+        assert all(val == [4., 2.]) and (J.toarray() == [[4., 2., 0.], [0., 0., 2.]]).all()
+        with pytest.raises(ValueError) as e:
+            sparse_jacobian(tridiagonal, x, seed=[1., 2.])
+
+    def test_forward_mode(self):
+        x = np.linspace(0.1, 1., n)
+        val, J = ForwardMode(x, tridiagonal).calculate_sparse_jacobian()
+        assert np.allclose(J.toarray(), ForwardMode(x, tridiagonal).get_derivative())
+        val, J = ForwardMode(x, tridiagonal, dtype=np.float32).calculate_sparse_jacobian()
+        assert J.data.dtype == np.float32
@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+from AD_fbi.tangent_number import TangentNumbers, TangentTape
+from AD_fbi.hyper_dual_number import HyperDualNumbers
+
+
+def second_derivative(z, input_num):
+    """Return the gradient and its derivative along the tangents of the inputs of the tape of z"""
+    return z.tape.backward_tangent([z.index], input_num)
+
+
+class TestTangentNumbers:
+    """Test class for TangentNumbers module"""
+
+    def test_init(self):
+        x = TangentNumbers(2, 1.)
+        assert x.val == 2. and x.dot == 1. and x.index == 0
+        assert isinstance(x.tape, TangentTape)
+        with pytest.raises(TypeError) as e:
+            TangentNumbers('a', 1.)
+
+    def test_operators(self):
+        tape = TangentTape()
+        x, y = TangentNumbers(2., 1., tape), TangentNumbers(4., -0.5, tape)
+        hx, hy = HyperDualNumbers(2., 1.), HyperDualNumbers(4., -0.5)
+        for op in (lambda a, b: a * b, lambda a, b: a / b, lambda a, b: a ** b, lambda a, b: a + b * b,
+                   lambda a, b: a - b * a, lambda a, b: 4 / a, lambda a, b: a ** 3, lambda a, b: a ** 2,
+                   lambda a, b: a ** 2.5, lambda a, b: 2 ** a, lambda a, b: -a * b, lambda a, b: a * 3 + 1,
+                   lambda a, b: 1 - a / 4, lambda a, b: 3 * a - 2):
+            z, expected = op(x, y), op(hx, hy)
+            assert z.val == pytest.approx(expected.val)
+            assert z.dot == pytest.approx(expected.derv1)
+            # the derivative of the gradient along the direction gives v^T H v
+            gradient, product = second_derivative(z, 2)
+            assert np.dot(product, [1., -0.5]) == pytest.approx(expected.derv12)
+
+    def test_functions(self):
+        for val in (0.3, -0.7, 0.9):
+            for name in ('exp', 'sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh', 'arcsin', 'arccos', 'arctan',
+                         'logistic', 'softplus'):
+                z, expected = getattr(TangentNumbers(val, 2.), name)(), getattr(HyperDualNumbers(val, 2.), name)()
+                gradient, product = second_derivative(z, 1)
+                assert z.val == pytest.approx(expected.val)
+                assert z.dot == pytest.approx(expected.derv1)
+                assert 2 * product[0] == pytest.approx(expected.derv12)
+            sin, cos = TangentNumbers(val, 1.).sincos()
+            assert second_derivative(sin, 1)[1][0] == pytest.approx(-np.sin(val))
+            assert second_derivative(cos, 1)[1][0] == pytest.approx(-np.cos(val))
+        x = TangentNumbers(8., 1.)
+        assert second_derivative(x.log(2), 1)[1][0] == pytest.approx(-1 / (64 * np.log(2)))
+        assert second_derivative(x.sqrt(), 1)[1][0] == pytest.approx(-0.25 * 8 ** -1.5)
+
+    def test_block_of_directions(self):
+        tape = TangentTape()
+        x, y = TangentNumbers(1., np.array([1., 0.]), tape), TangentNumbers(2., np.array([0., 1.]), tape)
+        z = x * x * y + y.sin()
+        gradient, product = second_derivative(z, 2)
+        assert np.allclose(gradient, [4., 1. + np.cos(2.)])
+        assert np.allclose(product, [[4., 2.], [2., -np.sin(2.)]])
+        # the tangents of the inputs are never updated in place
+        assert np.array_equal(x.dot, [1., 0.])
+
+    def test_domain(self):
+        with pytest.raises(ValueError) as e:
+            TangentNumbers(0., 1.).log()
+        with pytest.raises(ZeroDivisionError) as e:
+            1 / TangentNumbers(0., 1.)
+        with pytest.raises(ValueError) as e:
+            TangentNumbers(0., 1.) ** 1.5
+        with pytest.raises(ValueError) as e:
+            TangentNumbers(1., 1.).arcsin()
@@ -0,0 +1,63 @@
+import math
+import warnings
+
+import pytest
+import numpy as np
+
+from AD_fbi.taylor_mode import TaylorMode
+from AD_fbi.forward_mode import ForwardMode
+
+
+func1 = lambda x: x.sin()
+tm1 = TaylorMode(0, func1, 4)
+
+func2 = lambda x, y: x * y
+tm2 = TaylorMode(np.array([1, 2]), func2, 2, [1, 1])
+
+func3 = lambda x, y: (x**3 + y, (x * y).exp())
+tm3 = TaylorMode(np.array([1., 0.]), func3, 3, [1, -1])
+
+
+class TestTaylorMode:
+    """Test class for TaylorMode module"""
+
+    # test attribute initialization
+    def test_init(self):
+        assert tm1.inputs == 0
+        assert tm1.functions == func1
+        assert tm1.order == 4
+        assert tm1.seed == 1
+        assert tm2.seed == [1, 1]
+        assert all(TaylorMode(np.array([1, 2]), func2, 2).seed == [1., 1.])
+
+    # test a NumPy seed, which is not compared to the default seed string element-wise
+    def test_array_seed(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            tm = TaylorMode(np.array([1., 2.]), func2, 2, np.array([1., 0.]))
+            assert all(tm.seed == [1., 0.])
+            # along (1, 0): x * y = 2 + 2t
+            assert tm.get_derivatives() == pytest.approx([2., 2., 0.])
+
+    def test_get_fx_value(self):
+        assert tm1.get_fx_value() == 0
+        assert tm2.get_fx_value() == 2
+        assert all(tm3.get_fx_value() == [1., 1.])
+
+    def test_get_derivatives(self):
+        assert tm1.get_derivatives() == pytest.approx([0., 1., 0., -1., 0.])
+        assert tm2.get_derivatives() == pytest.approx([2., 3., 2.])
+        # along (1, -1): x**3 + y = (1 + t)**3 - t and x * y = -t - t**2
+        derivatives = tm3.get_derivatives()
+        assert derivatives.shape == (2, 4)
+        assert derivatives[0] == pytest.approx([1., 2., 6., 6.])
+        assert derivatives[1] == pytest.approx([1., -1., -1., 5.])
+        # the first derivative matches the directional derivative of ForwardMode
+        fm = ForwardMode(np.array([1., 0.]), func3, [1, -1])
+        assert derivatives[:, 1] == pytest.approx(fm.get_derivative().sum(axis=1))
+
+    def test_calculate_taylor_coefficients(self):
+        coefficients = TaylorMode(0, lambda x: x.exp(), 5).calculate_taylor_coefficients()
+        assert coefficients == pytest.approx([1 / math.factorial(k) for k in range(6)])
+        with pytest.raises(ValueError) as e:
+            TaylorMode(np.array([1, 2]), func2, 2, [1, 1, 1]).get_derivatives()
@@ -0,0 +1,120 @@
+import math
+
+import pytest
+import numpy as np
+from AD_fbi.taylor_number import TaylorNumbers
+from AD_fbi.hyper_dual_number import HyperDualNumbers
+
+K = 6
+t1 = TaylorNumbers.variable(0.5, K)
+t2 = TaylorNumbers.variable(0., K)
+factorials = np.array([math.factorial(k) for k in range(K + 1)], dtype=float)
+
+
+class TestTaylorNumbers:
+    """Test class for TaylorNumbers module"""
+
+    # test attribute initialization
+    def test_init(self):
+        assert all(t1.coefficients == [0.5, 1., 0., 0., 0., 0., 0.])
+        assert t1.val == 0.5
+        assert t1.order == K
+        assert all(TaylorNumbers([1, 2]).coefficients == [1., 2.])
+        assert all(TaylorNumbers.variable(2, 2, -3).coefficients == [2., -3., 0.])
+        assert all(TaylorNumbers.variable(2, 0).coefficients == [2.])
+        assert "Coefficients: [1. 2.]" == TaylorNumbers([1, 2]).__repr__()
+        assert not hasattr(t1, '__dict__')
+
+    def test_init_Error(self):
+        with pytest.raises(TypeError) as e:
+            TaylorNumbers(['a', 1])
+        with pytest.raises(TypeError) as e:
+            TaylorNumbers([])
+        with pytest.raises(TypeError) as e:
+            TaylorNumbers([[1, 2]])
+        with pytest.raises(ValueError) as e:
+            TaylorNumbers.variable(1, -1)
+
+    def test_operators(self):
+        assert all((t1 + t1).coefficients == [1., 2., 0., 0., 0., 0., 0.])
+        assert all((1 + t1).coefficients == [1.5, 1., 0., 0., 0., 0., 0.])
+        assert all((1 - t1).coefficients == [0.5, -1., 0., 0., 0., 0., 0.])
+        assert all((t1 - 1).coefficients == [-0.5, 1., 0., 0., 0., 0., 0.])
+        assert all((2 * t1).coefficients == [1., 2., 0., 0., 0., 0., 0.])
+        assert all((t1 * t1).coefficients == [0.25, 1., 1., 0., 0., 0., 0.])
+        assert all((t1 / 2).coefficients == [0.25, 0.5, 0., 0., 0., 0., 0.])
+        # 1 / (1 - x) at 0 is the geometric series
+        assert (1 / (1 - t2)).coefficients == pytest.approx(np.ones(K + 1))
+        assert ((t1 * t1) / t1).coefficients == pytest.approx(t1.coefficients)
+        # the k-th derivative of x ** p is p (p - 1) ... (p - k + 1) x ** (p - k)
+        for p in (3, 2.5, -1, -1.5):
+            expected = [np.prod(p - np.arange(k)) * 0.5 ** (p - k) for k in range(K + 1)]
+            assert (t1 ** p).derivatives() == pytest.approx(expected)
+        assert all((t2 ** 3).derivatives() == [0., 0., 0., 6., 0., 0., 0.])
+        assert all((t2 ** 0).coefficients == [1., 0., 0., 0., 0., 0., 0.])
+        assert (2 ** t1).derivatives() == pytest.approx(2 ** 0.5 * np.log(2) ** np.arange(K + 1))
+        # x ** x against exp(x log x)
+        assert (t1 ** t1).coefficients == pytest.approx((t1 * t1.log()).exp().coefficients)
+        assert t1.sqrt().coefficients == pytest.approx((t1 ** 0.5).coefficients)
+        # operands of different orders are truncated to the lower order
+        assert (t1 + TaylorNumbers.variable(1., 2)).order == 2
+        assert all((t1 * TaylorNumbers.variable(1., 2)).coefficients == [0.5, 1.5, 1.])
+
+    def test_operators_Error(self):
+        with pytest.raises(ZeroDivisionError) as e:
+            t1 / 0
+        with pytest.raises(ZeroDivisionError) as e:
+            t1 / t2
+        with pytest.raises(ZeroDivisionError) as e:
+            1 / t2
+        with pytest.raises(ValueError) as e:
+            (-t1) ** 0.5
+        with pytest.raises(ValueError) as e:
+            t2 ** 0.5
+        with pytest.raises(ValueError) as e:
+            t2 ** -1
+        with pytest.raises(ValueError) as e:
+            (-1) ** t1
+
+    def test_elementary_functions(self):
+        x, k = 0.5, np.arange(K + 1)
+        assert t1.exp().derivatives() == pytest.approx(np.exp(x) * np.ones(K + 1))
+        assert (2 * t1).exp().derivatives() == pytest.approx(np.exp(2 * x) * 2. ** k)
+        # the k-th derivative of log(x) is (-1) ** (k - 1) (k - 1)! / x ** k
+        expected = [np.log(x)] + [(-1) ** (j - 1) * math.factorial(j - 1) / x ** j for j in range(1, K + 1)]
+        assert t1.log().derivatives() == pytest.approx(expected)
+        assert t1.log(2).derivatives() == pytest.approx(np.array(expected) / np.log(2))
+        assert (3 * t1).sin().derivatives() == pytest.approx(3. ** k * np.sin(3 * x + k * np.pi / 2))
+        assert (3 * t1).cos().derivatives() == pytest.approx(3. ** k * np.cos(3 * x + k * np.pi / 2))
+        assert t1.sinh().derivatives() == pytest.approx(np.where(k % 2, np.cosh(x), np.sinh(x)))
+        assert t1.cosh().derivatives() == pytest.approx(np.where(k % 2, np.sinh(x), np.cosh(x)))
+        assert t1.tan().coefficients == pytest.approx((t1.sin() / t1.cos()).coefficients)
+        assert t1.tanh().coefficients == pytest.approx((t1.sinh() / t1.cosh()).coefficients)
+        assert t1.logistic().coefficients == pytest.approx((1 / (1 + (-t1).exp())).coefficients)
+        assert t1.softplus().coefficients == pytest.approx((t1.exp() + 1).log().coefficients)
+        # series at 0: arctan x = x - x**3 / 3 + x**5 / 5, arcsin x = x + x**3 / 6 + 3 x**5 / 40
+        assert t2.arctan().coefficients == pytest.approx([0., 1., 0., -1 / 3, 0., 1 / 5, 0.])
+        assert t2.arcsin().coefficients == pytest.approx([0., 1., 0., 1 / 6, 0., 3 / 40, 0.])
+        assert t2.arccos().coefficients == pytest.approx([np.pi / 2, -1., 0., -1 / 6, 0., -3 / 40, 0.])
+
+    def test_elementary_functions_Error(self):
+        with pytest.raises(ValueError) as e:
+            t2.log()
+        with pytest.raises(ValueError) as e:
+            t1.log(1)
+        with pytest.raises(ValueError) as e:
+            TaylorNumbers.variable(np.pi / 2, 2).tan()
+        with pytest.raises(ValueError) as e:
+            TaylorNumbers.variable(1., 2).arcsin()
+        with pytest.raises(ValueError) as e:
+            TaylorNumbers.variable(-1., 2).arccos()
+
+    # test the first two derivatives of a composite function against hyper-dual numbers
+    def test_composite(self):
+        f = lambda x: (x.sin() * x.exp() + x ** 2).log() / (1 + x.arctan()) + x.cosh() ** 1.5
+        z = f(t1)
+        h = f(HyperDualNumbers(0.5, 1.))
+        derivatives = z.derivatives()
+        assert derivatives[0] == pytest.approx(h.val)
+        assert derivatives[1] == pytest.approx(h.derv1)
+        assert derivatives[2] == pytest.approx(h.derv12)